@@ -36,6 +36,94 @@ class Settings(BaseSettings):
         default=None,
         description="SearchCarriers API token for insurance enrichment"
     )
+    enrichment_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Carriers enriched concurrently per job (bounded by the shared rate limiter and Neo4j pool)"
+    )
+    enrichment_queue_path: str = Field(
+        default="data/enrichment_queue.db",
+        description="SQLite file backing the durable enrichment queue"
+    )
+    enrichment_max_attempts: int = Field(
+        default=5,
+        ge=1,
+        description="Attempts per carrier before an enrichment item is dead-lettered"
+    )
+    enrichment_retry_base_delay: float = Field(
+        default=30.0,
+        ge=0,
+        description="Backoff in seconds after the first failed attempt; doubles per attempt"
+    )
+    enrichment_retry_max_delay: float = Field(
+        default=3600.0,
+        ge=0,
+        description="Upper bound in seconds on the retry backoff"
+    )
+    enrichment_lease_seconds: float = Field(
+        default=300.0,
+        gt=0,
+        description="Seconds a worker's claim on a carrier stays valid without renewal"
+    )
+    enrichment_write_queue_size: int = Field(
+        default=64,
+        ge=1,
+        description="Pages waiting for the enrichment writer before fetching is held back"
+    )
+    enrichment_write_batch_size: int = Field(
+        default=20,
+        ge=1,
+        description="Pages (from any carriers) coalesced into one enrichment write transaction"
+    )
+    enrichment_write_linger_ms: float = Field(
+        default=25.0,
+        ge=0,
+        description="Milliseconds the enrichment writer waits for more pages to fill a batch"
+    )
+    enrichment_revalidate_max_age_hours: float = Field(
+        default=24.0,
+        gt=0,
+        description="Age in hours after which a revalidating read queues a background refresh"
+    )
+    enrichment_refresh_enabled: bool = Field(
+        default=False,
+        description="Default for the enrichment worker's --refresh-scheduler flag; run the scheduler in exactly one process"
+    )
+    enrichment_refresh_max_age_days: float = Field(
+        default=7.0,
+        gt=0,
+        description="Age in days after which a carrier's enriched data family is refreshed"
+    )
+    enrichment_refresh_rate_per_hour: float = Field(
+        default=120.0,
+        ge=0,
+        description="Stale carriers queued for refresh per hour"
+    )
+    enrichment_refresh_interval_seconds: float = Field(
+        default=300.0,
+        gt=0,
+        description="Seconds between refresh scheduling passes"
+    )
+    enrichment_refresh_max_backlog: int = Field(
+        default=0,
+        ge=0,
+        description="Pending on-demand enrichment items above which refresh scheduling pauses"
+    )
+    insurance_statistics_refresh_seconds: float = Field(
+        default=900.0,
+        gt=0,
+        description="Seconds between background refreshes of the insurance statistics summary"
+    )
+    insurance_statistics_ingest_refresh_min_carriers: int = Field(
+        default=100,
+        ge=1,
+        description="Carriers created by one ingest that trigger an insurance statistics refresh"
+    )
+    coverage_index_sync_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        description="Seconds after which the in-memory coverage index reloads carriers with insurance changes"
+    )
     
     # Application Settings
     app_name: str = Field(
@@ -1,9 +1,11 @@
+import time
 import logging
 from contextlib import contextmanager
 from typing import Generator
 
 from neo4j import GraphDatabase, Session
 from config import settings
+from utils.cost_context import current_meter
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +72,33 @@ class BaseRepository:
     def __init__(self):
         self.db = db
     
+    @staticmethod
+    def _summary_counters(summary) -> dict:
+        """Write counters of a consumed result summary."""
+        return {
+            "nodes_created": summary.counters.nodes_created,
+            "nodes_deleted": summary.counters.nodes_deleted,
+            "relationships_created": summary.counters.relationships_created,
+            "relationships_deleted": summary.counters.relationships_deleted,
+            "properties_set": summary.counters.properties_set,
+        }
+    
+    def _record_cost(self, meter, start: float, summaries: list):
+        """Charge executed statements to the enrichment job being metered.
+        
+        Args:
+            meter: CostMeter of the current job, or None when not metering
+            start: ``time.perf_counter()`` before the statements were sent
+            summaries: Result summaries of the statements
+        """
+        if meter is None:
+            return
+        counters = {}
+        for summary in summaries:
+            for key, value in self._summary_counters(summary).items():
+                counters[key] = counters.get(key, 0) + value
+        meter.record_database(len(summaries), (time.perf_counter() - start) * 1000, counters)
+    
     def execute_query(self, query: str, parameters: dict = None) -> list:
         """Execute a read query and return results.
         
@@ -80,9 +109,14 @@ class BaseRepository:
         Returns:
             list: Query results as list of dictionaries
         """
+        meter = current_meter()
+        start = time.perf_counter()
         with self.db.get_session() as session:
             result = session.run(query, parameters or {})
-            return [record.data() for record in result]
+            records = [record.data() for record in result]
+            if meter is not None:
+                self._record_cost(meter, start, [result.consume()])
+            return records
     
     def execute_write(self, query: str, parameters: dict = None) -> dict:
         """Execute a write query and return summary.
@@ -94,16 +128,12 @@ class BaseRepository:
         Returns:
             dict: Summary of changes made to the database
         """
+        start = time.perf_counter()
         with self.db.get_session() as session:
             result = session.run(query, parameters or {})
             summary = result.consume()
-            return {
-                "nodes_created": summary.counters.nodes_created,
-                "nodes_deleted": summary.counters.nodes_deleted,
-                "relationships_created": summary.counters.relationships_created,
-                "relationships_deleted": summary.counters.relationships_deleted,
-                "properties_set": summary.counters.properties_set,
-            }
+            self._record_cost(current_meter(), start, [summary])
+            return self._summary_counters(summary)
     
     def transaction_write(self, queries: list) -> dict:
         """Execute multiple write queries in a transaction.
@@ -114,9 +144,39 @@ class BaseRepository:
         Returns:
             dict: Success status
         """
+        meter = current_meter()
+        start = time.perf_counter()
+        with self.db.get_session() as session:
+            with session.begin_transaction() as tx:
+                summaries = []
+                for query, params in queries:
+                    result = tx.run(query, params or {})
+                    if meter is not None:
+                        summaries.append(result.consume())
+                tx.commit()
+                self._record_cost(meter, start, summaries)
+                return {"success": True}
+
+    def transaction_query(self, queries: list) -> list:
+        """Execute multiple write queries in a transaction and return their results.
+
+        Args:
+            queries: List of tuples (query, parameters)
+
+        Returns:
+            list: One list of result dictionaries per query, in order
+        """
+        meter = current_meter()
+        start = time.perf_counter()
         with self.db.get_session() as session:
             with session.begin_transaction() as tx:
+                results = []
+                summaries = []
                 for query, params in queries:
-                    tx.run(query, params or {})
+                    result = tx.run(query, params or {})
+                    results.append([record.data() for record in result])
+                    if meter is not None:
+                        summaries.append(result.consume())
                 tx.commit()
-                return {"success": True}
\ No newline at end of file
+                self._record_cost(meter, start, summaries)
+                return results
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from typing import Optional
@@ -16,6 +17,7 @@ from routes.insurance_provider_routes import router as insurance_provider_router
 from routes.insurance_routes import router as insurance_router
 from routes.ingest_routes import router as ingest_router
 from routes.safety_routes import router as safety_router
+from services.insurance_statistics import get_insurance_statistics_cache
 
 # Configure logging based on settings
 logging.basicConfig(
@@ -64,10 +66,18 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("Successfully connected to Neo4j database")
     
+    # Enrichment jobs are only queued here; they are consumed by the
+    # standalone worker (python -m workers.enrichment)
+    
+    # The insurance statistics snapshot lives in this process's memory
+    statistics_stop = asyncio.Event()
+    statistics_task = asyncio.create_task(get_insurance_statistics_cache().run(statistics_stop))
     yield
     
     # Shutdown
     logger.info("Shutting down RICO API...")
+    statistics_stop.set()
+    await statistics_task
     db.close()
 
 
@@ -40,6 +40,18 @@ class IngestRequest(BaseModel):
         description="Skip invalid records instead of failing the entire import"
     )
     
+    enrichment_max_requests: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Stop the enrichment job once it has made this many upstream API requests"
+    )
+    
+    enrichment_max_duration_seconds: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Stop the enrichment job once it has run this many seconds"
+    )
+    
     @model_validator(mode='after')
     def validate_exclusive_input(self):
         """Ensure exactly one input method is provided."""
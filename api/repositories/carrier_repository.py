@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timezone, date
 
 from database import BaseRepository
@@ -42,7 +42,8 @@ class CarrierRepository(BaseRepository):
             created_date: $created_date,
             last_updated: $last_updated,
             mcs150_date: $mcs150_date,
-            data_source: $data_source
+            data_source: $data_source,
+            coverage_changed_at: $coverage_changed_at
         })
         RETURN c
         """
@@ -57,6 +58,8 @@ class CarrierRepository(BaseRepository):
             params['last_updated'] = params['last_updated'].isoformat()
         else:
             params['last_updated'] = datetime.now(timezone.utc).isoformat()
+        # New carriers start uninsured; the stamp lets the coverage index pick them up
+        params['coverage_changed_at'] = datetime.now(timezone.utc).isoformat()
         
         result = self.execute_query(query, params)
         return result[0]['c'] if result else None
@@ -339,7 +342,7 @@ class CarrierRepository(BaseRepository):
         query = """
         UNWIND $carriers as carrier
         CREATE (c:Carrier)
-        SET c = carrier
+        SET c = carrier, c.coverage_changed_at = $coverage_changed_at
         RETURN count(c) as created
         """
         
@@ -357,7 +360,10 @@ class CarrierRepository(BaseRepository):
                 data['last_updated'] = datetime.now(timezone.utc).isoformat()
             carriers_data.append(data)
         
-        result = self.execute_query(query, {"carriers": carriers_data})
+        result = self.execute_query(query, {
+            "carriers": carriers_data,
+            "coverage_changed_at": datetime.now(timezone.utc).isoformat()
+        })
         return {"created": result[0]['created']} if result else {"created": 0}
     
     def detect_insurance_gaps(self, min_gap_days: int = 30) -> List[Dict]:
@@ -470,28 +476,44 @@ class CarrierRepository(BaseRepository):
         result = self.execute_query(query, {"min_coverage": min_coverage})
         return [record['underinsured_info'] for record in result]
     
-    def get_insurance_fraud_risk_scores(self) -> List[Dict]:
-        """Calculate comprehensive fraud risk scores for all carriers based on insurance patterns.
+    def refresh_insurance_fraud_risk_scores(self, usdots: List[int]) -> int:
+        """Recompute and store the insurance fraud risk score of the given carriers.
+        
+        The score and its contributing factors are kept on the Carrier node
+        (``insurance_risk_*`` properties), so reads do not rescan every
+        carrier's policies and events. Call this for carriers whose
+        insurance policies or events were just written.
         
+        Args:
+            usdots: USDOT numbers of the carriers to rescore
+            
         Returns:
-            list: Carriers with calculated risk scores and contributing factors
+            int: Number of carriers scored
         """
+        if not usdots:
+            return 0
+        
         query = """
-        MATCH (c:Carrier)
-        OPTIONAL MATCH (c)-[:HAD_INSURANCE]->(ip:InsurancePolicy)
-        OPTIONAL MATCH (c)-[:INSURANCE_EVENT]->(ie:InsuranceEvent)
-        WITH c,
-             COUNT(DISTINCT ip) as policy_count,
-             COUNT(DISTINCT ip.provider_name) as provider_count,
-             COUNT(DISTINCT CASE WHEN ie.event_type = 'CANCELLATION' THEN ie END) as cancellations,
-             COUNT(DISTINCT CASE WHEN ie.compliance_violation = true THEN ie END) as violations,
-             MAX(CASE WHEN EXISTS((ip)<-[:PRECEDED_BY {gap_days: gap}]-()) THEN gap ELSE 0 END) as max_gap
-        WITH c, 
-             policy_count,
-             provider_count,
-             cancellations,
-             violations,
-             max_gap,
+        UNWIND $usdots as usdot
+        MATCH (c:Carrier {usdot: usdot})
+        CALL {
+            WITH c
+            OPTIONAL MATCH (c)-[:HAD_INSURANCE]->(ip:InsurancePolicy)
+            RETURN COUNT(DISTINCT ip) as policy_count,
+                   COUNT(DISTINCT ip.provider_name) as provider_count
+        }
+        CALL {
+            WITH c
+            OPTIONAL MATCH (c)-[:INSURANCE_EVENT]->(ie:InsuranceEvent)
+            RETURN COUNT(DISTINCT CASE WHEN ie.event_type = 'CANCELLATION' THEN ie END) as cancellations,
+                   COUNT(DISTINCT CASE WHEN ie.compliance_violation = true THEN ie END) as violations
+        }
+        CALL {
+            WITH c
+            OPTIONAL MATCH (c)-[:HAD_INSURANCE]->(:InsurancePolicy)<-[g:PRECEDED_BY]-(:InsurancePolicy)
+            RETURN coalesce(MAX(g.gap_days), 0) as max_gap
+        }
+        WITH c, policy_count, provider_count, cancellations, violations, max_gap,
              // Calculate risk score (0-100)
              CASE
                 WHEN policy_count = 0 THEN 100  // No insurance is highest risk
@@ -502,244 +524,295 @@ class CarrierRepository(BaseRepository):
                     (CASE WHEN max_gap > 30 THEN 25 WHEN max_gap > 7 THEN 15 ELSE 0 END)  // Gaps
                 )
              END as risk_score
-        WHERE risk_score > 0
+        SET c.insurance_risk_score = risk_score,
+            c.insurance_risk_policy_count = policy_count,
+            c.insurance_risk_provider_count = provider_count,
+            c.insurance_risk_cancellations = cancellations,
+            c.insurance_risk_compliance_violations = violations,
+            c.insurance_risk_max_gap_days = max_gap,
+            c.insurance_risk_scored_at = $scored_at
+        RETURN COUNT(c) as scored
+        """
+        
+        result = self.execute_query(query, {
+            "usdots": list(usdots),
+            "scored_at": datetime.now(timezone.utc).isoformat()
+        })
+        return result[0]['scored'] if result else 0
+    
+    def rebuild_insurance_fraud_risk_scores(self, batch_size: int = 500) -> Dict:
+        """Recompute the stored insurance fraud risk score of every carrier.
+        
+        Carriers are walked in USDOT order, one batch per transaction, so the
+        rebuild holds no long-running transaction however large the graph is.
+        
+        Args:
+            batch_size: Carriers rescored per transaction
+            
+        Returns:
+            dict: Carriers scored and batches run
+        """
+        query = """
+        MATCH (c:Carrier)
+        WHERE c.usdot > $after
+        RETURN c.usdot as usdot
+        ORDER BY c.usdot
+        LIMIT $limit
+        """
+        
+        scored = 0
+        batches = 0
+        after = -1
+        while True:
+            usdots = [record['usdot'] for record in self.execute_query(query, {"after": after, "limit": batch_size})]
+            if not usdots:
+                break
+            scored += self.refresh_insurance_fraud_risk_scores(usdots)
+            batches += 1
+            after = usdots[-1]
+        
+        return {"carriers_scored": scored, "batches": batches}
+    
+    def get_insurance_fraud_risk_scores(self, skip: int = 0, limit: int = 100, min_score: int = 1) -> List[Dict]:
+        """Get stored insurance fraud risk scores, highest first.
+        
+        Scores are maintained by refresh_insurance_fraud_risk_scores and
+        rebuild_insurance_fraud_risk_scores; carriers never scored are not listed.
+        
+        Args:
+            skip: Number of carriers to skip
+            limit: Maximum number of carriers to return
+            min_score: Lowest risk score to include
+            
+        Returns:
+            list: Carriers with risk scores and contributing factors
+        """
+        query = """
+        MATCH (c:Carrier)
+        WHERE c.insurance_risk_score >= $min_score
         RETURN {
             carrier_usdot: c.usdot,
             carrier_name: c.carrier_name,
-            risk_score: risk_score,
-            policy_count: policy_count,
-            provider_count: provider_count,
-            cancellations: cancellations,
-            compliance_violations: violations,
-            max_coverage_gap: max_gap,
+            risk_score: c.insurance_risk_score,
+            policy_count: c.insurance_risk_policy_count,
+            provider_count: c.insurance_risk_provider_count,
+            cancellations: c.insurance_risk_cancellations,
+            compliance_violations: c.insurance_risk_compliance_violations,
+            max_coverage_gap: c.insurance_risk_max_gap_days,
             safety_violations: c.violations,
-            crashes: c.crashes
+            crashes: c.crashes,
+            scored_at: c.insurance_risk_scored_at
         } as risk_info
-        ORDER BY risk_score DESC
+        ORDER BY c.insurance_risk_score DESC, c.usdot
+        SKIP $skip
+        LIMIT $limit
         """
         
-        result = self.execute_query(query)
+        result = self.execute_query(query, {"min_score": min_score, "skip": skip, "limit": limit})
         return [record['risk_info'] for record in result]
     
-    def find_chameleon_carrier_patterns(self) -> List[Dict]:
-        """Detect potential chameleon carriers based on insurance and authority patterns.
+    def count_insurance_fraud_risk_scores(self, min_score: int = 1) -> int:
+        """Count carriers whose stored insurance fraud risk score is at least ``min_score``.
         
+        Args:
+            min_score: Lowest risk score to count
+            
         Returns:
-            list: Potential chameleon carriers with suspicious patterns
+            int: Number of carriers
         """
         query = """
-        // Find carriers with similar officers and insurance patterns
-        MATCH (c1:Carrier)-[:MANAGED_BY]->(p:Person)<-[:MANAGED_BY]-(c2:Carrier)
-        WHERE c1.usdot <> c2.usdot
-        OPTIONAL MATCH (c1)-[:HAD_INSURANCE]->(ip1:InsurancePolicy)
-        OPTIONAL MATCH (c2)-[:HAD_INSURANCE]->(ip2:InsurancePolicy)
-        WHERE ip1.provider_name = ip2.provider_name
-        WITH c1, c2, p, COUNT(DISTINCT ip1.provider_name) as shared_providers
-        WHERE shared_providers > 0
-        RETURN {
-            carrier1_usdot: c1.usdot,
-            carrier1_name: c1.carrier_name,
-            carrier2_usdot: c2.usdot,
-            carrier2_name: c2.carrier_name,
-            shared_officer: p.name,
-            shared_insurance_providers: shared_providers,
-            carrier1_violations: c1.violations,
-            carrier2_violations: c2.violations
-        } as chameleon_pattern
-        ORDER BY shared_providers DESC
+        MATCH (c:Carrier)
+        WHERE c.insurance_risk_score >= $min_score
+        RETURN COUNT(c) as count
         """
         
-        result = self.execute_query(query)
-        return [record['chameleon_pattern'] for record in result]
+        result = self.execute_query(query, {"min_score": min_score})
+        return result[0]['count'] if result else 0
     
-    def get_carriers_without_insurance_on_date(self, check_date: date) -> List[Dict]:
-        """Find carriers without active insurance on a specific date.
+    def get_coverage_intervals(self, after_usdot: int = -1, limit: int = 1000) -> List[Dict]:
+        """Get the HAD_INSURANCE coverage periods of a page of carriers.
+        
+        Carriers are returned in USDOT order, including carriers without any
+        policy, so a caller can page through the whole graph.
         
         Args:
-            check_date: The date to check for insurance coverage
+            after_usdot: Return carriers with a greater USDOT number
+            limit: Maximum number of carriers to return
             
         Returns:
-            list: Carriers without insurance on the specified date
+            list: ``usdot``, ``carrier_name``, ``violations``, ``crashes`` and
+                ``periods`` (policy_id, provider_name, from_date, to_date) per carrier
         """
         query = """
         MATCH (c:Carrier)
-        WHERE NOT EXISTS {
-            MATCH (c)-[r:HAD_INSURANCE]->(:InsurancePolicy)
-            WHERE date($check_date) >= date(r.from_date)
-            AND (r.to_date IS NULL OR date($check_date) <= date(r.to_date))
-        }
-        RETURN {
-            carrier_usdot: c.usdot,
-            carrier_name: c.carrier_name,
-            last_known_provider: c.insurance_provider,
-            trucks: c.trucks,
-            violations: c.violations,
-            crashes: c.crashes
-        } as uninsured_carrier
-        ORDER BY c.trucks DESC
-        """
-        
-        params = {"check_date": check_date.isoformat()}
-        result = self.execute_query(query, params)
-        return [record['uninsured_carrier'] for record in result]
+        WHERE c.usdot > $after
+        WITH c ORDER BY c.usdot LIMIT $limit
+        OPTIONAL MATCH (c)-[r:HAD_INSURANCE]->(ip:InsurancePolicy)
+        RETURN c.usdot as usdot,
+               c.carrier_name as carrier_name,
+               c.violations as violations,
+               c.crashes as crashes,
+               COLLECT(CASE WHEN r IS NULL THEN null ELSE {
+                   policy_id: ip.policy_id,
+                   provider_name: ip.provider_name,
+                   from_date: r.from_date,
+                   to_date: r.to_date
+               } END) as periods
+        ORDER BY usdot
+        """
+        
+        return self.execute_query(query, {"after": after_usdot, "limit": limit})
     
-    def get_coverage_timeline(self, carrier_usdot: int) -> List[Dict]:
-        """Get complete insurance coverage timeline for a carrier.
+    def get_coverage_intervals_for(self, usdots: List[int]) -> List[Dict]:
+        """Get the HAD_INSURANCE coverage periods of the given carriers.
         
         Args:
-            carrier_usdot: The carrier's USDOT number
+            usdots: USDOT numbers of the carriers
             
         Returns:
-            list: Chronological list of insurance policies with temporal data
+            list: Carriers found, shaped like get_coverage_intervals rows
         """
         query = """
-        MATCH (c:Carrier {usdot: $carrier_usdot})-[r:HAD_INSURANCE]->(ip:InsurancePolicy)
-        RETURN {
-            policy_id: ip.policy_id,
-            provider_name: ip.provider_name,
-            from_date: r.from_date,
-            to_date: r.to_date,
-            status: r.status,
-            duration_days: r.duration_days,
-            coverage_amount: ip.coverage_amount,
-            policy_type: ip.policy_type
-        } as coverage_period
-        ORDER BY r.from_date
-        """
+        MATCH (c:Carrier)
+        WHERE c.usdot IN $usdots
+        OPTIONAL MATCH (c)-[r:HAD_INSURANCE]->(ip:InsurancePolicy)
+        RETURN c.usdot as usdot,
+               c.carrier_name as carrier_name,
+               c.violations as violations,
+               c.crashes as crashes,
+               COLLECT(CASE WHEN r IS NULL THEN null ELSE {
+                   policy_id: ip.policy_id,
+                   provider_name: ip.provider_name,
+                   from_date: r.from_date,
+                   to_date: r.to_date
+               } END) as periods
+        """
+        
+        return self.execute_query(query, {"usdots": list(usdots)})
+    
+    def iter_coverage_intervals(self, batch_size: int = 1000) -> Iterator[Dict]:
+        """Stream every carrier's coverage periods in USDOT order, one page per query.
         
-        params = {"carrier_usdot": carrier_usdot}
-        result = self.execute_query(query, params)
-        return [record['coverage_period'] for record in result]
+        Args:
+            batch_size: Carriers fetched per query
+            
+        Yields:
+            dict: A get_coverage_intervals row
+        """
+        after = -1
+        while True:
+            rows = self.get_coverage_intervals(after, batch_size)
+            if not rows:
+                return
+            yield from rows
+            after = rows[-1]["usdot"]
     
-    def find_overlapping_policies(self) -> List[Dict]:
-        """Find carriers with overlapping insurance policies.
+    def get_insurance_changed_carriers(self, since: str) -> List[int]:
+        """Get carriers created or with insurance written since a point in time.
+        
+        Every insurance write rescores the carrier, so the risk score
+        timestamp doubles as the carrier's last insurance change; carrier
+        creation stamps coverage_changed_at instead.
         
+        Args:
+            since: ISO timestamp
+            
         Returns:
-            list: Carriers with overlapping coverage periods
+            list: USDOT numbers of the changed carriers
         """
         query = """
-        MATCH (c:Carrier)-[r1:HAD_INSURANCE]->(ip1:InsurancePolicy)
-        MATCH (c)-[r2:HAD_INSURANCE]->(ip2:InsurancePolicy)
-        WHERE id(r1) < id(r2)
-          AND r1.from_date < r2.from_date
-          AND (r1.to_date IS NULL OR r1.to_date > r2.from_date)
-        RETURN {
-            carrier_usdot: c.usdot,
-            carrier_name: c.carrier_name,
-            policy1_id: ip1.policy_id,
-            policy1_provider: ip1.provider_name,
-            policy1_from: r1.from_date,
-            policy1_to: r1.to_date,
-            policy2_id: ip2.policy_id,
-            policy2_provider: ip2.provider_name,
-            policy2_from: r2.from_date,
-            policy2_to: r2.to_date,
-            overlap_days: CASE 
-                WHEN r1.to_date IS NULL THEN 
-                    duration.between(date(r2.from_date), date()).days
-                ELSE 
-                    duration.between(date(r2.from_date), date(r1.to_date)).days
-            END
-        } as overlap_info
-        ORDER BY overlap_info.overlap_days DESC
+        MATCH (c:Carrier)
+        WHERE c.insurance_risk_scored_at >= $since
+        RETURN c.usdot as usdot
+        UNION
+        MATCH (c:Carrier)
+        WHERE c.coverage_changed_at >= $since
+        RETURN c.usdot as usdot
         """
         
-        result = self.execute_query(query)
-        return [record['overlap_info'] for record in result]
+        result = self.execute_query(query, {"since": since})
+        return [record['usdot'] for record in result]
     
-    def calculate_total_days_without_coverage(self, carrier_usdot: int, 
-                                             start_date: date, 
-                                             end_date: date) -> int:
-        """Calculate total days without insurance coverage in a date range.
+    def count_carriers(self) -> int:
+        """Count all carriers.
+        
+        Returns:
+            int: Number of Carrier nodes
+        """
+        result = self.execute_query("MATCH (c:Carrier) RETURN count(c) as total")
+        return result[0]['total'] if result else 0
+    
+    def get_carrier_usdots(self, after_usdot: int, limit: int) -> List[int]:
+        """Get one page of carrier USDOT numbers in USDOT order.
         
         Args:
-            carrier_usdot: The carrier's USDOT number
-            start_date: Start of the period to check
-            end_date: End of the period to check
+            after_usdot: Return carriers with a greater USDOT number
+            limit: Maximum carriers to return
             
         Returns:
-            int: Total number of days without coverage
+            list: USDOT numbers, ascending
         """
         query = """
-        MATCH (c:Carrier {usdot: $carrier_usdot})-[r:HAD_INSURANCE]->(ip:InsurancePolicy)
-        WHERE r.from_date <= $end_date 
-          AND (r.to_date IS NULL OR r.to_date >= $start_date)
-        WITH c, 
-             COLLECT({
-                 from: CASE 
-                     WHEN r.from_date < $start_date THEN $start_date 
-                     ELSE r.from_date 
-                 END,
-                 to: CASE 
-                     WHEN r.to_date IS NULL OR r.to_date > $end_date THEN $end_date 
-                     ELSE r.to_date 
-                 END
-             }) as coverage_periods
-        
-        // Calculate total covered days
-        WITH c, coverage_periods,
-             duration.between(date($start_date), date($end_date)).days + 1 as total_days
-        UNWIND coverage_periods as period
-        WITH c, total_days, 
-             SUM(duration.between(date(period.from), date(period.to)).days + 1) as covered_days
-        
-        RETURN total_days - covered_days as days_without_coverage
+        MATCH (c:Carrier)
+        WHERE c.usdot > $after
+        RETURN c.usdot as usdot
+        ORDER BY usdot
+        LIMIT $limit
         """
         
-        params = {
-            "carrier_usdot": carrier_usdot,
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat()
-        }
-        
-        result = self.execute_query(query, params)
-        if result and result[0].get('days_without_coverage') is not None:
-            return result[0]['days_without_coverage']
-        return 0
+        result = self.execute_query(query, {"after": after_usdot, "limit": limit})
+        return [record['usdot'] for record in result]
     
-    def find_carriers_with_coverage_gaps(self, gap_threshold_days: int = 30) -> List[Dict]:
-        """Find carriers with significant gaps in insurance coverage.
+    def get_carrier_summaries(self, usdots: List[int]) -> List[Dict]:
+        """Get the identifying and size fields of the given carriers, largest fleets first.
         
         Args:
-            gap_threshold_days: Minimum gap size to report (default 30 days)
+            usdots: USDOT numbers of the carriers
             
         Returns:
-            list: Carriers with coverage gaps exceeding threshold
+            list: Carrier summaries
         """
         query = """
-        MATCH (c:Carrier)-[r1:HAD_INSURANCE]->(ip1:InsurancePolicy)
-        MATCH (c)-[r2:HAD_INSURANCE]->(ip2:InsurancePolicy)
-        WHERE r1.to_date IS NOT NULL 
-          AND r2.from_date > r1.to_date
-          AND id(r1) < id(r2)
-        WITH c, r1, r2, ip1, ip2,
-             duration.between(date(r1.to_date), date(r2.from_date)).days as gap_days
-        WHERE gap_days >= $gap_threshold_days
-        WITH c, 
-             COLLECT({
-                 from_policy: ip1.policy_id,
-                 to_policy: ip2.policy_id,
-                 gap_start: r1.to_date,
-                 gap_end: r2.from_date,
-                 gap_days: gap_days,
-                 from_provider: ip1.provider_name,
-                 to_provider: ip2.provider_name
-             }) as gaps,
-             MAX(gap_days) as max_gap,
-             SUM(gap_days) as total_gap_days
+        MATCH (c:Carrier)
+        WHERE c.usdot IN $usdots
         RETURN {
             carrier_usdot: c.usdot,
             carrier_name: c.carrier_name,
-            gap_count: SIZE(gaps),
-            max_gap_days: max_gap,
-            total_gap_days: total_gap_days,
-            gaps: gaps,
+            last_known_provider: c.insurance_provider,
+            trucks: c.trucks,
             violations: c.violations,
             crashes: c.crashes
-        } as gap_info
-        ORDER BY total_gap_days DESC
+        } as carrier
+        ORDER BY c.trucks DESC
         """
         
-        params = {"gap_threshold_days": gap_threshold_days}
+        result = self.execute_query(query, {"usdots": list(usdots)})
+        return [record['carrier'] for record in result]
+    
+    def get_coverage_timeline(self, carrier_usdot: int) -> List[Dict]:
+        """Get complete insurance coverage timeline for a carrier.
+        
+        Args:
+            carrier_usdot: The carrier's USDOT number
+            
+        Returns:
+            list: Chronological list of insurance policies with temporal data
+        """
+        query = """
+        MATCH (c:Carrier {usdot: $carrier_usdot})-[r:HAD_INSURANCE]->(ip:InsurancePolicy)
+        RETURN {
+            policy_id: ip.policy_id,
+            provider_name: ip.provider_name,
+            from_date: r.from_date,
+            to_date: r.to_date,
+            status: r.status,
+            duration_days: r.duration_days,
+            coverage_amount: ip.coverage_amount,
+            policy_type: ip.policy_type
+        } as coverage_period
+        ORDER BY r.from_date
+        """
+        
+        params = {"carrier_usdot": carrier_usdot}
         result = self.execute_query(query, params)
-        return [record['gap_info'] for record in result]
\ No newline at end of file
+        return [record['coverage_period'] for record in result]
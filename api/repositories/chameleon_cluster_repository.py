@@ -0,0 +1,267 @@
+from typing import Dict, List, Optional
+
+from database import BaseRepository
+
+
+# Carrier attributes that can tie carriers together, as pattern comprehensions
+# over a carrier ``c``; each yields the attribute values the carrier holds
+ATTRIBUTE_EXPRESSIONS = {
+    "officer": "[(c)-[:MANAGED_BY]->(p:Person) | p.person_id]",
+    "insurance_provider": "[(c)-[:HAD_INSURANCE]->(ip:InsurancePolicy) WHERE ip.provider_name IS NOT NULL | ip.provider_name]",
+    "phone": "CASE WHEN c.phone IS NULL THEN [] ELSE [c.phone] END",
+    "address": "CASE WHEN c.physical_address IS NULL THEN [] ELSE [c.physical_address] END",
+}
+
+# Carriers holding a given attribute value, as a MATCH binding ``c`` for ``value``
+ATTRIBUTE_HOLDERS = {
+    "officer": "MATCH (c:Carrier)-[:MANAGED_BY]->(:Person {person_id: value})",
+    "insurance_provider": "MATCH (c:Carrier)-[:HAD_INSURANCE]->(:InsurancePolicy {provider_name: value})",
+    "phone": "MATCH (c:Carrier {phone: value})",
+    "address": "MATCH (c:Carrier {physical_address: value})",
+}
+
+
+class ChameleonClusterRepository(BaseRepository):
+    """Repository for precomputed chameleon-carrier clusters.
+
+    Reads the carrier-attribute edges clustering is built from (shared
+    officers, insurance providers, phones and addresses) and stores the
+    resulting clusters as ChameleonCluster nodes, with each member carrier
+    pointing at its cluster through ``chameleon_cluster_id``.
+    """
+
+    _ATTRIBUTE_RETURN = ",\n               ".join(
+        f"{expression} as {kind}" for kind, expression in ATTRIBUTE_EXPRESSIONS.items()
+    )
+
+    def get_carrier_attributes(self, after_usdot: int = -1, limit: int = 1000) -> List[Dict]:
+        """Get the clustering attributes of a page of carriers in USDOT order.
+
+        Args:
+            after_usdot: Return carriers with a greater USDOT number
+            limit: Maximum number of carriers to return
+
+        Returns:
+            list: Per carrier ``usdot``, ``insurance_risk_score``, ``crashes``,
+                ``violations`` and a list of values per attribute kind
+        """
+        query = f"""
+        MATCH (c:Carrier)
+        WHERE c.usdot > $after
+        WITH c ORDER BY c.usdot LIMIT $limit
+        RETURN c.usdot as usdot,
+               c.insurance_risk_score as insurance_risk_score,
+               c.crashes as crashes,
+               c.violations as violations,
+               {self._ATTRIBUTE_RETURN}
+        ORDER BY usdot
+        """
+
+        return self.execute_query(query, {"after": after_usdot, "limit": limit})
+
+    def get_carrier_attributes_for(self, usdots: List[int]) -> List[Dict]:
+        """Get the clustering attributes of the given carriers.
+
+        Args:
+            usdots: USDOT numbers of the carriers
+
+        Returns:
+            list: Carriers found, shaped like get_carrier_attributes rows
+        """
+        query = f"""
+        MATCH (c:Carrier)
+        WHERE c.usdot IN $usdots
+        RETURN c.usdot as usdot,
+               c.insurance_risk_score as insurance_risk_score,
+               c.crashes as crashes,
+               c.violations as violations,
+               {self._ATTRIBUTE_RETURN}
+        """
+
+        return self.execute_query(query, {"usdots": list(usdots)})
+
+    def get_attribute_holders(self, kind: str, values: List[str], max_carriers: int) -> List[Dict]:
+        """Get the carriers holding each of some attribute values.
+
+        Member lists are cut off after ``max_carriers + 1`` carriers, which
+        is enough to tell that a value is too common to link carriers.
+
+        Args:
+            kind: Attribute kind (a key of ATTRIBUTE_EXPRESSIONS)
+            values: Attribute values
+            max_carriers: Most carriers a value may link
+
+        Returns:
+            list: ``value`` and ``usdots`` per value
+        """
+        query = f"""
+        UNWIND $values as value
+        CALL {{
+            WITH value
+            {ATTRIBUTE_HOLDERS[kind]}
+            WITH DISTINCT c LIMIT $cutoff
+            RETURN collect(c.usdot) as usdots
+        }}
+        RETURN value, usdots
+        """
+
+        return self.execute_query(query, {"values": list(values), "cutoff": max_carriers + 1})
+
+    def get_cluster_members(self, usdots: List[int]) -> List[int]:
+        """Get every member of the clusters the given carriers currently belong to.
+
+        Args:
+            usdots: USDOT numbers of the carriers
+
+        Returns:
+            list: USDOT numbers of the clusters' members
+        """
+        query = """
+        MATCH (c:Carrier)
+        WHERE c.usdot IN $usdots AND c.chameleon_cluster_id IS NOT NULL
+        MATCH (cl:ChameleonCluster {cluster_id: c.chameleon_cluster_id})
+        UNWIND cl.members as member
+        RETURN DISTINCT member
+        """
+
+        result = self.execute_query(query, {"usdots": list(usdots)})
+        return [record['member'] for record in result]
+
+    def replace_clusters(self, usdots: List[int], clusters: List[Dict], generation: str) -> Dict:
+        """Replace the clusters of a set of carriers in one transaction.
+
+        Clusters that any of the carriers belonged to are removed, the
+        carriers are detached from them, and the new clusters are written.
+
+        Args:
+            usdots: Every carrier whose clustering was recomputed
+            clusters: New clusters covering (some of) those carriers
+            generation: Identifier of the computation that produced the clusters
+
+        Returns:
+            dict: Transaction status
+        """
+        return self.transaction_write([
+            ("""
+            MATCH (c:Carrier)
+            WHERE c.usdot IN $usdots AND c.chameleon_cluster_id IS NOT NULL
+            WITH collect(DISTINCT c.chameleon_cluster_id) as cluster_ids
+            MATCH (cl:ChameleonCluster)
+            WHERE cl.cluster_id IN cluster_ids
+            UNWIND cl.members as member
+            OPTIONAL MATCH (m:Carrier {usdot: member})
+            REMOVE m.chameleon_cluster_id
+            WITH DISTINCT cl
+            DETACH DELETE cl
+            """, {"usdots": list(usdots)}),
+            self._write_clusters_statement(clusters, generation),
+        ])
+
+    def write_clusters(self, clusters: List[Dict], generation: str) -> Dict:
+        """Write clusters, replacing stored clusters with the same ID.
+
+        Args:
+            clusters: Clusters to write
+            generation: Identifier of the computation that produced the clusters
+
+        Returns:
+            dict: Write counters
+        """
+        return self.execute_write(*self._write_clusters_statement(clusters, generation))
+
+    @staticmethod
+    def _write_clusters_statement(clusters: List[Dict], generation: str) -> tuple:
+        query = """
+        UNWIND $clusters as row
+        MERGE (cl:ChameleonCluster {cluster_id: row.cluster_id})
+        SET cl += row, cl.generation = $generation
+        WITH cl, row
+        UNWIND row.members as member
+        MATCH (c:Carrier {usdot: member})
+        SET c.chameleon_cluster_id = row.cluster_id
+        """
+        return query, {"clusters": clusters, "generation": generation}
+
+    def delete_other_generations(self, generation: str, batch_size: int = 1000) -> int:
+        """Delete clusters left over from earlier full rebuilds.
+
+        Args:
+            generation: The generation to keep
+            batch_size: Clusters deleted per transaction
+
+        Returns:
+            int: Clusters deleted
+        """
+        query = """
+        MATCH (cl:ChameleonCluster)
+        WHERE cl.generation <> $generation
+        WITH cl LIMIT $limit
+        // Carriers still pointing here were not placed in a newer cluster
+        OPTIONAL MATCH (c:Carrier {chameleon_cluster_id: cl.cluster_id})
+        REMOVE c.chameleon_cluster_id
+        WITH DISTINCT cl
+        DETACH DELETE cl
+        RETURN count(*) as deleted
+        """
+
+        deleted = 0
+        while True:
+            result = self.execute_query(query, {"generation": generation, "limit": batch_size})
+            count = result[0]['deleted'] if result else 0
+            deleted += count
+            if count < batch_size:
+                return deleted
+
+    def get_clusters(self, skip: int = 0, limit: int = 100, min_score: float = 0.0,
+                     min_size: int = 2) -> List[Dict]:
+        """Get stored clusters, highest score first.
+
+        Args:
+            skip: Number of clusters to skip
+            limit: Maximum number of clusters to return
+            min_score: Lowest cluster score to include
+            min_size: Fewest member carriers to include
+
+        Returns:
+            list: Cluster properties
+        """
+        query = """
+        MATCH (cl:ChameleonCluster)
+        WHERE cl.score >= $min_score AND cl.size >= $min_size
+        RETURN cl {.*} as cluster
+        ORDER BY cl.score DESC, cl.cluster_id
+        SKIP $skip
+        LIMIT $limit
+        """
+
+        result = self.execute_query(query, {
+            "min_score": min_score, "min_size": min_size, "skip": skip, "limit": limit
+        })
+        return [record['cluster'] for record in result]
+
+    def get_cluster(self, cluster_id: str) -> Optional[Dict]:
+        """Get a stored cluster with its member carriers.
+
+        Args:
+            cluster_id: Cluster identifier
+
+        Returns:
+            dict: Cluster properties with ``carriers``, or None if not found
+        """
+        query = """
+        MATCH (cl:ChameleonCluster {cluster_id: $cluster_id})
+        OPTIONAL MATCH (c:Carrier)
+        WHERE c.usdot IN cl.members
+        WITH cl, c ORDER BY c.usdot
+        RETURN cl {.*, carriers: collect({
+            usdot: c.usdot,
+            carrier_name: c.carrier_name,
+            primary_officer: c.primary_officer,
+            insurance_risk_score: c.insurance_risk_score,
+            violations: c.violations,
+            crashes: c.crashes
+        })} as cluster
+        """
+
+        result = self.execute_query(query, {"cluster_id": cluster_id})
+        return result[0]['cluster'] if result else None
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime, timezone, timedelta
 
 from database import BaseRepository
@@ -109,6 +109,55 @@ class CrashRepository(BaseRepository):
         result = self.execute_query(query, params)
         return len(result) > 0
     
+    def bulk_write(self, crashes: List[Crash]) -> Dict:
+        """Write crashes of any number of carriers and their INVOLVED_IN edges in one transaction.
+        
+        Replaces the per-crash create and create_relationship_to_carrier round
+        trips with two UNWIND statements. Crashes are merged on report number,
+        so re-enriching a carrier updates its crashes instead of duplicating them.
+        
+        Args:
+            crashes: Crashes to write
+            
+        Returns:
+            dict: Counts of crashes and relationships written, and statements run
+        """
+        crash_query = """
+        UNWIND $crashes as row
+        MERGE (cr:Crash {report_number: row.report_number})
+        SET cr += row
+        RETURN count(cr) as count
+        """
+        
+        involved_query = """
+        UNWIND $links as link
+        MATCH (c:Carrier {usdot: link.usdot})
+        MATCH (cr:Crash {report_number: link.report_number})
+        MERGE (c)-[r:INVOLVED_IN]->(cr)
+        RETURN count(r) as count
+        """
+        
+        rows = []
+        for crash in crashes:
+            params = crash.model_dump()
+            if params.get('crash_date'):
+                params['crash_date'] = params['crash_date'].isoformat()
+            rows.append(params)
+        
+        results = self.transaction_query([
+            (crash_query, {"crashes": rows}),
+            (involved_query, {"links": [
+                {"usdot": row["usdot"], "report_number": row["report_number"]} for row in rows
+            ]})
+        ])
+        counts = [result[0]['count'] if result else 0 for result in results]
+        
+        return {
+            "crashes": counts[0],
+            "involved_in": counts[1],
+            "statements": 2
+        }
+    
     def find_fatal_crashes(self, usdot: int = None) -> List[Dict]:
         """Find crashes with fatalities.
         
@@ -251,6 +300,46 @@ class CrashRepository(BaseRepository):
             "preventable_rate": 0.0
         }
     
+    def calculate_crash_statistics_batch(self, usdots: List[int], months: int = 24) -> Dict[int, Dict]:
+        """Calculate crash statistics for many carriers in one query.
+        
+        Same figures as calculate_crash_statistics, per carrier.
+        
+        Args:
+            usdots: The USDOT numbers of the carriers
+            months: Number of months to look back
+            
+        Returns:
+            dict: Crash statistics by USDOT; carriers without crashes are absent
+        """
+        query = """
+        UNWIND $usdots as usdot
+        MATCH (cr:Crash {usdot: usdot})
+        WHERE cr.crash_date >= date() - duration('P' + $months + 'M')
+        WITH usdot,
+             COUNT(cr) as total_crashes,
+             SUM(cr.fatalities) as total_fatalities,
+             SUM(cr.injuries) as total_injuries,
+             SUM(CASE WHEN cr.fatalities > 0 THEN 1 ELSE 0 END) as fatal_crashes,
+             SUM(CASE WHEN cr.injuries > 0 THEN 1 ELSE 0 END) as injury_crashes,
+             SUM(CASE WHEN cr.tow_away = true THEN 1 ELSE 0 END) as tow_away_crashes,
+             SUM(CASE WHEN cr.preventable = true THEN 1 ELSE 0 END) as preventable_crashes
+        RETURN usdot,
+               total_crashes,
+               total_fatalities,
+               total_injuries,
+               fatal_crashes,
+               injury_crashes,
+               tow_away_crashes,
+               preventable_crashes,
+               CASE WHEN total_crashes > 0 
+                    THEN toFloat(preventable_crashes) / total_crashes * 100 
+                    ELSE 0.0 END as preventable_rate
+        """
+        
+        result = self.execute_query(query, {"usdots": usdots, "months": str(months)})
+        return {record.pop('usdot'): record for record in result}
+    
     def find_crashes_by_severity(self, min_fatalities: int = 0, min_injuries: int = 0) -> List[Dict]:
         """Find crashes meeting severity thresholds.
         
@@ -277,36 +366,92 @@ class CrashRepository(BaseRepository):
         result = self.execute_query(query, params)
         return [record['cr'] for record in result]
     
-    def find_crash_clusters(self, usdot: int, days_window: int = 30) -> List[Dict]:
-        """Find clusters of crashes within a time window.
+    def get_crash_timeline(self, usdot: int) -> List[Dict]:
+        """Get the dated fields of a carrier's crashes, oldest first.
         
         Args:
             usdot: The USDOT number of the carrier
-            days_window: Number of days for clustering window
             
         Returns:
-            list: Crash clusters with counts
+            list: Rows with report_number, crash_date, fatalities and injuries
         """
         query = """
-        MATCH (cr1:Crash {usdot: $usdot})
-        MATCH (cr2:Crash {usdot: $usdot})
-        WHERE cr1.report_number < cr2.report_number
-          AND abs(duration.between(date(cr1.crash_date), date(cr2.crash_date)).days) <= $days_window
-        WITH cr1.crash_date as cluster_start,
-             COLLECT(DISTINCT cr2.report_number) + [cr1.report_number] as crash_reports,
-             COUNT(DISTINCT cr2) + 1 as cluster_size
-        WHERE cluster_size >= 2
-        RETURN cluster_start, crash_reports, cluster_size
-        ORDER BY cluster_size DESC, cluster_start DESC
+        MATCH (cr:Crash {usdot: $usdot})
+        RETURN cr.report_number as report_number,
+               cr.crash_date as crash_date,
+               cr.fatalities as fatalities,
+               cr.injuries as injuries
+        ORDER BY cr.crash_date
         """
         
-        params = {
-            "usdot": usdot,
-            "days_window": days_window
-        }
+        return self.execute_query(query, {"usdot": usdot})
+    
+    def get_carrier_crashes(self, after_usdot: int, limit: int) -> List[Dict]:
+        """Get a page of carriers with their crashes, in USDOT order.
         
-        result = self.execute_query(query, params)
-        return result
+        Args:
+            after_usdot: Return carriers with a greater USDOT number
+            limit: Maximum number of carriers
+            
+        Returns:
+            list: Rows with ``usdot`` and ``crashes`` (report_number,
+                crash_date, fatalities, injuries) in date order
+        """
+        query = """
+        MATCH (cr:Crash)
+        WHERE cr.usdot > $after_usdot
+        WITH DISTINCT cr.usdot as usdot
+        ORDER BY usdot
+        LIMIT $limit
+        MATCH (cr:Crash {usdot: usdot})
+        WITH usdot, cr
+        ORDER BY cr.crash_date
+        WITH usdot, collect({
+            report_number: cr.report_number,
+            crash_date: cr.crash_date,
+            fatalities: cr.fatalities,
+            injuries: cr.injuries
+        }) as crashes
+        RETURN usdot, crashes
+        ORDER BY usdot
+        """
+        
+        return self.execute_query(query, {"after_usdot": after_usdot, "limit": limit})
+    
+    def iter_carrier_crashes(self, batch_size: int = 1000) -> Iterator[Dict]:
+        """Stream every carrier's crashes in USDOT order, one page per query.
+        
+        Args:
+            batch_size: Carriers fetched per query
+            
+        Yields:
+            dict: A get_carrier_crashes row
+        """
+        after = -1
+        while True:
+            rows = self.get_carrier_crashes(after, batch_size)
+            if not rows:
+                return
+            yield from rows
+            after = rows[-1]["usdot"]
+    
+    def get_carrier_names(self, usdots: List[int]) -> Dict[int, str]:
+        """Get the names of the given carriers.
+        
+        Args:
+            usdots: USDOT numbers of the carriers
+            
+        Returns:
+            dict: Carrier name by USDOT number, for carriers found
+        """
+        query = """
+        MATCH (c:Carrier)
+        WHERE c.usdot IN $usdots
+        RETURN c.usdot as usdot, c.carrier_name as carrier_name
+        """
+        
+        result = self.execute_query(query, {"usdots": list(usdots)})
+        return {record['usdot']: record['carrier_name'] for record in result}
     
     def find_high_risk_carriers_by_crashes(self, limit: int = 100) -> List[Dict]:
         """Find carriers with the most severe crash histories.
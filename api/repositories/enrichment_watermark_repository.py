@@ -0,0 +1,207 @@
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
+
+from database import BaseRepository
+
+
+class EnrichmentWatermarkRepository(BaseRepository):
+    """Repository for per-carrier, per-family enrichment watermarks.
+
+    A watermark records what the last full enrichment of one data family
+    (insurance, safety, crashes, inspections) saw upstream, so re-enrichment
+    can skip carriers whose upstream data has not changed.
+    """
+
+    @staticmethod
+    def _watermark_id(usdot: int, family: str) -> str:
+        return f"{usdot}:{family}"
+
+    def get(self, usdot: int, family: str) -> Optional[Dict]:
+        """Get the stored watermark for a carrier and data family.
+
+        Args:
+            usdot: The USDOT number of the carrier
+            family: Data family name, e.g. "inspections"
+
+        Returns:
+            dict: Watermark properties or None if never enriched
+        """
+        query = """
+        MATCH (w:EnrichmentWatermark {watermark_id: $watermark_id})
+        RETURN w
+        """
+
+        result = self.execute_query(query, {"watermark_id": self._watermark_id(usdot, family)})
+        return result[0]['w'] if result else None
+
+    def get_for_carrier(self, usdot: int) -> List[Dict]:
+        """Get all watermarks for a carrier.
+
+        Args:
+            usdot: The USDOT number of the carrier
+
+        Returns:
+            list: Watermarks for each enriched data family
+        """
+        query = """
+        MATCH (w:EnrichmentWatermark {usdot: $usdot})
+        RETURN w
+        ORDER BY w.family
+        """
+
+        result = self.execute_query(query, {"usdot": usdot})
+        return [record['w'] for record in result]
+
+    def upsert(self, usdot: int, family: str, record_count: int,
+               max_date: Optional[str], payload_hash: str) -> Dict:
+        """Store the watermark seen by a full enrichment.
+
+        Args:
+            usdot: The USDOT number of the carrier
+            family: Data family name
+            record_count: Total upstream record count
+            max_date: Latest record date seen (ISO string) or None
+            payload_hash: Hash of the probed payload
+
+        Returns:
+            dict: Stored watermark
+        """
+        query = """
+        MERGE (w:EnrichmentWatermark {watermark_id: $watermark_id})
+        ON CREATE SET w.usdot = $usdot,
+                      w.family = $family
+        SET w.record_count = $record_count,
+            w.max_date = $max_date,
+            w.payload_hash = $payload_hash,
+            w.updated_at = $now,
+            w.checked_at = $now
+        RETURN w
+        """
+
+        params = {
+            "watermark_id": self._watermark_id(usdot, family),
+            "usdot": usdot,
+            "family": family,
+            "record_count": record_count,
+            "max_date": max_date,
+            "payload_hash": payload_hash,
+            "now": datetime.now(timezone.utc).isoformat()
+        }
+
+        result = self.execute_query(query, params)
+        return result[0]['w'] if result else None
+
+    def mark_checked(self, usdot: int, family: str) -> bool:
+        """Record that a probe found the family unchanged.
+
+        Args:
+            usdot: The USDOT number of the carrier
+            family: Data family name
+
+        Returns:
+            bool: True if the watermark exists and was updated
+        """
+        query = """
+        MATCH (w:EnrichmentWatermark {watermark_id: $watermark_id})
+        SET w.checked_at = $now
+        RETURN count(w) as updated
+        """
+
+        result = self.execute_query(query, {
+            "watermark_id": self._watermark_id(usdot, family),
+            "now": datetime.now(timezone.utc).isoformat()
+        })
+        return bool(result and result[0]['updated'] > 0)
+
+    def find_stale_carriers(self, families: List[str], checked_before: str, limit: int,
+                            exclude: Optional[List[int]] = None,
+                            weights: Optional[Dict[str, float]] = None) -> List[Dict]:
+        """Find carriers with data families not checked since a cutoff, riskiest first.
+
+        A family is stale when it has no watermark or its watermark was last
+        checked before ``checked_before``. Carriers are ranked by a risk score
+        built from their OOS rates (relative to the high-risk thresholds),
+        fatal crashes and insurance coverage gaps, then by how long ago they
+        were last checked.
+
+        Args:
+            families: Data families to consider, e.g. ["insurance", "safety"]
+            checked_before: ISO timestamp; older checks are stale
+            limit: Maximum number of carriers to return
+            exclude: USDOT numbers to leave out (e.g. already queued)
+            weights: Optional overrides for ``driver_oos_threshold``,
+                ``vehicle_oos_threshold``, ``fatal_crash`` and ``coverage_gap``
+
+        Returns:
+            list: Carriers with ``usdot``, ``stale_families``, risk signals,
+                ``risk_score`` and ``oldest_check`` (None if never enriched)
+        """
+        query = """
+        MATCH (c:Carrier)
+        WHERE c.usdot IS NOT NULL AND NOT c.usdot IN $exclude
+        OPTIONAL MATCH (w:EnrichmentWatermark {usdot: c.usdot})
+        WHERE w.family IN $families
+        WITH c, collect(w) as marks
+        WITH c, marks,
+             [family IN $families WHERE NONE(w IN marks
+                 WHERE w.family = family AND w.checked_at >= $checked_before)] as stale_families
+        WHERE size(stale_families) > 0
+        OPTIONAL MATCH (cr:Crash {usdot: c.usdot})
+        WHERE cr.fatalities > 0
+        WITH c, marks, stale_families, count(cr) as fatal_crashes
+        OPTIONAL MATCH (c)-[:HAD_INSURANCE]->(:InsurancePolicy)-[g:PRECEDED_BY]-(:InsurancePolicy)
+        WHERE g.gap_days > 0
+        WITH c, marks, stale_families, fatal_crashes, count(DISTINCT g) as coverage_gaps
+        WITH c, stale_families, fatal_crashes, coverage_gaps,
+             CASE WHEN size(marks) < size($families) THEN null
+                  ELSE reduce(oldest = null, w IN marks |
+                      CASE WHEN oldest IS NULL OR w.checked_at < oldest THEN w.checked_at ELSE oldest END)
+             END as oldest_check,
+             coalesce(c.driver_oos_rate, 0.0) / $driver_oos_threshold
+               + coalesce(c.vehicle_oos_rate, 0.0) / $vehicle_oos_threshold
+               + fatal_crashes * $fatal_crash
+               + coverage_gaps * $coverage_gap as risk_score
+        RETURN c.usdot as usdot,
+               stale_families,
+               c.driver_oos_rate as driver_oos_rate,
+               c.vehicle_oos_rate as vehicle_oos_rate,
+               fatal_crashes,
+               coverage_gaps,
+               risk_score,
+               oldest_check
+        ORDER BY risk_score DESC, coalesce(oldest_check, '') ASC
+        LIMIT $limit
+        """
+
+        params = {
+            "driver_oos_threshold": 10.0,
+            "vehicle_oos_threshold": 40.0,
+            "fatal_crash": 2.0,
+            "coverage_gap": 0.5,
+            **(weights or {}),
+            "families": families,
+            "checked_before": checked_before,
+            "limit": limit,
+            "exclude": exclude or []
+        }
+
+        return self.execute_query(query, params)
+
+    def delete_for_carrier(self, usdot: int) -> int:
+        """Delete all watermarks for a carrier, forcing a full re-enrichment.
+
+        Args:
+            usdot: The USDOT number of the carrier
+
+        Returns:
+            int: Number of watermarks deleted
+        """
+        query = """
+        MATCH (w:EnrichmentWatermark {usdot: $usdot})
+        WITH w, count(w) as total
+        DELETE w
+        RETURN sum(total) as deleted
+        """
+
+        result = self.execute_query(query, {"usdot": usdot})
+        return result[0]['deleted'] if result and result[0]['deleted'] else 0
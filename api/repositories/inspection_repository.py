@@ -1,8 +1,9 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 
 from database import BaseRepository
 from models.inspection import Inspection
+from models.violation import Violation
 
 
 class InspectionRepository(BaseRepository):
@@ -146,6 +147,107 @@ class InspectionRepository(BaseRepository):
         result = self.execute_query(query, params)
         return result[0]['count'] if result else 0
     
+    def bulk_write_page(self, usdot: int, inspections: List[Inspection],
+                        violations: List[Violation]) -> Dict:
+        """Write a page of inspections and their violations in one transaction.
+        
+        Replaces the per-record create, create_relationship_to_carrier, violation
+        MERGE and link_violations round trips with four UNWIND statements:
+        inspections, UNDERWENT edges, violations and FOUND edges.
+        
+        Args:
+            usdot: The USDOT number of the carrier
+            inspections: Inspections on the page
+            violations: Detailed violations for those inspections
+        
+        Returns:
+            dict: Counts of inspections, violations and relationships written
+        """
+        return self.bulk_write_pages([(usdot, inspections, violations)])
+    
+    def bulk_write_pages(self, pages: List[Tuple[int, List[Inspection], List[Violation]]]) -> Dict:
+        """Write pages of inspections from any number of carriers in one transaction.
+        
+        Uses the same four UNWIND statements as bulk_write_page, with every
+        page's rows in the same parameter lists, so coalescing pages costs no
+        extra round trips.
+        
+        Args:
+            pages: ``(usdot, inspections, violations)`` per page
+        
+        Returns:
+            dict: Counts of inspections, violations and relationships written
+        """
+        inspection_query = """
+        UNWIND $inspections as row
+        MERGE (i:Inspection {inspection_id: row.inspection_id})
+        SET i += row
+        RETURN count(i) as count
+        """
+        
+        underwent_query = """
+        UNWIND $links as link
+        MATCH (c:Carrier {usdot: link.usdot})
+        MATCH (i:Inspection {inspection_id: link.inspection_id})
+        MERGE (c)-[r:UNDERWENT]->(i)
+        RETURN count(r) as count
+        """
+        
+        violation_query = """
+        UNWIND $violations as row
+        MERGE (v:Violation {violation_id: row.violation_id})
+        ON CREATE SET v += row
+        RETURN count(v) as count
+        """
+        
+        found_query = """
+        UNWIND $links as link
+        MATCH (i:Inspection {inspection_id: link.inspection_id})
+        MATCH (v:Violation {violation_id: link.violation_id})
+        MERGE (i)-[r:FOUND]->(v)
+        RETURN count(r) as count
+        """
+        
+        inspection_rows = []
+        underwent_links = []
+        violation_rows = []
+        for usdot, inspections, violations in pages:
+            for inspection in inspections:
+                params = inspection.model_dump()
+                if params.get('inspection_date'):
+                    params['inspection_date'] = params['inspection_date'].isoformat()
+                inspection_rows.append(params)
+                underwent_links.append({"usdot": usdot, "inspection_id": params["inspection_id"]})
+            
+            for violation in violations:
+                params = violation.model_dump()
+                if params.get('violation_date'):
+                    params['violation_date'] = params['violation_date'].isoformat()
+                violation_rows.append(params)
+        
+        queries = [
+            (inspection_query, {"inspections": inspection_rows}),
+            (underwent_query, {"links": underwent_links})
+        ]
+        if violation_rows:
+            queries.append((violation_query, {"violations": violation_rows}))
+            queries.append((found_query, {"links": [
+                {"inspection_id": row["inspection_id"], "violation_id": row["violation_id"]}
+                for row in violation_rows
+            ]}))
+        
+        results = self.transaction_query(queries)
+        counts = [result[0]['count'] if result else 0 for result in results]
+        counts += [0] * (4 - len(counts))
+        
+        return {
+            "inspections": counts[0],
+            "underwent": counts[1],
+            "violations": counts[2],
+            "found": counts[3],
+            "statements": len(queries)
+        }
+    
     def find_oos_inspections(self, usdot: int = None) -> List[Dict]:
         """Find inspections that resulted in out-of-service orders.
         
@@ -238,6 +340,46 @@ class InspectionRepository(BaseRepository):
             "clean_inspection_rate": 0.0
         }
     
+    def calculate_violation_rates(self, usdots: List[int], months: int = 24) -> Dict[int, Dict]:
+        """Calculate violation rates for many carriers in one query.
+        
+        Same figures as calculate_violation_rate, per carrier.
+        
+        Args:
+            usdots: The USDOT numbers of the carriers
+            months: Number of months to look back
+            
+        Returns:
+            dict: Violation statistics by USDOT; carriers without inspections are absent
+        """
+        query = """
+        UNWIND $usdots as usdot
+        MATCH (i:Inspection {usdot: usdot})
+        WHERE i.inspection_date >= date() - duration('P' + $months + 'M')
+        WITH usdot,
+             COUNT(i) as total_inspections,
+             SUM(i.violations_count) as total_violations,
+             SUM(i.oos_violations_count) as total_oos,
+             SUM(CASE WHEN i.violations_count = 0 THEN 1 ELSE 0 END) as clean_inspections
+        RETURN usdot,
+               total_inspections,
+               total_violations,
+               total_oos,
+               clean_inspections,
+               CASE WHEN total_inspections > 0 
+                    THEN toFloat(total_violations) / total_inspections 
+                    ELSE 0.0 END as avg_violations_per_inspection,
+               CASE WHEN total_inspections > 0 
+                    THEN toFloat(total_oos) / total_inspections 
+                    ELSE 0.0 END as avg_oos_per_inspection,
+               CASE WHEN total_inspections > 0 
+                    THEN toFloat(clean_inspections) / total_inspections * 100 
+                    ELSE 0.0 END as clean_inspection_rate
+        """
+        
+        result = self.execute_query(query, {"usdots": usdots, "months": str(months)})
+        return {record.pop('usdot'): record for record in result}
+    
     def find_repeat_violations(self, usdot: int) -> List[Dict]:
         """Find patterns of repeat violations for a carrier.
         
@@ -4,6 +4,7 @@ from datetime import datetime, timezone, date
 from database import BaseRepository
 from models.insurance_policy import InsurancePolicy
 from models.insurance_event import InsuranceEvent
+from models.insurance_provider import InsuranceProvider
 
 
 class InsurancePolicyRepository(BaseRepository):
@@ -132,16 +133,7 @@ class InsurancePolicyRepository(BaseRepository):
         Returns:
             bool: True if relationship created, False otherwise
         """
-        # Calculate status
-        status = "ACTIVE"
-        if to_date:
-            if to_date < date.today():
-                status = "EXPIRED"
-        
-        # Calculate duration days
-        duration_days = -1  # Active policy
-        if to_date:
-            duration_days = (to_date - from_date).days
+        status, duration_days = self._coverage_status(from_date, to_date)
         
         query = """
         MATCH (c:Carrier {usdot: $carrier_usdot})
@@ -480,4 +472,196 @@ class InsurancePolicyRepository(BaseRepository):
             policies_data.append(data)
         
         result = self.execute_query(query, {"policies": policies_data})
-        return {"created": result[0]['created']} if result else {"created": 0}
\ No newline at end of file
+        return {"created": result[0]['created']} if result else {"created": 0}
+    
+    def get_existing_policy_ids(self, policy_ids: List[str]) -> set:
+        """Get which of the given policy IDs already exist.
+        
+        Args:
+            policy_ids: Policy identifiers to check
+            
+        Returns:
+            set: Policy IDs that are already stored
+        """
+        if not policy_ids:
+            return set()
+        
+        query = """
+        MATCH (ip:InsurancePolicy)
+        WHERE ip.policy_id IN $policy_ids
+        RETURN ip.policy_id as policy_id
+        """
+        
+        result = self.execute_query(query, {"policy_ids": policy_ids})
+        return {record['policy_id'] for record in result}
+    
+    def bulk_write_timelines(self, timelines: List[Dict]) -> Dict:
+        """Persist the insurance timelines of one or more carriers in one transaction.
+        
+        Each timeline is a dict with ``carrier_usdot``, ``providers``
+        (InsuranceProvider), ``policies`` (new InsurancePolicy models only),
+        ``successions`` (dicts with previous_policy_id, next_policy_id and
+        gap_days) and ``events`` (InsuranceEvent). Rows of every carrier are
+        concatenated so the whole group costs one UNWIND statement per node or
+        relationship type. Providers are merged by name and events by event_id,
+        so replaying a timeline does not duplicate them.
+        
+        Args:
+            timelines: Per-carrier timelines built in memory
+            
+        Returns:
+            dict: Counts of nodes and relationships written
+        """
+        provider_query = """
+        UNWIND $providers as row
+        MERGE (prov:InsuranceProvider {name: row.name})
+        ON CREATE SET prov += row
+        RETURN count(prov) as count
+        """
+        
+        policy_query = """
+        UNWIND $policies as row
+        MERGE (ip:InsurancePolicy {policy_id: row.policy_id})
+        ON CREATE SET ip += row
+        RETURN count(ip) as count
+        """
+        
+        coverage_query = """
+        UNWIND $coverage as row
+        MATCH (c:Carrier {usdot: row.carrier_usdot})
+        MATCH (ip:InsurancePolicy {policy_id: row.policy_id})
+        MERGE (c)-[r:HAD_INSURANCE]->(ip)
+        ON CREATE SET 
+            r.from_date = row.from_date,
+            r.to_date = row.to_date,
+            r.status = row.status,
+            r.duration_days = row.duration_days,
+            r.created_at = $now
+        ON MATCH SET 
+            r.to_date = row.to_date,
+            r.status = row.status,
+            r.duration_days = row.duration_days,
+            r.updated_at = $now
+        RETURN count(r) as count
+        """
+        
+        provided_by_query = """
+        UNWIND $policies as row
+        MATCH (ip:InsurancePolicy {policy_id: row.policy_id})
+        MATCH (prov:InsuranceProvider {name: row.provider_name})
+        MERGE (ip)-[r:PROVIDED_BY]->(prov)
+        ON CREATE SET r.created_at = $now
+        RETURN count(r) as count
+        """
+        
+        succession_query = """
+        UNWIND $successions as row
+        MATCH (prev:InsurancePolicy {policy_id: row.previous_policy_id})
+        MATCH (next:InsurancePolicy {policy_id: row.next_policy_id})
+        MERGE (next)-[r:PRECEDED_BY]->(prev)
+        ON CREATE SET 
+            r.gap_days = row.gap_days,
+            r.created_at = $now
+        RETURN count(r) as count
+        """
+        
+        event_query = """
+        UNWIND $events as row
+        MATCH (c:Carrier {usdot: row.carrier_usdot})
+        MERGE (ie:InsuranceEvent {event_id: row.event_id})
+        ON CREATE SET ie += row
+        MERGE (c)-[:INSURANCE_EVENT]->(ie)
+        RETURN count(ie) as count
+        """
+        
+        now = datetime.now(timezone.utc).isoformat()
+        providers = {}
+        policies = []
+        coverage = []
+        successions = []
+        events = []
+        
+        for timeline in timelines:
+            for provider in timeline.get("providers", []):
+                if provider.name in providers:
+                    continue
+                data = provider.model_dump()
+                if data.get('created_date'):
+                    data['created_date'] = data['created_date'].isoformat()
+                data['last_updated'] = data['last_updated'].isoformat() if data.get('last_updated') else now
+                providers[provider.name] = data
+            
+            for policy in timeline.get("policies", []):
+                data = policy.model_dump()
+                for date_field in ['effective_date', 'expiration_date', 'cancellation_date']:
+                    if data.get(date_field):
+                        data[date_field] = data[date_field].isoformat()
+                data['created_at'] = data['created_at'].isoformat() if data.get('created_at') else now
+                if data.get('updated_at'):
+                    data['updated_at'] = data['updated_at'].isoformat()
+                policies.append(data)
+                
+                end_date = policy.cancellation_date or policy.expiration_date
+                status, duration_days = self._coverage_status(policy.effective_date, end_date)
+                coverage.append({
+                    "carrier_usdot": timeline["carrier_usdot"],
+                    "policy_id": policy.policy_id,
+                    "from_date": policy.effective_date.isoformat(),
+                    "to_date": end_date.isoformat() if end_date else None,
+                    "status": status,
+                    "duration_days": duration_days
+                })
+            
+            successions.extend(timeline.get("successions", []))
+            
+            for event in timeline.get("events", []):
+                data = event.model_dump()
+                if data.get('event_date'):
+                    data['event_date'] = data['event_date'].isoformat()
+                data['created_at'] = data['created_at'].isoformat() if data.get('created_at') else now
+                events.append(data)
+        
+        statements = [
+            ("providers", provider_query, {"providers": list(providers.values())}),
+            ("policies", policy_query, {"policies": policies}),
+            ("had_insurance", coverage_query, {"coverage": coverage, "now": now}),
+            ("provided_by", provided_by_query, {"policies": policies, "now": now}),
+            ("preceded_by", succession_query, {"successions": successions, "now": now}),
+            ("events", event_query, {"events": events}),
+        ]
+        
+        # Skip statements that would UNWIND an empty list
+        statements = [
+            (name, query, params) for name, query, params in statements
+            if any(isinstance(value, list) and value for value in params.values())
+        ]
+        
+        counts = {name: 0 for name in
+                  ("providers", "policies", "had_insurance", "provided_by", "preceded_by", "events")}
+        if not statements:
+            counts["statements"] = 0
+            return counts
+        
+        results = self.transaction_query([(query, params) for _, query, params in statements])
+        for (name, _, _), result in zip(statements, results):
+            counts[name] = result[0]['count'] if result else 0
+        counts["statements"] = len(statements)
+        return counts
+    
+    @staticmethod
+    def _coverage_status(from_date: date, to_date: Optional[date]) -> Tuple[str, int]:
+        """Derive HAD_INSURANCE status and duration from the coverage dates.
+        
+        Args:
+            from_date: Start date of the insurance coverage
+            to_date: End date of the insurance coverage (if ended)
+            
+        Returns:
+            tuple: (status, duration_days) where -1 days marks an active policy
+        """
+        status = "ACTIVE"
+        if to_date and to_date < date.today():
+            status = "EXPIRED"
+        
+        duration_days = (to_date - from_date).days if to_date else -1
+        return status, duration_days
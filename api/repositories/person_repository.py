@@ -5,6 +5,15 @@ import hashlib
 
 from database import BaseRepository
 from models.person import Person
+from utils.name_matching import fulltext_query, name_keys, name_similarity
+
+
+# Full-text index over Person name_normalized and name_phonetic (see init_schema.cypher)
+NAME_INDEX = "person_name_fulltext"
+
+# Full-text candidates re-ranked per requested search result
+SEARCH_CANDIDATES_PER_RESULT = 5
+MIN_SEARCH_CANDIDATES = 50
 
 
 class PersonRepository(BaseRepository):
@@ -44,12 +53,17 @@ class PersonRepository(BaseRepository):
             phone: $phone,
             first_seen: $first_seen,
             last_seen: $last_seen,
-            source: $source
+            source: $source,
+            name_normalized: $name_normalized,
+            name_tokens: $name_tokens,
+            name_soundex: $name_soundex,
+            name_metaphone: $name_metaphone,
+            name_phonetic: $name_phonetic
         })
         RETURN p
         """
         
-        params = person.model_dump()
+        params = {**person.model_dump(), **name_keys(person.full_name)}
         # Convert dates to strings
         if params.get('date_of_birth'):
             params['date_of_birth'] = params['date_of_birth'].isoformat()
@@ -75,16 +89,280 @@ class PersonRepository(BaseRepository):
         return result[0]['p'] if result else None
     
     def find_by_name(self, full_name: str) -> List[Dict]:
-        """Find persons by name (fuzzy matching)"""
+        """Find persons by name (fuzzy matching, see search_by_name)"""
+        return self.search_by_name(full_name)
+    
+    def search_by_name(self, name: str, limit: int = 10) -> List[Dict]:
+        """Ranked fuzzy person search by name.
+        
+        Candidates come from the name full-text index, matching each token
+        exactly, by prefix, within one edit or by Soundex/Metaphone code.
+        They are re-ranked by name_similarity, which requires every query
+        token to match some token of the name.
+        
+        Args:
+            name: Name to search for, in any token order
+            limit: Maximum number of persons to return
+            
+        Returns:
+            list: Persons with ``match_score`` (0-1), best match first
+        """
+        search = fulltext_query(name)
+        if not search:
+            return []
+        
+        query = """
+        CALL db.index.fulltext.queryNodes($index, $search, {limit: $candidates})
+        YIELD node, score
+        RETURN node as p, score
+        """
+        result = self.execute_query(query, {
+            "index": NAME_INDEX,
+            "search": search,
+            "candidates": max(limit * SEARCH_CANDIDATES_PER_RESULT, MIN_SEARCH_CANDIDATES)
+        })
+        
+        matches = []
+        for record in result:
+            match_score = name_similarity(name, record['p']['full_name'])
+            if match_score > 0:
+                matches.append(({**record['p'], "match_score": match_score}, record['score']))
+        matches.sort(key=lambda match: (-match[0]['match_score'], -match[1], match[0]['full_name']))
+        return [person for person, _ in matches[:limit]]
+    
+    def get_existing_names(self, full_names: List[str]) -> set:
+        """Return which of the given names already have a Person, in one query.
+        
+        Names are matched by the person_id they would be created under.
+        """
+        ids = {self._generate_person_id(name): name for name in full_names}
         query = """
         MATCH (p:Person)
-        WHERE toLower(p.full_name) CONTAINS toLower($name_search)
+        WHERE p.person_id IN $person_ids
+        RETURN p.person_id as person_id
+        UNION
+        MATCH (m:PersonMerge)
+        WHERE m.merged_id IN $person_ids
+        RETURN m.merged_id as person_id
+        """
+        result = self.execute_query(query, {"person_ids": list(ids)})
+        return {ids[record['person_id']] for record in result}
+    
+    def refresh_name_keys(self, batch_size: int = 1000) -> Dict:
+        """Recompute the name blocking keys of every person.
+        
+        Needed once for persons created before the keys existed; creates
+        and name updates keep them current afterwards.
+        
+        Args:
+            batch_size: Persons updated per transaction
+            
+        Returns:
+            dict: Persons updated and batches run
+        """
+        read_query = """
+        MATCH (p:Person)
+        WHERE p.person_id > $after
+        RETURN p.person_id as person_id, p.full_name as full_name
+        ORDER BY p.person_id
+        LIMIT $limit
+        """
+        write_query = """
+        UNWIND $rows as row
+        MATCH (p:Person {person_id: row.person_id})
+        SET p += row.keys
+        """
+        
+        updated = 0
+        batches = 0
+        after = ""
+        while True:
+            rows = self.execute_query(read_query, {"after": after, "limit": batch_size})
+            if not rows:
+                break
+            self.execute_write(write_query, {"rows": [
+                {"person_id": row['person_id'], "keys": name_keys(row['full_name'] or "")}
+                for row in rows
+            ]})
+            updated += len(rows)
+            batches += 1
+            after = rows[-1]['person_id']
+        
+        return {"persons_updated": updated, "batches": batches}
+    
+    def get_merge_survivor(self, person_id: str) -> Optional[Dict]:
+        """Get the person a merged-away person_id was merged into, if any"""
+        query = """
+        MATCH (m:PersonMerge {merged_id: $person_id})
+        MATCH (p:Person {person_id: m.survivor_id})
         RETURN p
-        ORDER BY p.full_name
-        LIMIT 10
+        LIMIT 1
+        """
+        result = self.execute_query(query, {"person_id": person_id})
+        return result[0]['p'] if result else None
+    
+    def get_resolution_profiles(self, after_id: str = "", limit: int = 5000) -> List[Dict]:
+        """Get a page of persons, in person_id order, with entity-resolution evidence.
+        
+        Args:
+            after_id: Return persons with a greater person_id
+            limit: Maximum number of persons to return
+            
+        Returns:
+            list: Person identity fields with managed carrier USDOTs, those
+                carriers' phones and addresses, and executive company DOTs
+        """
+        query = """
+        MATCH (p:Person)
+        WHERE p.person_id > $after
+        WITH p ORDER BY p.person_id LIMIT $limit
+        RETURN p.person_id as person_id,
+               p.full_name as full_name,
+               p.date_of_birth as date_of_birth,
+               p.email as email,
+               p.phone as phone,
+               [(p)<-[:MANAGED_BY]-(c:Carrier) | c.usdot] as carriers,
+               [(p)<-[:MANAGED_BY]-(c:Carrier) WHERE c.phone IS NOT NULL | c.phone] +
+               [(p)<-[:MANAGED_BY]-(c:Carrier) WHERE c.physical_address IS NOT NULL | c.physical_address]
+                   as carrier_contacts,
+               [(p)<-[:HAS_EXECUTIVE]-(tc:TargetCompany) | tc.dot_number] as companies
+        ORDER BY person_id
+        """
+        return self.execute_query(query, {"after": after_id, "limit": limit})
+    
+    def merge_persons(self, survivor_id: str, merges: List[Dict], run_id: str) -> Dict:
+        """Merge duplicate persons into a survivor in one transaction.
+        
+        Each merged person's MANAGED_BY and HAS_EXECUTIVE relationships move
+        to the survivor, its contact details and sources are added to the
+        survivor's, and its name becomes an alias. A PersonMerge audit node
+        (linked from the survivor by MERGED_FROM) records the merged person's
+        identity and relationships, the score and reasons; lookups of the
+        merged person_id resolve to the survivor through it. The merged
+        person is then deleted.
+        
+        Args:
+            survivor_id: Person kept
+            merges: ``person_id``, ``score`` and ``reasons`` per person merged in
+            run_id: Resolution run making the merge
+            
+        Returns:
+            dict: Transaction status
         """
-        result = self.execute_query(query, {"name_search": full_name})
-        return [record['p'] for record in result]
+        statements = []
+        merged_at = datetime.now(timezone.utc).isoformat()
+        for merge in merges:
+            params = {
+                "survivor_id": survivor_id,
+                "merged_id": merge['person_id'],
+                "merge_id": f"{run_id}:{merge['person_id']}",
+                "run_id": run_id,
+                "score": merge['score'],
+                "reasons": merge['reasons'],
+                "merged_at": merged_at
+            }
+            statements += [
+                ("""
+                MATCH (s:Person {person_id: $survivor_id})
+                MATCH (m:Person {person_id: $merged_id})
+                CREATE (a:PersonMerge {
+                    merge_id: $merge_id,
+                    run_id: $run_id,
+                    survivor_id: $survivor_id,
+                    merged_id: $merged_id,
+                    merged_name: m.full_name,
+                    merged_date_of_birth: m.date_of_birth,
+                    merged_email: m.email,
+                    merged_phone: m.phone,
+                    merged_source: m.source,
+                    merged_first_seen: m.first_seen,
+                    merged_carriers: [(m)<-[:MANAGED_BY]-(c:Carrier) | c.usdot],
+                    merged_companies: [(m)<-[:HAS_EXECUTIVE]-(tc:TargetCompany) | tc.dot_number],
+                    score: $score,
+                    reasons: $reasons,
+                    merged_at: $merged_at
+                })
+                CREATE (s)-[:MERGED_FROM]->(a)
+                SET s.email = coalesce(s.email, []) + [e IN coalesce(m.email, []) WHERE NOT e IN coalesce(s.email, [])],
+                    s.phone = coalesce(s.phone, []) + [x IN coalesce(m.phone, []) WHERE NOT x IN coalesce(s.phone, [])],
+                    s.source = coalesce(s.source, []) + [x IN coalesce(m.source, []) WHERE NOT x IN coalesce(s.source, [])],
+                    s.aliases = coalesce(s.aliases, []) +
+                        CASE WHEN m.full_name = s.full_name OR m.full_name IN coalesce(s.aliases, [])
+                             THEN [] ELSE [m.full_name] END,
+                    s.first_name = coalesce(s.first_name, m.first_name),
+                    s.last_name = coalesce(s.last_name, m.last_name),
+                    s.date_of_birth = coalesce(s.date_of_birth, m.date_of_birth),
+                    s.first_seen = CASE WHEN m.first_seen < s.first_seen THEN m.first_seen
+                                        ELSE coalesce(s.first_seen, m.first_seen) END,
+                    s.last_seen = CASE WHEN m.last_seen > s.last_seen THEN m.last_seen
+                                       ELSE coalesce(s.last_seen, m.last_seen) END
+                """, params),
+                ("""
+                MATCH (s:Person {person_id: $survivor_id})
+                MATCH (m:Person {person_id: $merged_id})<-[r:MANAGED_BY]-(c:Carrier)
+                MERGE (c)-[moved:MANAGED_BY]->(s)
+                ON CREATE SET moved = properties(r)
+                DELETE r
+                """, params),
+                ("""
+                MATCH (s:Person {person_id: $survivor_id})
+                MATCH (m:Person {person_id: $merged_id})<-[r:HAS_EXECUTIVE]-(tc:TargetCompany)
+                MERGE (tc)-[moved:HAS_EXECUTIVE]->(s)
+                ON CREATE SET moved = properties(r)
+                DELETE r
+                """, params),
+                # Earlier merges into the merged person now resolve to the survivor
+                ("""
+                MATCH (s:Person {person_id: $survivor_id})
+                MATCH (earlier:PersonMerge {survivor_id: $merged_id})
+                SET earlier.survivor_id = $survivor_id
+                MERGE (s)-[:MERGED_FROM]->(earlier)
+                """, params),
+                ("""
+                MATCH (m:Person {person_id: $merged_id})
+                DETACH DELETE m
+                """, params),
+            ]
+        return self.transaction_write(statements)
+    
+    def link_possible_duplicates(self, links: List[Dict], run_id: str) -> Dict:
+        """Record likely duplicates that were not merged, for review.
+        
+        Args:
+            links: ``person_id``, ``other_id``, ``score`` and ``reasons`` per pair
+            run_id: Resolution run making the links
+            
+        Returns:
+            dict: Write counters
+        """
+        query = """
+        UNWIND $links as link
+        MATCH (a:Person {person_id: link.person_id})
+        MATCH (b:Person {person_id: link.other_id})
+        MERGE (a)-[r:POSSIBLY_SAME_AS]->(b)
+        SET r.score = link.score,
+            r.reasons = link.reasons,
+            r.run_id = $run_id,
+            r.detected_at = $detected_at
+        """
+        return self.execute_write(query, {
+            "links": links,
+            "run_id": run_id,
+            "detected_at": datetime.now(timezone.utc).isoformat()
+        })
+    
+    def get_merge_audit(self, person_id: Optional[str] = None, skip: int = 0, limit: int = 100) -> List[Dict]:
+        """Get entity-resolution merges, newest first, optionally for one survivor or merged person"""
+        query = """
+        MATCH (a:PersonMerge)
+        WHERE $person_id IS NULL OR a.survivor_id = $person_id OR a.merged_id = $person_id
+        RETURN a {.*} as merge
+        ORDER BY a.merged_at DESC, a.merge_id
+        SKIP $skip
+        LIMIT $limit
+        """
+        result = self.execute_query(query, {"person_id": person_id, "skip": skip, "limit": limit})
+        return [record['merge'] for record in result]
     
     def find_or_create(self, person: Person) -> Dict:
         """Find existing person or create new one"""
@@ -95,11 +373,11 @@ class PersonRepository(BaseRepository):
                 person.date_of_birth
             )
         
-        # Try to find existing
-        existing = self.get_by_id(person.person_id)
+        # Try to find existing, following merges by entity resolution
+        existing = self.get_by_id(person.person_id) or self.get_merge_survivor(person.person_id)
         if existing:
             # Update last_seen
-            self.update(person.person_id, {"last_seen": date.today()})
+            self.update(existing['person_id'], {"last_seen": date.today()})
             return existing
         
         # Create new
@@ -110,6 +388,10 @@ class PersonRepository(BaseRepository):
         set_clauses = []
         params = {"person_id": person_id}
         
+        # Keep the name blocking keys in step with the name
+        if updates.get('full_name'):
+            updates = {**updates, **name_keys(updates['full_name'])}
+        
         for key, value in updates.items():
             if value is not None:
                 set_clauses.append(f"p.{key} = ${key}")
@@ -136,6 +136,29 @@ class SafetySnapshotRepository(BaseRepository):
         result = self.execute_query(query, {"usdot": usdot})
         return result[0]['s'] if result else None
     
+    def find_latest_by_usdots(self, usdots: List[int]) -> Dict[int, Dict]:
+        """Get the most recent safety snapshot of each of many carriers in one query.
+        
+        Args:
+            usdots: The USDOT numbers to look up
+            
+        Returns:
+            dict: Latest snapshot by USDOT; carriers without one are absent
+        """
+        query = """
+        UNWIND $usdots as usdot
+        CALL {
+            WITH usdot
+            MATCH (s:SafetySnapshot {usdot: usdot})
+            RETURN s
+            ORDER BY s.snapshot_date DESC
+            LIMIT 1
+        }
+        RETURN usdot, s
+        """
+        result = self.execute_query(query, {"usdots": usdots})
+        return {record['usdot']: record['s'] for record in result}
+    
     def create_relationship_to_carrier(self, usdot: int, snapshot: SafetySnapshot) -> bool:
         """Create a HAS_SAFETY_SNAPSHOT relationship between carrier and snapshot.
         
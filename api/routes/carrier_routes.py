@@ -1,10 +1,14 @@
+import logging
 from typing import Dict, List, Optional
 from fastapi import APIRouter, HTTPException, Query, Response, status
 from pydantic import BaseModel
 
 from models.carrier import Carrier
 from repositories.carrier_repository import CarrierRepository
+from services.chameleon_clustering import update_chameleon_clusters
+from services.coverage_index import get_coverage_index
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/carriers", 
@@ -71,6 +75,7 @@ async def create_carrier(carrier: Carrier):
             detail="Failed to create carrier"
         )
     
+    get_coverage_index().refresh_carriers([carrier.usdot])
     return result
 
 
@@ -140,6 +145,7 @@ async def delete_carrier(usdot: int):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Carrier with USDOT {usdot} not found"
         )
+    get_coverage_index().refresh_carriers([usdot])
     return None
 
 
@@ -215,6 +221,7 @@ async def bulk_create_carriers(carriers: List[Carrier]):
         )
     
     result = repo.bulk_create(carriers)
+    get_coverage_index().refresh_carriers(usdots)
     return result
 
 
@@ -338,6 +345,12 @@ async def link_carrier_to_officer(usdot: int, request: OfficerLinkRequest, respo
     if request.officer_name:
         repo.update(usdot, {"primary_officer": request.officer_name})
     
+    # A shared officer can join the carrier to a chameleon cluster
+    try:
+        update_chameleon_clusters([usdot])
+    except Exception as e:
+        logger.error(f"Error updating chameleon clusters for carrier {usdot}: {e}")
+    
     # Set appropriate status code
     response.status_code = status.HTTP_201_CREATED
     
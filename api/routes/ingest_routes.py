@@ -4,17 +4,26 @@ Data Ingestion Routes for RICO API.
 Provides endpoints for bulk data import from CSV files with optional enrichment.
 """
 
+import asyncio
 import base64
 import io
+import json
 import logging
 from pathlib import Path
 from typing import Optional, Dict
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, status
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from models.ingest_request import IngestRequest, IngestResponse
 from services.ingest_orchestrator import IngestionOrchestrator
+from services.enrichment_queue import get_enrichment_queue
+from services.enrichment_refresh_scheduler import RefreshScheduler
+from services.searchcarriers_enrichment_service import (
+    cancel_enrichment,
+    get_enrichment_status,
+    stream_enrichment_progress
+)
 
 logger = logging.getLogger(__name__)
 
@@ -182,7 +191,11 @@ async def ingest_data(
                     csv_content=csv_content,
                     target_company=request.target_company,
                     enable_enrichment=True,
-                    skip_invalid=request.skip_invalid
+                    skip_invalid=request.skip_invalid,
+                    enrichment_caps={
+                        "max_requests": request.enrichment_max_requests,
+                        "max_duration_seconds": request.enrichment_max_duration_seconds
+                    }
                 )
             
             # Add to background tasks
@@ -195,7 +208,8 @@ async def ingest_data(
                 message="Ingestion started. Data will be processed in the background.",
                 enrichment={
                     "enabled": True,
-                    "status": "queued"
+                    "status": "queued",
+                    "job_id": orchestrator.job_id
                 }
             )
         else:
@@ -235,29 +249,181 @@ async def ingest_data(
     "/status/{job_id}",
     response_model=dict,
     summary="Get ingestion job status",
-    description="Get the status of a running or completed ingestion job"
+    description="Get the status of a running or completed enrichment job"
 )
 async def get_job_status(job_id: str):
     """
-    Get the status of an ingestion job.
+    Get the status of an enrichment job.
+    
+    Args:
+        job_id: UUID of the enrichment job returned by ingestion or an enrich endpoint
+        
+    Returns:
+        Dictionary with job status, per-state item counts and aggregate results
+    """
+    return await get_enrichment_status(job_id)
+
+
+@router.get(
+    "/status/{job_id}/stream",
+    summary="Stream enrichment job progress",
+    description="""
+    Server-sent events stream of an enrichment job's progress.
+    
+    Events:
+    - `carrier`: a carrier finished (usdot, state, families enriched, error)
+    - `progress`: item counts, running counters, throughput and ETA
+    - `done`: final progress once the job completes or is cancelled
+    
+    Comment lines are sent as keep-alives while the job is idle.
+    """
+)
+async def stream_job_status(
+    job_id: str,
+    poll_interval: float = Query(1.0, ge=0.2, le=30.0, description="Seconds between progress checks")
+):
+    """
+    Stream the progress of an enrichment job as server-sent events.
     
     Args:
-        job_id: UUID of the ingestion job
+        job_id: UUID of the enrichment job
+        poll_interval: Seconds between progress checks
         
     Returns:
-        Dictionary with job status and details
+        text/event-stream response that ends when the job finishes
         
-    Note:
-        This is a placeholder endpoint. In a production system, this would
-        query a job tracking system or database to get real-time status.
+    Raises:
+        HTTPException: If the job does not exist
     """
-    # Placeholder implementation
-    # In production, this would query a job tracking system
-    return {
-        "job_id": job_id,
-        "status": "unknown",
-        "message": "Job status tracking not yet implemented"
-    }
+    if await asyncio.to_thread(get_enrichment_queue().get_job, job_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Enrichment job {job_id} not found"
+        )
+    
+    async def event_stream():
+        async for event, data in stream_enrichment_progress(job_id, poll_interval=poll_interval):
+            if event == "heartbeat":
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post(
+    "/status/{job_id}/cancel",
+    response_model=dict,
+    summary="Cancel an enrichment job",
+    description="Stop an enrichment job; carriers already in flight finish and no new ones start"
+)
+async def cancel_job(job_id: str):
+    """
+    Cancel an enrichment job.
+    
+    Args:
+        job_id: UUID of the enrichment job
+        
+    Returns:
+        Dictionary confirming the cancellation request
+        
+    Raises:
+        HTTPException: If the job does not exist or has already finished
+    """
+    if not await cancel_enrichment(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No active enrichment job {job_id}"
+        )
+    return {"job_id": job_id, "status": "cancelling"}
+
+
+@router.get(
+    "/queue/stats",
+    response_model=dict,
+    summary="Get enrichment queue depth",
+    description="Get the number of queued enrichment items per state and priority class"
+)
+async def get_queue_stats():
+    """
+    Get enrichment queue depth.
+    
+    Returns:
+        Dictionary of item counts keyed by state, then by priority class
+    """
+    return await asyncio.to_thread(get_enrichment_queue().stats)
+
+
+@router.get(
+    "/queue/dead-letter",
+    response_model=list,
+    summary="List dead-lettered enrichment items",
+    description="List carriers whose enrichment failed on every retry attempt"
+)
+async def get_dead_letters(
+    limit: int = Query(100, ge=1, le=1000, description="Maximum items to return")
+):
+    """
+    List dead-lettered enrichment items.
+    
+    Args:
+        limit: Maximum number of items to return
+        
+    Returns:
+        List of items with their job, carrier, attempts and last error
+    """
+    return await asyncio.to_thread(get_enrichment_queue().dead_letters, limit)
+
+
+@router.post(
+    "/queue/dead-letter/{item_id}/retry",
+    response_model=dict,
+    summary="Retry a dead-lettered enrichment item",
+    description="Return a dead-lettered item to the queue with a fresh attempt budget"
+)
+async def retry_dead_letter(item_id: int):
+    """
+    Retry a dead-lettered enrichment item.
+    
+    Args:
+        item_id: ID of the dead-lettered item
+        
+    Returns:
+        Dictionary confirming the item was requeued
+        
+    Raises:
+        HTTPException: If the item does not exist or is not dead-lettered
+    """
+    if not await asyncio.to_thread(get_enrichment_queue().retry_dead, item_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No dead-lettered item {item_id}"
+        )
+    return {"item_id": item_id, "status": "requeued"}
+
+
+@router.post(
+    "/refresh/run",
+    response_model=dict,
+    summary="Run a stale-data refresh pass",
+    description="""
+    Queue the riskiest carriers whose enriched data is older than the configured
+    age, up to one scheduling interval's budget. Runs automatically in the
+    background; this endpoint triggers a pass immediately.
+    """
+)
+async def run_refresh_pass():
+    """
+    Run one refresh scheduling pass.
+    
+    Returns:
+        Dictionary with the pass status, carriers queued and created job IDs
+    """
+    return await asyncio.to_thread(RefreshScheduler().tick)
 
 
 @router.get(
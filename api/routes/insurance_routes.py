@@ -5,7 +5,7 @@ and SearchCarriers enrichment.
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, Query
 from datetime import date
 import asyncio
 
@@ -13,14 +13,23 @@ from models.insurance_policy import InsurancePolicy
 from models.insurance_event import InsuranceEvent
 from repositories.insurance_policy_repository import InsurancePolicyRepository
 from repositories.carrier_repository import CarrierRepository
+from repositories.chameleon_cluster_repository import ChameleonClusterRepository
+from services import chameleon_clustering
 from services.searchcarriers_client import SearchCarriersClient
-from scripts.ingest.searchcarriers_insurance_enrichment import SearchCarriersInsuranceEnrichment
+from services.coverage_index import get_coverage_index
+from services.enrichment_queue import Priority
+from services.insurance_statistics import get_insurance_statistics_cache
+from services.searchcarriers_enrichment_service import INSURANCE_ONLY_OPTIONS, enqueue_enrichment
 
 router = APIRouter(prefix="/insurance", tags=["Insurance"])
 
+# Most dates accepted by one multi-date uninsured query
+MAX_UNINSURED_DATES = 366
+
 # Repository instances
 policy_repo = InsurancePolicyRepository()
 carrier_repo = CarrierRepository()
+cluster_repo = ChameleonClusterRepository()
 
 
 @router.post("/policies/", response_model=dict, status_code=201)
@@ -54,6 +63,8 @@ def create_insurance_policy(policy: InsurancePolicy):
             policy.effective_date,
             policy.cancellation_date or policy.expiration_date
         )
+        carrier_repo.refresh_insurance_fraud_risk_scores([policy.carrier_usdot])
+        get_coverage_index().refresh_carriers([policy.carrier_usdot])
     
     return {"message": "Insurance policy created", "policy": created}
 
@@ -115,16 +126,19 @@ def get_carrier_insurance_timeline(carrier_usdot: int):
 @router.post("/carriers/{carrier_usdot}/enrich", response_model=dict)
 async def enrich_carrier_insurance(
     carrier_usdot: int,
-    background_tasks: BackgroundTasks
+    force: bool = Query(False, description="Rewrite insurance data even if unchanged upstream")
 ):
-    """Trigger SearchCarriers API enrichment for a specific carrier.
+    """Queue SearchCarriers API enrichment for a specific carrier.
+    
+    The request is queued at interactive priority, ahead of any bulk
+    backfill, and survives API restarts.
     
     Args:
         carrier_usdot: Carrier's USDOT number
-        background_tasks: FastAPI background task handler
+        force: Skip the freshness probe and always rewrite
         
     Returns:
-        dict: Enrichment status
+        dict: Enrichment status with the job ID
         
     Raises:
         HTTPException: If carrier not found
@@ -134,17 +148,19 @@ async def enrich_carrier_insurance(
     if not carrier:
         raise HTTPException(status_code=404, detail=f"Carrier {carrier_usdot} not found")
     
-    # Run enrichment in background
-    async def enrich_task():
-        enricher = SearchCarriersInsuranceEnrichment()
-        await enricher.enrich_carrier(carrier)
-    
-    background_tasks.add_task(enrich_task)
+    job_id = await asyncio.to_thread(
+        enqueue_enrichment,
+        [carrier_usdot],
+        {**INSURANCE_ONLY_OPTIONS, "force_refresh": force},
+        Priority.INTERACTIVE,
+        "interactive"
+    )
     
     return {
-        "message": f"Enrichment started for carrier {carrier_usdot}",
+        "message": f"Enrichment queued for carrier {carrier_usdot}",
         "carrier_name": carrier['carrier_name'],
-        "status": "processing"
+        "job_id": job_id,
+        "status": "queued"
     }
 
 
@@ -170,6 +186,55 @@ def get_insurance_coverage_gaps(
     return gaps
 
 
+@router.get("/fraud/uninsured/{check_date}", response_model=List[dict])
+def get_carriers_without_insurance(check_date: date):
+    """Find carriers without active insurance on a date, largest fleets first.
+    
+    Answered from the in-memory coverage index rather than by scanning
+    every carrier's policies.
+    
+    Args:
+        check_date: Date to check (YYYY-MM-DD)
+        
+    Returns:
+        list: Uninsured carriers
+    """
+    usdots = get_coverage_index().uninsured_on(check_date)
+    return carrier_repo.get_carrier_summaries(usdots) if usdots else []
+
+
+@router.get("/fraud/uninsured", response_model=dict)
+def get_carriers_without_insurance_on_dates(
+    dates: List[date] = Query(..., description="Dates to check (repeat the parameter for each date)")
+):
+    """Find carriers without active insurance on each of several dates.
+    
+    Args:
+        dates: Dates to check
+        
+    Returns:
+        dict: Uninsured carrier USDOTs per date, a summary of every carrier
+              listed, and when the coverage index last synced
+        
+    Raises:
+        HTTPException: If more than MAX_UNINSURED_DATES dates are requested
+    """
+    if len(dates) > MAX_UNINSURED_DATES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_UNINSURED_DATES} dates per request")
+    
+    index = get_coverage_index()
+    uninsured = index.uninsured_on_dates(dates)
+    usdots = sorted({usdot for listed in uninsured.values() for usdot in listed})
+    return {
+        "dates": [
+            {"date": check_date.isoformat(), "uninsured_count": len(listed), "carrier_usdots": sorted(listed)}
+            for check_date, listed in uninsured.items()
+        ],
+        "carriers": carrier_repo.get_carrier_summaries(usdots) if usdots else [],
+        "coverage_synced_at": index.synced_at
+    }
+
+
 @router.get("/fraud/insurance-shopping", response_model=List[dict])
 def detect_insurance_shopping(
     months_window: int = Query(12, description="Time window in months"),
@@ -205,25 +270,88 @@ def find_underinsured_carriers(
 
 
 @router.get("/fraud/risk-scores", response_model=List[dict])
-def get_insurance_fraud_risk_scores():
-    """Calculate comprehensive fraud risk scores for all carriers.
+def get_insurance_fraud_risk_scores(
+    skip: int = Query(0, ge=0, description="Number of carriers to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of carriers to return"),
+    min_score: int = Query(1, ge=0, le=100, description="Lowest risk score to include")
+):
+    """Get carriers by stored insurance fraud risk score, highest first.
     
+    Scores are recomputed whenever a carrier's insurance data is written;
+    use the rebuild endpoint to rescore every carrier.
+    
+    Args:
+        skip: Number of carriers to skip
+        limit: Number of carriers to return
+        min_score: Lowest risk score to include
+        
     Returns:
         list: Carriers with risk scores and contributing factors
     """
-    risk_scores = carrier_repo.get_insurance_fraud_risk_scores()
+    risk_scores = carrier_repo.get_insurance_fraud_risk_scores(skip, limit, min_score)
     return risk_scores
 
 
+@router.post("/fraud/risk-scores/rebuild", response_model=dict)
+async def rebuild_insurance_fraud_risk_scores():
+    """Recompute the stored insurance fraud risk score of every carrier.
+    
+    Returns:
+        dict: Carriers scored and batches run
+    """
+    return await asyncio.to_thread(carrier_repo.rebuild_insurance_fraud_risk_scores)
+
+
 @router.get("/fraud/chameleon-patterns", response_model=List[dict])
-def detect_chameleon_carriers():
-    """Detect potential chameleon carriers based on insurance and officer patterns.
+def detect_chameleon_carriers(
+    skip: int = Query(0, ge=0, description="Number of clusters to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of clusters to return"),
+    min_score: float = Query(0, ge=0, le=100, description="Lowest cluster score to include"),
+    min_size: int = Query(2, ge=2, description="Fewest carriers a cluster must have")
+):
+    """Get clusters of potential chameleon carriers, highest score first.
+    
+    Carriers are clustered by shared officers, insurance providers, phones
+    and addresses. Clusters are updated when carriers or their officers and
+    insurance are written; use the rebuild endpoint to recompute them all.
+    
+    Args:
+        skip: Number of clusters to skip
+        limit: Number of clusters to return
+        min_score: Lowest cluster score to include
+        min_size: Fewest carriers a cluster must have
+        
+    Returns:
+        list: Clusters with members, shared attributes and score
+    """
+    clusters = cluster_repo.get_clusters(skip, limit, min_score, min_size)
+    return clusters
+
+
+@router.get("/fraud/chameleon-clusters/{cluster_id}", response_model=dict)
+def get_chameleon_cluster(cluster_id: str):
+    """Get a chameleon cluster with its member carriers.
+    
+    Args:
+        cluster_id: Cluster identifier
+        
+    Returns:
+        dict: Cluster with member carrier details
+    """
+    cluster = cluster_repo.get_cluster(cluster_id)
+    if not cluster:
+        raise HTTPException(status_code=404, detail=f"Chameleon cluster {cluster_id} not found")
+    return cluster
+
+
+@router.post("/fraud/chameleon-clusters/rebuild", response_model=dict)
+async def rebuild_chameleon_clusters():
+    """Recompute every chameleon cluster from one pass over the carriers.
     
     Returns:
-        list: Potential chameleon carriers with suspicious patterns
+        dict: Carriers scanned, clusters written and stale clusters deleted
     """
-    patterns = carrier_repo.find_chameleon_carrier_patterns()
-    return patterns
+    return await asyncio.to_thread(chameleon_clustering.rebuild_chameleon_clusters, cluster_repo)
 
 
 @router.post("/events/", response_model=dict, status_code=201)
@@ -240,6 +368,8 @@ def create_insurance_event(event: InsuranceEvent):
     if not created:
         raise HTTPException(status_code=500, detail="Failed to create insurance event")
     
+    carrier_repo.refresh_insurance_fraud_risk_scores([event.carrier_usdot])
+    
     return {"message": "Insurance event created", "event": created}
 
 
@@ -260,14 +390,12 @@ async def check_carrier_compliance(carrier_usdot: int):
 
 @router.post("/bulk-enrich/high-risk", response_model=dict)
 async def bulk_enrich_high_risk_carriers(
-    background_tasks: BackgroundTasks,
     limit: int = Query(10, description="Maximum number of carriers to process")
 ):
     """Enrich high-risk carriers (violations > 20 or crashes > 5) with insurance data.
     
     Args:
         limit: Maximum carriers to process
-        background_tasks: FastAPI background task handler
         
     Returns:
         dict: Enrichment status
@@ -278,42 +406,42 @@ async def bulk_enrich_high_risk_carriers(
     if not high_risk:
         return {"message": "No high-risk carriers found", "count": 0}
     
-    # Run enrichment in background
-    async def enrich_task():
-        enricher = SearchCarriersInsuranceEnrichment()
-        await enricher.enrich_high_risk_carriers(limit)
-    
-    background_tasks.add_task(enrich_task)
+    job_id = await asyncio.to_thread(
+        enqueue_enrichment,
+        [c['usdot'] for c in high_risk],
+        INSURANCE_ONLY_OPTIONS,
+        Priority.BULK,
+        "bulk_high_risk"
+    )
     
     return {
-        "message": f"Started enrichment for {len(high_risk)} high-risk carriers",
+        "message": f"Queued enrichment for {len(high_risk)} high-risk carriers",
+        "job_id": job_id,
         "carriers": [{"usdot": c['usdot'], "name": c['carrier_name']} for c in high_risk],
-        "status": "processing"
+        "status": "queued"
     }
 
 
 @router.get("/statistics/summary", response_model=dict)
-def get_insurance_statistics():
+async def get_insurance_statistics(
+    fresh: bool = Query(False, description="Recompute instead of serving the cached snapshot")
+):
     """Get summary statistics for insurance data and fraud patterns.
     
+    Served from a snapshot refreshed in the background; ``computed_at``
+    tells when it was computed. Concurrent fresh requests share one
+    recomputation.
+    
+    Args:
+        fresh: Recompute the statistics before returning them
+        
     Returns:
         dict: Comprehensive statistics
+        
+    Raises:
+        HTTPException: If the statistics cannot be computed
     """
-    # Get various fraud patterns
-    gaps = carrier_repo.detect_insurance_gaps(30)
-    shopping = carrier_repo.detect_insurance_shopping_patterns(12, 3)
-    underinsured = carrier_repo.find_underinsured_operations()
-    risk_scores = carrier_repo.get_insurance_fraud_risk_scores()
-    
-    # Calculate statistics
-    high_risk_count = sum(1 for r in risk_scores if r['risk_score'] > 50)
-    
-    return {
-        "total_carriers": len(carrier_repo.get_all()),
-        "carriers_with_gaps": len(gaps),
-        "average_gap_days": sum(g['gap_days'] for g in gaps) / len(gaps) if gaps else 0,
-        "insurance_shopping_carriers": len(shopping),
-        "underinsured_carriers": len(underinsured),
-        "high_risk_carriers": high_risk_count,
-        "top_risks": risk_scores[:5] if risk_scores else []
-    }
\ No newline at end of file
+    try:
+        return await get_insurance_statistics_cache().get(fresh=fresh)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Insurance statistics unavailable: {e}")
@@ -1,4 +1,5 @@
 # api/routes/person_routes.py
+import asyncio
 from typing import Dict, List, Optional
 from datetime import date
 from fastapi import APIRouter, HTTPException, Query, status
@@ -8,6 +9,7 @@ from models.person import Person
 from repositories.person_repository import PersonRepository
 from repositories.target_company_repository import TargetCompanyRepository
 from repositories.carrier_repository import CarrierRepository
+from services.person_resolution import resolve_persons
 
 
 router = APIRouter(
@@ -84,19 +86,44 @@ async def get_person(person_id: str):
 
 @router.get("/search/by-name", response_model=List[Dict])
 async def search_persons_by_name(
-    name: str = Query(..., description="Name to search for")
+    name: str = Query(..., description="Name to search for"),
+    limit: int = Query(10, ge=1, le=100, description="Number of persons to return")
 ):
-    """Search persons by name"""
+    """Search persons by name, best fuzzy match first (with match_score)"""
     if len(name) < 2:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Search term must be at least 2 characters"
         )
     
-    persons = person_repo.find_by_name(name)
+    persons = person_repo.search_by_name(name, limit)
     return persons
 
 
+@router.post("/search/name-keys/rebuild", response_model=Dict)
+async def rebuild_person_name_keys():
+    """Recompute the name search keys of every person"""
+    return await asyncio.to_thread(person_repo.refresh_name_keys)
+
+
+@router.post("/resolution/run", response_model=Dict)
+async def run_person_resolution(
+    dry_run: bool = Query(False, description="Report merges and links without writing them")
+):
+    """Find duplicate persons; merge strong matches and link likely ones for review"""
+    return await asyncio.to_thread(resolve_persons, person_repo, dry_run)
+
+
+@router.get("/resolution/merges", response_model=List[Dict])
+async def get_person_merges(
+    person_id: Optional[str] = Query(None, description="Only merges into or of this person"),
+    skip: int = Query(0, ge=0, description="Number of merges to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of merges to return")
+):
+    """Get the entity-resolution merge audit trail, newest first"""
+    return person_repo.get_merge_audit(person_id, skip, limit)
+
+
 @router.patch("/{person_id}", response_model=Dict)
 async def update_person(person_id: str, updates: PersonUpdate):
     """Update a person's properties"""
@@ -1,10 +1,19 @@
+import asyncio
+import json
+import logging
 from typing import Dict, List, Optional
 from fastapi import APIRouter, HTTPException, Query, Response, status
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
 from repositories.safety_snapshot_repository import SafetySnapshotRepository
 from repositories.inspection_repository import InspectionRepository
 from repositories.crash_repository import CrashRepository
+from services.crash_clustering import find_carriers_with_crash_bursts, find_crash_clusters
+from services.enrichment_revalidation import revalidate_carrier
+from services.risk_assessment import LOOKBACK_MONTHS, assess_carriers, chunk_usdots, score_carriers
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter(
@@ -18,6 +27,27 @@ inspection_repo = InspectionRepository()
 crash_repo = CrashRepository()
 
 
+# Watermark families each read endpoint is built from
+SAFETY_PROFILE_FAMILIES = ["safety"]
+RISK_ASSESSMENT_FAMILIES = ["safety", "crashes", "inspections"]
+
+# Most carriers one batch risk-assessment request may ask for
+MAX_BATCH_CARRIERS = 50000
+
+REVALIDATE_DESCRIPTION = (
+    "Serve current data immediately and queue a background refresh "
+    "if it is missing or older than the freshness threshold"
+)
+
+
+class Freshness(BaseModel):
+    """How current the served data is, reported in revalidate mode"""
+    data_as_of: Optional[str] = None
+    stale: bool
+    refresh_pending: bool
+    refresh_job_id: Optional[str] = None
+
+
 class RiskAssessment(BaseModel):
     """Model for carrier risk assessment"""
     usdot: int
@@ -29,25 +59,50 @@ class RiskAssessment(BaseModel):
     total_crashes: int
     violation_frequency: float
     high_risk_indicators: List[str]
+    freshness: Optional[Freshness] = None
+
+
+class RiskAssessmentBatchRequest(BaseModel):
+    """Model for assessing many carriers at once"""
+    usdots: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_CARRIERS)
 
 
 @router.get("/{usdot}/safety-profile",
             response_model=Dict,
             summary="Get carrier safety profile",
             description="Returns the latest safety snapshot with risk flags")
-async def get_carrier_safety_profile(usdot: int):
+async def get_carrier_safety_profile(
+    usdot: int,
+    response: Response,
+    revalidate: bool = Query(False, description=REVALIDATE_DESCRIPTION)
+):
     """Get the latest safety profile for a carrier.
     
     Args:
         usdot: USDOT number of the carrier
+        response: Response used to return 202 while a missing profile is fetched
+        revalidate: Report freshness and refresh stale or missing data in the background
         
     Returns:
-        dict: Latest SafetySnapshot with risk assessment
+        dict: Latest SafetySnapshot with risk assessment, plus ``freshness``
+            in revalidate mode
         
     Raises:
-        HTTPException: 404 if no safety data found
+        HTTPException: 404 if no safety data found and revalidate is off
     """
     snapshot = safety_repo.find_latest_by_usdot(usdot)
+    freshness = revalidate_carrier(usdot, SAFETY_PROFILE_FAMILIES) if revalidate else None
+    
+    if not snapshot and revalidate:
+        # Nothing to serve yet; the refresh is queued
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {
+            "snapshot": None,
+            "risk_flags": [],
+            "active_alerts": [],
+            "is_high_risk": False,
+            "freshness": freshness
+        }
     
     if not snapshot:
         raise HTTPException(
@@ -73,12 +128,15 @@ async def get_carrier_safety_profile(usdot: int):
                      for field in alert_fields 
                      if snapshot.get(field, False)]
     
-    return {
+    profile = {
         "snapshot": snapshot,
         "risk_flags": risk_flags,
         "active_alerts": active_alerts,
         "is_high_risk": len(risk_flags) > 0 or len(active_alerts) > 0
     }
+    if freshness is not None:
+        profile["freshness"] = freshness
+    return profile
 
 
 @router.get("/{usdot}/crashes",
@@ -127,6 +185,53 @@ async def get_carrier_crashes(
     }
 
 
+@router.get("/{usdot}/crash-clusters",
+            response_model=List[Dict],
+            summary="Get carrier crash clusters",
+            description="Returns bursts of crashes that fall within a time window")
+async def get_carrier_crash_clusters(
+    usdot: int,
+    days_window: int = Query(30, ge=0, description="Most days between the first and last crash of a cluster"),
+    min_size: int = Query(2, ge=2, description="Minimum number of crashes in a cluster")
+):
+    """Get non-overlapping clusters of a carrier's crashes.
+    
+    Args:
+        usdot: USDOT number of the carrier
+        days_window: Most days between the first and last crash of a cluster
+        min_size: Minimum number of crashes in a cluster
+        
+    Returns:
+        list: Crash clusters, largest first
+    """
+    return find_crash_clusters(usdot, days_window, min_size, crash_repo)
+
+
+@router.get("/crash-bursts",
+            response_model=List[Dict],
+            summary="Get carriers with crash bursts",
+            description="Ranks carriers by clusters of crashes close together in time")
+async def get_carriers_with_crash_bursts(
+    days_window: int = Query(30, ge=0, description="Most days between the first and last crash of a burst"),
+    min_cluster_size: int = Query(3, ge=2, description="Minimum number of crashes in a burst"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of carriers to return")
+):
+    """Rank carriers by crash bursts across the fleet.
+    
+    Args:
+        days_window: Most days between the first and last crash of a burst
+        min_cluster_size: Minimum number of crashes in a burst
+        limit: Maximum number of carriers to return
+        
+    Returns:
+        list: Carriers with their bursts, worst first
+    """
+    # One pass over every carrier's crashes; keep it off the event loop
+    return await asyncio.to_thread(
+        find_carriers_with_crash_bursts, days_window, min_cluster_size, limit, crash_repo
+    )
+
+
 @router.get("/{usdot}/inspections",
             response_model=Dict,
             summary="Get carrier inspections",
@@ -181,11 +286,15 @@ async def get_carrier_inspections(
             response_model=RiskAssessment,
             summary="Get carrier risk assessment",
             description="Calculate comprehensive risk analysis for a carrier")
-async def get_carrier_risk_assessment(usdot: int):
+async def get_carrier_risk_assessment(
+    usdot: int,
+    revalidate: bool = Query(False, description=REVALIDATE_DESCRIPTION)
+):
     """Calculate and return comprehensive risk analysis.
     
     Args:
         usdot: USDOT number of the carrier
+        revalidate: Report freshness and refresh stale or missing data in the background
         
     Returns:
         RiskAssessment: Comprehensive risk analysis including:
@@ -193,82 +302,62 @@ async def get_carrier_risk_assessment(usdot: int):
             - Fatal/injury crash count
             - Violation frequency
             - Risk classification: "LOW", "MODERATE", "HIGH", "CRITICAL"
+            - Freshness of the underlying data, in revalidate mode
     """
-    risk_indicators = []
-    
-    # Get safety snapshot
     safety_snapshot = safety_repo.find_latest_by_usdot(usdot)
-    driver_oos_multiplier = 0.0
-    vehicle_oos_multiplier = 0.0
-    
-    if safety_snapshot:
-        # Calculate OOS multipliers
-        driver_oos_rate = safety_snapshot.get("driver_oos_rate", 0.0)
-        vehicle_oos_rate = safety_snapshot.get("vehicle_oos_rate", 0.0)
-        driver_oos_multiplier = driver_oos_rate / 5.0  # National avg is 5%
-        vehicle_oos_multiplier = vehicle_oos_rate / 20.0  # National avg is 20%
-        
-        if driver_oos_multiplier > 2.0:
-            risk_indicators.append("DRIVER_OOS_2X_NATIONAL")
-        if vehicle_oos_multiplier > 2.0:
-            risk_indicators.append("VEHICLE_OOS_2X_NATIONAL")
-        
-        # Check SMS alerts
-        if any([safety_snapshot.get(f"{basic}_alert", False) 
-                for basic in ["unsafe_driving", "hours_of_service", "driver_fitness",
-                             "controlled_substances", "vehicle_maintenance", 
-                             "hazmat_compliance", "crash_indicator"]]):
-            risk_indicators.append("SMS_ALERTS_ACTIVE")
-    
-    # Get crash statistics
-    crash_stats = crash_repo.calculate_crash_statistics(usdot, months=24)
-    fatal_crashes = crash_stats.get("fatal_crashes", 0)
-    injury_crashes = crash_stats.get("injury_crashes", 0)
-    total_crashes = crash_stats.get("total_crashes", 0)
-    
-    if fatal_crashes > 0:
-        risk_indicators.append("FATAL_CRASHES")
-    if injury_crashes > 3:
-        risk_indicators.append("HIGH_INJURY_CRASHES")
-    
-    # Get inspection statistics
-    inspection_stats = inspection_repo.calculate_violation_rate(usdot, months=24)
-    violation_frequency = inspection_stats.get("avg_violations_per_inspection", 0.0)
-    
-    if violation_frequency > 20:
-        risk_indicators.append("HIGH_VIOLATION_FREQUENCY")
-    
-    # Determine risk level
-    risk_score = (
-        driver_oos_multiplier * 2 +
-        vehicle_oos_multiplier * 2 +
-        fatal_crashes * 10 +
-        min(injury_crashes, 10) +
-        min(violation_frequency / 5, 10)
-    )
+    crash_stats = crash_repo.calculate_crash_statistics(usdot, months=LOOKBACK_MONTHS)
+    inspection_stats = inspection_repo.calculate_violation_rate(usdot, months=LOOKBACK_MONTHS)
     
-    if risk_score >= 30:
-        risk_level = "CRITICAL"
-    elif risk_score >= 20:
-        risk_level = "HIGH"
-    elif risk_score >= 10:
-        risk_level = "MODERATE"
-    else:
-        risk_level = "LOW"
+    assessment = score_carriers(
+        [usdot],
+        {usdot: safety_snapshot} if safety_snapshot else {},
+        {usdot: crash_stats},
+        {usdot: inspection_stats}
+    )[0]
     
     return RiskAssessment(
-        usdot=usdot,
-        risk_level=risk_level,
-        driver_oos_multiplier=round(driver_oos_multiplier, 2),
-        vehicle_oos_multiplier=round(vehicle_oos_multiplier, 2),
-        fatal_crashes=fatal_crashes,
-        injury_crashes=injury_crashes,
-        total_crashes=total_crashes,
-        violation_frequency=round(violation_frequency, 2),
-        high_risk_indicators=risk_indicators
+        **assessment,
+        freshness=revalidate_carrier(usdot, RISK_ASSESSMENT_FAMILIES) if revalidate else None
     )
 
 
+@router.post("/risk-assessment/batch",
+             summary="Assess many carriers at once",
+             description="Stream risk assessments of up to 50,000 carriers as NDJSON",
+             response_class=StreamingResponse)
+async def get_carrier_risk_assessments_batch(request: RiskAssessmentBatchRequest):
+    """Assess many carriers, streaming one JSON line per carrier.
+    
+    Carriers are assessed in chunks; each chunk reads every data family
+    with one query and is scored in a single pass (see
+    services.risk_assessment), so the first lines arrive before the whole
+    batch has been read. Repeated USDOT numbers are assessed once. A chunk
+    that fails yields one ``{"error": ..., "usdots": [...]}`` line and the
+    stream carries on with the next chunk.
+    
+    Args:
+        request: USDOT numbers to assess
+        
+    Returns:
+        application/x-ndjson response of RiskAssessment objects, without freshness
+    """
+    chunks = chunk_usdots(request.usdots)
+    
+    async def assessment_stream():
+        for chunk in chunks:
+            try:
+                assessments = await asyncio.to_thread(
+                    assess_carriers, chunk, safety_repo, crash_repo, inspection_repo
+                )
+            except Exception as e:
+                logger.error(f"Risk assessment failed for {len(chunk)} carriers: {e}")
+                yield json.dumps({"error": str(e), "usdots": chunk}) + "\n"
+                continue
+            yield "".join(json.dumps(assessment) + "\n" for assessment in assessments)
+    
+    return StreamingResponse(assessment_stream(), media_type="application/x-ndjson")
+
+
 @router.get("/high-risk",
             summary="Get high-risk carriers",
             description="Returns carriers with high OOS rates or fatal crashes")
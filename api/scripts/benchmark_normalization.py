@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for SearchCarriers inspection normalization.
+
+Compares the previous per-record path (client field mapping followed by a
+second date parse in the enrichment script) with the batch normalizer on a
+page set of synthetic inspections.
+
+Usage:
+    python scripts/benchmark_normalization.py --records 10000 --per-page 100
+"""
+
+import sys
+import copy
+import time
+import argparse
+from pathlib import Path
+from datetime import datetime, date, timezone
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.searchcarriers_normalizer import PayloadNormalizer, to_date
+from scripts.searchcarriers_standin import SyntheticData
+
+
+def build_pages(total_records: int, per_page: int) -> list:
+    """Build pages of raw inspections in the API's wire format."""
+    synthetic = SyntheticData(seed=42)
+    records = []
+    dot = 1000
+    while len(records) < total_records:
+        records.extend(synthetic.inspections(str(dot)))
+        dot += 1
+    records = records[:total_records]
+    return [records[i:i + per_page] for i in range(0, len(records), per_page)]
+
+
+def legacy_normalize(inspections: list, dot_number: int):
+    """Previous client loop from get_inspections, kept for comparison."""
+    for inspection in inspections:
+        inspection["dot_number"] = dot_number
+        inspection["fetched_at"] = datetime.now(timezone.utc).isoformat()
+
+        if "insp_date" in inspection:
+            inspection["inspection_date"] = inspection["insp_date"]
+            try:
+                if inspection["inspection_date"]:
+                    date_str = str(inspection["inspection_date"]).split()[0]
+                    inspection["inspection_date"] = date_str
+            except Exception:
+                pass
+
+        if "viol_total" in inspection:
+            inspection["violations_count"] = inspection["viol_total"]
+        if "oos_total" in inspection:
+            inspection["oos_violations_count"] = inspection["oos_total"]
+
+        for flag in ("driver_oos", "vehicle_oos", "hazmat_oos"):
+            try:
+                value = int(inspection.get(f"{flag}_total", 0))
+            except (ValueError, TypeError):
+                value = 0
+            inspection[flag] = value > 0
+
+        try:
+            oos_count = int(inspection.get("oos_total", 0))
+        except (ValueError, TypeError):
+            oos_count = 0
+        try:
+            violations_count = int(inspection.get("viol_total", 0))
+        except (ValueError, TypeError):
+            violations_count = 0
+
+        if oos_count > 0:
+            inspection["result"] = "OOS"
+        elif violations_count > 0:
+            inspection["result"] = "Violations"
+        else:
+            inspection["result"] = "Clean"
+
+
+def legacy_parse_dates(inspections: list) -> int:
+    """Previous second parse from _process_inspection_batch."""
+    parsed = 0
+    for inspection_data in inspections:
+        date_field = inspection_data.get("inspection_date")
+        if not date_field:
+            continue
+        try:
+            inspection_date = datetime.strptime(date_field, "%Y-%m-%d").date()
+        except ValueError:
+            try:
+                inspection_date = datetime.fromisoformat(date_field).date()
+            except ValueError:
+                continue
+        if date(2000, 1, 1) <= inspection_date <= date.today():
+            parsed += 1
+    return parsed
+
+
+def batch_normalize(normalizer: PayloadNormalizer, inspections: list, dot_number: int):
+    """Current path: one normalization pass in the client."""
+    normalizer.normalize_page("inspections", inspections, dot_number)
+
+
+def batch_parse_dates(inspections: list) -> int:
+    """Current consumer path: dates are already typed."""
+    parsed = 0
+    for inspection_data in inspections:
+        inspection_date = to_date(inspection_data.get("inspection_date"))
+        if inspection_date and date(2000, 1, 1) <= inspection_date <= date.today():
+            parsed += 1
+    return parsed
+
+
+def run(label: str, pages: list, normalize, parse_dates, repeats: int) -> float:
+    """Time normalization plus consumer parsing over fresh copies of the pages."""
+    best = None
+    total = sum(len(page) for page in pages)
+    for _ in range(repeats):
+        working = copy.deepcopy(pages)
+        start = time.perf_counter()
+        for page in working:
+            normalize(page, 1234567)
+            parse_dates(page)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    rate = total / best
+    print(f"  {label:8s} {total:>7,d} records in {best * 1000:8.1f} ms  ->  {rate:>12,.0f} records/sec")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inspection normalization")
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = build_pages(args.records, args.per_page)
+    normalizer = PayloadNormalizer()
+
+    print(f"Inspection normalization: {args.records:,d} records, {len(pages)} pages, best of {args.repeats}")
+    before = run("before", pages, legacy_normalize, legacy_parse_dates, args.repeats)
+    after = run("after", pages, lambda page, dot: batch_normalize(normalizer, page, dot),
+                batch_parse_dates, args.repeats)
+    print(f"  speedup  {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,9 @@ with temporal insurance policies, detects gaps, and identifies fraud patterns.
 import sys
 import os
 import time
+from concurrent.futures import Future
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from datetime import datetime, date, timezone, timedelta
 import logging
 
@@ -20,6 +21,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from dotenv import load_dotenv
 from models.insurance_policy import InsurancePolicy
 from models.insurance_event import InsuranceEvent
+from models.insurance_provider import InsuranceProvider
 from models.carrier import Carrier
 from models.safety_snapshot import SafetySnapshot
 from models.crash import Crash
@@ -32,6 +34,11 @@ from repositories.safety_snapshot_repository import SafetySnapshotRepository
 from repositories.crash_repository import CrashRepository
 from repositories.inspection_repository import InspectionRepository
 from services.searchcarriers_client import SearchCarriersClient
+from services.searchcarriers_normalizer import to_date, to_datetime
+from services.enrichment_freshness import FreshnessProbe
+from services.enrichment_write_pipeline import WritePipeline
+from services.chameleon_clustering import update_chameleon_clusters
+from services.coverage_index import get_coverage_index
 
 # Load environment variables
 load_dotenv()
@@ -56,6 +63,10 @@ class SearchCarriersInsuranceEnrichment:
         self.crash_repo = CrashRepository()
         self.inspection_repo = InspectionRepository()
         self.client = SearchCarriersClient()
+        self.freshness = FreshnessProbe()
+        
+        # Write stage; writes run inline in the fetching thread until started
+        self.write_pipeline: Optional[WritePipeline] = None
         
         # Track statistics
         self.stats = {
@@ -68,6 +79,77 @@ class SearchCarriersInsuranceEnrichment:
             "errors": 0
         }
     
+    def start_write_pipeline(self, **kwargs) -> WritePipeline:
+        """Move writes to a background write stage shared by every fetching thread.
+        
+        Args:
+            **kwargs: WritePipeline sizing (max_pending, batch_size, linger_ms)
+            
+        Returns:
+            WritePipeline: The running pipeline
+        """
+        if self.write_pipeline is None:
+            self.write_pipeline = WritePipeline(self._batch_writers(), **kwargs).start()
+        return self.write_pipeline
+    
+    def _batch_writers(self) -> Dict:
+        """Batch writer per write-stage payload kind."""
+        return {
+            "insurance": self._write_insurance_timelines,
+            "crashes": self._write_crash_pages,
+            "inspections": self._write_inspection_pages,
+        }
+    
+    def stop_write_pipeline(self):
+        """Flush pending writes and return to inline writes."""
+        if self.write_pipeline is not None:
+            self.write_pipeline.close()
+            self.write_pipeline = None
+    
+    def _record_empty(self, usdot: int, family: str, response: Dict):
+        """Record that a family was fetched successfully but holds no records.
+        
+        Commits a watermark with a zero record count so the carrier counts
+        as enriched and is not picked again as never enriched.
+        
+        Args:
+            usdot: USDOT number of the carrier
+            family: Data family name
+            response: The empty upstream response
+        """
+        unchanged, watermark = self.freshness.check(usdot, family, response)
+        if not unchanged:
+            self.freshness.commit(usdot, family, watermark)
+    
+    def _submit_writes(self, kind: str, payloads: List[Any]) -> List[Future]:
+        """Hand payloads to the write stage.
+        
+        With the pipeline running, each payload is queued (blocking while the
+        queue is full) and coalesced with other carriers' writes. Otherwise
+        the payloads are written here, together, before returning.
+        
+        Args:
+            kind: Payload kind (insurance, crashes or inspections)
+            payloads: Payloads for that kind's batch writer
+            
+        Returns:
+            list: One future per payload, resolving to its write result
+        """
+        if self.write_pipeline is not None:
+            return [self.write_pipeline.submit(kind, payload) for payload in payloads]
+        
+        writer = self._batch_writers()[kind]
+        futures = [Future() for _ in payloads]
+        try:
+            results = writer(payloads)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+        else:
+            for future, result in zip(futures, results):
+                future.set_result(result)
+        return futures
+    
     def generate_policy_id(self, carrier_usdot: int, provider: str, effective_date: str) -> str:
         """Generate a unique policy ID.
         
@@ -137,29 +219,10 @@ class SearchCarriersInsuranceEnrichment:
             ins_form_code = record.get("ins_form_code", "")
             policy_type = form_code_mapping.get(ins_form_code, f"BMC-{ins_form_code}" if ins_form_code else "BMC-91")
             
-            # Parse dates (format: "YYYY-MM-DD HH:MM:SS")
-            effective_date = None
-            if record.get("effective_date"):
-                try:
-                    # Handle "YYYY-MM-DD HH:MM:SS" format
-                    effective_date = datetime.strptime(record["effective_date"], "%Y-%m-%d %H:%M:%S").date()
-                except ValueError:
-                    # Try ISO format as fallback
-                    effective_date = datetime.fromisoformat(record["effective_date"]).date()
-            
-            expiration_date = None
-            if record.get("expiration_date"):
-                try:
-                    expiration_date = datetime.strptime(record["expiration_date"], "%Y-%m-%d %H:%M:%S").date()
-                except ValueError:
-                    expiration_date = datetime.fromisoformat(record["expiration_date"]).date()
-            
-            cancellation_date = None
-            if record.get("cancellation_date"):
-                try:
-                    cancellation_date = datetime.strptime(record["cancellation_date"], "%Y-%m-%d %H:%M:%S").date()
-                except ValueError:
-                    cancellation_date = datetime.fromisoformat(record["cancellation_date"]).date()
+            # Dates are typed by the client's normalizer; to_date also accepts raw strings
+            effective_date = to_date(record.get("effective_date"))
+            expiration_date = to_date(record.get("expiration_date"))
+            cancellation_date = to_date(record.get("cancellation_date"))
             
             # Determine filing status
             filing_status = record.get("filing_status", "ACTIVE")
@@ -271,11 +334,12 @@ class SearchCarriersInsuranceEnrichment:
         
         return events
     
-    def enrich_carrier_by_usdot(self, carrier_usdot: int) -> Dict:
+    def enrich_carrier_by_usdot(self, carrier_usdot: int, force: bool = False) -> Dict:
         """Enrich a carrier by USDOT number with insurance data from SearchCarriers.
         
         Args:
             carrier_usdot: USDOT number of the carrier
+            force: Rewrite insurance data even if the probe reports no change
             
         Returns:
             dict: Enrichment results
@@ -295,7 +359,7 @@ class SearchCarriersInsuranceEnrichment:
                 }
             
             # Use existing enrich_carrier method
-            return self.enrich_carrier(carrier)
+            return self.enrich_carrier(carrier, force=force)
             
         except Exception as e:
             logger.error(f"Error fetching carrier {carrier_usdot} from database: {e}")
@@ -306,148 +370,252 @@ class SearchCarriersInsuranceEnrichment:
                 "events_created": 0
             }
     
-    def enrich_carrier(self, carrier: Dict) -> Dict:
+    def enrich_carrier(self, carrier: Dict, force: bool = False) -> Dict:
         """Enrich a single carrier with insurance data from SearchCarriers.
         
+        The insurance history response is compared with the stored watermark
+        and processing is skipped when it has not changed.
+        
         Args:
             carrier: Carrier data dictionary
+            force: Rewrite insurance data even if the probe reports no change
             
         Returns:
             dict: Enrichment results
         """
-        carrier_usdot = carrier['usdot']
-        logger.info(f"Enriching carrier {carrier_usdot}: {carrier['carrier_name']}")
+        return self.enrich_carriers([carrier], force=force)[0]
+    
+    def enrich_carriers(self, carriers: List[Dict], force: bool = False) -> List[Dict]:
+        """Enrich a group of carriers with insurance data in one write transaction.
         
-        result = {
-            "carrier_usdot": carrier_usdot,
-            "carrier_name": carrier['carrier_name'],
-            "policies_created": 0,
-            "events_created": 0,
-            "gaps_found": 0,
-            "compliance_violations": [],
-            "fraud_indicators": [],
-            "error": None
-        }
+        Each carrier's insurance history is fetched and turned into an
+        in-memory timeline of providers, policies, succession links and
+        events. The timelines of the whole group are then persisted together
+        with InsurancePolicyRepository.bulk_write_timelines, or handed to
+        the write pipeline when it is running, which may coalesce them with
+        other carriers' timelines.
         
-        try:
-            # Fetch insurance history from SearchCarriers
-            insurance_data = self.client.get_carrier_insurance_history(carrier_usdot)
-            
-            if not insurance_data.get("data"):
-                logger.warning(f"No insurance data found for carrier {carrier_usdot}")
-                result["error"] = "No insurance data available"
-                return result
-            
-            # Process insurance records into policies
-            policies = []
-            for record in insurance_data["data"]:
-                policy = self.process_insurance_record(carrier_usdot, record)
-                if policy:
-                    policies.append(policy)
-            
-            if not policies:
-                logger.warning(f"Could not process any policies for carrier {carrier_usdot}")
-                result["error"] = "Failed to process insurance records"
-                return result
-            
-            # Create insurance providers if they don't exist
-            unique_providers = set(p.provider_name for p in policies)
-            for provider_name in unique_providers:
-                existing_provider = self.provider_repo.get_by_name(provider_name)
-                if not existing_provider:
-                    # Create provider with required fields
-                    from models.insurance_provider import InsuranceProvider
-                    provider = InsuranceProvider(
-                        provider_id=f"PROV-{provider_name.replace(' ', '').upper()[:10]}",
-                        name=provider_name,
-                        data_source="SEARCHCARRIERS_API"
-                    )
-                    self.provider_repo.create(provider)
-            
-            # Store policies in database
-            for policy in policies:
-                existing = self.policy_repo.get_by_id(policy.policy_id)
-                if not existing:
-                    self.policy_repo.create(policy)
-                    result["policies_created"] += 1
-                    
-                    # Create relationships with proper temporal data
-                    # Determine the end date and check if it's a cancelled policy
-                    end_date = None
-                    if policy.cancellation_date:
-                        end_date = policy.cancellation_date
-                    elif policy.expiration_date:
-                        end_date = policy.expiration_date
-                    
-                    self.policy_repo.create_carrier_relationship(
-                        policy.policy_id,
-                        carrier_usdot,
-                        policy.effective_date,
-                        end_date
-                    )
-                    
-                    self.policy_repo.create_provider_relationship(
-                        policy.policy_id,
-                        policy.provider_name
-                    )
-            
-            # Link policy succession
-            sorted_policies = sorted(policies, key=lambda p: p.effective_date)
-            for i in range(len(sorted_policies) - 1):
-                current = sorted_policies[i]
-                next_policy = sorted_policies[i + 1]
-                gap_days = next_policy.calculate_coverage_gap(current)
+        Args:
+            carriers: Carrier data dictionaries
+            force: Rewrite insurance data even if the probe reports no change
+            
+        Returns:
+            list: Enrichment results, one per carrier in input order
+        """
+        results = []
+        pending = []
+        
+        for carrier in carriers:
+            carrier_usdot = carrier['usdot']
+            logger.info(f"Enriching carrier {carrier_usdot}: {carrier['carrier_name']}")
+            
+            result = {
+                "carrier_usdot": carrier_usdot,
+                "carrier_name": carrier['carrier_name'],
+                "policies_created": 0,
+                "events_created": 0,
+                "gaps_found": 0,
+                "compliance_violations": [],
+                "fraud_indicators": [],
+                "error": None
+            }
+            results.append(result)
+            
+            try:
+                # Fetch insurance history from SearchCarriers
+                insurance_data = self.client.get_carrier_insurance_history(carrier_usdot)
                 
-                if gap_days and gap_days > 0:
-                    self.policy_repo.link_policy_succession(
-                        current.policy_id,
-                        next_policy.policy_id,
-                        gap_days
-                    )
-                    
-                    if gap_days > 30:
-                        result["gaps_found"] += 1
-                        result["compliance_violations"].append({
-                            "type": "COVERAGE_GAP",
-                            "days": gap_days,
-                            "from_policy": current.policy_id,
-                            "to_policy": next_policy.policy_id
-                        })
-            
-            # Create insurance events
-            events = self.create_insurance_events(carrier_usdot, policies)
-            for event in events:
-                self.policy_repo.create_insurance_event(event)
-                result["events_created"] += 1
+                if "error" in insurance_data:
+                    logger.warning(f"No insurance data found for carrier {carrier_usdot}: {insurance_data['error']}")
+                    result["error"] = "No insurance data available"
+                    continue
                 
-                if event.is_suspicious:
-                    result["fraud_indicators"].extend(event.fraud_indicators or [])
-            
-            # Check compliance
-            compliance = self.client.check_insurance_compliance(carrier_usdot)
-            if not compliance["is_compliant"]:
-                result["compliance_violations"].extend(compliance["violations"])
+                if not insurance_data.get("data"):
+                    logger.info(f"No insurance policies found for carrier {carrier_usdot}")
+                    self._record_empty(carrier_usdot, "insurance", insurance_data)
+                    result["reason"] = "no insurance data"
+                    continue
+                
+                unchanged, watermark = self.freshness.check(carrier_usdot, "insurance", insurance_data)
+                if unchanged and not force:
+                    result["skipped"] = True
+                    result["reason"] = "unchanged"
+                    continue
+                
+                timeline = self.build_insurance_timeline(carrier_usdot, insurance_data["data"], result)
+                if timeline is not None:
+                    pending.append((result, insurance_data, watermark, timeline))
+                
+            except Exception as e:
+                logger.error(f"Error enriching carrier {carrier_usdot}: {e}")
+                result["error"] = str(e)
+                self.stats["errors"] += 1
+        
+        if not pending:
+            return results
+        
+        writes = self._submit_writes("insurance", [timeline for _, _, _, timeline in pending])
+        
+        for (result, insurance_data, watermark, timeline), write in zip(pending, writes):
+            carrier_usdot = result["carrier_usdot"]
+            try:
+                write.result()
+            except Exception as e:
+                logger.error(f"Error writing insurance timeline for carrier {carrier_usdot}: {e}")
+                result["error"] = str(e)
+                self.stats["errors"] += 1
+                continue
             
-            # Detect provider shopping
-            shopping = self.client.detect_provider_shopping(insurance_data["data"])
-            if shopping["is_shopping"]:
-                result["fraud_indicators"].append("insurance_shopping")
-                logger.warning(f"Carrier {carrier_usdot} shows insurance shopping pattern: {shopping['provider_count']} providers")
+            try:
+                result["policies_created"] = len(timeline["policies"])
+                result["events_created"] = len(timeline["events"])
+                
+                # Check compliance against the page already fetched
+                compliance = self.client.evaluate_insurance_compliance(carrier_usdot, insurance_data)
+                if not compliance["is_compliant"]:
+                    result["compliance_violations"].extend(compliance["violations"])
+                
+                # Detect provider shopping
+                shopping = self.client.detect_provider_shopping(insurance_data["data"])
+                if shopping["is_shopping"]:
+                    result["fraud_indicators"].append("insurance_shopping")
+                    logger.warning(f"Carrier {carrier_usdot} shows insurance shopping pattern: {shopping['provider_count']} providers")
+                
+                self.freshness.commit(carrier_usdot, "insurance", watermark)
+                logger.info(f"Successfully enriched carrier {carrier_usdot}: {result['policies_created']} policies, {result['events_created']} events")
+                
+            except Exception as e:
+                logger.error(f"Error enriching carrier {carrier_usdot}: {e}")
+                result["error"] = str(e)
+                self.stats["errors"] += 1
+        
+        return results
+    
+    def _write_insurance_timelines(self, timelines: List[Dict]) -> List[Dict]:
+        """Batch writer for insurance timelines of any number of carriers.
+        
+        Policies that are already stored are dropped from each timeline
+        (in place) before the timelines are written in one transaction,
+        after which the carriers' stored fraud risk scores are recomputed.
+        
+        Args:
+            timelines: Timelines from build_insurance_timeline
             
-            logger.info(f"Successfully enriched carrier {carrier_usdot}: {result['policies_created']} policies, {result['events_created']} events")
+        Returns:
+            list: Policies and events written, per timeline
+        """
+        # Only policies not already stored are created and linked
+        seen_ids = self.policy_repo.get_existing_policy_ids(
+            [p.policy_id for timeline in timelines for p in timeline["policies"]]
+        )
+        for timeline in timelines:
+            new_policies = []
+            for policy in timeline["policies"]:
+                if policy.policy_id not in seen_ids:
+                    seen_ids.add(policy.policy_id)
+                    new_policies.append(policy)
+            timeline["policies"] = new_policies
+        
+        self.policy_repo.bulk_write_timelines(timelines)
+        usdots = [timeline["carrier_usdot"] for timeline in timelines]
+        self.carrier_repo.refresh_insurance_fraud_risk_scores(usdots)
+        # Other processes' coverage indexes pick the change up on their next sync
+        get_coverage_index().refresh_carriers(usdots)
+        # New policies can link carriers through a shared insurance provider
+        linked = [timeline["carrier_usdot"] for timeline in timelines if timeline["policies"]]
+        if linked:
+            try:
+                update_chameleon_clusters(linked)
+            except Exception as e:
+                logger.error(f"Error updating chameleon clusters: {e}")
+        return [
+            {"policies_created": len(timeline["policies"]), "events_created": len(timeline["events"])}
+            for timeline in timelines
+        ]
+    
+    def build_insurance_timeline(self, carrier_usdot: int, records: List[Dict], result: Dict) -> Optional[Dict]:
+        """Build a carrier's insurance timeline in memory.
+        
+        Gap and fraud findings are recorded on ``result`` as the timeline is
+        built; nothing is written to the database.
+        
+        Args:
+            carrier_usdot: Carrier's USDOT number
+            records: Insurance records from the API
+            result: Enrichment result for the carrier, updated in place
             
-        except Exception as e:
-            logger.error(f"Error enriching carrier {carrier_usdot}: {e}")
-            result["error"] = str(e)
-            self.stats["errors"] += 1
+        Returns:
+            dict: Timeline for bulk_write_timelines, or None if no record could be processed
+        """
+        # Process insurance records into policies
+        policies = []
+        for record in records:
+            policy = self.process_insurance_record(carrier_usdot, record)
+            if policy:
+                policies.append(policy)
         
-        return result
+        if not policies:
+            logger.warning(f"Could not process any policies for carrier {carrier_usdot}")
+            result["error"] = "Failed to process insurance records"
+            return None
+        
+        # Providers are merged by name when the timeline is written
+        providers = [
+            InsuranceProvider(
+                provider_id=f"PROV-{provider_name.replace(' ', '').upper()[:10]}",
+                name=provider_name,
+                data_source="SEARCHCARRIERS_API"
+            )
+            for provider_name in sorted(set(p.provider_name for p in policies))
+        ]
+        
+        # Policy succession
+        successions = []
+        sorted_policies = sorted(policies, key=lambda p: p.effective_date)
+        for i in range(len(sorted_policies) - 1):
+            current = sorted_policies[i]
+            next_policy = sorted_policies[i + 1]
+            gap_days = next_policy.calculate_coverage_gap(current)
+            
+            if gap_days and gap_days > 0:
+                successions.append({
+                    "previous_policy_id": current.policy_id,
+                    "next_policy_id": next_policy.policy_id,
+                    "gap_days": gap_days
+                })
+                
+                if gap_days > 30:
+                    result["gaps_found"] += 1
+                    result["compliance_violations"].append({
+                        "type": "COVERAGE_GAP",
+                        "days": gap_days,
+                        "from_policy": current.policy_id,
+                        "to_policy": next_policy.policy_id
+                    })
+        
+        # Insurance events
+        events = self.create_insurance_events(carrier_usdot, policies)
+        for event in events:
+            if event.is_suspicious:
+                result["fraud_indicators"].extend(event.fraud_indicators or [])
+        
+        return {
+            "carrier_usdot": carrier_usdot,
+            "providers": providers,
+            "policies": policies,
+            "successions": successions,
+            "events": events
+        }
     
-    def enrich_carrier_safety_data(self, usdot: int) -> Dict:
+    def enrich_carrier_safety_data(self, usdot: int, force: bool = False) -> Dict:
         """Enrich a carrier with safety snapshot data from SearchCarriers.
         
+        A new snapshot is only written when the summary differs from the one
+        recorded by the last enrichment.
+        
         Args:
             usdot: USDOT number of the carrier
+            force: Write a snapshot even if the summary is unchanged
             
         Returns:
             dict: Enrichment results with snapshot creation status
@@ -462,11 +630,22 @@ class SearchCarriersInsuranceEnrichment:
                 return {"error": result["error"]}
             
             if not result.get("data"):
-                logger.warning(f"No safety data found for {usdot}")
-                return {"error": "No safety data available"}
+                logger.info(f"No safety data found for {usdot}")
+                self._record_empty(usdot, "safety", result)
+                return {"snapshot_created": False, "reason": "no safety data"}
             
             safety_data = result["data"]
             
+            unchanged, watermark = self.freshness.check(usdot, "safety", result)
+            if unchanged and not force:
+                return {
+                    "snapshot_created": False,
+                    "skipped": True,
+                    "reason": "unchanged",
+                    "driver_oos_rate": float(safety_data.get("driver_oos_rate", 0.0)),
+                    "vehicle_oos_rate": float(safety_data.get("vehicle_oos_rate", 0.0))
+                }
+            
             # Parse OOS rates and SMS scores from the response
             driver_oos_rate = float(safety_data.get("driver_oos_rate", 0.0))
             vehicle_oos_rate = float(safety_data.get("vehicle_oos_rate", 0.0))
@@ -510,6 +689,7 @@ class SearchCarriersInsuranceEnrichment:
                 if vehicle_oos_rate > 40.0:  # 2x national average
                     logger.warning(f"High vehicle OOS rate detected for {usdot}: {vehicle_oos_rate}%")
                 
+                self.freshness.commit(usdot, "safety", watermark)
                 logger.info(f"Created safety snapshot for carrier {usdot}")
                 
                 return {
@@ -527,11 +707,74 @@ class SearchCarriersInsuranceEnrichment:
             logger.error(f"Error fetching safety data for {usdot}: {e}")
             return {"error": str(e)}
     
-    def enrich_carrier_crash_data(self, usdot: int) -> Dict:
+    def _build_crashes(self, crashes: List[Dict], usdot: int, start_index: int = 0) -> List[Crash]:
+        """Map a page of crash records to Crash models.
+        
+        Args:
+            crashes: List of crash data from API
+            usdot: USDOT number of the carrier
+            start_index: Number of crashes already built, used for fallback report numbers
+            
+        Returns:
+            list: Crashes that could be mapped
+        """
+        built = []
+        
+        for crash_data in crashes:
+            try:
+                # Crash date is already typed by the client's normalizer
+                crash_date = to_datetime(crash_data.get("crash_date"))
+                
+                built.append(Crash(
+                    report_number=crash_data.get("report_number", f"CR-{usdot}-{start_index + len(built)}"),
+                    report_state=crash_data.get("report_state"),
+                    usdot=usdot,
+                    crash_date=crash_date or datetime.now(timezone.utc),
+                    severity=crash_data.get("severity"),
+                    tow_away=crash_data.get("tow_away", False),
+                    fatalities=crash_data.get("fatalities", 0),
+                    injuries=crash_data.get("injuries", 0),
+                    vehicles_involved=crash_data.get("vehicles_involved"),
+                    weather=crash_data.get("weather"),
+                    road_condition=crash_data.get("road_condition"),
+                    light_condition=crash_data.get("light_condition"),
+                    latitude=crash_data.get("latitude"),
+                    longitude=crash_data.get("longitude"),
+                    preventable=crash_data.get("preventable"),
+                    citation_issued=crash_data.get("citation_issued")
+                ))
+            
+            except Exception as e:
+                logger.error(f"Error processing crash for carrier {usdot}: {e}")
+                continue
+        
+        return built
+    
+    def _write_crash_pages(self, pages: List[List[Crash]]) -> List[Dict]:
+        """Batch writer for crash pages of any number of carriers.
+        
+        Args:
+            pages: Crashes per page
+            
+        Returns:
+            list: Crashes written, per page
+        """
+        self.crash_repo.bulk_write([crash for page in pages for crash in page])
+        return [{"crashes_written": len(page)} for page in pages]
+    
+    def enrich_carrier_crash_data(self, usdot: int, force: bool = False) -> Dict:
         """Enrich a carrier with crash history data from SearchCarriers.
         
+        Page one doubles as a freshness probe: if it matches the stored
+        watermark the remaining pages and all writes are skipped. Otherwise
+        all pages are fetched through the client's concurrent page iterator
+        and handed to the write stage, so with the write pipeline running
+        pages are written while the next ones are still downloading. The
+        watermark is only committed once every page has been written.
+        
         Args:
             usdot: USDOT number of the carrier
+            force: Re-fetch and rewrite even if the probe reports no change
             
         Returns:
             dict: Enrichment results with crash statistics
@@ -539,92 +782,68 @@ class SearchCarriersInsuranceEnrichment:
         logger.info(f"Fetching crash data for carrier {usdot}")
         
         try:
-            result = self.client.get_crashes(usdot)
+            first_page = self.client.get_crashes(usdot)
             
-            if "error" in result:
-                logger.warning(f"No crash data found for {usdot}: {result.get('error')}")
-                return {"error": result["error"]}
+            if "error" in first_page:
+                logger.warning(f"No crash data found for {usdot}: {first_page.get('error')}")
+                return {"error": first_page["error"]}
             
-            if not result.get("data"):
+            if not first_page.get("data"):
                 logger.info(f"No crashes found for carrier {usdot}")
+                self._record_empty(usdot, "crashes", first_page)
                 return {
                     "crash_count": 0,
                     "fatal_crashes": 0,
                     "injury_crashes": 0
                 }
             
-            crashes = result["data"]
+            unchanged, watermark = self.freshness.check(usdot, "crashes", first_page)
+            if unchanged and not force:
+                return {
+                    "crash_count": 0,
+                    "fatal_crashes": 0,
+                    "injury_crashes": 0,
+                    "skipped": True,
+                    "reason": "unchanged"
+                }
+            
             crash_count = 0
             fatal_crashes = 0
             injury_crashes = 0
+            built = 0
+            writes = []
             
-            for crash_data in crashes:
-                try:
-                    # Parse crash date
-                    crash_date = None
-                    if crash_data.get("crash_date"):
-                        try:
-                            crash_date = datetime.strptime(crash_data["crash_date"], "%Y-%m-%d %H:%M:%S")
-                        except ValueError:
-                            crash_date = datetime.fromisoformat(crash_data["crash_date"])
-                    
-                    # Create Crash instance
-                    crash = Crash(
-                        report_number=crash_data.get("report_number", f"CR-{usdot}-{crash_count}"),
-                        report_state=crash_data.get("report_state"),
-                        usdot=usdot,
-                        crash_date=crash_date or datetime.now(timezone.utc),
-                        severity=crash_data.get("severity"),
-                        tow_away=crash_data.get("tow_away", False),
-                        fatalities=crash_data.get("fatalities", 0),
-                        injuries=crash_data.get("injuries", 0),
-                        vehicles_involved=crash_data.get("vehicles_involved"),
-                        weather=crash_data.get("weather"),
-                        road_condition=crash_data.get("road_condition"),
-                        light_condition=crash_data.get("light_condition"),
-                        latitude=crash_data.get("latitude"),
-                        longitude=crash_data.get("longitude"),
-                        preventable=crash_data.get("preventable"),
-                        citation_issued=crash_data.get("citation_issued")
-                    )
-                    
-                    # Save to Neo4j
-                    created_crash = self.crash_repo.create(crash)
-                    
-                    if created_crash:
-                        # Create relationship to carrier
-                        self.crash_repo.create_relationship_to_carrier(usdot, crash)
-                        crash_count += 1
-                        
-                        # Count fatalities and injuries
-                        if crash.fatalities and crash.fatalities > 0:
-                            fatal_crashes += 1
-                            logger.warning(f"Fatal crash detected for carrier {usdot}: {crash.fatalities} fatalities")
-                        
-                        if crash.injuries and crash.injuries > 0:
-                            injury_crashes += 1
+            pages = self.client.iter_pages(self.client.get_crashes, usdot, first_page=first_page)
+            for page_number, result in enumerate(pages, 1):
+                if page_number > 1:
+                    logger.info(f"Processing page {page_number} of crashes for carrier {usdot}")
                 
+                crashes = self._build_crashes(result.get("data") or [], usdot, start_index=built)
+                built += len(crashes)
+                if crashes:
+                    writes.append((crashes, self._submit_writes("crashes", [crashes])[0]))
+            
+            write_failed = False
+            for crashes, write in writes:
+                try:
+                    write.result()
                 except Exception as e:
-                    logger.error(f"Error processing crash for carrier {usdot}: {e}")
+                    logger.error(f"Error writing crash page for carrier {usdot}: {e}")
+                    write_failed = True
                     continue
-            
-            # Handle pagination if needed (more than 100 crashes)
-            if len(crashes) == 100:
-                # Fetch additional pages
-                page = 2
-                while True:
-                    additional_result = self.client.get_crashes(usdot, page=page)
-                    if not additional_result.get("data"):
-                        break
-                    
-                    for crash_data in additional_result["data"]:
-                        # Process additional crashes (same logic as above)
-                        crash_count += 1
+                
+                crash_count += len(crashes)
+                for crash in crashes:
+                    # Count fatalities and injuries
+                    if crash.fatalities and crash.fatalities > 0:
+                        fatal_crashes += 1
+                        logger.warning(f"Fatal crash detected for carrier {usdot}: {crash.fatalities} fatalities")
                     
-                    if len(additional_result["data"]) < 100:
-                        break
-                    page += 1
+                    if crash.injuries and crash.injuries > 0:
+                        injury_crashes += 1
             
+            if not write_failed:
+                self.freshness.commit(usdot, "crashes", watermark)
             logger.info(f"Created {crash_count} crash records for carrier {usdot}")
             
             return {
@@ -637,43 +856,31 @@ class SearchCarriersInsuranceEnrichment:
             logger.error(f"Error fetching crash data for {usdot}: {e}")
             return {"error": str(e)}
     
-    def _process_inspection_batch(self, inspections: List[Dict], usdot: int) -> tuple:
-        """Process a batch of inspection records.
+    def _build_inspection_page(self, inspections: List[Dict], usdot: int) -> tuple:
+        """Validate and map a page of inspection records in memory.
         
         Args:
             inspections: List of inspection data from API
             usdot: USDOT number of the carrier
             
         Returns:
-            tuple: (inspection_count, violation_count, oos_inspections)
+            tuple: (inspections, violations, violation_count, oos_inspections)
         """
-        inspection_count = 0
         violation_count = 0
         oos_inspections = 0
+        page_inspections = []
+        page_violations = []
+        today = date.today()
         
         for inspection_data in inspections:
             try:
-                # Parse inspection date with proper error handling
-                inspection_date = None
-                date_field = inspection_data.get("inspection_date")
-                
-                if date_field:
-                    try:
-                        # Try standard ISO format first
-                        inspection_date = datetime.strptime(date_field, "%Y-%m-%d").date()
-                    except ValueError:
-                        try:
-                            # Try ISO datetime format
-                            inspection_date = datetime.fromisoformat(date_field).date()
-                        except ValueError:
-                            logger.error(f"Failed to parse inspection date '{date_field}' for inspection {inspection_data.get('inspection_id')}")
-                            continue  # Skip this inspection if date parsing fails
-                else:
-                    logger.error(f"No inspection_date field for inspection {inspection_data.get('inspection_id')}")
+                # Inspection date is already typed by the client's normalizer
+                inspection_date = to_date(inspection_data.get("inspection_date"))
+                if inspection_date is None:
+                    logger.error(f"Missing or invalid inspection_date for inspection {inspection_data.get('inspection_id')}")
                     continue  # Skip inspections without dates
                 
                 # Validate date is reasonable (not future, not too old)
-                today = date.today()
                 if inspection_date > today:
                     logger.warning(f"Future inspection date {inspection_date} for inspection {inspection_data.get('inspection_id')}")
                     continue
@@ -709,94 +916,80 @@ class SearchCarriersInsuranceEnrichment:
                     hazmat_oos=inspection_data.get("hazmat_oos", False),
                     result=inspection_data.get("result", "Clean" if violations_actual == 0 else "Violations")
                 )
+                page_inspections.append(inspection)
                 
-                # Save to Neo4j (MERGE will prevent duplicates)
-                created_inspection = self.inspection_repo.create(inspection)
+                # Count OOS inspections
+                if inspection.driver_oos or inspection.vehicle_oos or oos_count > 0:
+                    oos_inspections += 1
                 
-                if created_inspection:
-                    # Create relationship to carrier
-                    self.inspection_repo.create_relationship_to_carrier(usdot, inspection)
-                    inspection_count += 1
-                    
-                    # Count OOS inspections
-                    # Ensure oos_count is an integer for comparison
+                # Collect detailed violations if present
+                for violation_data in inspection_data.get("violations") or []:
                     try:
-                        oos_int = int(oos_count) if oos_count is not None else 0
-                    except (ValueError, TypeError):
-                        oos_int = 0
-                    
-                    if inspection.driver_oos or inspection.vehicle_oos or oos_int > 0:
-                        oos_inspections += 1
-                    
-                    # Process violations if present
-                    violations = inspection_data.get("violations", [])
-                    if violations:
-                        violation_ids = []
-                        for violation_data in violations:
-                            try:
-                                # Create Violation instance
-                                violation = Violation(
-                                    violation_id=violation_data.get("violation_id", f"VIOL-{inspection.inspection_id}-{violation_count}"),
-                                    inspection_id=inspection.inspection_id,
-                                    code=violation_data.get("code"),
-                                    description=violation_data.get("description"),
-                                    category=violation_data.get("category"),
-                                    severity_weight=violation_data.get("severity_weight"),
-                                    oos_indicator=violation_data.get("oos_indicator"),
-                                    violation_date=inspection.inspection_date,
-                                    inspection_state=inspection.state,
-                                    inspection_level=inspection.level
-                                )
-                                
-                                # Create violation node using MERGE to prevent duplicates
-                                violation_query = """
-                                MERGE (v:Violation {violation_id: $violation_id})
-                                ON CREATE SET
-                                    v.inspection_id = $inspection_id,
-                                    v.code = $code,
-                                    v.description = $description,
-                                    v.category = $category,
-                                    v.severity_weight = $severity_weight,
-                                    v.oos_indicator = $oos_indicator,
-                                    v.violation_date = $violation_date,
-                                    v.inspection_state = $inspection_state,
-                                    v.inspection_level = $inspection_level
-                                RETURN v
-                                """
-                                
-                                violation_params = violation.model_dump()
-                                if violation_params.get('violation_date'):
-                                    violation_params['violation_date'] = violation_params['violation_date'].isoformat()
-                                
-                                # Execute query using inspection repo's connection
-                                violation_result = self.inspection_repo.execute_query(violation_query, violation_params)
-                                
-                                if violation_result:
-                                    violation_ids.append(violation.violation_id)
-                                    violation_count += 1
-                            
-                            except Exception as e:
-                                logger.error(f"Error creating violation for inspection {inspection.inspection_id}: {e}")
-                                continue
-                        
-                        # Link violations to inspection
-                        if violation_ids:
-                            self.inspection_repo.link_violations(inspection.inspection_id, violation_ids)
-                    
-                    # Add to violation count even if no detailed violations
-                    violation_count += violations_actual
+                        page_violations.append(Violation(
+                            violation_id=violation_data.get("violation_id", f"VIOL-{inspection.inspection_id}-{violation_count}"),
+                            inspection_id=inspection.inspection_id,
+                            code=violation_data.get("code"),
+                            description=violation_data.get("description"),
+                            category=violation_data.get("category"),
+                            severity_weight=violation_data.get("severity_weight"),
+                            oos_indicator=violation_data.get("oos_indicator"),
+                            violation_date=inspection.inspection_date,
+                            inspection_state=inspection.state,
+                            inspection_level=inspection.level
+                        ))
+                        violation_count += 1
+                    except Exception as e:
+                        logger.error(f"Error creating violation for inspection {inspection.inspection_id}: {e}")
+                        continue
+                
+                # Add to violation count even if no detailed violations
+                violation_count += violations_actual
             
             except Exception as e:
                 logger.error(f"Error processing inspection for carrier {usdot}: {e}")
                 continue
         
-        return inspection_count, violation_count, oos_inspections
+        return page_inspections, page_violations, violation_count, oos_inspections
+    
+    def _write_inspection_pages(self, pages: List[tuple]) -> List[Dict]:
+        """Batch writer for inspection pages of any number of carriers.
+        
+        All pages are written with the four UNWIND statements of one
+        transaction; statements and write time are shared out across the
+        pages so per-page timings still add up to the work done.
+        
+        Args:
+            pages: ``(usdot, inspections, violations)`` per page
+            
+        Returns:
+            list: ``statements``, ``write_ms`` and ``batch_pages`` per page
+        """
+        start = time.perf_counter()
+        written = self.inspection_repo.bulk_write_pages(pages)
+        write_ms = (time.perf_counter() - start) * 1000
+        
+        statements, extra = divmod(written.get("statements", 0), len(pages))
+        return [
+            {
+                "statements": statements + (1 if i < extra else 0),
+                "write_ms": round(write_ms / len(pages), 1),
+                "batch_pages": len(pages)
+            }
+            for i in range(len(pages))
+        ]
     
-    def enrich_carrier_inspection_data(self, usdot: int) -> Dict:
+    def enrich_carrier_inspection_data(self, usdot: int, force: bool = False) -> Dict:
         """Enrich a carrier with inspection and violation data from SearchCarriers.
         
+        Page one is probed against the stored watermark first; unchanged
+        carriers cost a single request. Otherwise pages are fetched
+        concurrently by the client, mapped in order as they arrive and
+        handed to the write stage; the watermark is committed once every
+        page has been written.
+        
         Args:
             usdot: USDOT number of the carrier
+            force: Re-fetch and rewrite even if the probe reports no change
             
         Returns:
             dict: Enrichment results with inspection statistics
@@ -804,48 +997,77 @@ class SearchCarriersInsuranceEnrichment:
         logger.info(f"Fetching inspection data for carrier {usdot}")
         
         try:
-            result = self.client.get_inspections(usdot, since_months=24)
+            first_page = self.client.get_inspections(usdot, since_months=24)
             
-            if "error" in result:
-                logger.warning(f"No inspection data found for {usdot}: {result.get('error')}")
-                return {"error": result["error"]}
+            if "error" in first_page:
+                logger.warning(f"No inspection data found for {usdot}: {first_page.get('error')}")
+                return {"error": first_page["error"]}
             
-            if not result.get("data"):
+            if not first_page.get("data"):
                 logger.info(f"No inspections found for carrier {usdot}")
+                self._record_empty(usdot, "inspections", first_page)
                 return {
                     "inspection_count": 0,
                     "violation_count": 0,
                     "oos_inspections": 0
                 }
             
-            inspections = result["data"]
-            
-            # Process first batch of inspections using helper method
-            total_inspections, total_violations, total_oos = self._process_inspection_batch(inspections, usdot)
+            unchanged, watermark = self.freshness.check(usdot, "inspections", first_page)
+            if unchanged and not force:
+                return {
+                    "inspection_count": 0,
+                    "violation_count": 0,
+                    "oos_inspections": 0,
+                    "skipped": True,
+                    "reason": "unchanged"
+                }
             
-            # Handle pagination if needed
-            if len(inspections) == 100:
-                page = 2
-                while True:
-                    logger.info(f"Fetching page {page} of inspections for carrier {usdot}")
-                    additional_result = self.client.get_inspections(usdot, since_months=24, page=page)
-                    
-                    if not additional_result.get("data"):
-                        break
-                    
-                    # Process additional inspections using the same helper method
-                    batch_inspections, batch_violations, batch_oos = self._process_inspection_batch(
-                        additional_result["data"], usdot
-                    )
-                    
-                    total_inspections += batch_inspections
-                    total_violations += batch_violations
-                    total_oos += batch_oos
-                    
-                    if len(additional_result["data"]) < 100:
-                        break
-                    page += 1
+            total_inspections = 0
+            total_violations = 0
+            total_oos = 0
+            page_timings = []
+            writes = []
             
+            pages = self.client.iter_pages(
+                self.client.get_inspections, usdot, since_months=24, first_page=first_page
+            )
+            for page_number, result in enumerate(pages, 1):
+                if page_number > 1:
+                    logger.info(f"Processing page {page_number} of inspections for carrier {usdot}")
+                
+                records = result.get("data") or []
+                page_inspections, page_violations, violation_count, oos_count = self._build_inspection_page(
+                    records, usdot
+                )
+                write = None
+                if page_inspections:
+                    write = self._submit_writes("inspections", [(usdot, page_inspections, page_violations)])[0]
+                writes.append((page_number, len(records), page_inspections, violation_count, oos_count, write))
+            
+            write_failed = False
+            for page_number, record_count, page_inspections, violation_count, oos_count, write in writes:
+                write_stats = {"statements": 0, "write_ms": 0.0}
+                if write is not None:
+                    try:
+                        write_stats = write.result()
+                    except Exception as e:
+                        logger.error(f"Error writing inspection page for carrier {usdot}: {e}")
+                        write_failed = True
+                        page_inspections = []
+                
+                if page_inspections:
+                    total_inspections += len(page_inspections)
+                    total_violations += violation_count
+                    total_oos += oos_count
+                page_timings.append({
+                    "page": page_number,
+                    "records": record_count,
+                    "inspections_written": len(page_inspections),
+                    **write_stats
+                })
+            
+            if not write_failed:
+                self.freshness.commit(usdot, "inspections", watermark)
             logger.info(f"Created {total_inspections} inspection records with {total_violations} violations for carrier {usdot}")
             
             if total_oos > 0:
@@ -854,18 +1076,37 @@ class SearchCarriersInsuranceEnrichment:
             return {
                 "inspection_count": total_inspections,
                 "violation_count": total_violations,
-                "oos_inspections": total_oos
+                "oos_inspections": total_oos,
+                "page_timings": page_timings
             }
             
         except Exception as e:
             logger.error(f"Error fetching inspection data for {usdot}: {e}")
             return {"error": str(e)}
     
-    def enrich_high_risk_carriers(self, limit: int = 10):
+    def _record_stats(self, result: Dict):
+        """Add one carrier's insurance enrichment result to the run statistics.
+        
+        Args:
+            result: Result returned by enrich_carriers
+        """
+        self.stats["carriers_processed"] += 1
+        self.stats["policies_created"] += result["policies_created"]
+        self.stats["events_created"] += result["events_created"]
+        self.stats["gaps_detected"] += result["gaps_found"]
+        
+        if result["fraud_indicators"]:
+            self.stats["shopping_patterns"] += 1
+        
+        if result["compliance_violations"]:
+            self.stats["compliance_violations"] += 1
+    
+    def enrich_high_risk_carriers(self, limit: int = 10, group_size: int = 10):
         """Enrich high-risk carriers first (those with violations > 20 or crashes > 5).
         
         Args:
             limit: Maximum number of carriers to process
+            group_size: Number of carriers written per transaction
         """
         logger.info("Starting enrichment of high-risk carriers")
         
@@ -878,31 +1119,18 @@ class SearchCarriersInsuranceEnrichment:
         
         logger.info(f"Found {len(high_risk)} high-risk carriers")
         
-        # Process in batches
+        # Process in groups; request pacing is handled by the client's rate limiter
         carriers_to_process = high_risk[:limit]
         
-        for carrier in carriers_to_process:
-            result = self.enrich_carrier(carrier)
-            
-            self.stats["carriers_processed"] += 1
-            self.stats["policies_created"] += result["policies_created"]
-            self.stats["events_created"] += result["events_created"]
-            self.stats["gaps_detected"] += result["gaps_found"]
-            
-            if result["fraud_indicators"]:
-                self.stats["shopping_patterns"] += 1
-            
-            if result["compliance_violations"]:
-                self.stats["compliance_violations"] += 1
-            
-            # Rate limiting
-            time.sleep(1)
+        for i in range(0, len(carriers_to_process), group_size):
+            for result in self.enrich_carriers(carriers_to_process[i:i+group_size]):
+                self._record_stats(result)
     
     def enrich_all_jb_carriers(self, batch_size: int = 10):
         """Enrich all JB Hunt carriers with insurance data.
         
         Args:
-            batch_size: Number of carriers to process at a time
+            batch_size: Number of carriers to process, and write, per transaction
         """
         logger.info("Starting enrichment of all JB Hunt carriers")
         
@@ -911,27 +1139,13 @@ class SearchCarriersInsuranceEnrichment:
         
         logger.info(f"Found {len(all_carriers)} JB Hunt carriers to enrich")
         
-        # Process in batches
+        # Process in batches; request pacing is handled by the client's rate limiter
         for i in range(0, len(all_carriers), batch_size):
             batch = all_carriers[i:i+batch_size]
             logger.info(f"Processing batch {i//batch_size + 1}: carriers {i+1} to {min(i+batch_size, len(all_carriers))}")
             
-            for carrier in batch:
-                result = self.enrich_carrier(carrier)
-                
-                self.stats["carriers_processed"] += 1
-                self.stats["policies_created"] += result["policies_created"]
-                self.stats["events_created"] += result["events_created"]
-                self.stats["gaps_detected"] += result["gaps_found"]
-                
-                if result["fraud_indicators"]:
-                    self.stats["shopping_patterns"] += 1
-                
-                if result["compliance_violations"]:
-                    self.stats["compliance_violations"] += 1
-                
-                # Rate limiting
-                time.sleep(1)
+            for result in self.enrich_carriers(batch):
+                self._record_stats(result)
     
     def print_summary(self):
         """Print enrichment summary statistics."""
@@ -995,9 +1209,8 @@ def main():
         else:
             # Default: process first N carriers
             carriers = enricher.carrier_repo.get_all(limit=args.limit, filters={"jb_carrier": True})
-            for carrier in carriers:
-                enricher.enrich_carrier(carrier)
-                time.sleep(1)  # Rate limiting
+            for result in enricher.enrich_carriers(carriers):
+                enricher._record_stats(result)
     
     finally:
         enricher.print_summary()
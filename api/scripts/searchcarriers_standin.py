@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the SearchCarriers API.
+
+Serves the endpoints used by SearchCarriersClient (insurance v2, safety summary,
+crashes, inspections, out-of-service orders, authorities and authority history)
+so the enrichment pipeline can be benchmarked and load-tested without spending
+vendor quota.
+
+Modes:
+    synthetic - deterministic generated data per DOT number (default)
+    replay    - serve recorded fixtures, falling back to synthetic data
+    record    - proxy to the real API and capture responses into the fixture corpus
+
+Usage:
+    python scripts/searchcarriers_standin.py --port 8700 --latency-ms 250 --rate-429 0.02
+    SEARCH_CARRIERS_BASE_URL=http://localhost:8700 python test_enrichment.py
+"""
+
+import os
+import json
+import math
+import random
+import asyncio
+import argparse
+import threading
+import time
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any
+
+import requests
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+
+DEFAULT_FIXTURES_DIR = Path(__file__).parent / "fixtures" / "searchcarriers"
+DEFAULT_UPSTREAM_URL = "https://searchcarriers.com/api"
+
+
+class StandinConfig(BaseModel):
+    """Runtime configuration for the stand-in server."""
+    mode: str = Field(default="synthetic", description="synthetic, replay or record")
+    fixtures_dir: Path = Field(default=DEFAULT_FIXTURES_DIR, description="Fixture corpus directory")
+    upstream_url: str = Field(default=DEFAULT_UPSTREAM_URL, description="Real API base URL for record mode")
+    upstream_token: Optional[str] = Field(default=None, description="Real API token for record mode")
+    seed: int = Field(default=42, description="Seed for synthetic data and fault injection")
+    latency_dist: str = Field(default="fixed", description="fixed, uniform or lognormal")
+    latency_ms: float = Field(default=0.0, ge=0, description="Mean response latency in milliseconds")
+    latency_jitter_ms: float = Field(default=0.0, ge=0, description="Spread for uniform/lognormal latency")
+    max_per_page: int = Field(default=100, ge=1, description="Upper bound on page size honoured")
+    rate_429: float = Field(default=0.0, ge=0, le=1, description="Probability of a random 429 response")
+    rate_limit_per_minute: int = Field(default=0, ge=0, description="Requests per minute before 429 (0 = unlimited)")
+    retry_after_seconds: int = Field(default=1, ge=0, description="Retry-After value sent with 429 responses")
+
+
+class FixtureStore:
+    """Fixture corpus on disk, one JSON file per request path.
+
+    List endpoints are stored as recorded pages and flattened on read so they
+    can be re-paginated with any page size.
+    """
+
+    def __init__(self, fixtures_dir: Path):
+        self.fixtures_dir = Path(fixtures_dir)
+        self._lock = threading.Lock()
+
+    def _file_for(self, path: str) -> Path:
+        slug = path.strip("/").replace("/", "__")
+        return self.fixtures_dir / f"{slug}.json"
+
+    def load(self, path: str) -> Optional[Any]:
+        """Return recorded data for a path (list of records or a dict), or None."""
+        fixture_file = self._file_for(path)
+        if not fixture_file.exists():
+            return None
+
+        with open(fixture_file) as f:
+            fixture = json.load(f)
+
+        if "pages" in fixture:
+            records = []
+            for page in sorted(fixture["pages"], key=int):
+                records.extend(fixture["pages"][page])
+            return records
+        return fixture.get("data")
+
+    def record(self, path: str, response: Dict, page: Optional[int] = None):
+        """Merge an upstream response into the fixture for its path."""
+        fixture_file = self._file_for(path)
+
+        with self._lock:
+            self.fixtures_dir.mkdir(parents=True, exist_ok=True)
+            fixture = {"path": path}
+            if fixture_file.exists():
+                with open(fixture_file) as f:
+                    fixture = json.load(f)
+
+            data = response.get("data")
+            if isinstance(data, list):
+                fixture.setdefault("pages", {})[str(page or 1)] = data
+            else:
+                fixture["data"] = data
+            fixture["recorded_at"] = datetime.utcnow().isoformat()
+
+            with open(fixture_file, "w") as f:
+                json.dump(fixture, f, indent=2, default=str)
+
+
+class SyntheticData:
+    """Deterministic synthetic responses keyed by DOT number."""
+
+    PROVIDERS = [
+        "Progressive Casualty", "Great West Casualty", "National Indemnity",
+        "Northland Insurance", "Canal Insurance", "Sentry Select", "Carolina Casualty"
+    ]
+    STATES = ["TX", "CA", "IL", "GA", "OH", "PA", "FL", "TN", "IN", "AZ"]
+    VIOLATIONS = [
+        ("395.8E", "False report of drivers record of duty status", "Hours-of-service Compliance", 7),
+        ("392.2-SLLS2", "State/local laws - speeding 6-10 miles per hour over", "Unsafe Driving", 4),
+        ("393.9", "Inoperable required lamp", "Vehicle Maint.", 6),
+        ("396.3A1", "Inspection/repair and maintenance parts and accessories", "Vehicle Maint.", 4),
+        ("391.41A", "No medical certificate in driver's possession", "Driver Fitness", 1),
+        ("392.4A", "Driver uses or is in possession of drugs", "Controlled Substances", 10),
+    ]
+
+    def __init__(self, seed: int):
+        self.seed = seed
+
+    def _rng(self, dot: str, family: str) -> random.Random:
+        return random.Random(f"{self.seed}:{family}:{dot}")
+
+    def _date(self, rng: random.Random, max_days_ago: int) -> datetime:
+        return datetime(2025, 9, 1) - timedelta(days=rng.randint(0, max_days_ago))
+
+    def insurances(self, dot: str) -> List[Dict]:
+        rng = self._rng(dot, "insurances")
+        records = []
+        start = self._date(rng, 2000)
+        for i in range(rng.randint(1, 8)):
+            effective = start + timedelta(days=i * rng.randint(200, 400))
+            # Leave occasional gaps between policies
+            if rng.random() < 0.2:
+                effective += timedelta(days=rng.randint(31, 120))
+            cancelled = effective + timedelta(days=rng.randint(90, 365))
+            records.append({
+                "id": int(f"{dot}{i}") if dot.isdigit() else i,
+                "name_company": rng.choice(self.PROVIDERS),
+                "policy_no": f"POL-{dot}-{i:03d}",
+                "ins_form_code": rng.choice(["91X", "BMC-91", "34"]),
+                "max_cov_amount": rng.choice(["00750", "01000", "05000"]),
+                "effective_date": effective.strftime("%Y-%m-%d %H:%M:%S"),
+                "cancellation_date": cancelled.strftime("%Y-%m-%d %H:%M:%S"),
+                "cancellation_reason": rng.choice(["Replaced", "Non-payment", None]),
+            })
+        return records
+
+    def safety_summary(self, dot: str) -> Dict:
+        rng = self._rng(dot, "safety-summary")
+        summary = {
+            "driver_oos_rate": round(rng.uniform(0, 20), 1),
+            "vehicle_oos_rate": round(rng.uniform(0, 45), 1),
+        }
+        for basic in ["unsafe_driving", "hours_of_service", "driver_fitness", "controlled_substances",
+                      "vehicle_maintenance", "hazmat_compliance", "crash_indicator"]:
+            score = round(rng.uniform(0, 100), 1) if rng.random() < 0.7 else None
+            summary[f"{basic}_score"] = score
+            summary[f"{basic}_alert"] = bool(score and score > 65)
+        return summary
+
+    def crashes(self, dot: str) -> List[Dict]:
+        rng = self._rng(dot, "crashes")
+        records = []
+        for i in range(rng.choice([0, 0, 1, 3, 8, 30])):
+            fatalities = 1 if rng.random() < 0.05 else 0
+            injuries = rng.randint(1, 3) if rng.random() < 0.3 else 0
+            records.append({
+                "report_number": f"{rng.choice(self.STATES)}{dot}{i:04d}",
+                "report_state": rng.choice(self.STATES),
+                "crash_date": self._date(rng, 730).strftime("%Y-%m-%d %H:%M:%S"),
+                "severity": "FATAL" if fatalities else ("INJURY" if injuries else "TOW"),
+                "fatalities": fatalities,
+                "injuries": injuries,
+                "tow_away": True,
+                "vehicles_involved": rng.randint(1, 4),
+            })
+        return records
+
+    def inspections(self, dot: str) -> List[Dict]:
+        rng = self._rng(dot, "inspections")
+        records = []
+        for i in range(rng.choice([0, 5, 40, 120, 350])):
+            violations = []
+            for j in range(rng.choice([0, 0, 0, 1, 2, 4])):
+                code, description, category, weight = rng.choice(self.VIOLATIONS)
+                violations.append({
+                    "violation_id": f"V-{dot}-{i}-{j}",
+                    "code": code,
+                    "description": description,
+                    "category": category,
+                    "severity_weight": weight,
+                    "oos_indicator": rng.random() < 0.1,
+                })
+            driver_oos = sum(1 for v in violations if v["oos_indicator"] and v["category"] != "Vehicle Maint.")
+            vehicle_oos = sum(1 for v in violations if v["oos_indicator"] and v["category"] == "Vehicle Maint.")
+            records.append({
+                "inspection_id": f"{dot}{i:05d}",
+                "insp_date": self._date(rng, 730).strftime("%Y-%m-%d %H:%M:%S"),
+                "report_state": rng.choice(self.STATES),
+                "insp_level_id": rng.randint(1, 3),
+                "viol_total": str(len(violations)),
+                "oos_total": str(driver_oos + vehicle_oos),
+                "driver_oos_total": str(driver_oos),
+                "vehicle_oos_total": str(vehicle_oos),
+                "hazmat_oos_total": "0",
+                "violations": violations,
+            })
+        return records
+
+    def out_of_service_orders(self, dot: str) -> List[Dict]:
+        rng = self._rng(dot, "out-of-service-orders")
+        return [
+            {
+                "order_date": self._date(rng, 1500).strftime("%Y-%m-%d"),
+                "reason": rng.choice(["Unsatisfactory rating", "Imminent hazard", "Failure to pay"]),
+                "status": rng.choice(["ACTIVE", "RESCINDED"]),
+            }
+            for _ in range(rng.choice([0, 0, 0, 1, 3]))
+        ]
+
+    def authorities(self, dot: str) -> List[Dict]:
+        rng = self._rng(dot, "authorities")
+        return [
+            {
+                "docket_number": f"MC{rng.randint(100000, 999999)}",
+                "authority_type": rng.choice(["COMMON", "CONTRACT", "BROKER"]),
+                "status": rng.choice(["ACTIVE", "INACTIVE", "REVOKED"]),
+                "granted_date": self._date(rng, 3000).strftime("%Y-%m-%d"),
+            }
+            for _ in range(rng.randint(1, 3))
+        ]
+
+    def authority_history(self, docket: str) -> List[Dict]:
+        rng = self._rng(docket, "authority-history")
+        return [
+            {
+                "docket_number": docket,
+                "action": rng.choice(["GRANTED", "REVOKED", "REINSTATED", "DISMISSED"]),
+                "action_date": self._date(rng, 3000).strftime("%Y-%m-%d"),
+            }
+            for _ in range(rng.randint(1, 5))
+        ]
+
+    def generate(self, family: str, key: str) -> Any:
+        """Generate data for an endpoint family."""
+        return {
+            "insurances": self.insurances,
+            "safety-summary": self.safety_summary,
+            "crashes": self.crashes,
+            "inspections": self.inspections,
+            "out-of-service-orders": self.out_of_service_orders,
+            "authorities": self.authorities,
+            "authority-history": self.authority_history,
+        }[family](key)
+
+
+def paginate(records: List[Dict], path: str, page: int, per_page: int) -> Dict:
+    """Wrap a record list in the standard SearchCarriers pagination envelope."""
+    total = len(records)
+    last_page = max(1, math.ceil(total / per_page))
+    start = (page - 1) * per_page
+    data = records[start:start + per_page]
+
+    def link(p: int) -> str:
+        return f"{path}?page={p}&perPage={per_page}"
+
+    return {
+        "data": data,
+        "links": {
+            "first": link(1),
+            "last": link(last_page),
+            "prev": link(page - 1) if page > 1 else None,
+            "next": link(page + 1) if page < last_page else None,
+        },
+        "meta": {
+            "current_page": page,
+            "from": start + 1 if data else None,
+            "last_page": last_page,
+            "path": path,
+            "per_page": per_page,
+            "to": start + len(data) if data else None,
+            "total": total,
+        },
+    }
+
+
+class FaultInjector:
+    """Latency, rate-limit window and random 429 behaviour."""
+
+    def __init__(self, config: StandinConfig):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._window_start = time.time()
+        self._window_count = 0
+
+    def latency_seconds(self) -> float:
+        mean = self.config.latency_ms
+        jitter = self.config.latency_jitter_ms
+        dist = self.config.latency_dist
+
+        if dist == "uniform":
+            value = self._rng.uniform(max(0.0, mean - jitter), mean + jitter)
+        elif dist == "lognormal" and mean > 0:
+            # Parameterise so the distribution mean equals latency_ms
+            sigma = math.sqrt(math.log(1 + (jitter / mean) ** 2)) if jitter else 0.0
+            mu = math.log(mean) - sigma ** 2 / 2
+            value = self._rng.lognormvariate(mu, sigma)
+        else:
+            value = mean
+        return max(0.0, value) / 1000.0
+
+    def admit(self) -> Dict[str, Any]:
+        """Account for one request and decide whether it is throttled.
+
+        Returns:
+            dict: ``throttled`` flag plus the rate-limit headers to send
+        """
+        limit = self.config.rate_limit_per_minute
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= 60:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            count = self._window_count
+            reset = int(self._window_start + 60)
+            random_429 = self._rng.random() < self.config.rate_429
+
+        headers = {}
+        throttled = random_429
+        if limit:
+            headers = {
+                "X-RateLimit-Limit": str(limit),
+                "X-RateLimit-Remaining": str(max(0, limit - count)),
+                "X-RateLimit-Reset": str(reset),
+            }
+            throttled = throttled or count > limit
+
+        return {"throttled": throttled, "headers": headers}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"window_count": self._window_count, "window_start": self._window_start}
+
+
+def create_app(config: Optional[StandinConfig] = None) -> FastAPI:
+    """Build the stand-in FastAPI application.
+
+    Args:
+        config: Server configuration, defaults to synthetic mode without faults
+
+    Returns:
+        FastAPI: Application serving the SearchCarriers endpoints
+    """
+    config = config or StandinConfig()
+    store = FixtureStore(config.fixtures_dir)
+    synthetic = SyntheticData(config.seed)
+    faults = FaultInjector(config)
+    counters = {"requests": 0, "throttled": 0, "recorded": 0, "replayed": 0}
+
+    app = FastAPI(title="SearchCarriers Stand-in", version="1.0.0")
+
+    def fetch_upstream(path: str, params: Dict) -> Dict:
+        headers = {"Authorization": f"Bearer {config.upstream_token}", "Content-Type": "application/json"}
+        response = requests.get(f"{config.upstream_url}{path}", headers=headers, params=params, timeout=60)
+        if response.status_code == 404:
+            return {"data": []}
+        response.raise_for_status()
+        return response.json()
+
+    async def serve(request: Request, family: str, key: str) -> JSONResponse:
+        counters["requests"] += 1
+
+        if not request.headers.get("authorization", "").startswith("Bearer "):
+            return JSONResponse({"message": "Unauthenticated."}, status_code=401)
+
+        delay = faults.latency_seconds()
+        if delay:
+            await asyncio.sleep(delay)
+
+        admission = faults.admit()
+        headers = admission["headers"]
+        if admission["throttled"]:
+            counters["throttled"] += 1
+            headers["Retry-After"] = str(config.retry_after_seconds)
+            return JSONResponse({"message": "Too Many Attempts."}, status_code=429, headers=headers)
+
+        path = request.url.path
+        params = dict(request.query_params)
+        page = max(1, int(params.get("page", 1)))
+        per_page = max(1, min(int(params.get("perPage", config.max_per_page)), config.max_per_page))
+
+        if config.mode == "record":
+            upstream = await asyncio.to_thread(fetch_upstream, path, params)
+            store.record(path, upstream, page)
+            counters["recorded"] += 1
+            return JSONResponse(upstream, headers=headers)
+
+        data = store.load(path) if config.mode == "replay" else None
+        if data is not None:
+            counters["replayed"] += 1
+        else:
+            data = synthetic.generate(family, key)
+
+        if isinstance(data, list):
+            return JSONResponse(paginate(data, path, page, per_page), headers=headers)
+        return JSONResponse({"data": data}, headers=headers)
+
+    @app.get("/v2/company/{dot}/insurances")
+    async def insurances(dot: str, request: Request):
+        return await serve(request, "insurances", dot)
+
+    @app.get("/v1/company/{dot}/safety-summary")
+    async def safety_summary(dot: str, request: Request):
+        return await serve(request, "safety-summary", dot)
+
+    @app.get("/v1/company/{dot}/crashes")
+    async def crashes(dot: str, request: Request):
+        return await serve(request, "crashes", dot)
+
+    @app.get("/v1/company/{dot}/inspections")
+    async def inspections(dot: str, request: Request):
+        return await serve(request, "inspections", dot)
+
+    @app.get("/v1/company/{dot}/out-of-service-orders")
+    async def out_of_service_orders(dot: str, request: Request):
+        return await serve(request, "out-of-service-orders", dot)
+
+    @app.get("/v1/company/{dot}/authorities")
+    async def authorities(dot: str, request: Request):
+        return await serve(request, "authorities", dot)
+
+    @app.get("/v1/authority/{docket}/history")
+    async def authority_history(docket: str, request: Request):
+        return await serve(request, "authority-history", docket)
+
+    @app.get("/_standin/stats")
+    async def stats():
+        return {"mode": config.mode, **counters, **faults.stats()}
+
+    return app
+
+
+def main():
+    """Run the stand-in server from the command line."""
+    parser = argparse.ArgumentParser(description="Local SearchCarriers API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--mode", choices=["synthetic", "replay", "record"], default="synthetic")
+    parser.add_argument("--fixtures-dir", type=Path, default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument("--upstream-url", default=DEFAULT_UPSTREAM_URL)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default="fixed")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--max-per-page", type=int, default=100)
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Probability of a random 429")
+    parser.add_argument("--rate-limit-per-minute", type=int, default=0)
+    parser.add_argument("--retry-after-seconds", type=int, default=1)
+    args = parser.parse_args()
+
+    upstream_token = os.getenv("SEARCH_CARRIERS_API_TOKEN") or os.getenv("SEARCHCARRIERS_API_KEY")
+    if args.mode == "record" and not upstream_token:
+        parser.error("record mode requires SEARCH_CARRIERS_API_TOKEN for the real API")
+
+    config = StandinConfig(
+        mode=args.mode,
+        fixtures_dir=args.fixtures_dir,
+        upstream_url=args.upstream_url,
+        upstream_token=upstream_token,
+        seed=args.seed,
+        latency_dist=args.latency_dist,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        max_per_page=args.max_per_page,
+        rate_429=args.rate_429,
+        rate_limit_per_minute=args.rate_limit_per_minute,
+        retry_after_seconds=args.retry_after_seconds,
+    )
+
+    import uvicorn
+    uvicorn.run(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from dotenv import load_dotenv
 from repositories.carrier_repository import CarrierRepository
 from repositories.insurance_policy_repository import InsurancePolicyRepository
+from services.coverage_index import get_coverage_index
+from services.coverage_sweep import (
+    calculate_total_days_without_coverage,
+    find_carriers_with_coverage_gaps,
+    find_overlapping_policies
+)
 
 # Load environment variables
 load_dotenv()
@@ -43,7 +49,8 @@ def test_temporal_queries():
     # Test 1: Get carriers without insurance on a specific date
     print("\n1. Testing carriers without insurance on today's date...")
     today = date.today()
-    uninsured = carrier_repo.get_carriers_without_insurance_on_date(today)
+    uninsured_usdots = get_coverage_index().uninsured_on(today)
+    uninsured = carrier_repo.get_carrier_summaries(uninsured_usdots) if uninsured_usdots else []
     print(f"   Found {len(uninsured)} carriers without insurance today")
     if uninsured[:3]:
         print("   Sample uninsured carriers:")
@@ -78,7 +85,7 @@ def test_temporal_queries():
     
     # Test 3: Find overlapping policies
     print("\n3. Testing overlapping policies detection...")
-    overlaps = carrier_repo.find_overlapping_policies()
+    overlaps = find_overlapping_policies(carrier_repo)
     print(f"   Found {len(overlaps)} overlapping policy instances")
     if overlaps[:3]:
         print("   Sample overlaps:")
@@ -97,8 +104,8 @@ def test_temporal_queries():
         start_date = date.today() - timedelta(days=365)
         end_date = date.today()
         
-        days_without = carrier_repo.calculate_total_days_without_coverage(
-            test_carrier_usdot, start_date, end_date
+        days_without = calculate_total_days_without_coverage(
+            test_carrier_usdot, start_date, end_date, carrier_repo
         )
         print(f"   Carrier {test_carrier['name']} in the last year:")
         print(f"     Period: {start_date} to {end_date} (365 days)")
@@ -107,7 +114,7 @@ def test_temporal_queries():
     
     # Test 5: Find carriers with coverage gaps
     print("\n5. Testing coverage gaps detection...")
-    gaps = carrier_repo.find_carriers_with_coverage_gaps(gap_threshold_days=1)
+    gaps = find_carriers_with_coverage_gaps(gap_threshold_days=1, carrier_repo=carrier_repo)
     print(f"   Found {len(gaps)} carriers with coverage gaps > 1 day")
     if gaps[:3]:
         print("   Top carriers with gaps:")
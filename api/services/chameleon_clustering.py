@@ -0,0 +1,271 @@
+"""
+Chameleon-carrier clustering over shared attributes.
+
+Chameleon carriers re-register under new USDOT numbers but keep the same
+officers, phones, addresses or insurers. Carriers are linked when they
+share such a value, and the connected groups are found with union-find.
+The carrier-attribute edges are streamed once in USDOT order, so a full
+rebuild is linear in carriers plus edges. Comparing every pair of carriers
+would be quadratic.
+
+A value held by very many carriers (a large insurer, a registered agent's
+address) says nothing about common control. Such a value would also merge
+unrelated carriers into one giant cluster. Values held by more carriers
+than MAX_ATTRIBUTE_CARRIERS allows for their kind are therefore ignored.
+
+Clusters are stored as ChameleonCluster nodes and served from there. A
+full rebuild replaces them all. update_chameleon_clusters recomputes only
+the clusters reachable from carriers whose attributes changed.
+"""
+
+import time
+import uuid
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Points a cluster scores per shared value of each kind
+ATTRIBUTE_WEIGHTS = {
+    "officer": 20,
+    "phone": 15,
+    "address": 10,
+    "insurance_provider": 5,
+}
+
+# Most carriers a value of each kind may link before it is ignored
+MAX_ATTRIBUTE_CARRIERS = {
+    "officer": 50,
+    "phone": 25,
+    "address": 25,
+    "insurance_provider": 10,
+}
+
+# Shared values of one kind counted towards the score
+MAX_SCORED_VALUES = 3
+
+# Share of the members' average insurance fraud risk score added to the score
+RISK_SCORE_WEIGHT = 0.2
+
+# Carriers read per query during a full rebuild, and clusters written per transaction
+REBUILD_PAGE_SIZE = 5000
+WRITE_BATCH_SIZE = 1000
+
+
+class UnionFind:
+    """Disjoint sets with path compression and union by size."""
+
+    def __init__(self):
+        self.parent: Dict = {}
+        self.size: Dict = {}
+
+    def find(self, item):
+        """Representative of the set holding ``item``, adding it if new."""
+        parent = self.parent.setdefault(item, item)
+        if parent == item:
+            self.size.setdefault(item, 1)
+            return item
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a, b):
+        """Merge the sets holding ``a`` and ``b``."""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size.pop(b)
+
+    def groups(self) -> Dict:
+        """Members of every set, keyed by representative."""
+        groups: Dict = {}
+        for item in self.parent:
+            groups.setdefault(self.find(item), []).append(item)
+        return groups
+
+
+def _carrier_values(carrier: Dict) -> Iterable[Tuple[str, str]]:
+    """(kind, value) pairs a carrier holds."""
+    for kind in ATTRIBUTE_WEIGHTS:
+        for value in set(carrier.get(kind) or []):
+            yield kind, value
+
+
+def cluster_carriers(carriers: Iterable[Dict], hub_values: Set[Tuple[str, str]] = frozenset(),
+                     computed_at: Optional[str] = None) -> List[Dict]:
+    """Group carriers that share attribute values and score each group.
+
+    Args:
+        carriers: Rows shaped like ChameleonClusterRepository.get_carrier_attributes
+        hub_values: (kind, value) pairs known to link too many carriers, beyond
+            those detected among ``carriers``
+        computed_at: Timestamp stored on the clusters; defaults to now
+
+    Returns:
+        list: Clusters of two or more carriers, highest score first
+    """
+    computed_at = computed_at or datetime.now(timezone.utc).isoformat()
+    profiles: Dict[int, Dict] = {}
+    holders: Dict[Tuple[str, str], List[int]] = {}
+    for carrier in carriers:
+        usdot = carrier["usdot"]
+        profiles[usdot] = carrier
+        for key in _carrier_values(carrier):
+            holders.setdefault(key, []).append(usdot)
+
+    linking = {
+        key: usdots for key, usdots in holders.items()
+        if 2 <= len(usdots) <= MAX_ATTRIBUTE_CARRIERS[key[0]] and key not in hub_values
+    }
+    sets = UnionFind()
+    for usdots in linking.values():
+        for usdot in usdots[1:]:
+            sets.union(usdots[0], usdot)
+
+    shared: Dict = {}
+    for (kind, value), usdots in linking.items():
+        shared.setdefault(sets.find(usdots[0]), {}).setdefault(kind, []).append(value)
+
+    clusters = []
+    for root, members in sets.groups().items():
+        members.sort()
+        values = shared[root]
+        rows = [profiles[usdot] for usdot in members]
+        risk = sum(row.get("insurance_risk_score") or 0 for row in rows) / len(rows)
+        score = sum(
+            ATTRIBUTE_WEIGHTS[kind] * min(len(kind_values), MAX_SCORED_VALUES)
+            for kind, kind_values in values.items()
+        ) + RISK_SCORE_WEIGHT * risk
+        clusters.append({
+            "cluster_id": f"CC-{members[0]}",
+            "size": len(members),
+            "members": members,
+            "score": round(min(score, 100.0), 1),
+            "shared_officers": len(values.get("officer", [])),
+            "shared_phones": len(values.get("phone", [])),
+            "shared_addresses": len(values.get("address", [])),
+            "shared_insurance_providers": len(values.get("insurance_provider", [])),
+            "officer_ids": sorted(values.get("officer", [])),
+            "provider_names": sorted(values.get("insurance_provider", [])),
+            "average_insurance_risk_score": round(risk, 1),
+            "total_crashes": sum(row.get("crashes") or 0 for row in rows),
+            "total_violations": sum(row.get("violations") or 0 for row in rows),
+            "computed_at": computed_at,
+        })
+
+    clusters.sort(key=lambda cluster: (-cluster["score"], cluster["cluster_id"]))
+    return clusters
+
+
+def _cluster_repo(repo):
+    if repo is None:
+        from repositories.chameleon_cluster_repository import ChameleonClusterRepository
+        repo = ChameleonClusterRepository()
+    return repo
+
+
+def rebuild_chameleon_clusters(repo=None) -> Dict:
+    """Recompute every chameleon cluster from one pass over the carriers.
+
+    New clusters are written under a new generation; clusters of earlier
+    generations are deleted once all of them are written.
+
+    Args:
+        repo: ChameleonClusterRepository, created if not provided
+
+    Returns:
+        dict: Carriers scanned, clusters and clustered carriers written,
+            stale clusters deleted, and seconds taken
+    """
+    repo = _cluster_repo(repo)
+    start = time.perf_counter()
+    generation = uuid.uuid4().hex
+
+    carriers = []
+    scanned = 0
+    after = -1
+    while True:
+        rows = repo.get_carrier_attributes(after, REBUILD_PAGE_SIZE)
+        if not rows:
+            break
+        scanned += len(rows)
+        # Carriers without any attribute can never join a cluster
+        carriers.extend(row for row in rows if any(row.get(kind) for kind in ATTRIBUTE_WEIGHTS))
+        after = rows[-1]["usdot"]
+
+    clusters = cluster_carriers(carriers)
+    for i in range(0, len(clusters), WRITE_BATCH_SIZE):
+        repo.write_clusters(clusters[i:i + WRITE_BATCH_SIZE], generation)
+    stale = repo.delete_other_generations(generation)
+
+    stats = {
+        "carriers_scanned": scanned,
+        "clusters": len(clusters),
+        "clustered_carriers": sum(cluster["size"] for cluster in clusters),
+        "stale_clusters_deleted": stale,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    logger.info(f"Chameleon clusters rebuilt: {stats}")
+    return stats
+
+
+def update_chameleon_clusters(usdots: List[int], repo=None) -> Dict:
+    """Recompute the clusters of carriers whose attributes changed.
+
+    Starting from the carriers and the members of their current clusters,
+    carriers sharing a linking value are pulled in until the connected
+    groups are complete. Those groups replace the clusters any of their
+    carriers belonged to. A value that became too common since the last
+    rebuild only stops linking carriers reached from ``usdots``; the next
+    full rebuild corrects the rest.
+
+    Args:
+        usdots: USDOT numbers of the changed carriers
+        repo: ChameleonClusterRepository, created if not provided
+
+    Returns:
+        dict: Carriers recomputed and clusters written
+    """
+    if not usdots:
+        return {"carriers": 0, "clusters": 0}
+    repo = _cluster_repo(repo)
+
+    carriers: Dict[int, Dict] = {}
+    visited: Set[int] = set()
+    checked: Set[Tuple[str, str]] = set()
+    hubs: Set[Tuple[str, str]] = set()
+    frontier = set(usdots) | set(repo.get_cluster_members(list(usdots)))
+    while frontier:
+        rows = repo.get_carrier_attributes_for(sorted(frontier))
+        visited |= frontier
+        frontier = set()
+        new_values: Dict[str, List[str]] = {}
+        for row in rows:
+            carriers[row["usdot"]] = row
+            for key in _carrier_values(row):
+                if key not in checked:
+                    checked.add(key)
+                    new_values.setdefault(key[0], []).append(key[1])
+
+        for kind, values in new_values.items():
+            cap = MAX_ATTRIBUTE_CARRIERS[kind]
+            for holder in repo.get_attribute_holders(kind, values, cap):
+                if len(holder["usdots"]) > cap:
+                    hubs.add((kind, holder["value"]))
+                else:
+                    frontier.update(holder["usdots"])
+        frontier -= visited
+        if frontier:
+            frontier |= set(repo.get_cluster_members(sorted(frontier))) - visited
+
+    clusters = cluster_carriers(carriers.values(), hub_values=hubs)
+    repo.replace_clusters(sorted(carriers), clusters, uuid.uuid4().hex)
+    return {"carriers": len(carriers), "clusters": len(clusters)}
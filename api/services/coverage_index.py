@@ -0,0 +1,231 @@
+"""
+In-memory index of insurance coverage for point-in-time queries.
+
+"Who was uninsured on these dates?" used to be a NOT EXISTS subquery over
+every carrier's policies per date. The index instead keeps, per carrier,
+the HAD_INSURANCE periods merged into sorted, non-overlapping day ranges,
+so whether a carrier was covered on a day is one binary search.
+
+The index is loaded from Neo4j on first use and then kept current by
+reloading only carriers created or whose insurance was written since the
+last sync. Insurance writes stamp the carrier when they rescore it,
+including writes made by the enrichment worker process, and carrier
+creation stamps it too, so the API's copy catches up within one sync
+interval. Deleted carriers leave no stamp; a sync drops them once the
+carrier count no longer matches the index. Writes made in this process can
+reload their carriers immediately with refresh_carriers.
+"""
+
+import time
+import logging
+import threading
+from bisect import bisect_right
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+from utils.date_ranges import merge_periods
+
+logger = logging.getLogger(__name__)
+
+
+# Changes are re-read from a little before the last sync, so writes that
+# committed after stamping their carrier are not missed
+SYNC_OVERLAP = timedelta(minutes=5)
+
+# Carriers loaded per query during a full build
+BUILD_PAGE_SIZE = 5000
+
+
+class CoverageIndex:
+    """Merged coverage ranges per carrier, synchronized from Neo4j."""
+
+    def __init__(self, carrier_repo=None, sync_seconds: Optional[float] = None):
+        """Initialize an empty index; unset arguments come from settings.
+
+        Args:
+            carrier_repo: CarrierRepository, created lazily if not provided
+            sync_seconds: Seconds after which a query first syncs changed carriers
+        """
+        self._carrier_repo = carrier_repo
+        self.sync_seconds = settings.coverage_index_sync_seconds if sync_seconds is None else sync_seconds
+        # usdot -> (start days, end days); entries are replaced, never mutated
+        self._coverage: Dict[int, Tuple[List[int], List[int]]] = {}
+        self._built = False
+        self._synced_at: Optional[datetime] = None
+        self._synced_monotonic = 0.0
+        self._sync_lock = threading.Lock()
+
+    @property
+    def carrier_repo(self):
+        if self._carrier_repo is None:
+            from repositories.carrier_repository import CarrierRepository
+            self._carrier_repo = CarrierRepository()
+        return self._carrier_repo
+
+    @property
+    def synced_at(self) -> Optional[str]:
+        """When the index last caught up with Neo4j (ISO), or None before the first build."""
+        return self._synced_at.isoformat() if self._synced_at else None
+
+    def _load(self, rows: List[Dict]):
+        for row in rows:
+            self._coverage[row["usdot"]] = merge_periods(row["periods"])
+
+    def build(self):
+        """Load every carrier's coverage from Neo4j, replacing the index."""
+        start = time.perf_counter()
+        synced_at = datetime.now(timezone.utc)
+        coverage: Dict[int, Tuple[List[int], List[int]]] = {}
+        after = -1
+        while True:
+            rows = self.carrier_repo.get_coverage_intervals(after, BUILD_PAGE_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                coverage[row["usdot"]] = merge_periods(row["periods"])
+            after = rows[-1]["usdot"]
+
+        self._coverage = coverage
+        self._built = True
+        self._synced_at = synced_at
+        self._synced_monotonic = time.monotonic()
+        logger.info(f"Coverage index built for {len(coverage)} carriers in {time.perf_counter() - start:.2f}s")
+
+    def _remove_deleted(self) -> int:
+        """Drop carriers that no longer exist in the graph.
+
+        Returns:
+            int: Number of carriers dropped
+        """
+        existing = set()
+        after = -1
+        while True:
+            usdots = self.carrier_repo.get_carrier_usdots(after, BUILD_PAGE_SIZE)
+            if not usdots:
+                break
+            existing.update(usdots)
+            after = usdots[-1]
+
+        deleted = [usdot for usdot in list(self._coverage) if usdot not in existing]
+        for usdot in deleted:
+            self._coverage.pop(usdot, None)
+        return len(deleted)
+
+    def sync(self) -> int:
+        """Reload carriers that changed since the last sync and drop deleted ones.
+
+        Returns:
+            int: Number of carriers reloaded
+        """
+        synced_at = datetime.now(timezone.utc)
+        since = (self._synced_at - SYNC_OVERLAP).isoformat()
+        changed = self.carrier_repo.get_insurance_changed_carriers(since)
+        if changed:
+            self._load(self.carrier_repo.get_coverage_intervals_for(changed))
+        # Only a count mismatch pays for the full USDOT scan
+        if self.carrier_repo.count_carriers() != len(self._coverage):
+            deleted = self._remove_deleted()
+            if deleted:
+                logger.info(f"Coverage index dropped {deleted} deleted carriers")
+        self._synced_at = synced_at
+        self._synced_monotonic = time.monotonic()
+        return len(changed)
+
+    def refresh_carriers(self, usdots: List[int]):
+        """Reload the given carriers now, e.g. right after writing their insurance.
+
+        Carriers that no longer exist are dropped from the index.
+
+        Args:
+            usdots: USDOT numbers of the carriers
+        """
+        if self._built and usdots:
+            rows = self.carrier_repo.get_coverage_intervals_for(usdots)
+            self._load(rows)
+            for usdot in set(usdots) - {row["usdot"] for row in rows}:
+                self._coverage.pop(usdot, None)
+
+    def ensure_current(self):
+        """Build the index on first use and sync it once the sync interval has passed.
+
+        Only one thread syncs at a time; while it does, other queries are
+        answered from the data already loaded.
+        """
+        if not self._built:
+            with self._sync_lock:
+                if not self._built:
+                    self.build()
+            return
+        if time.monotonic() - self._synced_monotonic < self.sync_seconds:
+            return
+        if self._sync_lock.acquire(blocking=False):
+            try:
+                self.sync()
+            except Exception as e:
+                logger.warning(f"Coverage index sync failed, serving previous data: {e}")
+            finally:
+                self._sync_lock.release()
+
+    @staticmethod
+    def _covered(coverage: Tuple[List[int], List[int]], day: int) -> bool:
+        starts, ends = coverage
+        # Last range starting on or before the day
+        i = bisect_right(starts, day) - 1
+        return i >= 0 and ends[i] >= day
+
+    def is_covered(self, usdot: int, check_date: date) -> bool:
+        """Whether a carrier had insurance on a date.
+
+        Args:
+            usdot: Carrier USDOT number
+            check_date: Day to check
+
+        Returns:
+            bool: True if a policy covered the day
+        """
+        self.ensure_current()
+        coverage = self._coverage.get(usdot)
+        return coverage is not None and self._covered(coverage, check_date.toordinal())
+
+    def uninsured_on(self, check_date: date) -> List[int]:
+        """Carriers without insurance on a date.
+
+        Args:
+            check_date: Day to check
+
+        Returns:
+            list: USDOT numbers of the uninsured carriers
+        """
+        return self.uninsured_on_dates([check_date])[check_date]
+
+    def uninsured_on_dates(self, dates: List[date]) -> Dict[date, List[int]]:
+        """Carriers without insurance on each of several dates.
+
+        Args:
+            dates: Days to check
+
+        Returns:
+            dict: USDOT numbers of the uninsured carriers per date
+        """
+        self.ensure_current()
+        days = [(check_date, check_date.toordinal()) for check_date in dict.fromkeys(dates)]
+        uninsured: Dict[date, List[int]] = {check_date: [] for check_date, _ in days}
+        for usdot, coverage in list(self._coverage.items()):
+            for check_date, day in days:
+                if not self._covered(coverage, day):
+                    uninsured[check_date].append(usdot)
+        return uninsured
+
+
+_coverage_index: Optional[CoverageIndex] = None
+_coverage_index_lock = threading.Lock()
+
+
+def get_coverage_index() -> CoverageIndex:
+    """Process-wide coverage index."""
+    global _coverage_index
+    with _coverage_index_lock:
+        if _coverage_index is None:
+            _coverage_index = CoverageIndex()
+        return _coverage_index
@@ -0,0 +1,240 @@
+"""
+Sort-and-sweep analysis of a carrier's insurance coverage periods.
+
+Each carrier's HAD_INSURANCE periods are sorted once by start date and
+swept in order. The sweep tracks how far coverage reaches so far and
+which policies are still running. A period starting after that reach
+opens a gap. A period starting before a running policy ends overlaps it.
+That is O(k log k) per carrier plus the overlaps reported, instead of
+joining every pair of policies.
+
+Gap and overlap lengths follow the convention of PRECEDED_BY ``gap_days``:
+the number of days between the two dates, so a policy ending on the day
+the next one starts leaves no gap and has no overlap. Uncovered-day totals
+count whole days, with both ends of a period covered.
+
+The carrier-level reports at the end read periods through
+CarrierRepository.iter_coverage_intervals, one USDOT-ordered page at a
+time, so every carrier's periods are read once.
+"""
+
+import heapq
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from repositories.carrier_repository import CarrierRepository
+from utils.date_ranges import OPEN_END, merge_periods, to_day
+
+_carrier_repo = None
+
+
+def _get_carrier_repo():
+    """Lazily create the shared carrier repository."""
+    global _carrier_repo
+    if _carrier_repo is None:
+        _carrier_repo = CarrierRepository()
+    return _carrier_repo
+
+
+def _sorted_periods(periods: Iterable[Dict]) -> List[tuple]:
+    """(start, end, period) per valid period sorted by start; open ends are OPEN_END."""
+    spans = []
+    for period in periods:
+        start = to_day(period.get("from_date"))
+        if start is None:
+            continue
+        end = to_day(period.get("to_date"))
+        end = OPEN_END if end is None else end
+        if end >= start:
+            spans.append((start, end, period))
+    spans.sort(key=lambda span: (span[0], span[1]))
+    return spans
+
+
+def find_gaps(periods: Iterable[Dict], min_gap_days: int = 1) -> List[Dict]:
+    """Find the holes in a carrier's coverage.
+
+    Args:
+        periods: Coverage periods with ``from_date``, ``to_date`` and
+            optionally ``policy_id`` and ``provider_name``
+        min_gap_days: Smallest gap to report
+
+    Returns:
+        list: Gaps in date order, each with the policy whose coverage ended
+            and the policy that resumed it
+    """
+    gaps = []
+    reach = None
+    last = None
+    for start, end, period in _sorted_periods(periods):
+        if reach is not None and start - reach >= max(min_gap_days, 1):
+            gaps.append({
+                "from_policy": last.get("policy_id"),
+                "to_policy": period.get("policy_id"),
+                "gap_start": last.get("to_date"),
+                "gap_end": period.get("from_date"),
+                "gap_days": start - reach,
+                "from_provider": last.get("provider_name"),
+                "to_provider": period.get("provider_name")
+            })
+        if reach is None or end > reach:
+            reach, last = end, period
+        if reach == OPEN_END:
+            break
+    return gaps
+
+
+def find_overlaps(periods: Iterable[Dict], today: Optional[date] = None) -> List[Dict]:
+    """Find pairs of a carrier's policies that were in force at the same time.
+
+    Args:
+        periods: Coverage periods with ``from_date``, ``to_date`` and
+            optionally ``policy_id`` and ``provider_name``
+        today: End of open-ended periods when measuring overlaps (defaults to today)
+
+    Returns:
+        list: Overlapping pairs, the earlier-starting policy first
+    """
+    today = (today or date.today()).toordinal()
+    overlaps = []
+    # Policies still running at the current start, ordered by end
+    running: List[tuple] = []
+    for index, (start, end, period) in enumerate(_sorted_periods(periods)):
+        while running and running[0][0] <= start:
+            heapq.heappop(running)
+        for other_end, _, other in running:
+            # Open-ended overlaps are measured up to today
+            overlap_end = min(other_end, end)
+            overlap_end = today if overlap_end == OPEN_END else overlap_end
+            overlaps.append({
+                "policy1_id": other.get("policy_id"),
+                "policy1_provider": other.get("provider_name"),
+                "policy1_from": other.get("from_date"),
+                "policy1_to": other.get("to_date"),
+                "policy2_id": period.get("policy_id"),
+                "policy2_provider": period.get("provider_name"),
+                "policy2_from": period.get("from_date"),
+                "policy2_to": period.get("to_date"),
+                "overlap_days": max(0, overlap_end - start)
+            })
+        heapq.heappush(running, (end, index, period))
+    return overlaps
+
+
+def uncovered_days(periods: Iterable[Dict], start_date: date, end_date: date) -> int:
+    """Count the days in a range on which no policy was in force.
+
+    Overlapping policies are counted once.
+
+    Args:
+        periods: Coverage periods with ``from_date`` and ``to_date``
+        start_date: First day of the range
+        end_date: Last day of the range
+
+    Returns:
+        int: Uncovered days, 0 for an empty range
+    """
+    first, last = start_date.toordinal(), end_date.toordinal()
+    if last < first:
+        return 0
+    covered = 0
+    for start, end in zip(*merge_periods(periods)):
+        if end < first or start > last:
+            continue
+        covered += min(end, last) - max(start, first) + 1
+    return (last - first + 1) - covered
+
+
+def sweep_carriers(rows: Iterable[Dict], min_gap_days: Optional[int] = None,
+                   overlaps: bool = False, today: Optional[date] = None) -> Iterator[Dict]:
+    """Analyse carriers one at a time as their periods stream in.
+
+    Args:
+        rows: Carriers with ``usdot`` and ``periods`` (e.g. from
+            CarrierRepository.iter_coverage_intervals)
+        min_gap_days: Find gaps of at least this many days (skipped if None)
+        overlaps: Find overlapping policies
+        today: End of open-ended periods when measuring overlaps
+
+    Yields:
+        dict: The carrier row with ``gaps`` and/or ``overlaps`` added
+    """
+    for row in rows:
+        result = dict(row)
+        if min_gap_days is not None:
+            result["gaps"] = find_gaps(row["periods"], min_gap_days)
+        if overlaps:
+            result["overlaps"] = find_overlaps(row["periods"], today)
+        yield result
+
+
+def find_overlapping_policies(carrier_repo=None) -> List[Dict]:
+    """Find carriers with overlapping insurance policies.
+
+    Args:
+        carrier_repo: CarrierRepository (defaults to a shared instance)
+
+    Returns:
+        list: Overlapping policy pairs with the carrier, longest overlap first
+    """
+    carrier_repo = carrier_repo or _get_carrier_repo()
+    overlaps = []
+    for carrier in sweep_carriers(carrier_repo.iter_coverage_intervals(), overlaps=True):
+        for overlap in carrier["overlaps"]:
+            overlaps.append({
+                "carrier_usdot": carrier["usdot"],
+                "carrier_name": carrier["carrier_name"],
+                **overlap
+            })
+    overlaps.sort(key=lambda overlap: overlap["overlap_days"], reverse=True)
+    return overlaps
+
+
+def calculate_total_days_without_coverage(carrier_usdot: int, start_date: date, end_date: date,
+                                          carrier_repo=None) -> int:
+    """Count the days in a range on which a carrier had no insurance.
+
+    Args:
+        carrier_usdot: The carrier's USDOT number
+        start_date: First day of the range
+        end_date: Last day of the range
+        carrier_repo: CarrierRepository (defaults to a shared instance)
+
+    Returns:
+        int: Uncovered days, 0 for an unknown carrier
+    """
+    carrier_repo = carrier_repo or _get_carrier_repo()
+    rows = carrier_repo.get_coverage_intervals_for([carrier_usdot])
+    if not rows:
+        return 0
+    return uncovered_days(rows[0]["periods"], start_date, end_date)
+
+
+def find_carriers_with_coverage_gaps(gap_threshold_days: int = 30, carrier_repo=None) -> List[Dict]:
+    """Find carriers with stretches not covered by any policy.
+
+    Args:
+        gap_threshold_days: Minimum gap size to report
+        carrier_repo: CarrierRepository (defaults to a shared instance)
+
+    Returns:
+        list: Carriers with their gaps, largest total gap first
+    """
+    carrier_repo = carrier_repo or _get_carrier_repo()
+    carriers = []
+    for carrier in sweep_carriers(carrier_repo.iter_coverage_intervals(), min_gap_days=gap_threshold_days):
+        gaps = carrier["gaps"]
+        if not gaps:
+            continue
+        carriers.append({
+            "carrier_usdot": carrier["usdot"],
+            "carrier_name": carrier["carrier_name"],
+            "gap_count": len(gaps),
+            "max_gap_days": max(gap["gap_days"] for gap in gaps),
+            "total_gap_days": sum(gap["gap_days"] for gap in gaps),
+            "gaps": gaps,
+            "violations": carrier["violations"],
+            "crashes": carrier["crashes"]
+        })
+    carriers.sort(key=lambda carrier: carrier["total_gap_days"], reverse=True)
+    return carriers
@@ -0,0 +1,201 @@
+"""
+Sliding-window clustering of a carrier's crashes.
+
+A carrier's crashes are sorted once by date and scanned with two pointers:
+the window opens at the earliest unclustered crash and stretches over every
+crash within ``days_window`` days of it. A window holding at least
+``min_size`` crashes becomes a cluster and the scan resumes after it;
+otherwise the window start moves on by one crash. Each crash belongs to at
+most one cluster and no cluster can take in a later crash without spanning
+more than the window. That is O(k log k) per carrier for the sort plus a
+linear scan, instead of comparing every pair of crashes.
+
+Carriers stream through the same scan one at a time, so the whole fleet is
+clustered in a single pass and only the top-ranked carriers are kept.
+"""
+
+import heapq
+from datetime import date
+from typing import Dict, Iterable, Iterator, List
+
+from repositories.crash_repository import CrashRepository
+from utils.date_ranges import to_day
+
+
+# Smallest number of crashes that counts as a cluster
+MIN_CLUSTER_SIZE = 2
+
+# Smallest cluster that makes a carrier's crashes a burst in the fleet ranking
+MIN_BURST_SIZE = 3
+
+_crash_repo = None
+
+
+def _get_crash_repo():
+    """Lazily create the shared crash repository."""
+    global _crash_repo
+    if _crash_repo is None:
+        _crash_repo = CrashRepository()
+    return _crash_repo
+
+
+def _iso(day: int) -> str:
+    """ISO date of an ordinal day."""
+    return date.fromordinal(day).isoformat()
+
+
+def find_clusters(crashes: Iterable[Dict], days_window: int = 30,
+                  min_size: int = MIN_CLUSTER_SIZE) -> List[Dict]:
+    """Split a carrier's crashes into maximal non-overlapping clusters.
+
+    Args:
+        crashes: Crashes with ``report_number``, ``crash_date`` and
+            optionally ``fatalities`` and ``injuries``
+        days_window: Most days between the first and last crash of a cluster
+        min_size: Fewest crashes in a cluster
+
+    Returns:
+        list: Clusters in date order, each with its first and last date,
+            span, report numbers, size and casualty totals
+    """
+    dated = []
+    for crash in crashes:
+        day = to_day(crash.get("crash_date"))
+        if day is not None:
+            dated.append((day, crash))
+    dated.sort(key=lambda item: item[0])
+
+    clusters = []
+    start = end = 0
+    while start < len(dated):
+        end = max(end, start)
+        while end < len(dated) and dated[end][0] - dated[start][0] <= days_window:
+            end += 1
+        if end - start < max(min_size, 1):
+            start += 1
+            continue
+
+        members = [crash for _, crash in dated[start:end]]
+        first, last = dated[start][0], dated[end - 1][0]
+        clusters.append({
+            "cluster_start": _iso(first),
+            "cluster_end": _iso(last),
+            "span_days": last - first,
+            "crash_reports": [crash.get("report_number") for crash in members],
+            "cluster_size": len(members),
+            "fatalities": sum(crash.get("fatalities") or 0 for crash in members),
+            "injuries": sum(crash.get("injuries") or 0 for crash in members)
+        })
+        start = end
+    return clusters
+
+
+def cluster_carriers(rows: Iterable[Dict], days_window: int = 30,
+                     min_size: int = MIN_CLUSTER_SIZE) -> Iterator[Dict]:
+    """Cluster carriers one at a time as their crashes stream in.
+
+    Args:
+        rows: Carriers with ``usdot`` and ``crashes`` (e.g. from
+            CrashRepository.iter_carrier_crashes)
+        days_window: Most days between the first and last crash of a cluster
+        min_size: Fewest crashes in a cluster
+
+    Yields:
+        dict: The carrier row with ``clusters`` added
+    """
+    for row in rows:
+        yield {**row, "clusters": find_clusters(row["crashes"], days_window, min_size)}
+
+
+def burst_summary(carrier: Dict) -> Dict:
+    """Summarize a clustered carrier for the crash burst ranking.
+
+    Args:
+        carrier: A cluster_carriers row
+
+    Returns:
+        dict: USDOT, cluster count, clustered crashes, largest cluster,
+            casualties within clusters and the clusters themselves
+    """
+    clusters = carrier["clusters"]
+    return {
+        "usdot": carrier["usdot"],
+        "total_crashes": len(carrier["crashes"]),
+        "cluster_count": len(clusters),
+        "clustered_crashes": sum(cluster["cluster_size"] for cluster in clusters),
+        "largest_cluster": max((cluster["cluster_size"] for cluster in clusters), default=0),
+        "fatalities": sum(cluster["fatalities"] for cluster in clusters),
+        "injuries": sum(cluster["injuries"] for cluster in clusters),
+        "clusters": clusters
+    }
+
+
+def rank_crash_bursts(rows: Iterable[Dict], days_window: int = 30,
+                      min_size: int = MIN_BURST_SIZE, limit: int = 100) -> List[Dict]:
+    """Rank carriers by their crash bursts in one pass over the fleet.
+
+    Carriers are ordered by their largest cluster, then by crashes inside
+    clusters, fatalities and injuries. Only the top ``limit`` summaries are
+    held in memory.
+
+    Args:
+        rows: Carriers with ``usdot`` and ``crashes``
+        days_window: Most days between the first and last crash of a burst
+        min_size: Fewest crashes in a burst
+        limit: Maximum number of carriers to return
+
+    Returns:
+        list: burst_summary of each ranked carrier, worst first
+    """
+    summaries = (
+        burst_summary(carrier)
+        for carrier in cluster_carriers(rows, days_window, min_size)
+        if carrier["clusters"]
+    )
+    return heapq.nlargest(limit, summaries, key=lambda summary: (
+        summary["largest_cluster"],
+        summary["clustered_crashes"],
+        summary["fatalities"],
+        summary["injuries"],
+        -summary["usdot"]
+    ))
+
+
+def find_crash_clusters(usdot: int, days_window: int = 30, min_size: int = MIN_CLUSTER_SIZE,
+                        crash_repo=None) -> List[Dict]:
+    """Find non-overlapping clusters of one carrier's crashes.
+
+    Args:
+        usdot: The USDOT number of the carrier
+        days_window: Most days between the first and last crash of a cluster
+        min_size: Fewest crashes in a cluster
+        crash_repo: CrashRepository (defaults to a shared instance)
+
+    Returns:
+        list: Crash clusters, largest first
+    """
+    crash_repo = crash_repo or _get_crash_repo()
+    clusters = find_clusters(crash_repo.get_crash_timeline(usdot), days_window, min_size)
+    clusters.sort(key=lambda cluster: (cluster["cluster_size"], cluster["cluster_start"]), reverse=True)
+    return clusters
+
+
+def find_carriers_with_crash_bursts(days_window: int = 30, min_cluster_size: int = MIN_BURST_SIZE,
+                                    limit: int = 100, crash_repo=None) -> List[Dict]:
+    """Rank carriers by bursts of crashes close together in time.
+
+    Args:
+        days_window: Most days between the first and last crash of a burst
+        min_cluster_size: Fewest crashes in a burst
+        limit: Maximum number of carriers to return
+        crash_repo: CrashRepository (defaults to a shared instance)
+
+    Returns:
+        list: Carriers with their bursts and names, worst first
+    """
+    crash_repo = crash_repo or _get_crash_repo()
+    ranked = rank_crash_bursts(crash_repo.iter_carrier_crashes(), days_window, min_cluster_size, limit)
+    if not ranked:
+        return []
+    names = crash_repo.get_carrier_names([row["usdot"] for row in ranked])
+    return [{**row, "carrier_name": names.get(row["usdot"])} for row in ranked]
@@ -0,0 +1,253 @@
+"""
+Per-job cost accounting for SearchCarriers enrichment.
+
+A CostMeter is installed with utils.cost_context.metering while a carrier
+is enriched. The SearchCarriers client records every upstream request into
+it (per endpoint template, with bytes and latency), coalesced requests
+count as cache hits, the repositories record their Neo4j statements and
+write counters, and the enrichment service records wall time per family.
+
+Meters serialize to plain dictionaries of counters that merge by addition,
+so per-carrier costs can be folded into a job total stored on the queue.
+Latencies are kept as fixed-bucket histograms rather than samples, which
+keeps the job total a constant size however many carriers it covers;
+percentiles are read from the histogram and are therefore upper bounds at
+bucket resolution.
+"""
+
+import re
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Re-exported so enrichment code installs and reads meters from one place
+from utils.cost_context import current_meter, metering
+
+# Upper bounds, in milliseconds, of the latency histogram buckets; the last
+# bucket is unbounded
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+# Neo4j summary counters accumulated per job
+DB_WRITE_COUNTERS = [
+    "nodes_created", "nodes_deleted", "relationships_created",
+    "relationships_deleted", "properties_set"
+]
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Group endpoints by path shape, e.g. ``/carrier/123/crashes`` -> ``/carrier/{id}/crashes``."""
+    return re.sub(r"/\d+(?=/|$)", "/{id}", endpoint)
+
+
+def latency_bucket(latency_ms: float) -> int:
+    """Index of the LATENCY_BUCKETS_MS bucket holding ``latency_ms``."""
+    for index, bound in enumerate(LATENCY_BUCKETS_MS):
+        if latency_ms <= bound:
+            return index
+    return len(LATENCY_BUCKETS_MS)
+
+
+class CostMeter:
+    """Thread-safe accumulator of the costs of one unit of enrichment work."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._upstream: Dict[str, Dict] = {}
+        self._cache_hits: Dict[str, int] = {}
+        self._database = {"statements": 0, "time_ms": 0.0, **{key: 0 for key in DB_WRITE_COUNTERS}}
+        self._stages_ms: Dict[str, float] = {}
+
+    def record_request(self, endpoint: str, response_bytes: int, latency_ms: float, error: bool = False):
+        """Record one upstream HTTP request.
+
+        Args:
+            endpoint: Requested API path
+            response_bytes: Size of the response body
+            latency_ms: Round-trip time of the request
+            error: Whether the request failed
+        """
+        with self._lock:
+            stats = self._upstream.setdefault(endpoint_template(endpoint), {
+                "requests": 0, "bytes": 0, "errors": 0, "latency_ms_total": 0.0,
+                "latency_ms_max": 0.0, "latency_histogram": [0] * (len(LATENCY_BUCKETS_MS) + 1)
+            })
+            stats["requests"] += 1
+            stats["bytes"] += response_bytes
+            stats["errors"] += int(error)
+            stats["latency_ms_total"] += latency_ms
+            stats["latency_ms_max"] = max(stats["latency_ms_max"], latency_ms)
+            stats["latency_histogram"][latency_bucket(latency_ms)] += 1
+
+    def record_cache_hit(self, endpoint: str):
+        """Record a request served without going upstream."""
+        with self._lock:
+            key = endpoint_template(endpoint)
+            self._cache_hits[key] = self._cache_hits.get(key, 0) + 1
+
+    def record_database(self, statements: int, elapsed_ms: float, counters: Optional[Dict] = None):
+        """Record Neo4j statements and the writes they made.
+
+        Args:
+            statements: Cypher statements executed
+            elapsed_ms: Time spent in the database round trips
+            counters: Summary counters of the statements, keyed like DB_WRITE_COUNTERS
+        """
+        with self._lock:
+            self._database["statements"] += statements
+            self._database["time_ms"] += elapsed_ms
+            for key in DB_WRITE_COUNTERS:
+                self._database[key] += (counters or {}).get(key, 0)
+
+    def add_stage(self, stage: str, elapsed_ms: float):
+        """Add wall time spent in a stage."""
+        with self._lock:
+            self._stages_ms[stage] = self._stages_ms.get(stage, 0.0) + elapsed_ms
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Time the block as part of ``stage``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(stage, (time.perf_counter() - start) * 1000)
+
+    @property
+    def upstream_requests(self) -> int:
+        """Upstream requests recorded so far."""
+        with self._lock:
+            return sum(stats["requests"] for stats in self._upstream.values())
+
+    def to_dict(self) -> Dict:
+        """Serializable counters, mergeable with merge_costs."""
+        with self._lock:
+            return {
+                "upstream": {
+                    endpoint: {**stats, "latency_histogram": list(stats["latency_histogram"])}
+                    for endpoint, stats in self._upstream.items()
+                },
+                "cache_hits": dict(self._cache_hits),
+                "database": dict(self._database),
+                "stages_ms": dict(self._stages_ms)
+            }
+
+
+def merge_costs(total: Optional[Dict], cost: Optional[Dict]) -> Dict:
+    """Add the counters of ``cost`` to ``total``.
+
+    Numbers and histograms add up; keys ending in ``_max`` keep the maximum.
+
+    Args:
+        total: Accumulated counters (not modified)
+        cost: Counters to add
+
+    Returns:
+        dict: The combined counters
+    """
+    merged = dict(total or {})
+    for key, value in (cost or {}).items():
+        current = merged.get(key)
+        if current is None:
+            merged[key] = value
+        elif isinstance(value, dict):
+            merged[key] = merge_costs(current, value)
+        elif isinstance(value, list):
+            merged[key] = [a + b for a, b in zip(current, value)]
+        elif key.endswith("_max"):
+            merged[key] = max(current, value)
+        else:
+            merged[key] = current + value
+    return merged
+
+
+def histogram_percentile(histogram: List[int], pct: float, max_value: float) -> Optional[float]:
+    """Read a percentile from a latency histogram.
+
+    Args:
+        histogram: Counts per LATENCY_BUCKETS_MS bucket
+        pct: Percentile between 0 and 100
+        max_value: Largest observed value, reported for the unbounded bucket
+
+    Returns:
+        float: Upper bound of the bucket holding the percentile, or None if empty
+    """
+    count = sum(histogram)
+    if not count:
+        return None
+    rank = max(1, -(-count * pct // 100))
+    seen = 0
+    for index, n in enumerate(histogram):
+        seen += n
+        if seen >= rank:
+            bound = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else max_value
+            return float(min(bound, max_value))
+    return float(max_value)
+
+
+def cost_report(cost: Optional[Dict]) -> Dict:
+    """Summarize accumulated counters for the job status report.
+
+    Args:
+        cost: Counters as produced by CostMeter.to_dict / merge_costs
+
+    Returns:
+        dict: Per-endpoint requests, bytes, errors, cache hits and latency
+            percentiles, upstream totals, database counters and wall time per stage
+    """
+    cost = cost or {}
+    endpoints = {}
+    for endpoint, stats in sorted(cost.get("upstream", {}).items()):
+        requests = stats["requests"]
+        histogram = stats["latency_histogram"]
+        endpoints[endpoint] = {
+            "requests": requests,
+            "bytes": stats["bytes"],
+            "errors": stats["errors"],
+            "cache_hits": cost.get("cache_hits", {}).get(endpoint, 0),
+            "latency_ms": {
+                "mean": round(stats["latency_ms_total"] / requests, 1) if requests else None,
+                "p50": histogram_percentile(histogram, 50, stats["latency_ms_max"]),
+                "p90": histogram_percentile(histogram, 90, stats["latency_ms_max"]),
+                "p99": histogram_percentile(histogram, 99, stats["latency_ms_max"]),
+                "max": round(stats["latency_ms_max"], 1)
+            }
+        }
+    for endpoint, hits in cost.get("cache_hits", {}).items():
+        endpoints.setdefault(endpoint, {"requests": 0, "bytes": 0, "errors": 0, "cache_hits": hits})
+
+    requests = sum(stats["requests"] for stats in endpoints.values())
+    cache_hits = sum(stats["cache_hits"] for stats in endpoints.values())
+    database = dict(cost.get("database") or {"statements": 0, "time_ms": 0.0})
+    database["time_ms"] = round(database.get("time_ms", 0.0), 1)
+
+    return {
+        "upstream_requests": requests,
+        "upstream_bytes": sum(stats["bytes"] for stats in endpoints.values()),
+        "upstream_errors": sum(stats["errors"] for stats in endpoints.values()),
+        "cache_hits": cache_hits,
+        "cache_hit_rate": round(cache_hits / (requests + cache_hits), 3) if requests + cache_hits else 0.0,
+        "endpoints": endpoints,
+        "database": database,
+        "stages_ms": {stage: round(ms, 1) for stage, ms in sorted(cost.get("stages_ms", {}).items())}
+    }
+
+
+def budget_exceeded(options: Dict, upstream_requests: int, elapsed_seconds: float) -> Optional[str]:
+    """Check a job's caps.
+
+    Args:
+        options: Job options, optionally with ``max_requests`` and ``max_duration_seconds``
+        upstream_requests: Upstream requests the job has made so far
+        elapsed_seconds: Time since the job's first carrier started
+
+    Returns:
+        str: Why the job must stop, or None while it is within its caps
+    """
+    max_requests = options.get("max_requests")
+    if max_requests is not None and upstream_requests >= max_requests:
+        return f"max_requests reached ({upstream_requests}/{max_requests})"
+    max_duration = options.get("max_duration_seconds")
+    if max_duration is not None and elapsed_seconds >= max_duration:
+        return f"max_duration_seconds reached ({elapsed_seconds:.0f}s/{max_duration}s)"
+    return None
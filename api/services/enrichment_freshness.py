@@ -0,0 +1,173 @@
+"""
+Freshness probe for SearchCarriers re-enrichment.
+
+Each full enrichment of a data family stores a watermark: the upstream record
+count, the latest record date and a hash of the probed payload. Before the next
+full fetch, the first page (the cheapest call that carries all three signals)
+is compared against the stored watermark and the rest of the fetch and all
+graph writes are skipped when nothing changed. The probed page is handed back
+to the caller so a changed carrier costs no extra request.
+"""
+
+import json
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional, Any, Tuple
+
+from services.searchcarriers_normalizer import to_date
+
+logger = logging.getLogger(__name__)
+
+
+# Record date used for the max-date watermark of each family
+FAMILY_DATE_FIELDS = {
+    "insurance": "effective_date",
+    "safety": None,
+    "crashes": "crash_date",
+    "inspections": "inspection_date",
+}
+
+# Fields added locally by the client that must not affect the payload hash
+VOLATILE_FIELDS = {"dot_number", "fetched_at"}
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: v for k, v in value.items() if k not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [_strip_volatile(item) for item in value]
+    return value
+
+
+def compute_watermark(family: str, response: Dict) -> Dict:
+    """Compute the watermark for a probed response.
+
+    Args:
+        family: Data family ("insurance", "safety", "crashes" or "inspections")
+        response: First page (or only page) of the upstream response
+
+    Returns:
+        dict: ``record_count``, ``max_date`` (ISO string or None) and ``payload_hash``
+    """
+    data = response.get("data")
+    meta = response.get("meta") or {}
+
+    if isinstance(data, list):
+        record_count = int(meta["total"]) if meta.get("total") is not None else len(data)
+    else:
+        record_count = 1 if data else 0
+
+    max_date = None
+    date_field = FAMILY_DATE_FIELDS.get(family)
+    if date_field and isinstance(data, list):
+        dates = [d for d in (to_date(record.get(date_field)) for record in data) if d]
+        if dates:
+            max_date = max(dates).isoformat()
+
+    canonical = json.dumps(_strip_volatile(data), sort_keys=True, default=str)
+    payload_hash = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    return {
+        "record_count": record_count,
+        "max_date": max_date,
+        "payload_hash": payload_hash,
+    }
+
+
+def is_unchanged(stored: Optional[Dict], probe: Dict) -> bool:
+    """Compare a stored watermark with a freshly probed one.
+
+    Args:
+        stored: Watermark from the last full enrichment, or None
+        probe: Watermark computed from the probe response
+
+    Returns:
+        bool: True if count, max date and payload hash all match
+    """
+    if not stored:
+        return False
+    return (
+        stored.get("record_count") == probe["record_count"]
+        and stored.get("max_date") == probe["max_date"]
+        and stored.get("payload_hash") == probe["payload_hash"]
+    )
+
+
+class FreshnessProbe:
+    """Decides whether a carrier's data family needs a full re-fetch.
+
+    Watermark storage failures never block enrichment: a failed lookup is
+    treated as "changed" and a failed save is logged.
+    """
+
+    def __init__(self, watermark_repo=None):
+        """Initialize the probe.
+
+        Args:
+            watermark_repo: EnrichmentWatermarkRepository, created lazily if not provided
+        """
+        self._watermark_repo = watermark_repo
+        self._lock = threading.Lock()
+        self.stats = {"probed": 0, "unchanged": 0, "changed": 0}
+
+    @property
+    def watermark_repo(self):
+        if self._watermark_repo is None:
+            from repositories.enrichment_watermark_repository import EnrichmentWatermarkRepository
+            self._watermark_repo = EnrichmentWatermarkRepository()
+        return self._watermark_repo
+
+    def check(self, usdot: int, family: str, response: Dict) -> Tuple[bool, Dict]:
+        """Probe a family using its first page.
+
+        Args:
+            usdot: USDOT number of the carrier
+            family: Data family name
+            response: First page of the upstream response
+
+        Returns:
+            tuple: (unchanged, watermark) where watermark should be passed to
+                ``commit`` after a successful full enrichment
+        """
+        watermark = compute_watermark(family, response)
+
+        try:
+            stored = self.watermark_repo.get(usdot, family)
+        except Exception as e:
+            logger.warning(f"Could not read {family} watermark for {usdot}: {e}")
+            stored = None
+
+        unchanged = is_unchanged(stored, watermark)
+
+        with self._lock:
+            self.stats["probed"] += 1
+            self.stats["unchanged" if unchanged else "changed"] += 1
+
+        if unchanged:
+            logger.info(f"Skipping {family} for carrier {usdot}: unchanged since last enrichment")
+            try:
+                self.watermark_repo.mark_checked(usdot, family)
+            except Exception as e:
+                logger.warning(f"Could not update {family} watermark for {usdot}: {e}")
+
+        return unchanged, watermark
+
+    def commit(self, usdot: int, family: str, watermark: Dict):
+        """Store the watermark after a successful full enrichment.
+
+        Args:
+            usdot: USDOT number of the carrier
+            family: Data family name
+            watermark: Watermark returned by ``check``
+        """
+        try:
+            self.watermark_repo.upsert(
+                usdot,
+                family,
+                watermark["record_count"],
+                watermark["max_date"],
+                watermark["payload_hash"]
+            )
+        except Exception as e:
+            logger.warning(f"Could not store {family} watermark for {usdot}: {e}")
@@ -0,0 +1,714 @@
+"""
+Durable priority queue for SearchCarriers enrichment.
+
+Enrichment jobs are persisted to a local SQLite database so they survive API
+restarts and deploys. A job is split into one item per carrier; each item
+carries its own state, attempt count and next-attempt time. Failed items are
+retried with exponential backoff and moved to a dead-letter state once they
+run out of attempts. Workers always claim the most urgent available item, so
+interactive single-carrier requests jump ahead of bulk backfills. Cancelling a
+job withdraws its pending items; carriers already being enriched finish.
+Jobs also carry their accumulated cost (see services.enrichment_cost), and a
+job that exceeds its caps is stopped the same way, with the reason recorded.
+
+Claims are leases: a worker owns an item until its lease expires and renews
+the lease while it works. Items whose lease expired (the worker crashed or
+was stopped) are claimable again, results from a worker that lost its lease
+are discarded, and a carrier is never leased to two workers at once, even
+when it is queued by several jobs. Any number of worker processes can
+therefore share one queue file.
+
+The queue is single-host: the database runs in WAL mode, which relies on
+shared memory between the processes using it and does not work on network
+filesystems. The API and every worker must run on the same machine with the
+queue file on a local disk.
+"""
+
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from enum import IntEnum
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+from services.enrichment_cost import merge_costs
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Priority classes; lower values are claimed first."""
+    INTERACTIVE = 0
+    INGEST = 10
+    BULK = 20
+    REFRESH = 30
+
+
+class ItemState:
+    """Lifecycle states of a queue item."""
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    DEAD = "dead"
+    CANCELLED = "cancelled"
+
+    ALL = (PENDING, RUNNING, SUCCEEDED, DEAD, CANCELLED)
+    FINISHED = (SUCCEEDED, DEAD)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS enrichment_jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    options TEXT NOT NULL,
+    total_items INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    cancelled_at TEXT,
+    stop_reason TEXT,
+    cost TEXT
+);
+
+CREATE TABLE IF NOT EXISTS enrichment_items (
+    item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL REFERENCES enrichment_jobs(job_id),
+    usdot INTEGER NOT NULL,
+    priority INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    last_error TEXT,
+    result TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    lease_owner TEXT,
+    lease_expires_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_enrichment_items_claim
+    ON enrichment_items (state, priority, available_at, item_id);
+
+CREATE INDEX IF NOT EXISTS idx_enrichment_items_job
+    ON enrichment_items (job_id, state);
+"""
+
+# Indexes on columns added by MIGRATIONS, created once the columns exist
+POST_MIGRATION_SCHEMA = """
+CREATE INDEX IF NOT EXISTS idx_enrichment_items_lease
+    ON enrichment_items (state, usdot, lease_expires_at);
+"""
+
+# Columns added after the first release, applied to existing queue files
+MIGRATIONS = [
+    ("enrichment_jobs", "cancelled_at", "ALTER TABLE enrichment_jobs ADD COLUMN cancelled_at TEXT"),
+    ("enrichment_items", "lease_owner", "ALTER TABLE enrichment_items ADD COLUMN lease_owner TEXT"),
+    ("enrichment_items", "lease_expires_at", "ALTER TABLE enrichment_items ADD COLUMN lease_expires_at REAL"),
+    ("enrichment_jobs", "stop_reason", "ALTER TABLE enrichment_jobs ADD COLUMN stop_reason TEXT"),
+    ("enrichment_jobs", "cost", "ALTER TABLE enrichment_jobs ADD COLUMN cost TEXT"),
+]
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class EnrichmentQueue:
+    """SQLite-backed enrichment work queue.
+
+    All methods are safe to call from multiple threads; each call opens a
+    short-lived connection and claims run inside an IMMEDIATE transaction so
+    two workers never receive the same item.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 5,
+                 base_delay: float = 30.0, max_delay: float = 3600.0,
+                 lease_seconds: float = 300.0):
+        """Initialize the queue and create its tables if needed.
+
+        Args:
+            path: SQLite database file, or ":memory:" for tests
+            max_attempts: Attempts before an item is dead-lettered
+            base_delay: Backoff after the first failure, in seconds
+            max_delay: Upper bound on the backoff, in seconds
+            lease_seconds: How long a claim is valid without renewal
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._memory_conn = None
+
+        if path == ":memory:":
+            self._memory_conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+            self._memory_conn.row_factory = sqlite3.Row
+        else:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            if self._memory_conn is None:
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            for table, column, statement in MIGRATIONS:
+                columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+                if column not in columns:
+                    conn.execute(statement)
+            conn.executescript(POST_MIGRATION_SCHEMA)
+        finally:
+            if conn is not self._memory_conn:
+                conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._memory_conn is not None:
+            return self._memory_conn
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _transaction(self, fn):
+        """Run fn(conn) inside an IMMEDIATE transaction."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    result = fn(conn)
+                    conn.execute("COMMIT")
+                    return result
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            finally:
+                if conn is not self._memory_conn:
+                    conn.close()
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            conn = self._connect()
+            try:
+                return conn.execute(sql, params).fetchall()
+            finally:
+                if conn is not self._memory_conn:
+                    conn.close()
+
+    def backoff_delay(self, attempts: int) -> float:
+        """Delay before the next attempt after ``attempts`` failed attempts.
+
+        Args:
+            attempts: Attempts made so far (1 after the first failure)
+
+        Returns:
+            float: Seconds to wait, doubling per attempt up to max_delay
+        """
+        return min(self.base_delay * (2 ** max(attempts - 1, 0)), self.max_delay)
+
+    def enqueue(self, usdots: List[int], options: Optional[Dict] = None,
+                priority: Priority = Priority.BULK, kind: str = "enrichment",
+                job_id: Optional[str] = None) -> str:
+        """Create a job with one item per carrier.
+
+        Args:
+            usdots: Carrier USDOT numbers to enrich
+            options: Enrichment options shared by every item of the job
+            priority: Priority class of the job
+            kind: Free-form label of what created the job
+            job_id: Optional job identifier, generated if not given
+
+        Returns:
+            str: The job ID
+        """
+        job_id = job_id or str(uuid.uuid4())
+        created_at = _now_iso()
+        available_at = time.time()
+        # Preserve order but drop duplicates within the job
+        usdots = list(dict.fromkeys(int(u) for u in usdots))
+
+        def insert(conn):
+            conn.execute(
+                "INSERT INTO enrichment_jobs (job_id, kind, priority, options, total_items, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, int(priority), json.dumps(options or {}), len(usdots), created_at)
+            )
+            conn.executemany(
+                "INSERT INTO enrichment_items "
+                "(job_id, usdot, priority, state, max_attempts, available_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(job_id, usdot, int(priority), ItemState.PENDING, self.max_attempts, available_at, created_at)
+                 for usdot in usdots]
+            )
+
+        self._transaction(insert)
+        logger.info(f"Queued enrichment job {job_id}: {len(usdots)} carriers at priority {Priority(priority).name}")
+        return job_id
+
+    def claim(self, worker_id: str = "local") -> Optional[Dict]:
+        """Lease the most urgent available item.
+
+        Items are ordered by priority class, then by the time they became
+        available, so an interactive request queued behind a large backfill
+        is still claimed next. Running items whose lease expired are
+        available again. Carriers currently leased to any worker are skipped.
+
+        Args:
+            worker_id: Identifier of the claiming worker, recorded as lease owner
+
+        Returns:
+            dict: The claimed item with its job options, or None if nothing is due
+        """
+        def take(conn):
+            now = time.time()
+            row = conn.execute(
+                "SELECT i.*, j.options FROM enrichment_items i "
+                "JOIN enrichment_jobs j ON j.job_id = i.job_id "
+                "WHERE j.cancelled_at IS NULL "
+                "AND ((i.state = ? AND i.available_at <= ?) OR (i.state = ? AND i.lease_expires_at < ?)) "
+                "AND i.usdot NOT IN (SELECT usdot FROM enrichment_items "
+                "                    WHERE state = ? AND lease_expires_at >= ?) "
+                "ORDER BY i.priority, i.available_at, i.item_id LIMIT 1",
+                (ItemState.PENDING, now, ItemState.RUNNING, now, ItemState.RUNNING, now)
+            ).fetchone()
+            if row is None:
+                return None
+            if row["state"] == ItemState.RUNNING:
+                logger.warning(
+                    f"Reclaiming enrichment item {row['item_id']} from {row['lease_owner']} (lease expired)"
+                )
+            conn.execute(
+                "UPDATE enrichment_items SET state = ?, attempts = attempts + 1, started_at = ?, "
+                "lease_owner = ?, lease_expires_at = ? WHERE item_id = ?",
+                (ItemState.RUNNING, _now_iso(), worker_id, now + self.lease_seconds, row["item_id"])
+            )
+            item = dict(row)
+            item["attempts"] += 1
+            item["state"] = ItemState.RUNNING
+            item["lease_owner"] = worker_id
+            item["lease_expires_at"] = now + self.lease_seconds
+            item["options"] = json.loads(item["options"])
+            return item
+
+        return self._transaction(take)
+
+    def renew(self, item_id: int, worker_id: str = "local") -> bool:
+        """Extend the lease on an item the worker still owns.
+
+        Args:
+            item_id: Claimed item
+            worker_id: Lease owner
+
+        Returns:
+            bool: False if the lease was lost to another worker or the item finished
+        """
+        return self._transaction(lambda conn: conn.execute(
+            "UPDATE enrichment_items SET lease_expires_at = ? "
+            "WHERE item_id = ? AND state = ? AND lease_owner = ?",
+            (time.time() + self.lease_seconds, item_id, ItemState.RUNNING, worker_id)
+        ).rowcount) > 0
+
+    def complete(self, item_id: int, result: Dict, worker_id: str = "local") -> bool:
+        """Mark an item as succeeded and store its result.
+
+        Args:
+            item_id: Claimed item
+            result: Per-carrier enrichment result
+            worker_id: Lease owner
+
+        Returns:
+            bool: False if the worker no longer held the lease; the result is discarded
+        """
+        completed = self._transaction(lambda conn: conn.execute(
+            "UPDATE enrichment_items SET state = ?, result = ?, last_error = NULL, finished_at = ?, "
+            "lease_owner = NULL, lease_expires_at = NULL "
+            "WHERE item_id = ? AND state = ? AND lease_owner = ?",
+            (ItemState.SUCCEEDED, json.dumps(result, default=str), _now_iso(),
+             item_id, ItemState.RUNNING, worker_id)
+        ).rowcount) > 0
+        if not completed:
+            logger.warning(f"Discarding result of enrichment item {item_id}: lease lost by {worker_id}")
+        return completed
+
+    def fail(self, item_id: int, error: str, result: Optional[Dict] = None,
+             worker_id: str = "local") -> Optional[str]:
+        """Record a failed attempt, scheduling a retry or dead-lettering the item.
+
+        Args:
+            item_id: Claimed item
+            error: Error message of the attempt
+            result: Partial result of the attempt, if any
+            worker_id: Lease owner
+
+        Returns:
+            str: The item's new state, or None if the worker no longer held the lease
+        """
+        def record(conn):
+            row = conn.execute(
+                "SELECT i.attempts, i.max_attempts, j.cancelled_at FROM enrichment_items i "
+                "JOIN enrichment_jobs j ON j.job_id = i.job_id "
+                "WHERE i.item_id = ? AND i.state = ? AND i.lease_owner = ?",
+                (item_id, ItemState.RUNNING, worker_id)
+            ).fetchone()
+            if row is None:
+                logger.warning(f"Ignoring failure of enrichment item {item_id}: lease lost by {worker_id}")
+                return None
+
+            if row["cancelled_at"]:
+                conn.execute(
+                    "UPDATE enrichment_items SET state = ?, last_error = ?, finished_at = ?, "
+                    "lease_owner = NULL, lease_expires_at = NULL WHERE item_id = ?",
+                    (ItemState.CANCELLED, error, _now_iso(), item_id)
+                )
+                return ItemState.CANCELLED
+
+            if row["attempts"] >= row["max_attempts"]:
+                conn.execute(
+                    "UPDATE enrichment_items SET state = ?, last_error = ?, result = ?, finished_at = ?, "
+                    "lease_owner = NULL, lease_expires_at = NULL WHERE item_id = ?",
+                    (ItemState.DEAD, error, json.dumps(result, default=str) if result else None,
+                     _now_iso(), item_id)
+                )
+                logger.warning(f"Enrichment item {item_id} dead-lettered after {row['attempts']} attempts: {error}")
+                return ItemState.DEAD
+
+            delay = self.backoff_delay(row["attempts"])
+            conn.execute(
+                "UPDATE enrichment_items SET state = ?, last_error = ?, available_at = ?, "
+                "lease_owner = NULL, lease_expires_at = NULL WHERE item_id = ?",
+                (ItemState.PENDING, error, time.time() + delay, item_id)
+            )
+            logger.info(f"Enrichment item {item_id} failed (attempt {row['attempts']}), retrying in {delay:.0f}s")
+            return ItemState.PENDING
+
+        return self._transaction(record)
+
+    def requeue_interrupted(self) -> int:
+        """Return items whose lease expired to the queue.
+
+        Claims already take over expired leases, so this is housekeeping that
+        makes abandoned work visible as pending; items leased by live workers
+        are left alone.
+
+        Returns:
+            int: Number of items requeued
+        """
+        def requeue(conn):
+            now = time.time()
+            expired = "state = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)"
+            conn.execute(
+                f"UPDATE enrichment_items SET state = ?, finished_at = ?, lease_owner = NULL, "
+                f"lease_expires_at = NULL WHERE {expired} AND job_id IN "
+                f"(SELECT job_id FROM enrichment_jobs WHERE cancelled_at IS NOT NULL)",
+                (ItemState.CANCELLED, _now_iso(), ItemState.RUNNING, now)
+            )
+            return conn.execute(
+                f"UPDATE enrichment_items SET state = ?, available_at = ?, lease_owner = NULL, "
+                f"lease_expires_at = NULL WHERE {expired}",
+                (ItemState.PENDING, now, ItemState.RUNNING, now)
+            ).rowcount
+
+        count = self._transaction(requeue)
+        if count:
+            logger.info(f"Requeued {count} interrupted enrichment items")
+        return count
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get a job with per-state item counts.
+
+        Args:
+            job_id: The job ID
+
+        Returns:
+            dict: Job details and status, or None if the job does not exist
+        """
+        rows = self._query("SELECT * FROM enrichment_jobs WHERE job_id = ?", (job_id,))
+        if not rows:
+            return None
+        job = dict(rows[0])
+        job["options"] = json.loads(job["options"])
+        job["priority"] = Priority(job["priority"]).name.lower()
+        job["cost"] = json.loads(job["cost"]) if job["cost"] else None
+
+        counts = {state: 0 for state in ItemState.ALL}
+        for row in self._query(
+            "SELECT state, count(*) AS n FROM enrichment_items WHERE job_id = ? GROUP BY state", (job_id,)
+        ):
+            counts[row["state"]] = row["n"]
+        job["items"] = counts
+        job["started_at"] = self._query(
+            "SELECT min(started_at) AS started_at FROM enrichment_items WHERE job_id = ?", (job_id,)
+        )[0]["started_at"]
+
+        if job["cancelled_at"] and job["stop_reason"]:
+            job["status"] = "stopping" if counts[ItemState.RUNNING] else "stopped"
+        elif job["cancelled_at"]:
+            job["status"] = "cancelling" if counts[ItemState.RUNNING] else "cancelled"
+        elif counts[ItemState.PENDING] + counts[ItemState.RUNNING] == 0:
+            job["status"] = "completed_with_errors" if counts[ItemState.DEAD] else "completed"
+        elif counts[ItemState.RUNNING] or counts[ItemState.SUCCEEDED] or counts[ItemState.DEAD]:
+            job["status"] = "processing"
+        else:
+            job["status"] = "queued"
+        return job
+
+    def get_job_results(self, job_id: str, after: Optional[Tuple[str, int]] = None) -> List[Dict]:
+        """Get the finished items of a job.
+
+        Args:
+            job_id: The job ID
+            after: Optional ``(finished_at, item_id)`` cursor of the last item
+                already seen; only items finished after it are returned
+
+        Returns:
+            list: Succeeded and dead-lettered items in the order they finished,
+                each with ``item_id``, ``usdot``, ``state``, ``last_error``,
+                ``finished_at`` and the stored ``result`` (or None)
+        """
+        finished_at, item_id = after or ("", 0)
+        rows = self._query(
+            "SELECT item_id, usdot, state, last_error, result, finished_at FROM enrichment_items "
+            "WHERE job_id = ? AND state IN (?, ?) "
+            "AND (finished_at > ? OR (finished_at = ? AND item_id > ?)) "
+            "ORDER BY finished_at, item_id",
+            (job_id, *ItemState.FINISHED, finished_at, finished_at, item_id)
+        )
+        return [
+            {**dict(row), "result": json.loads(row["result"]) if row["result"] else None}
+            for row in rows
+        ]
+
+    def cancel_job(self, job_id: str, reason: Optional[str] = None) -> Optional[int]:
+        """Cancel a job by withdrawing its pending items.
+
+        Items already claimed by a worker run to completion, so a job stops
+        within one carrier per worker of the request.
+
+        Args:
+            job_id: The job ID
+            reason: Why the job was stopped, e.g. a cap it reached; a job
+                stopped with a reason reports status "stopped" rather than
+                "cancelled"
+
+        Returns:
+            int: Number of items withdrawn, or None if the job does not exist
+                or has already finished or been cancelled
+        """
+        def cancel(conn):
+            job = conn.execute(
+                "SELECT cancelled_at FROM enrichment_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if job is None or job["cancelled_at"]:
+                return None
+            active = conn.execute(
+                "SELECT count(*) AS n FROM enrichment_items WHERE job_id = ? AND state IN (?, ?)",
+                (job_id, ItemState.PENDING, ItemState.RUNNING)
+            ).fetchone()["n"]
+            if not active:
+                return None
+
+            now = _now_iso()
+            conn.execute(
+                "UPDATE enrichment_jobs SET cancelled_at = ?, stop_reason = ? WHERE job_id = ?",
+                (now, reason, job_id)
+            )
+            return conn.execute(
+                "UPDATE enrichment_items SET state = ?, finished_at = ? WHERE job_id = ? AND state = ?",
+                (ItemState.CANCELLED, now, job_id, ItemState.PENDING)
+            ).rowcount
+
+        withdrawn = self._transaction(cancel)
+        if withdrawn is not None:
+            logger.info(
+                f"{'Stopped' if reason else 'Cancelled'} enrichment job {job_id}"
+                f"{f' ({reason})' if reason else ''}: {withdrawn} pending items withdrawn"
+            )
+        return withdrawn
+
+    @staticmethod
+    def _usage(conn: sqlite3.Connection, job_id: str, cost: Optional[Dict]) -> Dict:
+        started_at = conn.execute(
+            "SELECT min(started_at) AS started_at FROM enrichment_items WHERE job_id = ?", (job_id,)
+        ).fetchone()["started_at"]
+        return {
+            "upstream_requests": sum(
+                stats["requests"] for stats in ((cost or {}).get("upstream") or {}).values()
+            ),
+            "started_at": started_at
+        }
+
+    def record_cost(self, job_id: str, cost: Dict) -> Optional[Dict]:
+        """Add the cost of one carrier (or one attempt) to its job.
+
+        Args:
+            job_id: The job ID
+            cost: Counters from CostMeter.to_dict
+
+        Returns:
+            dict: The job's ``upstream_requests`` so far and ``started_at``,
+                or None if the job does not exist
+        """
+        def record(conn):
+            row = conn.execute("SELECT cost FROM enrichment_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            total = merge_costs(json.loads(row["cost"]) if row["cost"] else None, cost)
+            conn.execute("UPDATE enrichment_jobs SET cost = ? WHERE job_id = ?", (json.dumps(total), job_id))
+            return self._usage(conn, job_id, total)
+
+        return self._transaction(record)
+
+    def job_usage(self, job_id: str) -> Optional[Dict]:
+        """Get what a job has consumed so far, for checking its caps.
+
+        Args:
+            job_id: The job ID
+
+        Returns:
+            dict: ``upstream_requests`` and ``started_at`` (first claim), or
+                None if the job does not exist
+        """
+        def read(conn):
+            row = conn.execute("SELECT cost FROM enrichment_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            return self._usage(conn, job_id, json.loads(row["cost"]) if row["cost"] else None)
+
+        return self._transaction(read)
+
+    def dead_letters(self, limit: int = 100) -> List[Dict]:
+        """List dead-lettered items, most recent first.
+
+        Args:
+            limit: Maximum number of items to return
+
+        Returns:
+            list: Dead-lettered items with their last error
+        """
+        rows = self._query(
+            "SELECT item_id, job_id, usdot, priority, attempts, last_error, finished_at "
+            "FROM enrichment_items WHERE state = ? ORDER BY finished_at DESC LIMIT ?",
+            (ItemState.DEAD, limit)
+        )
+        return [dict(row) for row in rows]
+
+    def retry_dead(self, item_id: int) -> bool:
+        """Move a dead-lettered item back to the queue with a fresh attempt budget.
+
+        Args:
+            item_id: Dead-lettered item
+
+        Returns:
+            bool: True if the item was requeued
+        """
+        def retry(conn):
+            return conn.execute(
+                "UPDATE enrichment_items SET state = ?, attempts = 0, available_at = ?, finished_at = NULL "
+                "WHERE item_id = ? AND state = ?",
+                (ItemState.PENDING, time.time(), item_id, ItemState.DEAD)
+            ).rowcount
+
+        return self._transaction(retry) > 0
+
+    def active_item(self, usdot: int) -> Optional[Dict]:
+        """Get the most urgent pending or running item for a carrier.
+
+        Args:
+            usdot: Carrier USDOT number
+
+        Returns:
+            dict: ``item_id``, ``job_id``, ``state`` and ``priority`` of the item,
+                or None if the carrier is not queued
+        """
+        rows = self._query(
+            "SELECT item_id, job_id, state, priority FROM enrichment_items "
+            "WHERE usdot = ? AND state IN (?, ?) ORDER BY priority, item_id LIMIT 1",
+            (int(usdot), ItemState.PENDING, ItemState.RUNNING)
+        )
+        return dict(rows[0]) if rows else None
+
+    def promote(self, item_id: int, priority: Priority) -> bool:
+        """Raise a pending item to a more urgent priority class.
+
+        Args:
+            item_id: Pending item
+            priority: New priority class; ignored if not more urgent
+
+        Returns:
+            bool: True if the item was promoted
+        """
+        return self._transaction(lambda conn: conn.execute(
+            "UPDATE enrichment_items SET priority = ? WHERE item_id = ? AND state = ? AND priority > ?",
+            (int(priority), item_id, ItemState.PENDING, int(priority))
+        ).rowcount) > 0
+
+    def pending_count(self, priorities: List[Priority]) -> int:
+        """Count items waiting to be claimed in the given priority classes.
+
+        Args:
+            priorities: Priority classes to count
+
+        Returns:
+            int: Number of pending items
+        """
+        placeholders = ", ".join("?" for _ in priorities)
+        rows = self._query(
+            f"SELECT count(*) AS n FROM enrichment_items WHERE state = ? AND priority IN ({placeholders})",
+            (ItemState.PENDING, *(int(p) for p in priorities))
+        )
+        return rows[0]["n"]
+
+    def recent_usdots(self, priority: Priority, since: str) -> List[int]:
+        """List carriers queued at a priority class that are active or were queued recently.
+
+        Args:
+            priority: Priority class
+            since: ISO timestamp; items created at or after it count as recent
+
+        Returns:
+            list: Distinct USDOT numbers with a pending or running item, or an
+                item created since ``since``
+        """
+        rows = self._query(
+            "SELECT DISTINCT usdot FROM enrichment_items "
+            "WHERE priority = ? AND (state IN (?, ?) OR created_at >= ?)",
+            (int(priority), ItemState.PENDING, ItemState.RUNNING, since)
+        )
+        return [row["usdot"] for row in rows]
+
+    def stats(self) -> Dict:
+        """Get queue depth per state and priority class.
+
+        Returns:
+            dict: Item counts keyed by state, then by priority class name
+        """
+        stats = {}
+        for row in self._query(
+            "SELECT state, priority, count(*) AS n FROM enrichment_items GROUP BY state, priority"
+        ):
+            stats.setdefault(row["state"], {})[Priority(row["priority"]).name.lower()] = row["n"]
+        return stats
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_enrichment_queue() -> EnrichmentQueue:
+    """Get the process-wide queue, opening it on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = EnrichmentQueue(
+                settings.enrichment_queue_path,
+                max_attempts=settings.enrichment_max_attempts,
+                base_delay=settings.enrichment_retry_base_delay,
+                max_delay=settings.enrichment_retry_max_delay,
+                lease_seconds=settings.enrichment_lease_seconds
+            )
+        return _queue
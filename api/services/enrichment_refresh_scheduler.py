@@ -0,0 +1,149 @@
+"""
+Staleness-driven refresh scheduler for SearchCarriers enrichment.
+
+Enrichment watermarks record when each data family of a carrier was last
+checked upstream. The scheduler periodically selects carriers with a family
+older than the configured age, ranks them by risk (OOS rates, fatal crashes,
+coverage gaps) and queues them at the lowest priority class. It hands out a
+fixed number of carriers per hour, and holds back while on-demand work is
+waiting, so refreshes only consume vendor quota that would otherwise go
+unused. Re-enrichment runs through the freshness probe, so carriers that
+have not changed upstream cost a single request per family.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from config import settings
+from services.enrichment_queue import EnrichmentQueue, Priority, get_enrichment_queue
+from services.searchcarriers_enrichment_service import FAMILY_OPTIONS, enqueue_enrichment
+
+logger = logging.getLogger(__name__)
+
+
+# Priority classes whose pending work the scheduler never competes with
+ON_DEMAND_PRIORITIES = [Priority.INTERACTIVE, Priority.INGEST, Priority.BULK]
+
+
+class RefreshScheduler:
+    """Feeds stale carriers into the enrichment queue at a steady rate."""
+
+    def __init__(self, queue: Optional[EnrichmentQueue] = None, watermark_repo=None,
+                 max_age_days: Optional[float] = None, rate_per_hour: Optional[float] = None,
+                 interval_seconds: Optional[float] = None, max_backlog: Optional[int] = None,
+                 families: Optional[List[str]] = None):
+        """Initialize the scheduler; unset arguments come from settings.
+
+        Args:
+            queue: Enrichment queue to feed (defaults to the process-wide queue)
+            watermark_repo: EnrichmentWatermarkRepository, created lazily if not provided
+            max_age_days: Age after which a family's last check is stale
+            rate_per_hour: Carriers queued per hour
+            interval_seconds: Seconds between scheduling ticks
+            max_backlog: Pending on-demand items above which a tick is skipped
+            families: Watermark families to keep fresh (defaults to all)
+        """
+        self._queue = queue
+        self._watermark_repo = watermark_repo
+        self.max_age_days = settings.enrichment_refresh_max_age_days if max_age_days is None else max_age_days
+        self.rate_per_hour = settings.enrichment_refresh_rate_per_hour if rate_per_hour is None else rate_per_hour
+        self.interval_seconds = (settings.enrichment_refresh_interval_seconds
+                                 if interval_seconds is None else interval_seconds)
+        self.max_backlog = settings.enrichment_refresh_max_backlog if max_backlog is None else max_backlog
+        self.families = families or list(FAMILY_OPTIONS)
+        # Fraction of a carrier carried between ticks so low rates still add up
+        self._budget_remainder = 0.0
+
+    @property
+    def queue(self) -> EnrichmentQueue:
+        if self._queue is None:
+            self._queue = get_enrichment_queue()
+        return self._queue
+
+    @property
+    def watermark_repo(self):
+        if self._watermark_repo is None:
+            from repositories.enrichment_watermark_repository import EnrichmentWatermarkRepository
+            self._watermark_repo = EnrichmentWatermarkRepository()
+        return self._watermark_repo
+
+    def _tick_budget(self) -> int:
+        """Carriers this tick may queue, carrying fractions to the next tick."""
+        budget = self.rate_per_hour * self.interval_seconds / 3600.0 + self._budget_remainder
+        whole = int(budget)
+        self._budget_remainder = budget - whole
+        return whole
+
+    def tick(self) -> Dict:
+        """Run one scheduling pass.
+
+        Returns:
+            dict: Summary with ``status`` ("scheduled", "idle" or "deferred"),
+                the number of carriers queued and the created job IDs
+        """
+        backlog = self.queue.pending_count(ON_DEMAND_PRIORITIES)
+        if backlog > self.max_backlog:
+            logger.info(f"Refresh deferred: {backlog} on-demand items waiting")
+            return {"status": "deferred", "on_demand_backlog": backlog, "carriers_queued": 0, "job_ids": []}
+
+        # Unclaimed refreshes from earlier ticks use up this tick's budget,
+        # so a busy worker pool is not handed an ever-growing backlog
+        budget = self._tick_budget() - self.queue.pending_count([Priority.REFRESH])
+        if budget <= 0:
+            return {"status": "idle", "on_demand_backlog": backlog, "carriers_queued": 0, "job_ids": []}
+
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.max_age_days)).isoformat()
+        # Carriers refreshed within the max age are left alone even if the
+        # refresh failed, so a permanently failing carrier is not retried every tick
+        recent = self.queue.recent_usdots(Priority.REFRESH, cutoff)
+        candidates = self.watermark_repo.find_stale_carriers(self.families, cutoff, budget, exclude=recent)
+        if not candidates:
+            return {"status": "idle", "on_demand_backlog": backlog, "carriers_queued": 0, "job_ids": []}
+
+        # One job per set of stale families, so fresh families are not re-fetched
+        groups: Dict[tuple, List[int]] = {}
+        for candidate in candidates:
+            groups.setdefault(tuple(sorted(candidate["stale_families"])), []).append(candidate["usdot"])
+
+        job_ids = []
+        for families, usdots in groups.items():
+            options = {option_key: result_key in families for result_key, option_key in FAMILY_OPTIONS.items()}
+            job_ids.append(enqueue_enrichment(usdots, options, priority=Priority.REFRESH, kind="refresh"))
+
+        logger.info(
+            f"Queued {len(candidates)} stale carriers for refresh "
+            f"(top risk score {candidates[0]['risk_score']:.2f})"
+        )
+        return {
+            "status": "scheduled",
+            "on_demand_backlog": backlog,
+            "carriers_queued": len(candidates),
+            "job_ids": job_ids
+        }
+
+    async def run(self, stop_event: Optional[asyncio.Event] = None):
+        """Run scheduling ticks until stopped.
+
+        Args:
+            stop_event: Set to stop the scheduler
+        """
+        stop_event = stop_event or asyncio.Event()
+        logger.info(
+            f"Enrichment refresh scheduler started: {self.rate_per_hour}/hour, "
+            f"max age {self.max_age_days} days"
+        )
+
+        while not stop_event.is_set():
+            try:
+                await asyncio.to_thread(self.tick)
+            except Exception as e:
+                logger.error(f"Refresh scheduling tick failed: {e}")
+
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+        logger.info("Enrichment refresh scheduler stopped")
@@ -0,0 +1,94 @@
+"""
+Stale-while-revalidate support for carrier read endpoints.
+
+Read endpoints serve whatever is in the graph immediately. When asked to
+revalidate, they look up when the relevant data families were last checked
+upstream (the enrichment watermarks) and, if any is missing or older than
+the allowed age, queue a background refresh for the carrier. Refreshes are
+deduplicated against work already queued for the carrier, so repeated reads
+never pile up vendor requests.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from config import settings
+from services.enrichment_queue import EnrichmentQueue, ItemState, Priority, get_enrichment_queue
+from services.searchcarriers_enrichment_service import FAMILY_OPTIONS, enqueue_enrichment
+
+logger = logging.getLogger(__name__)
+
+
+_watermark_repo = None
+
+
+def _get_watermark_repo():
+    global _watermark_repo
+    if _watermark_repo is None:
+        from repositories.enrichment_watermark_repository import EnrichmentWatermarkRepository
+        _watermark_repo = EnrichmentWatermarkRepository()
+    return _watermark_repo
+
+
+def revalidate_carrier(usdot: int, families: List[str], max_age_hours: Optional[float] = None,
+                       watermark_repo=None, queue: Optional[EnrichmentQueue] = None) -> Dict:
+    """Report how fresh a carrier's data is and queue a refresh if it is stale.
+
+    Never calls the vendor API. A failed watermark lookup is treated as
+    "never enriched"; a failed enqueue is logged and reported as no refresh
+    pending, so the read itself always succeeds.
+
+    Args:
+        usdot: Carrier USDOT number
+        families: Watermark families the caller's response is built from
+        max_age_hours: Allowed age of the data (defaults to settings)
+        watermark_repo: EnrichmentWatermarkRepository (defaults to a shared instance)
+        queue: Enrichment queue (defaults to the process-wide queue)
+
+    Returns:
+        dict: ``data_as_of`` (oldest last check among the families, None if
+            any was never enriched), ``stale``, ``refresh_pending`` and
+            ``refresh_job_id``
+    """
+    max_age_hours = settings.enrichment_revalidate_max_age_hours if max_age_hours is None else max_age_hours
+    watermark_repo = watermark_repo or _get_watermark_repo()
+
+    try:
+        checked = {w["family"]: w.get("checked_at") for w in watermark_repo.get_for_carrier(usdot)}
+    except Exception as e:
+        logger.warning(f"Could not read watermarks for carrier {usdot}: {e}")
+        checked = {}
+
+    checks = [checked.get(family) for family in families]
+    data_as_of = None if not checks or None in checks else min(checks)
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=max_age_hours)).isoformat()
+    stale = data_as_of is None or data_as_of < cutoff
+
+    freshness = {
+        "data_as_of": data_as_of,
+        "stale": stale,
+        "refresh_pending": False,
+        "refresh_job_id": None
+    }
+    if not stale or not settings.search_carriers_api_token:
+        return freshness
+
+    try:
+        queue = queue or get_enrichment_queue()
+        active = queue.active_item(usdot)
+        if active:
+            # Already queued, e.g. by a bulk job: make it interactive instead of queueing twice
+            if active["state"] == ItemState.PENDING:
+                queue.promote(active["item_id"], Priority.INTERACTIVE)
+            job_id = active["job_id"]
+        else:
+            options = {option_key: family in families for family, option_key in FAMILY_OPTIONS.items()}
+            job_id = enqueue_enrichment([usdot], options, priority=Priority.INTERACTIVE, kind="revalidate")
+    except Exception as e:
+        logger.error(f"Could not queue refresh for carrier {usdot}: {e}")
+        return freshness
+
+    freshness["refresh_pending"] = True
+    freshness["refresh_job_id"] = job_id
+    return freshness
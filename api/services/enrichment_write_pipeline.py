@@ -0,0 +1,206 @@
+"""
+Write stage of the SearchCarriers enrichment pipeline.
+
+Enrichment families used to fetch a page from SearchCarriers and then write
+it to Neo4j before fetching the next, so network and database waits never
+overlapped. With a WritePipeline attached to the enricher, the fetch stage
+only builds records and submits them; a writer thread drains a bounded
+queue and coalesces the records of many pages and carriers into one
+transaction per kind. When Neo4j falls behind the queue fills up and
+submit blocks, which holds the fetching threads back until the writer
+catches up.
+
+Submit returns a Future, so a family can keep fetching while its earlier
+pages are written and only waits for the outcome before committing its
+freshness watermark.
+"""
+
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from config import settings
+from services.enrichment_cost import DB_WRITE_COUNTERS, CostMeter, current_meter, metering
+
+logger = logging.getLogger(__name__)
+
+
+# Batch writer: takes the payloads of one kind and returns one result per payload
+BatchWriter = Callable[[List[Any]], List[Any]]
+
+_STOP = object()
+
+
+class _Entry:
+    """A submitted payload waiting to be written."""
+    __slots__ = ("kind", "payload", "future", "meter")
+
+    def __init__(self, kind: str, payload: Any, meter: Optional[CostMeter]):
+        self.kind = kind
+        self.payload = payload
+        self.future: Future = Future()
+        self.meter = meter
+
+
+def _charge(entries: List[_Entry], kind: str, cost: Dict, elapsed_ms: float):
+    """Split the cost of a coalesced write among the jobs whose records it wrote.
+
+    Counters are divided as evenly as whole numbers allow, so job totals add
+    up to what the database actually did.
+    """
+    meters = [entry.meter for entry in entries]
+    if not any(meters):
+        return
+    database = cost["database"]
+    n = len(meters)
+    shares = {}
+    for key in ["statements"] + DB_WRITE_COUNTERS:
+        base, extra = divmod(database[key], n)
+        shares[key] = [base + (1 if i < extra else 0) for i in range(n)]
+    for i, meter in enumerate(meters):
+        if meter is None:
+            continue
+        meter.record_database(
+            shares["statements"][i], database["time_ms"] / n,
+            {key: shares[key][i] for key in DB_WRITE_COUNTERS}
+        )
+        meter.add_stage(f"{kind}_write", elapsed_ms / n)
+
+
+class WritePipeline:
+    """Bounded write-behind queue drained by a coalescing writer thread."""
+
+    def __init__(self, writers: Dict[str, BatchWriter], max_pending: Optional[int] = None,
+                 batch_size: Optional[int] = None, linger_ms: Optional[float] = None):
+        """Initialize the pipeline; unset arguments come from settings.
+
+        Args:
+            writers: Batch writer per payload kind
+            max_pending: Payloads queued before submit blocks (the backpressure bound)
+            batch_size: Most payloads coalesced into one write
+            linger_ms: How long the writer waits for more payloads to fill a batch
+        """
+        self.writers = writers
+        self.max_pending = settings.enrichment_write_queue_size if max_pending is None else max_pending
+        self.batch_size = settings.enrichment_write_batch_size if batch_size is None else batch_size
+        self.linger_ms = settings.enrichment_write_linger_ms if linger_ms is None else linger_ms
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, self.max_pending))
+        self._thread: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "payloads": 0, "batches": 0, "max_batch": 0, "failed_batches": 0,
+            "write_ms": 0.0, "backpressure_waits": 0, "backpressure_ms": 0.0
+        }
+
+    def start(self) -> "WritePipeline":
+        """Start the writer thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="enrichment-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        """Write everything already submitted, then stop the writer thread."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+            logger.info(f"Enrichment write pipeline stopped: {self.stats()}")
+
+    def submit(self, kind: str, payload: Any) -> Future:
+        """Queue a payload for writing, blocking while the queue is full.
+
+        The cost of the write is charged to the caller's cost meter.
+
+        Args:
+            kind: Payload kind, selecting the batch writer
+            payload: Records to write
+
+        Returns:
+            Future: Resolves to the batch writer's result for this payload
+        """
+        if kind not in self.writers:
+            raise ValueError(f"No batch writer for {kind!r}")
+        if self._thread is None:
+            raise RuntimeError("Write pipeline is not running")
+
+        entry = _Entry(kind, payload, current_meter())
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # Backpressure: the writer is behind, so the fetch stage waits
+            start = time.perf_counter()
+            self._queue.put(entry)
+            waited_ms = (time.perf_counter() - start) * 1000
+            with self._stats_lock:
+                self._stats["backpressure_waits"] += 1
+                self._stats["backpressure_ms"] += waited_ms
+            if entry.meter is not None:
+                entry.meter.add_stage("write_backpressure", waited_ms)
+        return entry.future
+
+    def stats(self) -> Dict:
+        """Counters of the write stage."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["pending"] = self._queue.qsize()
+        stats["write_ms"] = round(stats["write_ms"], 1)
+        stats["backpressure_ms"] = round(stats["backpressure_ms"], 1)
+        return stats
+
+    def _next_batch(self) -> List:
+        """Block for one entry, then gather more until the batch is full or the linger time ends."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.linger_ms / 1000
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            timeout = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = self._next_batch()
+            if batch[-1] is _STOP:
+                stopping = True
+                batch.pop()
+
+            by_kind: Dict[str, List[_Entry]] = {}
+            for entry in batch:
+                by_kind.setdefault(entry.kind, []).append(entry)
+            for kind, entries in by_kind.items():
+                self._write(kind, entries)
+
+    def _write(self, kind: str, entries: List[_Entry]):
+        """Write a batch of one kind, isolating failures to the payloads that caused them."""
+        meter = CostMeter()
+        start = time.perf_counter()
+        try:
+            with metering(meter):
+                results = self.writers[kind]([entry.payload for entry in entries])
+        except Exception as e:
+            if len(entries) == 1:
+                entries[0].future.set_exception(e)
+                with self._stats_lock:
+                    self._stats["failed_batches"] += 1
+                return
+            logger.warning(f"Coalesced {kind} write of {len(entries)} payloads failed ({e}); writing them one by one")
+            for entry in entries:
+                self._write(kind, [entry])
+            return
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        _charge(entries, kind, meter.to_dict(), elapsed_ms)
+        with self._stats_lock:
+            self._stats["payloads"] += len(entries)
+            self._stats["batches"] += 1
+            self._stats["max_batch"] = max(self._stats["max_batch"], len(entries))
+            self._stats["write_ms"] += elapsed_ms
+        for entry, result in zip(entries, results):
+            entry.future.set_result(result)
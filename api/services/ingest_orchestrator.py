@@ -11,6 +11,7 @@ from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from config import settings
 from models.carrier import Carrier
 from models.target_company import TargetCompany
 from models.insurance_provider import InsuranceProvider
@@ -19,6 +20,8 @@ from repositories.carrier_repository import CarrierRepository
 from repositories.target_company_repository import TargetCompanyRepository
 from repositories.insurance_provider_repository import InsuranceProviderRepository
 from repositories.person_repository import PersonRepository
+from services.chameleon_clustering import update_chameleon_clusters
+from services.insurance_statistics import get_insurance_statistics_cache
 from utils.csv_parser import parse_carriers_csv, validate_carrier_data, extract_unique_values
 
 logger = logging.getLogger(__name__)
@@ -193,20 +196,27 @@ class IngestionOrchestrator:
                 logger.error(f"Error creating insurance provider {provider_name}: {e}")
                 self.stats["errors"].append(f"Insurance provider '{provider_name}': {str(e)}")
         
-        # Create persons (officers)
+        # Create persons (officers), checking which exist in one query
+        try:
+            existing_officers = self.person_repo.get_existing_names(unique_values['officers'])
+        except Exception as e:
+            logger.error(f"Error looking up existing persons: {e}")
+            self.stats["errors"].append(f"Person lookup: {str(e)}")
+            existing_officers = set()
+        created_person_ids = set()
         for officer_name in unique_values['officers']:
             try:
-                # Check if person exists first
-                existing_persons = self.person_repo.find_by_name(officer_name)
-                if not existing_persons:
-                    # Create new person
+                if officer_name not in existing_officers:
+                    # Create new person; names differing only in case or
+                    # spacing share a person_id, so the second one finds it
                     person = Person(
                         person_id="",  # Will be auto-generated
                         full_name=officer_name,
                         source=["CSV_IMPORT"]
                     )
-                    result = self.person_repo.create(person)
-                    if result:
+                    result = self.person_repo.find_or_create(person)
+                    if result and person.person_id not in created_person_ids:
+                        created_person_ids.add(person.person_id)
                         entity_counts["persons"] += 1
                         logger.debug(f"Created person: {officer_name}")
                 else:
@@ -349,40 +359,82 @@ class IngestionOrchestrator:
         self.stats["relationships_created"] = relationships_created
         return relationships_created
     
-    async def queue_enrichment(self, carriers: List[Dict]) -> Dict:
+    def refresh_risk_scores(self, carriers: List[Dict]):
+        """
+        Recompute the stored insurance fraud risk scores of ingested carriers.
+        
+        Args:
+            carriers: List of validated carrier dictionaries
+        """
+        try:
+            scored = self.carrier_repo.refresh_insurance_fraud_risk_scores(
+                [carrier['usdot'] for carrier in carriers]
+            )
+            logger.info(f"Refreshed insurance fraud risk scores for {scored} carriers")
+        except Exception as e:
+            logger.error(f"Error refreshing insurance fraud risk scores: {e}")
+            self.stats["errors"].append(f"Risk score refresh: {str(e)}")
+    
+    def refresh_chameleon_clusters(self, carriers: List[Dict]):
+        """
+        Recompute the chameleon clusters reachable from ingested carriers.
+        
+        Args:
+            carriers: List of validated carrier dictionaries
+        """
+        try:
+            result = update_chameleon_clusters([carrier['usdot'] for carrier in carriers])
+            logger.info(
+                f"Updated chameleon clusters: {result['clusters']} clusters "
+                f"over {result['carriers']} carriers"
+            )
+        except Exception as e:
+            logger.error(f"Error updating chameleon clusters: {e}")
+            self.stats["errors"].append(f"Chameleon cluster update: {str(e)}")
+    
+    async def queue_enrichment(self, carriers: List[Dict], caps: Optional[Dict] = None) -> Dict:
         """
         Queue carriers for SearchCarriers API enrichment.
         
+        The enrichment job shares the ingestion job's ID, so the ID returned
+        by ingestion can be polled on the enrichment status endpoints.
+        
         Args:
             carriers: List of carrier dictionaries to enrich
+            caps: Optional job caps (``max_requests``, ``max_duration_seconds``)
             
         Returns:
             Dictionary with enrichment job details
         """
-        # This will be called as a background task
         enrichment_job = {
-            "job_id": str(uuid.uuid4()),
+            "job_id": self.job_id,
             "carrier_count": len(carriers),
             "status": "queued",
             "queued_at": datetime.now(timezone.utc).isoformat()
         }
         
-        # In a real implementation, this would queue the enrichment job
-        # For now, we'll just log it
-        logger.info(
-            f"Queued {len(carriers)} carriers for enrichment. "
-            f"Job ID: {enrichment_job['job_id']}"
-        )
-        
         # Import here to avoid circular dependency
         try:
-            from services.searchcarriers_enrichment_service import enrich_carriers_async
+            from services.enrichment_queue import Priority
+            from services.searchcarriers_enrichment_service import DEFAULT_ENRICHMENT_OPTIONS, enqueue_enrichment
             
-            # Process enrichment in background
+            # Persist the job; the enrichment worker picks it up from the queue
             carrier_usdots = [c['usdot'] for c in carriers if c.get('usdot')]
-            await enrich_carriers_async(carrier_usdots, enrichment_job['job_id'])
+            caps = {key: value for key, value in (caps or {}).items() if value is not None}
+            if caps:
+                enrichment_job["caps"] = caps
+            enqueue_enrichment(
+                carrier_usdots,
+                {**DEFAULT_ENRICHMENT_OPTIONS, **caps},
+                priority=Priority.INGEST,
+                kind="ingest",
+                job_id=enrichment_job['job_id']
+            )
             
-            enrichment_job["status"] = "processing"
+            logger.info(
+                f"Queued {len(carrier_usdots)} carriers for enrichment. "
+                f"Job ID: {enrichment_job['job_id']}"
+            )
         except ImportError:
             logger.warning("SearchCarriers enrichment service not available")
             enrichment_job["status"] = "unavailable"
@@ -398,7 +450,8 @@ class IngestionOrchestrator:
         csv_content: str,
         target_company: str = "JB_HUNT",
         enable_enrichment: bool = False,
-        skip_invalid: bool = True
+        skip_invalid: bool = True,
+        enrichment_caps: Optional[Dict] = None
     ) -> Dict:
         """
         Main ingestion method that orchestrates the entire import process.
@@ -408,6 +461,7 @@ class IngestionOrchestrator:
             target_company: Target company identifier
             enable_enrichment: Whether to queue SearchCarriers enrichment
             skip_invalid: Whether to skip invalid records or fail
+            enrichment_caps: Optional caps for the enrichment job
             
         Returns:
             Dictionary with complete ingestion results
@@ -450,10 +504,20 @@ class IngestionOrchestrator:
                 relationships = self.create_relationships(valid_carriers, target_dot)
                 logger.info(f"Created {relationships} relationships")
             
+            # Score ingested carriers so they appear in the fraud risk listing
+            self.refresh_risk_scores(valid_carriers)
+            
+            # Shared officers and insurers can join ingested carriers to clusters
+            self.refresh_chameleon_clusters(valid_carriers)
+            
+            # Large ingests shift the insurance statistics noticeably
+            if self.stats["carriers_created"] >= settings.insurance_statistics_ingest_refresh_min_carriers:
+                get_insurance_statistics_cache().schedule_refresh()
+            
             # Queue enrichment if enabled
             enrichment_info = None
             if enable_enrichment and valid_carriers:
-                enrichment_info = await self.queue_enrichment(valid_carriers)
+                enrichment_info = await self.queue_enrichment(valid_carriers, enrichment_caps)
             
             # Calculate execution time
             execution_time = (datetime.now(timezone.utc) - self.start_time).total_seconds()
@@ -490,19 +554,3 @@ class IngestionOrchestrator:
                 "error": str(e),
                 "summary": self.stats
             }
-
-
-async def enrich_carriers_async(carrier_usdots: List[int], job_id: str):
-    """
-    Placeholder for async enrichment function.
-    
-    This would be implemented in a separate service module that handles
-    the actual SearchCarriers API calls.
-    
-    Args:
-        carrier_usdots: List of carrier USDOT numbers to enrich
-        job_id: Job ID for tracking
-    """
-    logger.info(f"Starting enrichment for job {job_id} with {len(carrier_usdots)} carriers")
-    # Actual implementation would call SearchCarriers API
-    pass
\ No newline at end of file
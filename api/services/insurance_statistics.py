@@ -0,0 +1,159 @@
+"""
+Precomputed insurance statistics summary.
+
+The summary behind /insurance/statistics/summary aggregates gap, shopping,
+underinsurance and risk-score queries over the whole graph, which is too
+expensive to run per request. The cache keeps the last computed snapshot in
+memory together with when it was computed. It is refreshed on a schedule
+by a background loop in the API process and after large ingests. A caller
+may ask for a fresh snapshot, in which case concurrent requests share one
+recomputation instead of each starting their own.
+"""
+
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Risk score above which a carrier counts as high risk
+HIGH_RISK_SCORE = 50
+
+
+class InsuranceStatisticsCache:
+    """In-memory insurance statistics snapshot with single-flight refresh."""
+
+    def __init__(self, carrier_repo=None, refresh_interval_seconds: Optional[float] = None):
+        """Initialize the cache; unset arguments come from settings.
+
+        Args:
+            carrier_repo: CarrierRepository, created lazily if not provided
+            refresh_interval_seconds: Seconds between scheduled refreshes
+        """
+        self._carrier_repo = carrier_repo
+        self.refresh_interval_seconds = (settings.insurance_statistics_refresh_seconds
+                                         if refresh_interval_seconds is None else refresh_interval_seconds)
+        self._snapshot: Optional[Dict] = None
+        self._inflight: Optional[asyncio.Future] = None
+
+    @property
+    def carrier_repo(self):
+        if self._carrier_repo is None:
+            from repositories.carrier_repository import CarrierRepository
+            self._carrier_repo = CarrierRepository()
+        return self._carrier_repo
+
+    @property
+    def snapshot(self) -> Optional[Dict]:
+        """The last computed snapshot, or None before the first refresh."""
+        return self._snapshot
+
+    def compute(self) -> Dict:
+        """Run the whole-graph statistics queries.
+
+        Returns:
+            dict: Statistics with ``computed_at`` and ``compute_seconds``
+        """
+        start = time.perf_counter()
+        repo = self.carrier_repo
+        gaps = repo.detect_insurance_gaps(30)
+        shopping = repo.detect_insurance_shopping_patterns(12, 3)
+        underinsured = repo.find_underinsured_operations()
+
+        return {
+            "total_carriers": repo.get_statistics().get("total_carriers", 0),
+            "carriers_with_gaps": len(gaps),
+            "average_gap_days": sum(g['gap_days'] for g in gaps) / len(gaps) if gaps else 0,
+            "insurance_shopping_carriers": len(shopping),
+            "underinsured_carriers": len(underinsured),
+            "high_risk_carriers": repo.count_insurance_fraud_risk_scores(min_score=HIGH_RISK_SCORE + 1),
+            "top_risks": repo.get_insurance_fraud_risk_scores(limit=5),
+            "computed_at": datetime.now(timezone.utc).isoformat(),
+            "compute_seconds": round(time.perf_counter() - start, 3)
+        }
+
+    async def refresh(self) -> Dict:
+        """Recompute the snapshot, joining a recomputation already in progress.
+
+        Returns:
+            dict: The new snapshot
+
+        Raises:
+            Exception: If the statistics queries fail; the previous snapshot is kept
+        """
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._compute_and_store())
+        inflight = self._inflight
+        # Shielded so a cancelled caller does not cancel the others' recomputation
+        return await asyncio.shield(inflight)
+
+    async def _compute_and_store(self) -> Dict:
+        try:
+            snapshot = await asyncio.to_thread(self.compute)
+            self._snapshot = snapshot
+            logger.info(f"Insurance statistics refreshed in {snapshot['compute_seconds']}s")
+            return snapshot
+        finally:
+            self._inflight = None
+
+    def schedule_refresh(self):
+        """Start a background refresh unless one is already running."""
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._compute_and_store())
+            self._inflight.add_done_callback(self._log_failure)
+
+    @staticmethod
+    def _log_failure(future: asyncio.Future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Insurance statistics refresh failed: {future.exception()}")
+
+    async def get(self, fresh: bool = False) -> Dict:
+        """Get the statistics snapshot.
+
+        Args:
+            fresh: Recompute instead of serving the cached snapshot
+
+        Returns:
+            dict: The snapshot; computed now if there is none yet
+        """
+        if fresh or self._snapshot is None:
+            return await self.refresh()
+        return self._snapshot
+
+    async def run(self, stop_event: Optional[asyncio.Event] = None):
+        """Refresh the snapshot on a schedule until stopped.
+
+        Args:
+            stop_event: Set to stop the refresh loop
+        """
+        stop_event = stop_event or asyncio.Event()
+        logger.info(f"Insurance statistics refresh started: every {self.refresh_interval_seconds}s")
+
+        while not stop_event.is_set():
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Insurance statistics refresh failed: {e}")
+
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=self.refresh_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+        logger.info("Insurance statistics refresh stopped")
+
+
+_statistics_cache: Optional[InsuranceStatisticsCache] = None
+
+
+def get_insurance_statistics_cache() -> InsuranceStatisticsCache:
+    """Process-wide insurance statistics cache."""
+    global _statistics_cache
+    if _statistics_cache is None:
+        _statistics_cache = InsuranceStatisticsCache()
+    return _statistics_cache
@@ -0,0 +1,391 @@
+"""
+Batch entity resolution for Person nodes.
+
+Person IDs hash the lowercased name, so spelling variants of one officer
+("JOHN A SMITH", "John Smith", "Smith, John") become separate persons and
+split the officer network. The resolution job finds such duplicates
+without comparing every pair of persons:
+
+1. Every person is read once, with the carriers and companies linked to it.
+2. Persons are grouped into blocks by keys only likely duplicates share:
+   first initial with the Soundex code of the last name (in either name
+   order), and any email address or phone number.
+3. Pairs within a block are scored on name similarity, corroborated by
+   a matching date of birth and shared carriers, companies, emails, phones
+   and carrier contact details. A differing date of birth or middle initial
+   rules a pair out.
+4. Pairs scoring at least MERGE_THRESHOLD are merged into one person with
+   an audit record. Weaker pairs above LINK_THRESHOLD are linked
+   POSSIBLY_SAME_AS for review.
+
+Blocks larger than MAX_BLOCK_SIZE (very common names) are only compared
+between neighbours in name order, so the work grows linearly with the
+number of persons.
+"""
+
+import re
+import time
+import uuid
+import logging
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from services.chameleon_clustering import UnionFind, update_chameleon_clusters
+from utils.name_matching import name_tokens, soundex, token_similarity
+
+logger = logging.getLogger(__name__)
+
+
+# Pairs scoring at least this are merged, and at least LINK_THRESHOLD linked
+MERGE_THRESHOLD = 0.85
+LINK_THRESHOLD = 0.55
+
+# Pairs whose names match less than this are never duplicates, whatever
+# else they share (co-officers share carriers)
+MIN_NAME_SCORE = 0.8
+
+# Share of the pair score coming from the names
+NAME_WEIGHT = 0.6
+
+# Score added for each kind of shared evidence
+EVIDENCE_WEIGHTS = {
+    "same_date_of_birth": 0.3,
+    "shared_carriers": 0.3,
+    "shared_emails": 0.3,
+    "shared_phones": 0.25,
+    "shared_companies": 0.2,
+    "shared_carrier_contacts": 0.15,
+}
+
+# Name score kept when both names have middle names with different initials
+MIDDLE_NAME_CONFLICT = 0.7
+
+# Name score kept for single-token names, which say less about identity
+SINGLE_TOKEN_FACTOR = 0.8
+
+# Blocks above this size are compared within a sliding window in name order
+MAX_BLOCK_SIZE = 200
+BLOCK_WINDOW = 20
+
+# Persons read per query
+PROFILE_PAGE_SIZE = 5000
+
+# Merge groups and links listed in a dry-run report
+MAX_REPORTED = 100
+
+
+def _digits(phone: str) -> str:
+    """Last ten digits of a phone number."""
+    return re.sub(r"\D", "", phone or "")[-10:]
+
+
+def build_profile(row: Dict) -> Dict:
+    """Normalize a person row from PersonRepository.get_resolution_profiles for matching."""
+    return {
+        "person_id": row["person_id"],
+        "full_name": row.get("full_name") or "",
+        "tokens": name_tokens(row.get("full_name") or ""),
+        "date_of_birth": row.get("date_of_birth"),
+        "emails": {email.strip().lower() for email in row.get("email") or [] if email and email.strip()},
+        "phones": {digits for digits in (_digits(phone) for phone in row.get("phone") or []) if len(digits) >= 7},
+        "carriers": set(row.get("carriers") or []),
+        "companies": set(row.get("companies") or []),
+        "carrier_contacts": {contact.strip().lower() for contact in row.get("carrier_contacts") or [] if contact},
+    }
+
+
+def blocking_keys(profile: Dict) -> Set[str]:
+    """Keys a person is blocked under; persons sharing none are never compared."""
+    keys = set()
+    words = [token for token in profile["tokens"] if token.isalpha()]
+    if len(words) >= 2:
+        first, last = words[0], words[-1]
+        keys.add(f"name:{first[0]}:{soundex(last)}")
+        # Also under the reversed order, so "Smith John" meets "John Smith"
+        keys.add(f"name:{last[0]}:{soundex(first)}")
+    elif words:
+        keys.add(f"name:{soundex(words[0])}")
+    keys.update(f"email:{email}" for email in profile["emails"])
+    keys.update(f"phone:{phone}" for phone in profile["phones"])
+    return keys
+
+
+def candidate_pairs(profiles: List[Dict]) -> Tuple[Set[Tuple[str, str]], int]:
+    """Pairs of persons sharing a blocking key.
+
+    Args:
+        profiles: Profiles from build_profile
+
+    Returns:
+        tuple: Pairs of person IDs (lower ID first) and the number of blocks
+    """
+    blocks: Dict[str, List[Dict]] = {}
+    for profile in profiles:
+        for key in blocking_keys(profile):
+            blocks.setdefault(key, []).append(profile)
+
+    pairs: Set[Tuple[str, str]] = set()
+    compared_blocks = 0
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        compared_blocks += 1
+        if len(members) <= MAX_BLOCK_SIZE:
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    pairs.add(_pair(a["person_id"], b["person_id"]))
+        else:
+            members = sorted(members, key=lambda profile: (profile["tokens"], profile["person_id"]))
+            for i, a in enumerate(members):
+                for b in members[i + 1:i + 1 + BLOCK_WINDOW]:
+                    pairs.add(_pair(a["person_id"], b["person_id"]))
+    return pairs, compared_blocks
+
+
+def _pair(a: str, b: str) -> Tuple[str, str]:
+    return (a, b) if a < b else (b, a)
+
+
+def _similar(a: str, b: str) -> float:
+    """Token similarity in either direction, so an initial matches the full name."""
+    return max(token_similarity(a, b), token_similarity(b, a))
+
+
+def _similar_spelling(a: str, b: str) -> float:
+    """Similarity by spelling only; first names that merely sound alike (Jane, John) differ."""
+    if a == b:
+        return 1.0
+    if a.startswith(b) or b.startswith(a):
+        return 0.9
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def _ordered_name_score(a: List[str], b: List[str], surname_by_sound: bool = True) -> float:
+    surname = _similar(a[-1], b[-1]) if surname_by_sound else _similar_spelling(a[-1], b[-1])
+    score = (_similar_spelling(a[0], b[0]) + surname) / 2
+    middle_a, middle_b = a[1:-1], b[1:-1]
+    if middle_a and middle_b and middle_a[0][0] != middle_b[0][0]:
+        score *= MIDDLE_NAME_CONFLICT
+    return score
+
+
+def name_score(a: List[str], b: List[str]) -> float:
+    """How likely two tokenized names name the same person, from 0 to 1.
+
+    Surnames may sound alike, given names must be spelled alike. Names
+    are also compared with one of them reversed ("Smith John"); as it is
+    then unclear which token is the given name, both must be spelled
+    alike. A missing middle name is no conflict, a different middle
+    initial is.
+    """
+    if not a or not b:
+        return 0.0
+    if len(a) == 1 or len(b) == 1:
+        return max(_similar(x, y) for x in a for y in b) * SINGLE_TOKEN_FACTOR
+    return max(
+        _ordered_name_score(a, b),
+        _ordered_name_score(a, [b[-1], *b[1:-1], b[0]], surname_by_sound=False),
+    )
+
+
+def score_pair(a: Dict, b: Dict) -> Optional[Dict]:
+    """Score whether two profiles are the same person.
+
+    Args:
+        a: Profile from build_profile
+        b: Profile from build_profile
+
+    Returns:
+        dict: ``score`` and ``reasons``, or None if the pair is ruled out
+    """
+    if not compatible(a, b):
+        return None
+    names = name_score(a["tokens"], b["tokens"])
+    if names < MIN_NAME_SCORE:
+        return None
+
+    reasons = [f"name:{names:.2f}"]
+    score = NAME_WEIGHT * names
+    if a["date_of_birth"] and b["date_of_birth"]:
+        # compatible() has ruled out differing dates, so these are equal
+        score += EVIDENCE_WEIGHTS["same_date_of_birth"]
+        reasons.append("same_date_of_birth")
+    for evidence, field in (
+        ("shared_carriers", "carriers"),
+        ("shared_emails", "emails"),
+        ("shared_phones", "phones"),
+        ("shared_companies", "companies"),
+        ("shared_carrier_contacts", "carrier_contacts"),
+    ):
+        if a[field] & b[field]:
+            score += EVIDENCE_WEIGHTS[evidence]
+            reasons.append(evidence)
+    return {"score": round(min(score, 1.0), 3), "reasons": reasons}
+
+
+def compatible(a: Dict, b: Dict) -> bool:
+    """Whether two profiles may be the same person: no differing date of birth or middle initial."""
+    if a["date_of_birth"] and b["date_of_birth"] and str(a["date_of_birth"]) != str(b["date_of_birth"]):
+        return False
+    middle_a, middle_b = a["tokens"][1:-1], b["tokens"][1:-1]
+    return not (middle_a and middle_b and middle_a[0][0] != middle_b[0][0])
+
+
+def resolve_profiles(profiles: List[Dict]) -> Dict:
+    """Decide merges and links among profiles.
+
+    Merge pairs are applied best first. A pair only joins two groups if
+    every person in one is compatible with every person in the other, so
+    "John A Smith" and "John B Smith" are not merged through a shared
+    "John Smith"; such pairs are linked instead.
+
+    Args:
+        profiles: Profiles from build_profile
+
+    Returns:
+        dict: ``merge_groups`` (survivor and merged persons with scores),
+            ``links``, ``comparisons`` and ``blocks``
+    """
+    by_id = {profile["person_id"]: profile for profile in profiles}
+    pairs, blocks = candidate_pairs(profiles)
+
+    merge_pairs = []
+    link_pairs = []
+    for a, b in sorted(pairs):
+        decision = score_pair(by_id[a], by_id[b])
+        if decision is None or decision["score"] < LINK_THRESHOLD:
+            continue
+        pair = {"person_id": a, "other_id": b, **decision}
+        (merge_pairs if decision["score"] >= MERGE_THRESHOLD else link_pairs).append(pair)
+
+    sets = UnionFind()
+    members: Dict[str, List[str]] = {}
+    accepted: Dict[str, List[Dict]] = {}
+    for pair in sorted(merge_pairs, key=lambda pair: -pair["score"]):
+        root_a, root_b = sets.find(pair["person_id"]), sets.find(pair["other_id"])
+        if root_a == root_b:
+            continue
+        group_a, group_b = members.get(root_a, [root_a]), members.get(root_b, [root_b])
+        if not all(compatible(by_id[x], by_id[y]) for x in group_a for y in group_b):
+            link_pairs.append(pair)
+            continue
+        sets.union(root_a, root_b)
+        root = sets.find(root_a)
+        members[root] = group_a + group_b
+        accepted[root] = accepted.pop(root_a, []) + accepted.pop(root_b, []) + [pair]
+
+    merge_groups = []
+    merged_into = {}
+    for root, group in members.items():
+        if sets.find(root) != root:
+            continue
+        # Keep the best-connected person; ties go to the lowest ID
+        survivor = min(group, key=lambda m: (
+            -(len(by_id[m]["carriers"]) + len(by_id[m]["companies"])), m
+        ))
+        best: Dict[str, Dict] = {}
+        for pair in accepted[root]:
+            for person_id in (pair["person_id"], pair["other_id"]):
+                if person_id != survivor and pair["score"] > best.get(person_id, {}).get("score", -1):
+                    best[person_id] = {"person_id": person_id, "score": pair["score"], "reasons": pair["reasons"]}
+        merged_into.update({person_id: survivor for person_id in best})
+        merge_groups.append({
+            "survivor_id": survivor,
+            "merges": [best[person_id] for person_id in sorted(best)],
+        })
+
+    links = {}
+    for pair in link_pairs:
+        a, b = (merged_into.get(pair["person_id"], pair["person_id"]),
+                merged_into.get(pair["other_id"], pair["other_id"]))
+        if a == b:
+            continue
+        key = _pair(a, b)
+        if pair["score"] > links.get(key, {}).get("score", -1):
+            links[key] = {**pair, "person_id": key[0], "other_id": key[1]}
+
+    merge_groups.sort(key=lambda group: group["survivor_id"])
+    return {
+        "merge_groups": merge_groups,
+        "links": [links[key] for key in sorted(links)],
+        "comparisons": len(pairs),
+        "blocks": blocks,
+    }
+
+
+def _person_repo(repo):
+    if repo is None:
+        from repositories.person_repository import PersonRepository
+        repo = PersonRepository()
+    return repo
+
+
+def _read_profiles(repo) -> Iterable[Dict]:
+    after = ""
+    while True:
+        rows = repo.get_resolution_profiles(after, PROFILE_PAGE_SIZE)
+        if not rows:
+            return
+        for row in rows:
+            yield build_profile(row)
+        after = rows[-1]["person_id"]
+
+
+def resolve_persons(repo=None, dry_run: bool = False) -> Dict:
+    """Find duplicate persons and merge or link them.
+
+    Args:
+        repo: PersonRepository, created if not provided
+        dry_run: Report the decisions without writing them
+
+    Returns:
+        dict: Run ID, persons read, blocks and pairs compared, persons
+            merged and pairs linked; a dry run also lists (up to
+            MAX_REPORTED) merge groups and links
+    """
+    repo = _person_repo(repo)
+    start = time.perf_counter()
+    run_id = uuid.uuid4().hex
+
+    profiles = list(_read_profiles(repo))
+    decisions = resolve_profiles(profiles)
+    merged = sum(len(group["merges"]) for group in decisions["merge_groups"])
+
+    stats = {
+        "run_id": run_id,
+        "dry_run": dry_run,
+        "persons": len(profiles),
+        "blocks": decisions["blocks"],
+        "comparisons": decisions["comparisons"],
+        "persons_merged": merged,
+        "merge_groups": len(decisions["merge_groups"]),
+        "links": len(decisions["links"]),
+    }
+    if dry_run:
+        stats["merge_groups_sample"] = decisions["merge_groups"][:MAX_REPORTED]
+        stats["links_sample"] = decisions["links"][:MAX_REPORTED]
+        return stats
+
+    failed = 0
+    for group in decisions["merge_groups"]:
+        try:
+            repo.merge_persons(group["survivor_id"], group["merges"], run_id)
+        except Exception as e:
+            failed += 1
+            logger.error(f"Error merging persons into {group['survivor_id']}: {e}")
+    if decisions["links"]:
+        repo.link_possible_duplicates(decisions["links"], run_id)
+
+    # Officers moved between persons can change which carriers share one
+    merged_ids = {merge["person_id"] for group in decisions["merge_groups"] for merge in group["merges"]}
+    carriers = {usdot for profile in profiles if profile["person_id"] in merged_ids for usdot in profile["carriers"]}
+    if carriers:
+        try:
+            update_chameleon_clusters(sorted(carriers))
+        except Exception as e:
+            logger.error(f"Error updating chameleon clusters after person merges: {e}")
+
+    stats["failed_merge_groups"] = failed
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    logger.info(f"Person resolution run {run_id}: {stats}")
+    return stats
@@ -0,0 +1,161 @@
+"""
+Carrier risk scoring shared by the single and batch risk-assessment endpoints.
+
+Scores are computed column by column over a whole batch: each input family
+(latest safety snapshot, crash statistics, inspection statistics) is
+gathered into one list per field, every derived figure is computed over
+those lists, and the rows are assembled at the end. The batch path fetches
+each family for up to BATCH_CHUNK_SIZE carriers with one UNWIND query, so
+assessing N carriers costs three queries per chunk instead of three per
+carrier.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from repositories.crash_repository import CrashRepository
+from repositories.inspection_repository import InspectionRepository
+from repositories.safety_snapshot_repository import SafetySnapshotRepository
+
+
+# Months of crashes and inspections an assessment looks back over
+LOOKBACK_MONTHS = 24
+
+# National average out-of-service rates (percent)
+NATIONAL_DRIVER_OOS_RATE = 5.0
+NATIONAL_VEHICLE_OOS_RATE = 20.0
+
+# SMS BASICs whose alert flags mark a carrier
+SMS_BASICS = [
+    "unsafe_driving", "hours_of_service", "driver_fitness", "controlled_substances",
+    "vehicle_maintenance", "hazmat_compliance", "crash_indicator"
+]
+
+# Lowest risk score of each level, highest first
+RISK_LEVELS = [(30, "CRITICAL"), (20, "HIGH"), (10, "MODERATE"), (0, "LOW")]
+
+# Carriers fetched and scored per round of batch queries
+BATCH_CHUNK_SIZE = 1000
+
+_safety_repo = None
+_crash_repo = None
+_inspection_repo = None
+
+
+def _get_repos():
+    """Lazily create the shared repositories."""
+    global _safety_repo, _crash_repo, _inspection_repo
+    if _safety_repo is None:
+        _safety_repo = SafetySnapshotRepository()
+        _crash_repo = CrashRepository()
+        _inspection_repo = InspectionRepository()
+    return _safety_repo, _crash_repo, _inspection_repo
+
+
+def _column(rows: List[Optional[Dict]], field: str, default=0):
+    """One field of every row, with the default for missing rows or values."""
+    return [(row or {}).get(field) or default for row in rows]
+
+
+def score_carriers(usdots: List[int], snapshots: Dict[int, Dict], crash_stats: Dict[int, Dict],
+                   inspection_stats: Dict[int, Dict]) -> List[Dict]:
+    """Score a batch of carriers from their already-fetched data.
+
+    Args:
+        usdots: Carriers to score, in output order
+        snapshots: Latest safety snapshot by USDOT (missing if none)
+        crash_stats: Crash statistics by USDOT (missing if no crashes)
+        inspection_stats: Inspection statistics by USDOT (missing if no inspections)
+
+    Returns:
+        list: One RiskAssessment-shaped dict per carrier, without freshness
+    """
+    snapshot_rows = [snapshots.get(usdot) for usdot in usdots]
+    crash_rows = [crash_stats.get(usdot) for usdot in usdots]
+    inspection_rows = [inspection_stats.get(usdot) for usdot in usdots]
+
+    driver_oos = [rate / NATIONAL_DRIVER_OOS_RATE for rate in _column(snapshot_rows, "driver_oos_rate", 0.0)]
+    vehicle_oos = [rate / NATIONAL_VEHICLE_OOS_RATE for rate in _column(snapshot_rows, "vehicle_oos_rate", 0.0)]
+    alerts = [
+        any(row.get(f"{basic}_alert", False) for basic in SMS_BASICS) if row else False
+        for row in snapshot_rows
+    ]
+    fatal = _column(crash_rows, "fatal_crashes")
+    injury = _column(crash_rows, "injury_crashes")
+    total = _column(crash_rows, "total_crashes")
+    violations = _column(inspection_rows, "avg_violations_per_inspection", 0.0)
+
+    scores = [
+        d * 2 + v * 2 + f * 10 + min(i, 10) + min(vf / 5, 10)
+        for d, v, f, i, vf in zip(driver_oos, vehicle_oos, fatal, injury, violations)
+    ]
+
+    assessments = []
+    for n, usdot in enumerate(usdots):
+        indicators = []
+        if driver_oos[n] > 2.0:
+            indicators.append("DRIVER_OOS_2X_NATIONAL")
+        if vehicle_oos[n] > 2.0:
+            indicators.append("VEHICLE_OOS_2X_NATIONAL")
+        if alerts[n]:
+            indicators.append("SMS_ALERTS_ACTIVE")
+        if fatal[n] > 0:
+            indicators.append("FATAL_CRASHES")
+        if injury[n] > 3:
+            indicators.append("HIGH_INJURY_CRASHES")
+        if violations[n] > 20:
+            indicators.append("HIGH_VIOLATION_FREQUENCY")
+
+        assessments.append({
+            "usdot": usdot,
+            "risk_level": next(level for floor, level in RISK_LEVELS if scores[n] >= floor),
+            "driver_oos_multiplier": round(driver_oos[n], 2),
+            "vehicle_oos_multiplier": round(vehicle_oos[n], 2),
+            "fatal_crashes": fatal[n],
+            "injury_crashes": injury[n],
+            "total_crashes": total[n],
+            "violation_frequency": round(violations[n], 2),
+            "high_risk_indicators": indicators
+        })
+    return assessments
+
+
+def assess_carriers(usdots: List[int], safety_repo=None, crash_repo=None, inspection_repo=None) -> List[Dict]:
+    """Fetch and score one chunk of carriers with one query per data family.
+
+    Args:
+        usdots: Carriers to assess
+        safety_repo: SafetySnapshotRepository (defaults to a shared instance)
+        crash_repo: CrashRepository (defaults to a shared instance)
+        inspection_repo: InspectionRepository (defaults to a shared instance)
+
+    Returns:
+        list: score_carriers rows in the order given
+    """
+    if not usdots:
+        return []
+    if safety_repo is None or crash_repo is None or inspection_repo is None:
+        default_safety, default_crash, default_inspection = _get_repos()
+        safety_repo = safety_repo or default_safety
+        crash_repo = crash_repo or default_crash
+        inspection_repo = inspection_repo or default_inspection
+
+    return score_carriers(
+        usdots,
+        safety_repo.find_latest_by_usdots(usdots),
+        crash_repo.calculate_crash_statistics_batch(usdots, months=LOOKBACK_MONTHS),
+        inspection_repo.calculate_violation_rates(usdots, months=LOOKBACK_MONTHS)
+    )
+
+
+def chunk_usdots(usdots: Iterable[int], chunk_size: int = BATCH_CHUNK_SIZE) -> List[List[int]]:
+    """Split requested carriers into query-sized chunks, dropping repeats.
+
+    Args:
+        usdots: Requested USDOT numbers
+        chunk_size: Carriers per chunk
+
+    Returns:
+        list: Chunks of distinct USDOT numbers in request order
+    """
+    distinct = list(dict.fromkeys(usdots))
+    return [distinct[i:i + chunk_size] for i in range(0, len(distinct), chunk_size)]
@@ -4,24 +4,96 @@ Implements rate limiting, error handling, and data normalization.
 """
 
 import os
+import copy
+import math
 import time
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Callable, Iterator, AsyncIterator
 from datetime import datetime, date, timedelta, timezone
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from utils.cost_context import current_meter
+from services.searchcarriers_normalizer import normalizer, to_date
+
 logger = logging.getLogger(__name__)
 
 
+class RateLimiter:
+    """Thread-safe request spacing shared by every client in the process.
+    
+    Each caller reserves the next free request slot under a lock, so
+    concurrent callers start ``delay`` seconds apart while their network
+    round trips still overlap.
+    """
+    
+    def __init__(self, delay: float = 1.0):
+        """Initialize the limiter.
+        
+        Args:
+            delay: Minimum seconds between request starts
+        """
+        self.delay = delay
+        self.last_request_time = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until the caller's reserved request slot arrives."""
+        with self._lock:
+            current_time = time.time()
+            slot = max(current_time, self.last_request_time + self.delay)
+            self.last_request_time = slot
+        
+        sleep_time = slot - current_time
+        if sleep_time > 0:
+            logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
+            time.sleep(sleep_time)
+
+
+def process_request_delay(delay: float, processes: int) -> float:
+    """Spacing for one process when several processes share the vendor quota.
+    
+    Each process spaces its own requests, so N processes (the API plus every
+    ``enrichment-worker`` replica) each get 1/N of the allowed rate.
+    
+    Args:
+        delay: Minimum seconds between request starts across all processes
+        processes: Processes calling the API concurrently
+        
+    Returns:
+        float: Minimum seconds between request starts in this process
+    """
+    return delay * max(processes, 1)
+
+
+# One vendor quota split across SEARCH_CARRIERS_RATE_LIMIT_PROCESSES processes;
+# all clients and enrichment tasks in this process share its slice
+shared_rate_limiter = RateLimiter(delay=process_request_delay(
+    float(os.getenv('SEARCH_CARRIERS_RATE_LIMIT_DELAY', '1.0')),
+    int(os.getenv('SEARCH_CARRIERS_RATE_LIMIT_PROCESSES', '1'))
+))
+
+
 class SearchCarriersClient:
     """Client for interacting with the SearchCarriers API.
     
     Handles authentication, rate limiting, retries, and data fetching
     for insurance history, authority status, and compliance information.
+    
+    Identical requests (same endpoint and params) issued concurrently from any
+    client instance in the process share a single upstream call.
     """
     
+    # Single-flight registry shared by all client instances
+    _inflight: Dict[tuple, Future] = {}
+    _inflight_lock = threading.Lock()
+    _request_stats = {"upstream_requests": 0, "coalesced_requests": 0}
+    
     def __init__(self, api_key: Optional[str] = None):
         """Initialize the SearchCarriers client.
         
@@ -32,7 +104,8 @@ class SearchCarriersClient:
         if not self.api_key:
             raise ValueError("SearchCarriers API key is required. Set SEARCH_CARRIERS_API_TOKEN environment variable.")
         
-        self.base_url = "https://searchcarriers.com/api"
+        # SEARCH_CARRIERS_BASE_URL points the client at a local stand-in (scripts/searchcarriers_standin.py)
+        self.base_url = os.getenv('SEARCH_CARRIERS_BASE_URL', "https://searchcarriers.com/api").rstrip("/")
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
@@ -50,25 +123,103 @@ class SearchCarriersClient:
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
-        # Rate limiting configuration
-        self.rate_limit_delay = 1.0  # Seconds between requests
-        self.last_request_time = 0
+        # Rate limiting is shared across instances (one vendor quota)
+        self.rate_limiter = shared_rate_limiter
+        
+        # Pagination configuration
+        self.max_concurrent_pages = 4  # Pages in flight at once for paginated endpoints
     
     def _rate_limit(self):
         """Implement rate limiting to respect API limits."""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
+        self.rate_limiter.acquire()
+    
+    @staticmethod
+    def _request_key(base_url: str, endpoint: str, params: Optional[Dict]) -> tuple:
+        """Build the single-flight key for a request.
         
-        if time_since_last_request < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last_request
-            logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
+        Args:
+            base_url: API base URL
+            endpoint: API endpoint path
+            params: Query parameters
+            
+        Returns:
+            tuple: Hashable key identifying the upstream call
+        """
+        items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return (base_url, endpoint, items)
+    
+    @classmethod
+    def get_request_stats(cls) -> Dict[str, int]:
+        """Return single-flight counters for this process.
         
-        self.last_request_time = time.time()
+        Returns:
+            dict: ``upstream_requests`` actually sent, ``coalesced_requests``
+                served from another caller's in-flight call, and ``in_flight``
+        """
+        with cls._inflight_lock:
+            stats = dict(cls._request_stats)
+            stats["in_flight"] = len(cls._inflight)
+        return stats
+    
+    @classmethod
+    def reset_request_stats(cls):
+        """Reset single-flight counters (in-flight calls are left untouched)."""
+        with cls._inflight_lock:
+            cls._request_stats = {"upstream_requests": 0, "coalesced_requests": 0}
     
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
         """Make a rate-limited request to the API.
         
+        Concurrent identical requests are coalesced: the first caller performs
+        the upstream call and later callers wait for its result. Each caller
+        receives its own copy of the response since the fetch methods
+        normalize records in place.
+        
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters
+            
+        Returns:
+            dict: JSON response from the API
+            
+        Raises:
+            requests.exceptions.RequestException: On API errors
+        """
+        key = self._request_key(self.base_url, endpoint, params)
+        
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            if flight is None:
+                flight = Future()
+                self._inflight[key] = flight
+                self._request_stats["upstream_requests"] += 1
+                leader = True
+            else:
+                self._request_stats["coalesced_requests"] += 1
+                leader = False
+        
+        if not leader:
+            logger.debug(f"Joining in-flight request to {endpoint}")
+            meter = current_meter()
+            if meter is not None:
+                meter.record_cache_hit(endpoint)
+            return copy.deepcopy(flight.result())
+        
+        try:
+            result = self._fetch(endpoint, params)
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return copy.deepcopy(result)
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def _fetch(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+        """Perform the upstream HTTP request with rate limiting.
+        
         Args:
             endpoint: API endpoint path
             params: Query parameters
@@ -84,8 +235,11 @@ class SearchCarriersClient:
         url = f"{self.base_url}{endpoint}"
         logger.info(f"Making request to {endpoint}")
         
+        response = None
+        start = time.perf_counter()
         try:
             response = self.session.get(url, headers=self.headers, params=params)
+            self._record_cost(endpoint, start, response)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as e:
@@ -95,14 +249,152 @@ class SearchCarriersClient:
             elif e.response.status_code == 429:
                 logger.warning("Rate limit exceeded, backing off...")
                 time.sleep(5)  # Extra backoff for rate limit
-                return self._make_request(endpoint, params)  # Retry
+                return self._fetch(endpoint, params)  # Retry
             else:
                 logger.error(f"API error: {e}")
                 raise
         except Exception as e:
+            if response is None:
+                self._record_cost(endpoint, start)
             logger.error(f"Request failed: {e}")
             raise
     
+    @staticmethod
+    def _record_cost(endpoint: str, start: float, response: Optional[requests.Response] = None):
+        """Charge an upstream request to the job being metered, if any.
+        
+        Args:
+            endpoint: API endpoint path
+            start: ``time.perf_counter()`` when the request was sent
+            response: The response, or None if no response was received
+        """
+        meter = current_meter()
+        if meter is None:
+            return
+        meter.record_request(
+            endpoint,
+            len(response.content) if response is not None else 0,
+            (time.perf_counter() - start) * 1000,
+            error=response is None or response.status_code >= 400
+        )
+    
+    @staticmethod
+    def _get_last_page(result: Dict, per_page: int) -> Optional[int]:
+        """Read the last page number from a paginated response.
+        
+        Args:
+            result: First page response from the API
+            per_page: Page size used for the request
+            
+        Returns:
+            int: Last page number, or None if the response has no pagination metadata
+        """
+        meta = result.get("meta") or {}
+        if meta.get("last_page"):
+            return int(meta["last_page"])
+        if meta.get("total") is not None:
+            page_size = int(meta.get("per_page") or per_page)
+            return max(1, math.ceil(int(meta["total"]) / page_size))
+        return None
+    
+    def iter_pages(self, fetch_page: Callable[..., Dict], *args,
+                   per_page: int = 100, first_page: Optional[Dict] = None,
+                   **kwargs) -> Iterator[Dict]:
+        """Fetch every page of a paginated endpoint, yielding pages in order.
+        
+        Page one is fetched first to read the page count from its ``meta``
+        block. The remaining pages are then requested concurrently (bounded by
+        ``max_concurrent_pages`` and the shared rate limiter) before page one
+        is yielded, so callers process early pages while later ones are still
+        in flight. Responses without pagination metadata fall back to walking
+        pages one at a time until a short page comes back.
+        
+        Args:
+            fetch_page: Client method accepting ``page`` and ``per_page`` keywords,
+                e.g. ``self.get_inspections``
+            *args: Positional arguments for ``fetch_page`` (usually the DOT number)
+            per_page: Number of results per page
+            first_page: Page one if the caller already fetched it (e.g. for a freshness probe)
+            **kwargs: Additional keyword arguments for ``fetch_page``
+            
+        Yields:
+            dict: Page responses, starting with page one
+        """
+        first = first_page if first_page is not None else fetch_page(*args, page=1, per_page=per_page, **kwargs)
+        data = first.get("data")
+        if "error" in first or not isinstance(data, list) or len(data) == 0:
+            yield first
+            return
+        
+        last_page = self._get_last_page(first, per_page)
+        
+        if last_page is None:
+            # No metadata - walk sequentially until a short page
+            yield first
+            page = 1
+            while len(data) >= per_page:
+                page += 1
+                result = fetch_page(*args, page=page, per_page=per_page, **kwargs)
+                data = result.get("data")
+                if not isinstance(data, list) or len(data) == 0:
+                    break
+                yield result
+            return
+        
+        if last_page <= 1:
+            yield first
+            return
+        
+        logger.info(f"Fetching pages 2-{last_page} concurrently")
+        executor = ThreadPoolExecutor(max_workers=min(self.max_concurrent_pages, last_page - 1))
+        futures = [
+            # Each page runs in a copy of the caller's context so its cost is metered
+            executor.submit(contextvars.copy_context().run, fetch_page, *args,
+                            page=page, per_page=per_page, **kwargs)
+            for page in range(2, last_page + 1)
+        ]
+        try:
+            yield first
+            for future in futures:
+                yield future.result()
+        finally:
+            # Caller stopped early or a page failed - drop pages not yet started
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    async def aiter_pages(self, fetch_page: Callable[..., Dict], *args,
+                          per_page: int = 100, **kwargs) -> AsyncIterator[Dict]:
+        """Async iterator over every page of a paginated endpoint.
+        
+        Wraps ``iter_pages`` so event-loop code can consume pages in order
+        without blocking; later pages keep downloading in the background while
+        earlier ones are being processed.
+        
+        Args:
+            fetch_page: Client method accepting ``page`` and ``per_page`` keywords
+            *args: Positional arguments for ``fetch_page``
+            per_page: Number of results per page
+            **kwargs: Additional keyword arguments for ``fetch_page``
+            
+        Yields:
+            dict: Page responses, starting with page one
+        """
+        pages = self.iter_pages(fetch_page, *args, per_page=per_page, **kwargs)
+        done = object()
+        try:
+            while True:
+                page = await asyncio.to_thread(next, pages, done)
+                if page is done:
+                    break
+                yield page
+        finally:
+            try:
+                pages.close()
+            except ValueError:
+                # Cancelled while a page fetch was still running in its thread
+                pass
+    
     def get_carrier_insurance_history(self, dot_number: int, 
                                            page: int = 1, 
                                            per_page: int = 100) -> Dict:
@@ -125,31 +417,9 @@ class SearchCarriersClient:
         result = self._make_request(endpoint, params)
         
         # Normalize the response
-        if "data" in result:
-            insurance_records = result["data"]
-            logger.info(f"Found {len(insurance_records)} insurance records for DOT {dot_number}")
-            
-            # Parse and enhance the data
-            for record in insurance_records:
-                record["dot_number"] = dot_number
-                record["fetched_at"] = datetime.utcnow().isoformat()
-                
-                # Ensure date fields are properly formatted
-                for date_field in ["effective_date", "expiration_date", "cancellation_date"]:
-                    if date_field in record and record[date_field]:
-                        try:
-                            # Parse and reformat date to ensure consistency
-                            if isinstance(record[date_field], str):
-                                # Handle various date formats
-                                for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%Y-%m-%dT%H:%M:%S"]:
-                                    try:
-                                        dt = datetime.strptime(record[date_field], fmt)
-                                        record[date_field] = dt.date().isoformat()
-                                        break
-                                    except ValueError:
-                                        continue
-                        except Exception as e:
-                            logger.warning(f"Could not parse date {record[date_field]}: {e}")
+        if "data" in result and isinstance(result["data"], list):
+            logger.info(f"Found {len(result['data'])} insurance records for DOT {dot_number}")
+            normalizer.normalize_page("insurances", result["data"], dot_number)
         
         return result
     
@@ -186,9 +456,21 @@ class SearchCarriersClient:
         Returns:
             dict: Compliance status including violations and requirements
         """
-        # Get current insurance
-        insurance_data = self.get_carrier_insurance_history(dot_number, per_page=10)
+        # Same page as enrichment fetches, so a concurrent enrichment of this
+        # carrier coalesces with this call instead of sending a second request
+        insurance_data = self.get_carrier_insurance_history(dot_number)
+        return self.evaluate_insurance_compliance(dot_number, insurance_data)
+    
+    def evaluate_insurance_compliance(self, dot_number: int, insurance_data: Dict) -> Dict:
+        """Evaluate insurance compliance from an already fetched history page.
         
+        Args:
+            dot_number: USDOT number of the carrier
+            insurance_data: Response of get_carrier_insurance_history
+            
+        Returns:
+            dict: Compliance status including violations and requirements
+        """
         compliance_result = {
             "dot_number": dot_number,
             "is_compliant": True,
@@ -250,7 +532,7 @@ class SearchCarriersClient:
         # Sort by effective date
         sorted_policies = sorted(
             insurance_history,
-            key=lambda x: x.get("effective_date", "")
+            key=lambda x: to_date(x.get("effective_date")) or date.min
         )
         
         gaps = []
@@ -266,8 +548,10 @@ class SearchCarriersClient:
             
             # Parse dates
             try:
-                end = datetime.fromisoformat(end_date).date()
-                start = datetime.fromisoformat(next_policy["effective_date"]).date()
+                end = to_date(end_date)
+                start = to_date(next_policy["effective_date"])
+                if end is None or start is None:
+                    raise ValueError(f"Unparseable policy dates: {end_date}, {next_policy['effective_date']}")
                 
                 gap_days = (start - end).days
                 
@@ -275,8 +559,8 @@ class SearchCarriersClient:
                     gaps.append({
                         "from_policy": current.get("policy_id"),
                         "to_policy": next_policy.get("policy_id"),
-                        "gap_start": end_date,
-                        "gap_end": next_policy["effective_date"],
+                        "gap_start": end.isoformat(),
+                        "gap_end": start.isoformat(),
                         "gap_days": gap_days,
                         "from_provider": current.get("provider_name"),
                         "to_provider": next_policy.get("provider_name"),
@@ -308,8 +592,8 @@ class SearchCarriersClient:
         
         for policy in insurance_history:
             try:
-                effective_date = datetime.fromisoformat(policy["effective_date"]).date()
-                if effective_date >= cutoff_date:
+                effective_date = to_date(policy["effective_date"])
+                if effective_date and effective_date >= cutoff_date:
                     recent_policies.append(policy)
             except (ValueError, KeyError):
                 continue
@@ -399,18 +683,8 @@ class SearchCarriersClient:
             crashes = result["data"]
             logger.info(f"Found {len(crashes)} crashes for DOT {dot_number}")
             
-            # Enhance crash data
-            for crash in crashes:
-                crash["dot_number"] = dot_number
-                crash["fetched_at"] = datetime.now(timezone.utc).isoformat()
-                
-                # Determine severity level
-                if crash.get("fatalities", 0) > 0:
-                    crash["severity_level"] = "FATAL"
-                elif crash.get("injuries", 0) > 0:
-                    crash["severity_level"] = "INJURY"
-                else:
-                    crash["severity_level"] = "PROPERTY"
+            # Type dates and counts, derive severity level
+            normalizer.normalize_page("crashes", crashes, dot_number)
         
         return result
     
@@ -441,74 +715,8 @@ class SearchCarriersClient:
             inspections = result["data"]
             logger.info(f"Found {len(inspections)} inspections for DOT {dot_number}")
             
-            # Process inspection data with correct field mapping from API
-            for inspection in inspections:
-                inspection["dot_number"] = dot_number
-                inspection["fetched_at"] = datetime.now(timezone.utc).isoformat()
-                
-                # Map actual API field names to expected field names
-                # The API returns different field names than documented
-                
-                # Map date field: insp_date -> inspection_date
-                if "insp_date" in inspection:
-                    inspection["inspection_date"] = inspection["insp_date"]
-                    # Parse the date to ensure it's in ISO format
-                    try:
-                        if inspection["inspection_date"]:
-                            # Convert from "2025-08-25 00:00:00" to "2025-08-25"
-                            date_str = str(inspection["inspection_date"]).split()[0]
-                            inspection["inspection_date"] = date_str
-                    except Exception as e:
-                        logger.warning(f"Could not parse date for inspection {inspection.get('inspection_id')}: {e}")
-                
-                # Map violation fields
-                if "viol_total" in inspection:
-                    inspection["violations_count"] = inspection["viol_total"]
-                
-                # Map OOS fields  
-                if "oos_total" in inspection:
-                    inspection["oos_violations_count"] = inspection["oos_total"]
-                
-                # Convert numeric OOS fields to boolean (handle string values from API)
-                try:
-                    driver_oos_val = int(inspection.get("driver_oos_total", 0))
-                except (ValueError, TypeError):
-                    driver_oos_val = 0
-                inspection["driver_oos"] = driver_oos_val > 0
-                
-                try:
-                    vehicle_oos_val = int(inspection.get("vehicle_oos_total", 0))
-                except (ValueError, TypeError):
-                    vehicle_oos_val = 0
-                inspection["vehicle_oos"] = vehicle_oos_val > 0
-                
-                try:
-                    hazmat_oos_val = int(inspection.get("hazmat_oos_total", 0))
-                except (ValueError, TypeError):
-                    hazmat_oos_val = 0
-                inspection["hazmat_oos"] = hazmat_oos_val > 0
-                
-                # Categorize inspection result based on actual violations
-                try:
-                    oos_count = int(inspection.get("oos_total", 0))
-                except (ValueError, TypeError):
-                    oos_count = 0
-                    
-                try:
-                    violations_count = int(inspection.get("viol_total", 0))
-                except (ValueError, TypeError):
-                    violations_count = 0
-                
-                if oos_count > 0:
-                    inspection["result"] = "OOS"
-                elif violations_count > 0:
-                    inspection["result"] = "Violations"
-                else:
-                    inspection["result"] = "Clean"
-                
-                # Log suspicious data patterns
-                if violations_count > 100:
-                    logger.warning(f"Unusually high violation count {violations_count} for inspection {inspection.get('inspection_id')}")
+            # Map API field names, type dates/counts and categorize results
+            normalizer.normalize_page("inspections", inspections, dot_number)
         
         return result
     
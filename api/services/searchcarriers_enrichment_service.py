@@ -10,7 +10,7 @@ import sys
 import asyncio
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from datetime import datetime, timezone
 
 # Add parent directory to path for imports
@@ -18,43 +18,203 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import settings
 from database import db
+from services.enrichment_cost import (
+    LATENCY_BUCKETS_MS, CostMeter, budget_exceeded, cost_report, current_meter, histogram_percentile,
+    latency_bucket, metering
+)
+from services.enrichment_queue import EnrichmentQueue, ItemState, Priority, get_enrichment_queue
 
 logger = logging.getLogger(__name__)
 
 
-async def enrich_carriers_async(carrier_usdots: List[int], job_id: str, enrichment_options: Dict = None) -> Dict:
-    """
-    Asynchronously enrich carriers with SearchCarriers data.
+# Options used when a caller does not choose data families
+DEFAULT_ENRICHMENT_OPTIONS = {
+    "safety_data": True,
+    "crash_data": True,
+    "inspection_data": True,
+    "insurance_data": True
+}
+
+# Options that enrich insurance history alone
+INSURANCE_ONLY_OPTIONS = {
+    "safety_data": False,
+    "crash_data": False,
+    "inspection_data": False,
+    "insurance_data": True
+}
+
+# Enrichment families in write-phase order: (options key, result key, enricher method)
+ENRICHMENT_FAMILIES = [
+    ("insurance_data", "insurance", "enrich_carrier_by_usdot"),
+    ("safety_data", "safety", "enrich_carrier_safety_data"),
+    ("crash_data", "crashes", "enrich_carrier_crash_data"),
+    ("inspection_data", "inspections", "enrich_carrier_inspection_data"),
+]
+
+# Family name (as used in results and watermarks) -> enrichment option key
+FAMILY_OPTIONS = {result_key: option_key for option_key, result_key, _ in ENRICHMENT_FAMILIES}
+
+# Job counters pushed with every progress event
+PROGRESS_COUNTERS = [
+    "carriers_processed", "policies_created", "events_created", "gaps_detected",
+    "safety_snapshots_created", "crashes_found", "fatal_crashes", "injury_crashes",
+    "inspections_created", "violations_created", "families_skipped_unchanged"
+]
+
+TERMINAL_JOB_STATUSES = {"completed", "completed_with_errors", "cancelled", "stopped"}
+
+# Job options that cap what a job may consume
+JOB_CAPS = ("max_requests", "max_duration_seconds")
+
+async def _enrich_carrier(enricher, usdot: int, enrichment_options: Dict, force_refresh: bool) -> Dict:
+    """Run the requested enrichment families for one carrier concurrently.
     
-    This function is called by the ingestion orchestrator when enrichment
-    is enabled. It processes carriers in the background, fetching insurance
-    history, safety data, crash data, and inspection records.
+    The four families are independent upstream calls, and their writes only
+    share the Carrier node, which each family MATCHes rather than creates, so
+    they run side by side in worker threads. Per-carrier latency is that of
+    the slowest family instead of the sum. Anything that depends on more
+    than one family (the high-risk classification) is derived afterwards in
+    _record_carrier_result, once every family has settled.
     
     Args:
-        carrier_usdots: List of carrier USDOT numbers to enrich
-        job_id: Job ID for tracking the enrichment process
-        enrichment_options: Dict with options:
-            - safety_data: bool - Fetch OOS rates & SMS scores
-            - crash_data: bool - Fetch crash history
-            - inspection_data: bool - Fetch inspections & violations
-            - insurance_data: bool - Fetch insurance history
+        enricher: SearchCarriersInsuranceEnrichment instance shared by all workers
+        usdot: Carrier USDOT number
+        enrichment_options: Job options, merged over DEFAULT_ENRICHMENT_OPTIONS
+        force_refresh: Bypass the freshness probe
         
     Returns:
-        Dictionary with enrichment results and statistics
+        Per-family results for the carrier
     """
-    logger.info(f"Starting enrichment job {job_id} for {len(carrier_usdots)} carriers")
+    carrier_result = {"usdot": usdot}
     
-    # Default options if not provided
-    if enrichment_options is None:
-        enrichment_options = {
-            "safety_data": True,
-            "crash_data": True,
-            "inspection_data": True,
-            "insurance_data": True
-        }
+    families = [
+        (result_key, getattr(enricher, method_name))
+        for option_key, result_key, method_name in ENRICHMENT_FAMILIES
+        if enrichment_options[option_key]
+    ]
+    
+    outcomes = await asyncio.gather(
+        *(asyncio.to_thread(_run_family, result_key, method, usdot, force_refresh)
+          for result_key, method in families),
+        return_exceptions=True
+    )
+    
+    family_errors = {}
+    for (result_key, _), outcome in zip(families, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error(f"Error enriching {result_key} for carrier {usdot}: {outcome}")
+            family_errors[result_key] = str(outcome)
+        elif outcome and isinstance(outcome, dict):
+            carrier_result[result_key] = outcome
+    
+    # Check for errors in the insurance result
+    insurance_result = carrier_result.get("insurance")
+    if insurance_result and insurance_result.get("error"):
+        carrier_result["error"] = insurance_result["error"]
+    
+    if family_errors:
+        carrier_result["family_errors"] = family_errors
+        carrier_result["error"] = "; ".join(f"{key}: {error}" for key, error in family_errors.items())
+    
+    return carrier_result
+
+
+def _run_family(result_key: str, method, usdot: int, force_refresh: bool):
+    """Run one family's enrichment, timing it as a stage of the metered job."""
+    meter = current_meter()
+    if meter is None:
+        return method(usdot, force_refresh)
+    with meter.stage(result_key):
+        return method(usdot, force_refresh)
+
+
+def _elapsed_seconds(started_at: Optional[str]) -> float:
+    if not started_at:
+        return 0.0
+    return (datetime.now(timezone.utc) - datetime.fromisoformat(started_at)).total_seconds()
+
+
+def _job_caps(options: Dict) -> Dict:
+    """The caps set in a job's options."""
+    return {key: options[key] for key in JOB_CAPS if options.get(key) is not None}
+
+
+def _record_carrier_result(results: Dict, usdot: int, carrier_result: Dict):
+    """Fold one carrier's results into the job counters.
+    
+    Only called from the event loop thread, so workers never update the
+    counters concurrently.
+    
+    Args:
+        results: Job results dictionary being accumulated
+        usdot: Carrier USDOT number
+        carrier_result: Output of _enrich_carrier
+    """
+    insurance_result = carrier_result.get("insurance")
+    if insurance_result:
+        results["policies_created"] += insurance_result.get("policies_created", 0)
+        results["events_created"] += insurance_result.get("events_created", 0)
+        results["gaps_detected"] += insurance_result.get("gaps_found", 0)
+    
+    safety_result = carrier_result.get("safety")
+    if safety_result:
+        if safety_result.get("snapshot_created"):
+            results["safety_snapshots_created"] += 1
+        
+        # Check if high risk based on OOS rates
+        if safety_result.get("driver_oos_rate", 0) > 10.0 or \
+           safety_result.get("vehicle_oos_rate", 0) > 40.0:
+            results["high_risk_carriers"].append(usdot)
     
-    start_time = datetime.now(timezone.utc)
-    results = {
+    crash_result = carrier_result.get("crashes")
+    if crash_result:
+        results["crashes_found"] += crash_result.get("crash_count", 0)
+        results["fatal_crashes"] += crash_result.get("fatal_crashes", 0)
+        results["injury_crashes"] += crash_result.get("injury_crashes", 0)
+        
+        # High risk if fatal crashes
+        if crash_result.get("fatal_crashes", 0) > 0:
+            if usdot not in results["high_risk_carriers"]:
+                results["high_risk_carriers"].append(usdot)
+    
+    inspection_result = carrier_result.get("inspections")
+    if inspection_result:
+        results["inspections_created"] += inspection_result.get("inspection_count", 0)
+        results["violations_created"] += inspection_result.get("violation_count", 0)
+        
+        # Per-page write timing from the batched inspection writes, folded
+        # into fixed-size stats so the report does not grow with page count
+        page_timings = inspection_result.get("page_timings", [])
+        write_stats = results["inspection_write_stats"]
+        for timing in page_timings:
+            write_ms = timing.get("write_ms", 0.0)
+            write_stats["pages"] += 1
+            write_stats["statements"] += timing.get("statements", 0)
+            write_stats["total_ms"] = round(write_stats["total_ms"] + write_ms, 1)
+            write_stats["max_ms"] = max(write_stats["max_ms"], write_ms)
+            write_stats["write_ms_histogram"][latency_bucket(write_ms)] += 1
+        if page_timings:
+            write_stats["p50_ms"] = histogram_percentile(write_stats["write_ms_histogram"], 50, write_stats["max_ms"])
+            write_stats["p95_ms"] = histogram_percentile(write_stats["write_ms_histogram"], 95, write_stats["max_ms"])
+    
+    # Update statistics
+    results["carriers_processed"] += 1
+    results["families_skipped_unchanged"] += sum(
+        1 for key in ("insurance", "safety", "crashes", "inspections")
+        if isinstance(carrier_result.get(key), dict) and carrier_result[key].get("skipped")
+    )
+    
+    if carrier_result.get("error"):
+        results["errors"].append({
+            "usdot": usdot,
+            "error": carrier_result["error"],
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        })
+
+
+def _new_results(job_id: str, start_time: datetime) -> Dict:
+    """Create the empty aggregate report for an enrichment job."""
+    return {
         "job_id": job_id,
         "status": "processing",
         "carriers_processed": 0,
@@ -67,180 +227,357 @@ async def enrich_carriers_async(carrier_usdots: List[int], job_id: str, enrichme
         "injury_crashes": 0,
         "inspections_created": 0,
         "violations_created": 0,
+        "families_skipped_unchanged": 0,
+        "inspection_write_stats": {
+            "pages": 0, "statements": 0, "total_ms": 0.0, "max_ms": 0.0, "p50_ms": None, "p95_ms": None,
+            "write_ms_histogram": [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        },
         "high_risk_carriers": [],
         "errors": [],
         "started_at": start_time.isoformat()
     }
+
+
+def enqueue_enrichment(carrier_usdots: List[int], enrichment_options: Dict = None,
+                       priority: Priority = Priority.BULK, kind: str = "enrichment",
+                       job_id: Optional[str] = None) -> str:
+    """
+    Queue carriers for enrichment on the durable queue.
     
-    # Check if API token is configured
-    if not settings.search_carriers_api_token:
-        logger.warning("SearchCarriers API token not configured, skipping enrichment")
-        results["status"] = "skipped"
-        results["error"] = "API token not configured"
-        return results
+    The queue is drained by the standalone worker process (see
+    run_queue_worker); this is the only way enrichment is started.
     
-    try:
-        # Import the enrichment script
-        from scripts.ingest.searchcarriers_insurance_enrichment import SearchCarriersInsuranceEnrichment
+    Args:
+        carrier_usdots: List of carrier USDOT numbers to enrich
+        enrichment_options: Dict with options, defaulting to all families;
+            families it leaves out take their DEFAULT_ENRICHMENT_OPTIONS value:
+            - safety_data: bool - Fetch OOS rates & SMS scores
+            - crash_data: bool - Fetch crash history
+            - inspection_data: bool - Fetch inspections & violations
+            - insurance_data: bool - Fetch insurance history
+            - force_refresh: bool - Rewrite data even when the freshness probe
+              reports it unchanged upstream
+            - max_requests: int - Stop the job once it has made this many
+              upstream requests
+            - max_duration_seconds: float - Stop the job once it has run this long
+        priority: Priority class; interactive requests are claimed before bulk work
+        kind: Label describing what created the job
+        job_id: Optional job identifier
         
-        # Create enrichment instance
-        enricher = SearchCarriersInsuranceEnrichment()
+    Returns:
+        The job ID
+    """
+    options = dict(DEFAULT_ENRICHMENT_OPTIONS if enrichment_options is None else enrichment_options)
+    return get_enrichment_queue().enqueue(carrier_usdots, options, priority=priority, kind=kind, job_id=job_id)
+
+
+async def _renew_lease(queue: EnrichmentQueue, item_id: int, worker_id: str):
+    """Keep renewing a lease until cancelled, at a third of the lease length."""
+    while True:
+        await asyncio.sleep(max(queue.lease_seconds / 3, 0.01))
+        if not await asyncio.to_thread(queue.renew, item_id, worker_id):
+            logger.warning(f"Lost lease on enrichment item {item_id}; its result will be discarded")
+            return
+
+
+async def _settle_queue_item(queue: EnrichmentQueue, enricher, item: Dict, worker_id: str) -> Optional[str]:
+    """Enrich a claimed item, renewing its lease, and record the outcome."""
+    options = {**DEFAULT_ENRICHMENT_OPTIONS, **item["options"]}
+    usdot = item["usdot"]
+    
+    heartbeat = asyncio.create_task(_renew_lease(queue, item["item_id"], worker_id))
+    try:
+        carrier_result = await _enrich_carrier(enricher, usdot, options, options.get("force_refresh", False))
+    except Exception as e:
+        logger.error(f"Error enriching carrier {usdot}: {e}")
+        return await asyncio.to_thread(queue.fail, item["item_id"], str(e), None, worker_id)
+    finally:
+        heartbeat.cancel()
+    
+    if carrier_result.get("family_errors"):
+        return await asyncio.to_thread(
+            queue.fail, item["item_id"], carrier_result["error"], carrier_result, worker_id
+        )
+    
+    if not await asyncio.to_thread(queue.complete, item["item_id"], carrier_result, worker_id):
+        return None
+    return ItemState.SUCCEEDED
+
+
+async def process_queue_item(queue: EnrichmentQueue, enricher, item: Dict,
+                             worker_id: str = "local") -> Optional[str]:
+    """
+    Enrich one claimed queue item and record the outcome.
+    
+    Families that raised are treated as transient failures: the item is
+    retried with backoff and dead-lettered once it runs out of attempts.
+    Errors reported by the API in a normal response (e.g. carrier not
+    found) are stored with the result and not retried. The item's lease is
+    renewed while the carrier is being enriched.
+    
+    The attempt's cost is added to its job whatever the outcome. A job
+    that has reached one of its caps is stopped: its pending items are
+    withdrawn and this item is cancelled without being enriched.
+    
+    Args:
+        queue: Queue the item was claimed from
+        enricher: Shared SearchCarriersInsuranceEnrichment instance
+        item: Claimed item
+        worker_id: Lease owner the item was claimed with
         
-        # Process carriers in batches to avoid overwhelming the API
-        batch_size = 10
-        for i in range(0, len(carrier_usdots), batch_size):
-            batch = carrier_usdots[i:i+batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}: carriers {i+1} to {min(i+batch_size, len(carrier_usdots))}")
-            
-            # Process each carrier in the batch
-            for usdot in batch:
+    Returns:
+        The item's new state, or None if the lease was lost meanwhile
+    """
+    job_id = item["job_id"]
+    caps = _job_caps(item["options"])
+    
+    if caps:
+        usage = await asyncio.to_thread(queue.job_usage, job_id)
+        reason = budget_exceeded(caps, usage["upstream_requests"], _elapsed_seconds(usage["started_at"]))
+        if reason:
+            await asyncio.to_thread(queue.cancel_job, job_id, reason)
+            return await asyncio.to_thread(queue.fail, item["item_id"], reason, None, worker_id)
+    
+    meter = CostMeter()
+    with metering(meter):
+        state = await _settle_queue_item(queue, enricher, item, worker_id)
+    
+    usage = await asyncio.to_thread(queue.record_cost, job_id, meter.to_dict())
+    if caps and usage:
+        reason = budget_exceeded(caps, usage["upstream_requests"], _elapsed_seconds(usage["started_at"]))
+        if reason:
+            await asyncio.to_thread(queue.cancel_job, job_id, reason)
+    return state
+
+
+async def run_queue_worker(queue: Optional[EnrichmentQueue] = None, stop_event: Optional[asyncio.Event] = None,
+                           concurrency: Optional[int] = None, poll_interval: float = 1.0,
+                           worker_id: str = "local"):
+    """
+    Drain the durable enrichment queue until stopped.
+    
+    Each of ``concurrency`` workers claims one item at a time, so a newly
+    queued interactive request is picked up as soon as any worker is free.
+    Workers only fetch and map records; a shared write stage batches the
+    writes of all of them and holds them back when Neo4j falls behind.
+    Runs in the standalone worker process (``python -m workers.enrichment``).
+    
+    Args:
+        queue: Queue to drain (defaults to the process-wide queue)
+        stop_event: Set to stop the workers after their current item
+        concurrency: Worker count (defaults to settings.enrichment_concurrency)
+        poll_interval: Seconds to wait when no item is due
+        worker_id: Lease owner recorded on claimed items; unique per process
+    """
+    from scripts.ingest.searchcarriers_insurance_enrichment import SearchCarriersInsuranceEnrichment
+    
+    queue = queue or get_enrichment_queue()
+    stop_event = stop_event or asyncio.Event()
+    concurrency = max(1, int(concurrency or settings.enrichment_concurrency))
+    enricher = SearchCarriersInsuranceEnrichment()
+    
+    async def worker(index: int):
+        while not stop_event.is_set():
+            item = await asyncio.to_thread(queue.claim, worker_id)
+            if item is None:
                 try:
-                    carrier_result = {"usdot": usdot}
-                    
-                    # Enrich with insurance data if requested
-                    if enrichment_options.get("insurance_data", True):
-                        insurance_result = await asyncio.to_thread(
-                            enricher.enrich_carrier_by_usdot,
-                            usdot
-                        )
-                        if insurance_result and isinstance(insurance_result, dict):
-                            results["policies_created"] += insurance_result.get("policies_created", 0)
-                            results["events_created"] += insurance_result.get("events_created", 0)
-                            results["gaps_detected"] += insurance_result.get("gaps_found", 0)
-                            carrier_result["insurance"] = insurance_result
-                            # Check for errors in the result
-                            if insurance_result.get("error"):
-                                carrier_result["error"] = insurance_result["error"]
-                    
-                    # Enrich with safety data if requested
-                    if enrichment_options.get("safety_data", False):
-                        safety_result = await asyncio.to_thread(
-                            enricher.enrich_carrier_safety_data,
-                            usdot
-                        )
-                        if safety_result and isinstance(safety_result, dict):
-                            if safety_result.get("snapshot_created"):
-                                results["safety_snapshots_created"] += 1
-                            
-                            # Check if high risk based on OOS rates
-                            if safety_result.get("driver_oos_rate", 0) > 10.0 or \
-                               safety_result.get("vehicle_oos_rate", 0) > 40.0:
-                                results["high_risk_carriers"].append(usdot)
-                            
-                            carrier_result["safety"] = safety_result
-                    
-                    # Enrich with crash data if requested
-                    if enrichment_options.get("crash_data", False):
-                        crash_result = await asyncio.to_thread(
-                            enricher.enrich_carrier_crash_data,
-                            usdot
-                        )
-                        if crash_result and isinstance(crash_result, dict):
-                            results["crashes_found"] += crash_result.get("crash_count", 0)
-                            results["fatal_crashes"] += crash_result.get("fatal_crashes", 0)
-                            results["injury_crashes"] += crash_result.get("injury_crashes", 0)
-                            
-                            # High risk if fatal crashes
-                            if crash_result.get("fatal_crashes", 0) > 0:
-                                if usdot not in results["high_risk_carriers"]:
-                                    results["high_risk_carriers"].append(usdot)
-                            
-                            carrier_result["crashes"] = crash_result
-                    
-                    # Enrich with inspection data if requested
-                    if enrichment_options.get("inspection_data", False):
-                        inspection_result = await asyncio.to_thread(
-                            enricher.enrich_carrier_inspection_data,
-                            usdot
-                        )
-                        if inspection_result and isinstance(inspection_result, dict):
-                            results["inspections_created"] += inspection_result.get("inspection_count", 0)
-                            results["violations_created"] += inspection_result.get("violation_count", 0)
-                            carrier_result["inspections"] = inspection_result
-                    
-                    # Update statistics
-                    results["carriers_processed"] += 1
-                    
-                    if carrier_result.get("error"):
-                        results["errors"].append({
-                            "usdot": usdot,
-                            "error": carrier_result["error"],
-                            "timestamp": datetime.now(timezone.utc).isoformat()
-                        })
-                    
-                    logger.info(f"Enriched carrier {usdot} with requested data types")
-                    
-                except Exception as e:
-                    logger.error(f"Error enriching carrier {usdot}: {e}")
-                    results["carriers_processed"] += 1  # Still count as processed
-                    results["errors"].append({
-                        "usdot": usdot,
-                        "error": str(e),
-                        "timestamp": datetime.now(timezone.utc).isoformat()
-                    })
+                    await asyncio.wait_for(stop_event.wait(), timeout=poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
             
-            # Add delay between batches to respect rate limits
-            if i + batch_size < len(carrier_usdots):
-                await asyncio.sleep(2)  # 2 second delay between batches
-        
-        # Calculate execution time
-        execution_time = (datetime.now(timezone.utc) - start_time).total_seconds()
-        
-        # Update final status
-        results["status"] = "completed" if not results["errors"] else "completed_with_errors"
-        results["completed_at"] = datetime.now(timezone.utc).isoformat()
-        results["execution_time_seconds"] = execution_time
-        
-        logger.info(
-            f"Enrichment job {job_id} completed in {execution_time:.2f} seconds. "
-            f"Processed: {results['carriers_processed']}, "
-            f"Policies: {results['policies_created']}, "
-            f"Events: {results['events_created']}, "
-            f"Errors: {len(results['errors'])}"
-        )
-        
-    except ImportError as e:
-        logger.error(f"Failed to import enrichment module: {e}")
-        results["status"] = "failed"
-        results["error"] = f"Import error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Enrichment job {job_id} failed: {e}")
-        results["status"] = "failed"
-        results["error"] = str(e)
+            state = await process_queue_item(queue, enricher, item, worker_id)
+            logger.info(f"Worker {worker_id}/{index} finished carrier {item['usdot']} (job {item['job_id']}): {state}")
     
-    return results
+    logger.info(f"Enrichment queue worker {worker_id} started with {concurrency} workers")
+    # One write stage per process coalesces the writes of every worker
+    enricher.start_write_pipeline()
+    try:
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    finally:
+        enricher.stop_write_pipeline()
+    logger.info("Enrichment queue worker stopped")
 
 
 async def get_enrichment_status(job_id: str) -> Dict:
     """
     Get the status of an enrichment job.
     
+    The aggregate report is rebuilt from the per-carrier results stored on
+    the durable queue, so it is available after restarts. It includes the
+    job's cost: upstream requests, bytes, cache hits and latency percentiles
+    per endpoint, Neo4j statements and write counters, and wall time per
+    enrichment family.
+    
     Args:
         job_id: Job ID to check
         
     Returns:
         Dictionary with job status and statistics
     """
-    # In a production system, this would query a job tracking database
-    # For now, return a placeholder
+    queue = get_enrichment_queue()
+    job = await asyncio.to_thread(queue.get_job, job_id)
+    if job is None:
+        return {
+            "job_id": job_id,
+            "status": "unknown",
+            "message": "Job not found"
+        }
+    
+    results = _new_results(job_id, datetime.fromisoformat(job["created_at"]))
+    for finished in await asyncio.to_thread(queue.get_job_results, job_id):
+        _record_carrier_result(results, finished["usdot"], _finished_carrier_result(finished))
+    
+    results.update({
+        "status": job["status"],
+        "kind": job["kind"],
+        "priority": job["priority"],
+        "options": job["options"],
+        "total_carriers": job["total_items"],
+        "items": job["items"],
+        "caps": _job_caps(job["options"]),
+        "stop_reason": job["stop_reason"],
+        "cost": cost_report(job["cost"])
+    })
+    return results
+
+
+def _finished_carrier_result(finished: Dict) -> Dict:
+    """Rebuild the carrier result of a finished queue item."""
+    carrier_result = finished["result"] or {"usdot": finished["usdot"]}
+    if finished["state"] == ItemState.DEAD:
+        carrier_result = {**carrier_result, "error": finished["last_error"]}
+    return carrier_result
+
+
+def _progress_snapshot(job: Dict, results: Dict) -> Dict:
+    """
+    Summarize a job's progress for the status stream.
+    
+    Throughput is measured from the first claimed item, so time spent
+    waiting behind higher-priority work does not count against the job.
+    
+    Args:
+        job: Job as returned by EnrichmentQueue.get_job
+        results: Counters accumulated from the job's finished items
+        
+    Returns:
+        Dictionary with item counts, running counters, throughput and ETA
+    """
+    items = job["items"]
+    total = job["total_items"]
+    done = items[ItemState.SUCCEEDED] + items[ItemState.DEAD]
+    remaining = items[ItemState.PENDING] + items[ItemState.RUNNING]
+    
+    elapsed = 0.0
+    if job.get("started_at"):
+        elapsed = (datetime.now(timezone.utc) - datetime.fromisoformat(job["started_at"])).total_seconds()
+    throughput = done / elapsed if done and elapsed > 0 else 0.0
+    
+    if not remaining:
+        eta = 0.0
+    elif throughput:
+        eta = round(remaining / throughput, 1)
+    else:
+        eta = None
+    
     return {
-        "job_id": job_id,
-        "status": "unknown",
-        "message": "Job tracking not yet implemented"
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "total_carriers": total,
+        "completed": done,
+        "failed": items[ItemState.DEAD],
+        "cancelled": items[ItemState.CANCELLED],
+        "running": items[ItemState.RUNNING],
+        "remaining": remaining,
+        "percent_complete": round(100.0 * done / total, 1) if total else 100.0,
+        "counters": {key: results[key] for key in PROGRESS_COUNTERS},
+        "errors": len(results["errors"]),
+        "high_risk_carriers": len(results["high_risk_carriers"]),
+        "elapsed_seconds": round(elapsed, 1),
+        "throughput_per_minute": round(throughput * 60, 2),
+        "eta_seconds": eta
     }
 
 
+async def stream_enrichment_progress(job_id: str, poll_interval: float = 1.0,
+                                     heartbeat_interval: float = 15.0) -> AsyncIterator[Tuple[str, Dict]]:
+    """
+    Follow an enrichment job until it finishes.
+    
+    Polls the durable queue, so it works whichever process runs the workers.
+    Yields one ``carrier`` event per finished carrier, a ``progress`` event
+    whenever carriers finish or the job status changes, ``heartbeat`` events
+    while idle, and a final ``done`` event once the job reaches a terminal
+    status.
+    
+    Args:
+        job_id: Job ID to follow
+        poll_interval: Seconds between queue polls
+        heartbeat_interval: Seconds of inactivity between heartbeats
+        
+    Yields:
+        (event name, payload) tuples; nothing if the job does not exist
+    """
+    queue = get_enrichment_queue()
+    job = await asyncio.to_thread(queue.get_job, job_id)
+    if job is None:
+        return
+    
+    loop = asyncio.get_running_loop()
+    results = _new_results(job_id, datetime.fromisoformat(job["created_at"]))
+    cursor = None
+    last_status = None
+    last_event = loop.time()
+    
+    while True:
+        finished_items = await asyncio.to_thread(queue.get_job_results, job_id, cursor)
+        for finished in finished_items:
+            cursor = (finished["finished_at"], finished["item_id"])
+            carrier_result = _finished_carrier_result(finished)
+            _record_carrier_result(results, finished["usdot"], carrier_result)
+            yield "carrier", {
+                "usdot": finished["usdot"],
+                "state": finished["state"],
+                "families": [key for _, key, _ in ENRICHMENT_FAMILIES if key in carrier_result],
+                "error": carrier_result.get("error"),
+                "finished_at": finished["finished_at"]
+            }
+        
+        job = await asyncio.to_thread(queue.get_job, job_id)
+        snapshot = _progress_snapshot(job, results)
+        
+        if job["status"] in TERMINAL_JOB_STATUSES:
+            yield "done", snapshot
+            return
+        
+        if finished_items or job["status"] != last_status:
+            yield "progress", snapshot
+            last_status = job["status"]
+            last_event = loop.time()
+        elif loop.time() - last_event >= heartbeat_interval:
+            yield "heartbeat", {}
+            last_event = loop.time()
+        
+        await asyncio.sleep(poll_interval)
+
+
 async def cancel_enrichment(job_id: str) -> bool:
     """
     Cancel an ongoing enrichment job.
     
+    Cancellation is cooperative: workers check for it before starting each
+    carrier, so carriers already in flight finish and are recorded, and no
+    further carriers of the job are started.
+    
     Args:
         job_id: Job ID to cancel
         
     Returns:
-        Boolean indicating if cancellation was successful
+        Boolean indicating if cancellation was successful; False if the job
+        does not exist or has already finished
     """
     logger.info(f"Cancelling enrichment job {job_id}")
-    # In a production system, this would set a cancellation flag
-    # that the enrichment process checks periodically
-    return True
\ No newline at end of file
+    
+    withdrawn = await asyncio.to_thread(get_enrichment_queue().cancel_job, job_id)
+    return withdrawn is not None
\ No newline at end of file
@@ -0,0 +1,238 @@
+"""
+Batch normalization for SearchCarriers API payloads.
+
+Converts whole pages of raw API records into typed records in a single pass.
+Date formats are inferred once per endpoint and field from the first value
+seen and cached, so each subsequent value is parsed by a single known parser
+instead of trying several ``strptime`` formats per record.
+"""
+
+import re
+import logging
+import threading
+from datetime import datetime, date, timezone
+from typing import Dict, List, Optional, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_iso(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def _parse_us(value: str) -> datetime:
+    return datetime.strptime(value[:10], "%m/%d/%Y")
+
+
+# Candidate formats in inference order: (name, matcher, parser)
+DATE_FORMATS: List[Tuple[str, re.Pattern, Callable[[str], datetime]]] = [
+    ("iso", re.compile(r"^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?(Z|[+-]\d{2}:\d{2})?$"), _parse_iso),
+    ("us", re.compile(r"^\d{2}/\d{2}/\d{4}"), _parse_us),
+]
+
+
+def to_datetime(value: Any) -> Optional[datetime]:
+    """Coerce a normalized or raw date value to a datetime.
+
+    Args:
+        value: datetime, date or date string in any supported format
+
+    Returns:
+        datetime or None if the value is empty or unparseable
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    text = str(value).strip()
+    for _, matcher, parser in DATE_FORMATS:
+        if matcher.match(text):
+            try:
+                return parser(text)
+            except ValueError:
+                return None
+    return None
+
+
+def to_date(value: Any) -> Optional[date]:
+    """Coerce a normalized or raw date value to a date.
+
+    Args:
+        value: datetime, date or date string in any supported format
+
+    Returns:
+        date or None if the value is empty or unparseable
+    """
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    parsed = to_datetime(value)
+    return parsed.date() if parsed else None
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value) if value is not None and value != "" else 0
+    except (ValueError, TypeError):
+        try:
+            return int(float(value))
+        except (ValueError, TypeError):
+            return 0
+
+
+class PayloadNormalizer:
+    """Single normalization engine for SearchCarriers list endpoints.
+
+    Each endpoint family declares its date fields once. The parser for a
+    (family, field) pair is inferred from the first non-empty value and reused
+    for the rest of the process; a value that does not fit the cached parser
+    triggers re-inference for that value only.
+    """
+
+    # Date fields per endpoint family: field -> "date" or "datetime"
+    DATE_FIELDS = {
+        "insurances": {"effective_date": "date", "expiration_date": "date", "cancellation_date": "date"},
+        "crashes": {"crash_date": "datetime"},
+        "inspections": {"inspection_date": "date"},
+    }
+
+    def __init__(self):
+        self._parsers: Dict[Tuple[str, str], Callable[[str], datetime]] = {}
+        self._lock = threading.Lock()
+
+    def _infer_parser(self, family: str, field: str, value: str) -> Optional[Callable[[str], datetime]]:
+        for name, matcher, parser in DATE_FORMATS:
+            if matcher.match(value):
+                with self._lock:
+                    self._parsers[(family, field)] = parser
+                logger.debug(f"Inferred '{name}' date format for {family}.{field}")
+                return parser
+        return None
+
+    def parse_date_field(self, family: str, field: str, value: Any) -> Optional[datetime]:
+        """Parse a date value using the cached parser for its endpoint and field.
+
+        Args:
+            family: Endpoint family, e.g. "inspections"
+            field: Field name, e.g. "inspection_date"
+            value: Raw value from the API
+
+        Returns:
+            datetime or None if the value is empty or unparseable
+        """
+        if value is None or value == "":
+            return None
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, date):
+            return datetime(value.year, value.month, value.day)
+
+        text = value if isinstance(value, str) else str(value)
+        parser = self._parsers.get((family, field))
+        if parser is not None:
+            try:
+                return parser(text)
+            except ValueError:
+                pass
+
+        parser = self._infer_parser(family, field, text.strip())
+        if parser is None:
+            logger.warning(f"Unrecognized date format for {family}.{field}: {value!r}")
+            return None
+        try:
+            return parser(text.strip())
+        except ValueError:
+            logger.warning(f"Could not parse {family}.{field}: {value!r}")
+            return None
+
+    def _normalize_dates(self, family: str, record: Dict):
+        for field, kind in self.DATE_FIELDS.get(family, {}).items():
+            if field in record:
+                parsed = self.parse_date_field(family, field, record[field])
+                record[field] = parsed.date() if parsed and kind == "date" else parsed
+
+    def normalize_page(self, family: str, records: List[Dict], dot_number: int) -> List[Dict]:
+        """Normalize a page of records in place in a single pass.
+
+        Args:
+            family: Endpoint family ("insurances", "crashes" or "inspections")
+            records: Raw records from the API response
+            dot_number: USDOT number the page belongs to
+
+        Returns:
+            list: The same records with typed fields
+        """
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        normalize_record = getattr(self, f"_normalize_{family}")
+
+        for record in records:
+            record["dot_number"] = dot_number
+            record["fetched_at"] = fetched_at
+            normalize_record(record)
+
+        return records
+
+    def _normalize_insurances(self, record: Dict):
+        self._normalize_dates("insurances", record)
+
+    def _normalize_crashes(self, record: Dict):
+        self._normalize_dates("crashes", record)
+        fatalities = _to_int(record.get("fatalities"))
+        injuries = _to_int(record.get("injuries"))
+        record["fatalities"] = fatalities
+        record["injuries"] = injuries
+
+        if fatalities > 0:
+            record["severity_level"] = "FATAL"
+        elif injuries > 0:
+            record["severity_level"] = "INJURY"
+        else:
+            record["severity_level"] = "PROPERTY"
+
+    def _normalize_inspections(self, record: Dict):
+        # Map API field names to expected names: insp_date -> inspection_date,
+        # viol_total -> violations_count, oos_total -> oos_violations_count
+        if "insp_date" in record:
+            record["inspection_date"] = record["insp_date"]
+        self._normalize_dates("inspections", record)
+
+        violations_count = _to_int(record.get("viol_total", record.get("violations_count")))
+        oos_count = _to_int(record.get("oos_total", record.get("oos_count")))
+        record["violations_count"] = violations_count
+        record["oos_violations_count"] = oos_count
+
+        # Convert numeric OOS totals to booleans, keeping flags already present
+        for flag in ("driver_oos", "vehicle_oos", "hazmat_oos"):
+            total_field = f"{flag}_total"
+            if total_field in record:
+                record[flag] = _to_int(record[total_field]) > 0
+            else:
+                record[flag] = bool(record.get(flag, False))
+
+        if oos_count > 0:
+            record["result"] = "OOS"
+        elif violations_count > 0:
+            record["result"] = "Violations"
+        else:
+            record["result"] = "Clean"
+
+        if violations_count > 100:
+            logger.warning(f"Unusually high violation count {violations_count} for inspection {record.get('inspection_id')}")
+
+    @staticmethod
+    def to_columns(records: List[Dict], fields: List[str]) -> Dict[str, List[Any]]:
+        """Pivot normalized records into column lists.
+
+        Args:
+            records: Normalized records
+            fields: Field names to extract
+
+        Returns:
+            dict: Field name to list of values, one entry per record
+        """
+        return {field: [record.get(field) for record in records] for field in fields}
+
+
+# Shared engine so inferred formats are reused across client instances
+normalizer = PayloadNormalizer()
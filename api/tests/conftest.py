@@ -21,4 +21,11 @@ else:
     os.environ["NEO4J_URI"] = "bolt://localhost:7688"
     os.environ["NEO4J_USER"] = "neo4j"
     os.environ["NEO4J_PASSWORD"] = "testpassword123"
-    os.environ["API_KEY"] = "test-api-key"
\ No newline at end of file
+    os.environ["API_KEY"] = "test-api-key"
+
+# Keep the durable enrichment queue out of the working tree during tests
+import tempfile
+os.environ.setdefault(
+    "ENRICHMENT_QUEUE_PATH",
+    str(Path(tempfile.gettempdir()) / f"rico_test_enrichment_queue_{os.getpid()}.db")
+)
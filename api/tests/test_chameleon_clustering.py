@@ -0,0 +1,283 @@
+"""
+Unit tests for chameleon-carrier clustering.
+
+Tests union-find, cluster scoring and hub suppression, the streaming full
+rebuild, incremental updates and the cluster endpoints.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import app
+from services.chameleon_clustering import (
+    MAX_ATTRIBUTE_CARRIERS, UnionFind, cluster_carriers,
+    rebuild_chameleon_clusters, update_chameleon_clusters
+)
+
+
+def carrier(usdot, officer=(), insurance_provider=(), phone=(), address=(), risk=0, crashes=0):
+    """Build a carrier attributes row."""
+    return {
+        "usdot": usdot,
+        "insurance_risk_score": risk,
+        "crashes": crashes,
+        "violations": 0,
+        "officer": list(officer),
+        "insurance_provider": list(insurance_provider),
+        "phone": list(phone),
+        "address": list(address),
+    }
+
+
+class FakeClusterRepository:
+    """In-memory stand-in for ChameleonClusterRepository."""
+
+    def __init__(self, carriers, clusters=None):
+        self.carriers = {row["usdot"]: row for row in carriers}
+        self.clusters = {cluster["cluster_id"]: cluster for cluster in clusters or []}
+        self.attribute_queries = 0
+
+    def get_carrier_attributes(self, after_usdot, limit):
+        usdots = sorted(usdot for usdot in self.carriers if usdot > after_usdot)[:limit]
+        return [self.carriers[usdot] for usdot in usdots]
+
+    def get_carrier_attributes_for(self, usdots):
+        self.attribute_queries += 1
+        return [self.carriers[usdot] for usdot in usdots if usdot in self.carriers]
+
+    def get_attribute_holders(self, kind, values, max_carriers):
+        return [
+            {"value": value,
+             "usdots": [u for u, row in sorted(self.carriers.items()) if value in row[kind]][:max_carriers + 1]}
+            for value in values
+        ]
+
+    def get_cluster_members(self, usdots):
+        return sorted({
+            member for cluster in self.clusters.values()
+            if set(cluster["members"]) & set(usdots) for member in cluster["members"]
+        })
+
+    def write_clusters(self, clusters, generation):
+        for cluster in clusters:
+            self.clusters[cluster["cluster_id"]] = {**cluster, "generation": generation}
+
+    def delete_other_generations(self, generation):
+        stale = [cid for cid, cluster in self.clusters.items() if cluster["generation"] != generation]
+        for cid in stale:
+            del self.clusters[cid]
+        return len(stale)
+
+    def replace_clusters(self, usdots, clusters, generation):
+        for cid in [cid for cid, cluster in self.clusters.items() if set(cluster["members"]) & set(usdots)]:
+            del self.clusters[cid]
+        self.write_clusters(clusters, generation)
+
+
+class TestUnionFind:
+    """Test suite for UnionFind."""
+
+    def test_groups(self):
+        """Test unions merge sets transitively and leave others apart."""
+        sets = UnionFind()
+        sets.union(1, 2)
+        sets.union(3, 4)
+        sets.union(2, 4)
+        sets.find(5)
+
+        groups = sorted(sorted(members) for members in sets.groups().values())
+        assert groups == [[1, 2, 3, 4], [5]]
+
+    def test_long_chain(self):
+        """Test a long chain of unions resolves without recursion."""
+        sets = UnionFind()
+        for n in range(100000):
+            sets.union(n, n + 1)
+        assert sets.find(0) == sets.find(100000)
+
+
+class TestClusterCarriers:
+    """Test suite for cluster_carriers."""
+
+    def test_shared_officer_links_carriers(self):
+        """Test carriers sharing an officer form one cluster; loners do not."""
+        clusters = cluster_carriers([
+            carrier(1, officer=["P1"]),
+            carrier(2, officer=["P1"], phone=["555"]),
+            carrier(3, phone=["555"]),
+            carrier(4, officer=["P2"]),
+        ])
+
+        assert len(clusters) == 1
+        cluster = clusters[0]
+        assert cluster["cluster_id"] == "CC-1"
+        assert cluster["members"] == [1, 2, 3]
+        assert cluster["shared_officers"] == 1
+        assert cluster["shared_phones"] == 1
+        assert cluster["officer_ids"] == ["P1"]
+        assert cluster["score"] == 35.0
+
+    def test_common_value_ignored(self):
+        """Test a provider held by more carriers than allowed links nobody."""
+        cap = MAX_ATTRIBUTE_CARRIERS["insurance_provider"]
+        clusters = cluster_carriers([
+            carrier(n, insurance_provider=["Big Insurer"]) for n in range(cap + 1)
+        ])
+        assert clusters == []
+
+    def test_known_hub_ignored(self):
+        """Test values flagged as hubs do not link carriers."""
+        clusters = cluster_carriers(
+            [carrier(1, address=["1 Main St"]), carrier(2, address=["1 Main St"])],
+            hub_values={("address", "1 Main St")}
+        )
+        assert clusters == []
+
+    def test_score_capped(self):
+        """Test shared values of one kind stop adding after the cap and scores stay within 100."""
+        officers = [f"P{n}" for n in range(6)]
+        clusters = cluster_carriers([
+            carrier(1, officer=officers, phone=["555"], risk=100),
+            carrier(2, officer=officers, phone=["555"], risk=100),
+        ])
+        assert clusters[0]["shared_officers"] == 6
+        assert clusters[0]["score"] == 95.0
+
+        clusters = cluster_carriers([
+            carrier(1, officer=officers, phone=["555"], address=["A"], risk=100),
+            carrier(2, officer=officers, phone=["555"], address=["A"], risk=100),
+        ])
+        assert clusters[0]["score"] == 100.0
+
+    def test_totals_and_order(self):
+        """Test crash totals are summed and clusters are ordered by score."""
+        clusters = cluster_carriers([
+            carrier(1, insurance_provider=["Acme"], crashes=2),
+            carrier(2, insurance_provider=["Acme"], crashes=3),
+            carrier(3, officer=["P1"]),
+            carrier(4, officer=["P1"]),
+        ])
+        assert [cluster["cluster_id"] for cluster in clusters] == ["CC-3", "CC-1"]
+        assert clusters[1]["total_crashes"] == 5
+
+
+class TestRebuild:
+    """Test suite for rebuild_chameleon_clusters."""
+
+    def test_rebuild_replaces_stale_clusters(self):
+        """Test a rebuild pages through carriers once and drops clusters it did not produce."""
+        repo = FakeClusterRepository(
+            [carrier(1, officer=["P1"]), carrier(2, officer=["P1"]), carrier(3)],
+            clusters=[{"cluster_id": "CC-3", "members": [3, 9], "generation": "old"}]
+        )
+        with patch('services.chameleon_clustering.REBUILD_PAGE_SIZE', 2):
+            stats = rebuild_chameleon_clusters(repo)
+
+        assert stats["carriers_scanned"] == 3
+        assert stats["clusters"] == 1
+        assert stats["clustered_carriers"] == 2
+        assert stats["stale_clusters_deleted"] == 1
+        assert list(repo.clusters) == ["CC-1"]
+
+
+class TestIncrementalUpdate:
+    """Test suite for update_chameleon_clusters."""
+
+    def test_new_link_merges_clusters(self):
+        """Test a carrier sharing values with two clusters joins them into one."""
+        rows = [
+            carrier(1, officer=["P1"]), carrier(2, officer=["P1"]),
+            carrier(3, phone=["555"]), carrier(4, phone=["555"]),
+            carrier(5, officer=["P1"], phone=["555"]),
+            carrier(6, officer=["P9"]), carrier(7, officer=["P9"]),
+        ]
+        repo = FakeClusterRepository(rows)
+        repo.write_clusters(cluster_carriers(rows[:4] + rows[5:]), "g1")
+
+        result = update_chameleon_clusters([5], repo)
+
+        assert result == {"carriers": 5, "clusters": 1}
+        assert repo.clusters["CC-1"]["members"] == [1, 2, 3, 4, 5]
+        assert "CC-3" not in repo.clusters
+        assert repo.clusters["CC-6"]["members"] == [6, 7]
+
+    def test_lost_link_splits_cluster(self):
+        """Test members of a carrier's previous cluster are recomputed with it."""
+        rows = [carrier(1, officer=["P1"]), carrier(2, officer=["P1"])]
+        repo = FakeClusterRepository(rows)
+        repo.write_clusters(cluster_carriers(rows), "g1")
+        repo.carriers[2] = carrier(2)
+
+        result = update_chameleon_clusters([2], repo)
+
+        assert result == {"carriers": 2, "clusters": 0}
+        assert repo.clusters == {}
+
+    def test_hub_not_expanded(self):
+        """Test a value held by too many carriers is not followed."""
+        cap = MAX_ATTRIBUTE_CARRIERS["insurance_provider"]
+        repo = FakeClusterRepository([
+            carrier(n, insurance_provider=["Big Insurer"]) for n in range(1, cap + 3)
+        ])
+
+        result = update_chameleon_clusters([1], repo)
+
+        assert result == {"carriers": 1, "clusters": 0}
+        assert repo.attribute_queries == 1
+
+    def test_no_carriers(self):
+        """Test an empty update does not touch the repository."""
+        repo = Mock()
+        assert update_chameleon_clusters([], repo) == {"carriers": 0, "clusters": 0}
+        repo.assert_not_called()
+
+
+class TestChameleonRoutes:
+    """Test suite for the chameleon cluster endpoints."""
+
+    @pytest.fixture
+    def client(self):
+        """Create test client."""
+        return TestClient(app)
+
+    @pytest.fixture
+    def headers(self):
+        """API key headers."""
+        return {"X-API-Key": "test-api-key"}
+
+    def test_patterns_paged(self, client, headers):
+        """Test chameleon patterns are served from the stored clusters."""
+        with patch('routes.insurance_routes.cluster_repo') as cluster_repo:
+            cluster_repo.get_clusters.return_value = [{"cluster_id": "CC-1", "score": 40.0}]
+            response = client.get(
+                "/insurance/fraud/chameleon-patterns?skip=10&limit=5&min_score=30&min_size=3",
+                headers=headers
+            )
+
+        assert response.status_code == 200
+        assert response.json() == [{"cluster_id": "CC-1", "score": 40.0}]
+        cluster_repo.get_clusters.assert_called_once_with(10, 5, 30.0, 3)
+
+    def test_cluster_not_found(self, client, headers):
+        """Test an unknown cluster returns 404."""
+        with patch('routes.insurance_routes.cluster_repo') as cluster_repo:
+            cluster_repo.get_cluster.return_value = None
+            response = client.get("/insurance/fraud/chameleon-clusters/CC-404", headers=headers)
+
+        assert response.status_code == 404
+
+    def test_rebuild(self, client, headers):
+        """Test the rebuild endpoint runs a full rebuild."""
+        with patch('routes.insurance_routes.chameleon_clustering.rebuild_chameleon_clusters',
+                   return_value={"clusters": 2}) as rebuild:
+            response = client.post("/insurance/fraud/chameleon-clusters/rebuild", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json() == {"clusters": 2}
+        rebuild.assert_called_once()
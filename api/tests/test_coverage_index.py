@@ -0,0 +1,253 @@
+"""
+Unit tests for the in-memory insurance coverage index.
+
+Tests interval merging, point-in-time and multi-date uninsured queries,
+synchronization with the graph, and the uninsured routes, with a mocked
+carrier repository.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from datetime import date, datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import app
+from models.carrier import Carrier
+from repositories.carrier_repository import CarrierRepository
+from services.coverage_index import CoverageIndex
+from utils.date_ranges import OPEN_END, merge_periods
+
+
+client = TestClient(app)
+headers = {"X-API-Key": "test-api-key"}
+
+
+def period(from_date, to_date=None):
+    """Build a HAD_INSURANCE period as stored on the relationship."""
+    return {"from_date": from_date, "to_date": to_date}
+
+
+@pytest.fixture
+def carrier_repo():
+    """Create a carrier repository mock holding three carriers."""
+    repo = Mock()
+    pages = [
+        [
+            # Two policies with a gap in February 2023
+            {"usdot": 1, "periods": [period("2022-01-01", "2023-01-31"), period("2023-03-01")]},
+            # Never insured
+            {"usdot": 2, "periods": []},
+        ],
+        [
+            # Lapsed at the end of 2023
+            {"usdot": 3, "periods": [period("2021-06-01", "2023-12-31")]},
+        ],
+        []
+    ]
+    repo.get_coverage_intervals.side_effect = lambda after, limit: pages[{-1: 0, 2: 1, 3: 2}[after]]
+    repo.get_insurance_changed_carriers.return_value = []
+    repo.count_carriers.return_value = 3
+    return repo
+
+
+class TestMergePeriods:
+    """Test suite for merge_periods."""
+
+    def test_overlapping_and_adjacent_periods_merge(self):
+        """Test overlapping and back-to-back policies become one range."""
+        starts, ends = merge_periods([
+            period("2023-06-01", "2023-12-31"),
+            period("2023-01-01", "2023-06-30"),
+            period("2024-01-01", "2024-03-31"),
+            period("2024-05-01", "2024-05-31"),
+        ])
+
+        assert [date.fromordinal(d) for d in starts] == [date(2023, 1, 1), date(2024, 5, 1)]
+        assert [date.fromordinal(d) for d in ends] == [date(2024, 3, 31), date(2024, 5, 31)]
+
+    def test_open_ended_and_invalid_periods(self):
+        """Test open-ended coverage runs forever and inverted or undated periods are ignored."""
+        starts, ends = merge_periods([
+            period("2023-01-01"),
+            period("2022-05-01", "2022-04-01"),
+            period(None, "2022-01-01"),
+            period(date(2022, 1, 1), date(2022, 12, 31)),
+        ])
+
+        assert starts == [date(2022, 1, 1).toordinal()]
+        assert ends == [OPEN_END]
+
+
+class TestCoverageIndex:
+    """Test suite for CoverageIndex."""
+
+    @pytest.fixture
+    def index(self, carrier_repo):
+        """Create a coverage index that syncs on every query."""
+        return CoverageIndex(carrier_repo, sync_seconds=0)
+
+    def test_single_date(self, index):
+        """Test uninsured carriers on a date, with inclusive policy ends."""
+        assert sorted(index.uninsured_on(date(2023, 2, 15))) == [1, 2]
+        assert sorted(index.uninsured_on(date(2023, 1, 31))) == [2]
+        assert sorted(index.uninsured_on(date(2024, 1, 1))) == [2, 3]
+        assert index.is_covered(1, date(2030, 1, 1))
+
+    def test_multiple_dates(self, index):
+        """Test a multi-date query answers every date from one pass."""
+        result = index.uninsured_on_dates([date(2021, 1, 1), date(2023, 2, 1), date(2023, 2, 1)])
+
+        assert list(result) == [date(2021, 1, 1), date(2023, 2, 1)]
+        assert sorted(result[date(2021, 1, 1)]) == [1, 2, 3]
+        assert sorted(result[date(2023, 2, 1)]) == [1, 2]
+
+    def test_built_once(self, index, carrier_repo):
+        """Test the full build pages through carriers once."""
+        index.uninsured_on(date(2023, 1, 1))
+        index.uninsured_on(date(2023, 1, 1))
+
+        assert [c[0][0] for c in carrier_repo.get_coverage_intervals.call_args_list] == [-1, 2, 3]
+
+    def test_sync_reloads_changed_carriers(self, index, carrier_repo):
+        """Test carriers with new insurance writes are reloaded on sync."""
+        index.build()
+        carrier_repo.get_insurance_changed_carriers.return_value = [2]
+        carrier_repo.get_coverage_intervals_for.return_value = [{"usdot": 2, "periods": [period("2023-01-01")]}]
+
+        assert 2 not in index.uninsured_on(date(2023, 6, 1))
+        carrier_repo.get_coverage_intervals_for.assert_called_once_with([2])
+        since = datetime.fromisoformat(carrier_repo.get_insurance_changed_carriers.call_args[0][0])
+        assert since < datetime.now(timezone.utc) - timedelta(minutes=4)
+
+    def test_sync_waits_for_interval(self, carrier_repo):
+        """Test no sync query is made within the sync interval."""
+        index = CoverageIndex(carrier_repo, sync_seconds=3600)
+
+        index.uninsured_on(date(2023, 1, 1))
+        index.uninsured_on(date(2023, 1, 1))
+
+        carrier_repo.get_insurance_changed_carriers.assert_not_called()
+
+    def test_failed_sync_serves_previous_data(self, index, carrier_repo):
+        """Test a failed sync does not fail the query."""
+        index.build()
+        carrier_repo.get_insurance_changed_carriers.side_effect = Exception("Neo4j unavailable")
+
+        assert sorted(index.uninsured_on(date(2023, 2, 15))) == [1, 2]
+
+    def test_refresh_carriers(self, index, carrier_repo):
+        """Test carriers written in this process are reloaded immediately once built."""
+        index.refresh_carriers([3])
+        carrier_repo.get_coverage_intervals_for.assert_not_called()
+
+        index.build()
+        carrier_repo.get_coverage_intervals_for.return_value = [{"usdot": 3, "periods": [period("2021-06-01")]}]
+        index.refresh_carriers([3])
+
+        assert index.is_covered(3, date(2024, 6, 1))
+
+    def test_sync_adds_new_uninsured_carrier(self, index, carrier_repo):
+        """Test a carrier created without insurance is reported after a sync."""
+        index.build()
+        carrier_repo.get_insurance_changed_carriers.return_value = [4]
+        carrier_repo.get_coverage_intervals_for.return_value = [{"usdot": 4, "periods": []}]
+        carrier_repo.count_carriers.return_value = 4
+
+        assert sorted(index.uninsured_on(date(2024, 1, 1))) == [2, 3, 4]
+        carrier_repo.get_carrier_usdots.assert_not_called()
+
+    def test_sync_drops_deleted_carriers(self, index, carrier_repo):
+        """Test carriers deleted from the graph stop being reported."""
+        index.build()
+        carrier_repo.count_carriers.return_value = 2
+        carrier_repo.get_carrier_usdots.side_effect = [[1, 3], []]
+
+        assert sorted(index.uninsured_on(date(2024, 1, 1))) == [3]
+        assert [c[0][0] for c in carrier_repo.get_carrier_usdots.call_args_list] == [-1, 3]
+
+    def test_refresh_drops_deleted_carrier(self, index, carrier_repo):
+        """Test refreshing a carrier that no longer exists removes it."""
+        index.build()
+        carrier_repo.get_coverage_intervals_for.return_value = []
+        index.refresh_carriers([2])
+
+        assert sorted(index.uninsured_on(date(2024, 1, 1))) == [3]
+
+
+class TestCoverageChangeMarker:
+    """Test suite for the carrier change stamps the index syncs from."""
+
+    @pytest.fixture
+    def repo(self):
+        """Create a repository without a database."""
+        return CarrierRepository()
+
+    def test_created_carriers_stamped(self, repo):
+        """Test single and bulk carrier creation stamp coverage_changed_at."""
+        carrier = Carrier(usdot=5, jb_carrier=False, carrier_name="New Co", primary_officer="A. Officer")
+        with patch.object(repo, 'execute_query', return_value=[{"c": {}, "created": 1}]) as execute_query:
+            repo.create(carrier)
+            repo.bulk_create([carrier])
+
+        create_params = execute_query.call_args_list[0][0][1]
+        bulk_params = execute_query.call_args_list[1][0][1]
+        assert create_params["coverage_changed_at"]
+        assert "c.coverage_changed_at = $coverage_changed_at" in execute_query.call_args_list[1][0][0]
+        assert bulk_params["coverage_changed_at"]
+
+    def test_changed_carriers_include_created(self, repo):
+        """Test the sync query matches both insurance writes and creations."""
+        with patch.object(repo, 'execute_query', return_value=[{"usdot": 1}, {"usdot": 5}]) as execute_query:
+            assert repo.get_insurance_changed_carriers("2024-01-01T00:00:00") == [1, 5]
+
+        query = execute_query.call_args[0][0]
+        assert "c.insurance_risk_scored_at >= $since" in query
+        assert "c.coverage_changed_at >= $since" in query
+
+
+class TestUninsuredRoutes:
+    """Test suite for the uninsured carrier routes."""
+
+    @pytest.fixture
+    def index(self, carrier_repo):
+        """Patch the process-wide coverage index."""
+        index = CoverageIndex(carrier_repo, sync_seconds=3600)
+        with patch('services.coverage_index._coverage_index', index):
+            yield index
+
+    def test_single_date(self, index):
+        """Test the single-date route lists uninsured carriers from the index."""
+        with patch('routes.insurance_routes.carrier_repo.get_carrier_summaries',
+                   return_value=[{"carrier_usdot": 2}, {"carrier_usdot": 3}]) as summaries:
+            response = client.get("/insurance/fraud/uninsured/2024-01-01", headers=headers)
+
+        assert response.status_code == 200
+        assert [c["carrier_usdot"] for c in response.json()] == [2, 3]
+        assert sorted(summaries.call_args[0][0]) == [2, 3]
+
+    def test_multiple_dates(self, index):
+        """Test the multi-date route returns USDOTs per date and each carrier once."""
+        with patch('routes.insurance_routes.carrier_repo') as repo:
+            repo.get_carrier_summaries.return_value = [{"carrier_usdot": 2}, {"carrier_usdot": 3}]
+            response = client.get(
+                "/insurance/fraud/uninsured?dates=2023-02-15&dates=2024-01-01", headers=headers
+            )
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["dates"][0] == {"date": "2023-02-15", "uninsured_count": 2, "carrier_usdots": [1, 2]}
+        assert body["dates"][1]["carrier_usdots"] == [2, 3]
+        repo.get_carrier_summaries.assert_called_once_with([1, 2, 3])
+        assert body["coverage_synced_at"] == index.synced_at
+
+    def test_too_many_dates(self, index):
+        """Test the number of dates per request is capped."""
+        query = "&".join(f"dates={date(2023, 1, 1) + timedelta(days=n)}" for n in range(367))
+        response = client.get(f"/insurance/fraud/uninsured?{query}", headers=headers)
+
+        assert response.status_code == 400
@@ -0,0 +1,175 @@
+"""
+Unit tests for the coverage sweep engine.
+
+Tests gap, overlap and uncovered-day computation over coverage periods,
+and the carrier-level reports built on it, with mocked Neo4j operations.
+"""
+
+import pytest
+from unittest.mock import patch
+from datetime import date
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from repositories.carrier_repository import CarrierRepository
+from services.coverage_sweep import (
+    calculate_total_days_without_coverage,
+    find_carriers_with_coverage_gaps,
+    find_gaps,
+    find_overlapping_policies,
+    find_overlaps,
+    uncovered_days
+)
+
+
+def period(policy_id, from_date, to_date=None, provider="Acme Insurance"):
+    """Build a coverage period as returned by the repository."""
+    return {"policy_id": policy_id, "provider_name": provider, "from_date": from_date, "to_date": to_date}
+
+
+class TestCoverageSweep:
+    """Test suite for the sweep functions."""
+
+    def test_gap_measured_from_furthest_reach(self):
+        """Test a long policy spanning shorter ones hides their ends, so only true holes are gaps."""
+        periods = [
+            period("P1", "2022-01-01", "2022-12-31"),
+            period("P2", "2022-02-01", "2022-03-31"),
+            period("P3", "2023-03-01", "2023-12-31", provider="Budget Mutual"),
+            period("P4", "2024-01-10"),
+        ]
+
+        gaps = find_gaps(periods)
+
+        assert [(g["from_policy"], g["to_policy"], g["gap_days"]) for g in gaps] == [("P1", "P3", 60), ("P3", "P4", 10)]
+        assert gaps[0]["gap_start"] == "2022-12-31"
+        assert gaps[0]["to_provider"] == "Budget Mutual"
+
+    def test_gap_threshold_and_open_coverage(self):
+        """Test small gaps are dropped and nothing after open-ended coverage is a gap."""
+        periods = [
+            period("P1", "2022-01-01", "2022-06-30"),
+            period("P2", "2022-07-05"),
+            period("P3", "2025-01-01", "2025-12-31"),
+        ]
+
+        assert find_gaps(periods, min_gap_days=30) == []
+        assert [g["gap_days"] for g in find_gaps(periods)] == [5]
+
+    def test_back_to_back_policies_do_not_overlap(self):
+        """Test a renewal starting the day the previous policy ends is neither gap nor overlap."""
+        periods = [period("P1", "2022-01-01", "2022-12-31"), period("P2", "2022-12-31", "2023-12-31")]
+
+        assert find_gaps(periods) == []
+        assert find_overlaps(periods) == []
+
+    def test_overlaps(self):
+        """Test every pair in force together is reported with its shared days."""
+        periods = [
+            period("P1", "2022-01-01", "2022-12-31"),
+            period("P2", "2022-06-01", "2022-07-01"),
+            period("P3", "2022-12-01"),
+        ]
+
+        overlaps = find_overlaps(periods, today=date(2023, 1, 31))
+
+        assert [(o["policy1_id"], o["policy2_id"], o["overlap_days"]) for o in overlaps] == [
+            ("P1", "P2", 30),  # contained: bounded by P2's end
+            ("P1", "P3", 30),
+        ]
+
+    def test_open_ended_overlap_measured_to_today(self):
+        """Test two open-ended policies overlap until today."""
+        periods = [period("P1", "2023-01-01"), period("P2", "2023-03-01")]
+
+        assert find_overlaps(periods, today=date(2023, 3, 11))[0]["overlap_days"] == 10
+
+    def test_uncovered_days_counts_overlap_once(self):
+        """Test overlapping policies are not double-counted."""
+        periods = [
+            period("P1", "2023-01-01", "2023-01-20"),
+            period("P2", "2023-01-10", "2023-01-25"),
+        ]
+
+        # January: 25 covered days, 6 uncovered
+        assert uncovered_days(periods, date(2023, 1, 1), date(2023, 1, 31)) == 6
+        assert uncovered_days(periods, date(2023, 2, 1), date(2023, 2, 28)) == 28
+        assert uncovered_days([], date(2023, 1, 1), date(2023, 1, 1)) == 1
+        assert uncovered_days(periods, date(2023, 2, 1), date(2023, 1, 1)) == 0
+
+    def test_many_policies(self):
+        """Test a long chain of monthly renewals is swept without pairwise blowup."""
+        periods = [
+            period(f"P{n}", date.fromordinal(738000 + 30 * n), date.fromordinal(738000 + 30 * n + 35))
+            for n in range(5000)
+        ]
+
+        overlaps = find_overlaps(periods)
+
+        assert len(overlaps) == 4999
+        assert find_gaps(periods) == []
+
+
+class TestCarrierCoverageReports:
+    """Test suite for the carrier-level coverage reports."""
+
+    @pytest.fixture
+    def repo(self):
+        """Create a CarrierRepository whose carriers are streamed from two pages."""
+        repo = CarrierRepository()
+        pages = {
+            -1: [
+                {"usdot": 1, "carrier_name": "One", "violations": 3, "crashes": 0, "periods": [
+                    period("P1", "2022-01-01", "2022-06-30"),
+                    period("P2", "2022-09-01", "2023-06-30"),
+                    period("P3", "2023-01-01"),
+                ]},
+                {"usdot": 2, "carrier_name": "Two", "violations": 0, "crashes": 1, "periods": []},
+            ],
+            2: [
+                {"usdot": 3, "carrier_name": "Three", "violations": 9, "crashes": 2, "periods": [
+                    period("P4", "2020-01-01", "2020-12-31"),
+                    period("P5", "2021-12-31"),
+                ]},
+            ],
+            3: [],
+        }
+        with patch.object(repo, 'get_coverage_intervals', side_effect=lambda after, limit: pages[after]):
+            yield repo
+
+    def test_coverage_gaps(self, repo):
+        """Test gaps are reported per carrier, largest total first."""
+        carriers = find_carriers_with_coverage_gaps(30, repo)
+
+        assert [c["carrier_usdot"] for c in carriers] == [3, 1]
+        assert carriers[0]["max_gap_days"] == 365
+        assert carriers[1]["gaps"][0]["from_policy"] == "P1"
+        assert carriers[1]["total_gap_days"] == 63
+
+    def test_overlapping_policies(self, repo):
+        """Test overlaps carry the carrier and are ordered by length."""
+        overlaps = find_overlapping_policies(repo)
+
+        assert len(overlaps) == 1
+        assert overlaps[0]["carrier_usdot"] == 1
+        assert (overlaps[0]["policy1_id"], overlaps[0]["policy2_id"]) == ("P2", "P3")
+        assert overlaps[0]["overlap_days"] == 180
+
+    def test_days_without_coverage(self, repo):
+        """Test uncovered days come from the carrier's merged periods."""
+        with patch.object(repo, 'get_coverage_intervals_for', return_value=[{"usdot": 1, "periods": [
+            period("P2", "2022-09-01", "2023-06-30"),
+            period("P3", "2023-01-01"),
+        ]}]) as intervals:
+            days = calculate_total_days_without_coverage(1, date(2022, 1, 1), date(2022, 12, 31), repo)
+
+        intervals.assert_called_once_with([1])
+        assert days == 243  # January through August 2022
+
+    def test_days_without_coverage_unknown_carrier(self, repo):
+        """Test an unknown carrier reports no uncovered days."""
+        with patch.object(repo, 'get_coverage_intervals_for', return_value=[]):
+            assert calculate_total_days_without_coverage(9, date(2022, 1, 1), date(2022, 12, 31), repo) == 0
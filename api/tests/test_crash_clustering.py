@@ -0,0 +1,176 @@
+"""
+Unit tests for crash clustering.
+
+Tests the sliding-window clustering of a carrier's crashes, the fleet-wide
+crash burst ranking, the carrier-level reports over the repository's crash
+rows and the endpoints.
+"""
+
+import pytest
+from datetime import date, timedelta
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import app
+from repositories.crash_repository import CrashRepository
+from services.crash_clustering import (
+    find_carriers_with_crash_bursts,
+    find_clusters,
+    find_crash_clusters,
+    rank_crash_bursts
+)
+
+
+def crash(report_number, day, fatalities=0, injuries=0):
+    """Build a crash row dated ``day`` days into 2023."""
+    return {
+        "report_number": report_number,
+        "crash_date": (date(2023, 1, 1) + timedelta(days=day)).isoformat(),
+        "fatalities": fatalities,
+        "injuries": injuries,
+    }
+
+
+def carrier(usdot, *days):
+    """Build a carrier row with one crash per day given."""
+    return {"usdot": usdot, "crashes": [crash(f"{usdot}-{n}", day) for n, day in enumerate(days)]}
+
+
+class TestFindClusters:
+    """Test suite for find_clusters."""
+
+    def test_clusters_do_not_overlap(self):
+        """Test each crash is in at most one cluster, unlike pairwise matching."""
+        clusters = find_clusters([crash("A", 0), crash("B", 10), crash("C", 20), crash("D", 35), crash("E", 45)])
+
+        assert [cluster["crash_reports"] for cluster in clusters] == [["A", "B", "C"], ["D", "E"]]
+        assert clusters[0]["cluster_start"] == "2023-01-01"
+        assert clusters[0]["cluster_end"] == "2023-01-21"
+        assert clusters[0]["span_days"] == 20
+
+    def test_unsorted_input_and_window_edge(self):
+        """Test crashes are sorted by date and the window includes its last day."""
+        clusters = find_clusters([crash("B", 30), crash("C", 31), crash("A", 0)], days_window=30)
+        assert clusters[0]["crash_reports"] == ["A", "B"]
+        assert len(clusters) == 1
+
+    def test_isolated_crashes_skipped(self):
+        """Test a lone crash does not start a cluster that would swallow later ones."""
+        clusters = find_clusters([crash("A", 0), crash("B", 40), crash("C", 45), crash("D", 60)], min_size=3)
+        assert [cluster["crash_reports"] for cluster in clusters] == [["B", "C", "D"]]
+
+    def test_totals_and_undated(self):
+        """Test casualties are summed and undated crashes ignored."""
+        clusters = find_clusters([
+            crash("A", 0, fatalities=1, injuries=2),
+            crash("B", 1, injuries=None),
+            {"report_number": "C", "crash_date": None},
+        ])
+        assert clusters[0]["cluster_size"] == 2
+        assert clusters[0]["fatalities"] == 1
+        assert clusters[0]["injuries"] == 2
+
+    def test_large_history(self):
+        """Test a long daily crash history is split into window-sized clusters."""
+        clusters = find_clusters([crash(str(day), day) for day in range(100000)], days_window=9)
+        assert len(clusters) == 10000
+        assert all(cluster["cluster_size"] == 10 for cluster in clusters)
+
+
+class TestRankCrashBursts:
+    """Test suite for rank_crash_bursts."""
+
+    def test_ranking(self):
+        """Test carriers rank by largest burst, then crashes in bursts; carriers without bursts drop out."""
+        ranked = rank_crash_bursts([
+            carrier(1, 0, 5, 10),
+            carrier(2, 0, 1, 2, 3),
+            carrier(3, 0, 100, 200),
+            carrier(4, 0, 1, 2, 50, 51, 52),
+        ])
+
+        assert [row["usdot"] for row in ranked] == [2, 4, 1]
+        assert ranked[1]["cluster_count"] == 2
+        assert ranked[1]["clustered_crashes"] == 6
+        assert ranked[1]["total_crashes"] == 6
+
+    def test_limit(self):
+        """Test only the top carriers are returned."""
+        ranked = rank_crash_bursts((carrier(usdot, 0, 1, 2) for usdot in range(50)), limit=5)
+        assert [row["usdot"] for row in ranked] == [0, 1, 2, 3, 4]
+
+
+class TestCrashClusterReports:
+    """Test suite for the carrier-level reports over repository crash rows."""
+
+    @pytest.fixture
+    def repo(self):
+        """Create a repository without a database."""
+        return CrashRepository()
+
+    def test_carrier_clusters(self, repo):
+        """Test one carrier's crashes are read once and clustered, largest first."""
+        crashes = [crash("A", 0, injuries=1), crash("B", 9, fatalities=1), crash("C", 24, injuries=2),
+                   crash("D", 200), crash("E", 300), crash("F", 301)]
+        with patch.object(repo, 'execute_query', return_value=crashes) as execute_query:
+            result = find_crash_clusters(3487141, days_window=30, crash_repo=repo)
+
+        assert [cluster["crash_reports"] for cluster in result] == [["A", "B", "C"], ["E", "F"]]
+        assert result[0]["injuries"] == 3
+        assert execute_query.call_args[0][1] == {"usdot": 3487141}
+
+    def test_pages_through_carriers_once(self, repo):
+        """Test carriers are read page by page in USDOT order and names attached to the ranked few."""
+        pages = [[carrier(1, 0, 1, 2), carrier(2, 0)], [carrier(3, 0, 1, 2, 3)], []]
+        with patch.object(repo, 'get_carrier_crashes', side_effect=pages) as get_carrier_crashes, \
+             patch.object(repo, 'execute_query', return_value=[{"usdot": 3, "carrier_name": "Burst Co"}]):
+            result = find_carriers_with_crash_bursts(limit=10, crash_repo=repo)
+
+        assert [row["usdot"] for row in result] == [3, 1]
+        assert result[0]["carrier_name"] == "Burst Co"
+        assert result[1]["carrier_name"] is None
+        assert [call.args[0] for call in get_carrier_crashes.call_args_list] == [-1, 2, 3]
+
+    def test_no_bursts(self, repo):
+        """Test no carrier lookup is made when nothing ranks."""
+        with patch.object(repo, 'get_carrier_crashes', side_effect=[[carrier(1, 0)], []]), \
+             patch.object(repo, 'execute_query') as execute_query:
+            assert find_carriers_with_crash_bursts(crash_repo=repo) == []
+        execute_query.assert_not_called()
+
+
+class TestCrashClusterRoutes:
+    """Test suite for the crash cluster endpoints."""
+
+    @pytest.fixture
+    def client(self):
+        """Create test client."""
+        return TestClient(app)
+
+    @pytest.fixture
+    def headers(self):
+        """API key headers."""
+        return {"X-API-Key": "test-api-key"}
+
+    def test_carrier_clusters(self, client, headers):
+        """Test the per-carrier endpoint passes the window and size."""
+        with patch('routes.safety_routes.find_crash_clusters', return_value=[{"cluster_size": 3}]) as clusters:
+            response = client.get("/carriers/123/crash-clusters?days_window=14&min_size=3", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json() == [{"cluster_size": 3}]
+        assert clusters.call_args[0][:3] == (123, 14, 3)
+
+    def test_crash_bursts(self, client, headers):
+        """Test the fleet ranking endpoint."""
+        with patch('routes.safety_routes.find_carriers_with_crash_bursts', return_value=[{"usdot": 3}]) as bursts:
+            response = client.get("/carriers/crash-bursts?limit=5", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json() == [{"usdot": 3}]
+        assert bursts.call_args[0][:3] == (30, 3, 5)
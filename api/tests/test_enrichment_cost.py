@@ -0,0 +1,253 @@
+"""
+Unit tests for per-job enrichment cost accounting and caps.
+
+Tests the cost meter and its report, metering in the SearchCarriers client
+and the base repository, job totals on the durable queue, and stopping a
+job once it reaches a cap.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from datetime import datetime, timedelta, timezone
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import BaseRepository
+from services.enrichment_cost import (
+    CostMeter, budget_exceeded, cost_report, current_meter, endpoint_template, merge_costs, metering
+)
+from services.enrichment_queue import EnrichmentQueue, ItemState
+from services.searchcarriers_client import SearchCarriersClient
+from services.searchcarriers_enrichment_service import (
+    get_enrichment_status, process_queue_item
+)
+
+
+def charging_method(requests: int, result: dict):
+    """Build an enricher method that charges upstream requests to the current meter."""
+    def method(usdot, force_refresh):
+        for _ in range(requests):
+            current_meter().record_request(f"/v1/company/{usdot}/insurances", 100, 20.0)
+        return result
+    return method
+
+
+class TestCostMeter:
+    """Test suite for CostMeter and the cost report."""
+
+    def test_endpoint_template(self):
+        """Test IDs in paths are folded so endpoints group across carriers."""
+        assert endpoint_template("/v1/company/3487141/crashes") == "/v1/company/{id}/crashes"
+        assert endpoint_template("/v2/carrier/42") == "/v2/carrier/{id}"
+
+    def test_report_per_endpoint(self):
+        """Test requests, bytes, errors, cache hits and percentiles per endpoint."""
+        meter = CostMeter()
+        for latency in [8, 20, 30, 40, 45, 60, 70, 80, 90, 400]:
+            meter.record_request("/v1/company/1/crashes", 1000, latency)
+        meter.record_request("/v1/company/2/crashes", 0, 3000, error=True)
+        meter.record_cache_hit("/v1/company/1/crashes")
+        meter.record_database(3, 12.5, {"nodes_created": 4, "properties_set": 9})
+        meter.add_stage("crashes", 150.0)
+
+        report = cost_report(meter.to_dict())
+        crashes = report["endpoints"]["/v1/company/{id}/crashes"]
+
+        assert crashes["requests"] == 11
+        assert crashes["bytes"] == 10000
+        assert crashes["errors"] == 1
+        assert crashes["cache_hits"] == 1
+        assert crashes["latency_ms"]["p50"] == 100
+        assert crashes["latency_ms"]["p90"] == 500
+        assert crashes["latency_ms"]["max"] == 3000
+        assert report["upstream_requests"] == 11
+        assert report["cache_hit_rate"] == round(1 / 12, 3)
+        assert report["database"]["statements"] == 3
+        assert report["database"]["nodes_created"] == 4
+        assert report["stages_ms"] == {"crashes": 150.0}
+
+    def test_merge_costs(self):
+        """Test counters and histograms add up while maxima are kept."""
+        first, second = CostMeter(), CostMeter()
+        first.record_request("/v1/company/1/crashes", 10, 5)
+        second.record_request("/v1/company/2/crashes", 20, 900)
+        second.record_request("/v1/company/2/safety-summary", 30, 40)
+
+        report = cost_report(merge_costs(merge_costs(None, first.to_dict()), second.to_dict()))
+
+        crashes = report["endpoints"]["/v1/company/{id}/crashes"]
+        assert crashes["requests"] == 2
+        assert crashes["bytes"] == 30
+        assert crashes["latency_ms"]["max"] == 900
+        assert report["upstream_bytes"] == 60
+
+    def test_empty_report(self):
+        """Test a job without recorded costs reports zeros."""
+        report = cost_report(None)
+
+        assert report["upstream_requests"] == 0
+        assert report["endpoints"] == {}
+        assert report["database"]["statements"] == 0
+
+    def test_budget_exceeded(self):
+        """Test each cap is reported once reached and ignored when unset."""
+        assert budget_exceeded({}, 10_000, 10_000) is None
+        assert budget_exceeded({"max_requests": 10}, 9, 0) is None
+        assert budget_exceeded({"max_requests": 10}, 10, 0).startswith("max_requests")
+        assert budget_exceeded({"max_duration_seconds": 60}, 0, 61).startswith("max_duration_seconds")
+
+
+class TestMeteringSources:
+    """Test suite for cost recording in the client and repositories."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a SearchCarriers client with mocked API key."""
+        with patch.dict('os.environ', {'SEARCH_CARRIERS_API_TOKEN': 'test_token_123'}):
+            return SearchCarriersClient()
+
+    def test_client_records_upstream_requests(self, client):
+        """Test each upstream request is charged with its size and status."""
+        response = Mock(content=b'{"data": {}}', status_code=200)
+        response.json.return_value = {"data": {}}
+        meter = CostMeter()
+
+        with patch.object(client, '_rate_limit'), patch.object(client, 'session') as mock_session:
+            mock_session.get.return_value = response
+            with metering(meter):
+                client.get_safety_summary(3487141)
+            client.get_safety_summary(3487141)  # not metered
+
+        stats = meter.to_dict()["upstream"]["/v1/company/{id}/safety-summary"]
+        assert stats["requests"] == 1
+        assert stats["bytes"] == len(b'{"data": {}}')
+        assert stats["errors"] == 0
+
+    def test_client_records_failed_requests(self, client):
+        """Test a request without a response is charged as an error."""
+        meter = CostMeter()
+
+        with patch.object(client, '_rate_limit'), patch.object(client, 'session') as mock_session:
+            mock_session.get.side_effect = Exception("Connection reset")
+            with metering(meter), pytest.raises(Exception):
+                client.get_safety_summary(3487141)
+
+        assert meter.to_dict()["upstream"]["/v1/company/{id}/safety-summary"]["errors"] == 1
+
+    def test_concurrent_pages_are_metered(self, client):
+        """Test pages fetched on the page pool still charge the caller's meter."""
+        def fetch_page(dot, page, per_page):
+            current_meter().record_request(f"/v1/company/{dot}/inspections", 1, 1)
+            return {"data": [{}] * per_page, "meta": {"last_page": 3, "per_page": per_page}}
+
+        meter = CostMeter()
+        with metering(meter):
+            pages = list(client.iter_pages(fetch_page, 123, per_page=2))
+
+        assert len(pages) == 3
+        assert meter.upstream_requests == 3
+
+    def test_repository_records_statements(self):
+        """Test repository writes charge statements and write counters."""
+        summary = Mock()
+        summary.counters = Mock(nodes_created=2, nodes_deleted=0, relationships_created=1,
+                                relationships_deleted=0, properties_set=5)
+        session = Mock()
+        session.run.return_value.consume.return_value = summary
+        repo = BaseRepository()
+        repo.db = Mock()
+        repo.db.get_session.return_value.__enter__ = Mock(return_value=session)
+        repo.db.get_session.return_value.__exit__ = Mock(return_value=False)
+        meter = CostMeter()
+
+        with metering(meter):
+            counters = repo.execute_write("CREATE (n)")
+
+        database = meter.to_dict()["database"]
+        assert counters["nodes_created"] == 2
+        assert database["statements"] == 1
+        assert database["nodes_created"] == 2
+        assert database["relationships_created"] == 1
+        assert database["properties_set"] == 5
+
+
+class TestJobCostAndCaps:
+    """Test suite for job cost totals and caps on the durable queue."""
+
+    @pytest.fixture
+    def queue(self):
+        """Create an in-memory queue with no backoff between attempts."""
+        return EnrichmentQueue(":memory:", max_attempts=2, base_delay=0, max_delay=0)
+
+    @pytest.fixture
+    def mock_enricher(self):
+        """Create an enricher whose insurance family makes two upstream requests."""
+        enricher = Mock()
+        enricher.enrich_carrier_by_usdot = Mock(side_effect=charging_method(2, {"policies_created": 1}))
+        return enricher
+
+    @pytest.mark.asyncio
+    async def test_cost_reported_from_job_status(self, queue, mock_enricher):
+        """Test every attempt's cost is added to the job and reported."""
+        job_id = queue.enqueue([1, 2], {"insurance_data": True})
+
+        await process_queue_item(queue, mock_enricher, queue.claim())
+        await process_queue_item(queue, mock_enricher, queue.claim())
+        with patch('services.searchcarriers_enrichment_service.get_enrichment_queue', return_value=queue):
+            report = await get_enrichment_status(job_id)
+
+        cost = report["cost"]
+        assert cost["upstream_requests"] == 4
+        assert cost["endpoints"]["/v1/company/{id}/insurances"]["bytes"] == 400
+        assert cost["stages_ms"]["insurance"] >= 0
+        assert report["caps"] == {}
+        assert report["stop_reason"] is None
+
+    @pytest.mark.asyncio
+    async def test_failed_attempts_are_charged(self, queue, mock_enricher):
+        """Test requests made by an attempt that raised still count against the job."""
+        def failing(usdot, force_refresh):
+            current_meter().record_request(f"/v1/company/{usdot}/insurances", 0, 5000, error=True)
+            raise Exception("Read timed out")
+
+        mock_enricher.enrich_carrier_by_usdot.side_effect = failing
+        job_id = queue.enqueue([1], {"insurance_data": True})
+
+        assert await process_queue_item(queue, mock_enricher, queue.claim()) == ItemState.PENDING
+        assert queue.job_usage(job_id)["upstream_requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_request_cap_stops_job(self, queue, mock_enricher):
+        """Test reaching max_requests withdraws the rest of the job."""
+        job_id = queue.enqueue([1, 2, 3], {"insurance_data": True, "max_requests": 3})
+
+        await process_queue_item(queue, mock_enricher, queue.claim())
+        await process_queue_item(queue, mock_enricher, queue.claim())
+
+        job = queue.get_job(job_id)
+        assert job["status"] == "stopped"
+        assert job["stop_reason"].startswith("max_requests")
+        assert job["items"][ItemState.SUCCEEDED] == 2
+        assert job["items"][ItemState.CANCELLED] == 1
+        assert queue.claim() is None
+
+    @pytest.mark.asyncio
+    async def test_duration_cap_checked_before_enriching(self, queue, mock_enricher):
+        """Test an item of a job past max_duration_seconds is cancelled unenriched."""
+        job_id = queue.enqueue([1, 2], {"insurance_data": True, "max_duration_seconds": 60})
+        item = queue.claim()
+        an_hour_ago = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+        queue._transaction(lambda conn: conn.execute(
+            "UPDATE enrichment_items SET started_at = ? WHERE item_id = ?", (an_hour_ago, item["item_id"])
+        ))
+
+        state = await process_queue_item(queue, mock_enricher, item)
+
+        assert state == ItemState.CANCELLED
+        mock_enricher.enrich_carrier_by_usdot.assert_not_called()
+        job = queue.get_job(job_id)
+        assert job["status"] == "stopped"
+        assert job["stop_reason"].startswith("max_duration_seconds")
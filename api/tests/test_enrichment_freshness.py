@@ -0,0 +1,201 @@
+"""
+Unit tests for the enrichment freshness probe.
+
+Tests watermark computation, the probe decision and how the crash enrichment
+path skips unchanged carriers.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.enrichment_freshness import FreshnessProbe, compute_watermark, is_unchanged
+
+
+def crash_page(total=2, fetched_at="2025-01-01T00:00:00"):
+    """Build a normalized first page of crashes."""
+    return {
+        "data": [
+            {"report_number": "A", "crash_date": "2024-05-01 10:00:00", "fetched_at": fetched_at, "dot_number": 1},
+            {"report_number": "B", "crash_date": "2024-07-15 08:30:00", "fetched_at": fetched_at, "dot_number": 1},
+        ],
+        "meta": {"current_page": 1, "last_page": 1, "total": total}
+    }
+
+
+class TestWatermarks:
+    """Test suite for watermark computation."""
+
+    def test_compute_watermark(self):
+        """Test count comes from meta and max date from the page records."""
+        watermark = compute_watermark("crashes", crash_page(total=140))
+
+        assert watermark["record_count"] == 140
+        assert watermark["max_date"] == "2024-07-15"
+        assert len(watermark["payload_hash"]) == 64
+
+    def test_hash_ignores_client_fields(self):
+        """Test fetch timestamps added by the client do not change the hash."""
+        first = compute_watermark("crashes", crash_page(fetched_at="2025-01-01T00:00:00"))
+        second = compute_watermark("crashes", crash_page(fetched_at="2025-02-01T00:00:00"))
+
+        assert first == second
+
+    def test_safety_summary_watermark(self):
+        """Test non-list payloads hash the whole summary."""
+        first = compute_watermark("safety", {"data": {"driver_oos_rate": 5.0}})
+        second = compute_watermark("safety", {"data": {"driver_oos_rate": 6.0}})
+
+        assert first["record_count"] == 1
+        assert first["max_date"] is None
+        assert first["payload_hash"] != second["payload_hash"]
+
+    def test_is_unchanged(self):
+        """Test all three signals must match."""
+        probe = compute_watermark("crashes", crash_page())
+
+        assert is_unchanged(dict(probe), probe)
+        assert not is_unchanged(None, probe)
+        assert not is_unchanged({**probe, "record_count": 3}, probe)
+
+
+class TestFreshnessProbe:
+    """Test suite for the probe decision."""
+
+    def test_new_carrier_is_changed(self):
+        """Test a carrier without a watermark needs a full fetch."""
+        repo = Mock()
+        repo.get.return_value = None
+        probe = FreshnessProbe(repo)
+
+        unchanged, watermark = probe.check(1, "crashes", crash_page())
+        probe.commit(1, "crashes", watermark)
+
+        assert unchanged is False
+        repo.upsert.assert_called_once_with(
+            1, "crashes", watermark["record_count"], watermark["max_date"], watermark["payload_hash"]
+        )
+        assert probe.stats == {"probed": 1, "unchanged": 0, "changed": 1}
+
+    def test_matching_watermark_is_unchanged(self):
+        """Test a matching watermark skips and records the check."""
+        repo = Mock()
+        repo.get.return_value = compute_watermark("crashes", crash_page())
+        probe = FreshnessProbe(repo)
+
+        unchanged, _ = probe.check(1, "crashes", crash_page())
+
+        assert unchanged is True
+        repo.mark_checked.assert_called_once_with(1, "crashes")
+
+    def test_storage_failure_treated_as_changed(self):
+        """Test watermark lookup errors never block enrichment."""
+        repo = Mock()
+        repo.get.side_effect = Exception("Neo4j unavailable")
+        probe = FreshnessProbe(repo)
+
+        unchanged, _ = probe.check(1, "crashes", crash_page())
+
+        assert unchanged is False
+
+
+class TestCrashEnrichmentProbe:
+    """Test suite for probe integration in crash enrichment."""
+
+    @pytest.fixture
+    def enricher(self):
+        """Create an enricher with repositories mocked out."""
+        module = 'scripts.ingest.searchcarriers_insurance_enrichment'
+        with patch.dict('os.environ', {'SEARCH_CARRIERS_API_TOKEN': 'test_token_123'}), \
+             patch(f'{module}.CarrierRepository'), \
+             patch(f'{module}.InsurancePolicyRepository'), \
+             patch(f'{module}.InsuranceProviderRepository'), \
+             patch(f'{module}.SafetySnapshotRepository'), \
+             patch(f'{module}.CrashRepository'), \
+             patch(f'{module}.InspectionRepository'):
+            from scripts.ingest.searchcarriers_insurance_enrichment import SearchCarriersInsuranceEnrichment
+            enricher = SearchCarriersInsuranceEnrichment()
+        enricher.freshness = FreshnessProbe(Mock())
+        return enricher
+
+    def test_unchanged_carrier_costs_one_request(self, enricher):
+        """Test an unchanged carrier skips remaining pages and writes."""
+        page = crash_page(total=250)
+        page["meta"]["last_page"] = 3
+        enricher.freshness.watermark_repo.get.return_value = compute_watermark("crashes", page)
+
+        with patch.object(enricher.client, 'get_crashes', return_value=page) as mock_get:
+            result = enricher.enrich_carrier_crash_data(1)
+
+        assert result["skipped"] is True
+        mock_get.assert_called_once()
+        enricher.crash_repo.bulk_write.assert_not_called()
+
+    def test_changed_carrier_reuses_probe_page(self, enricher):
+        """Test a changed carrier processes the probe page without refetching it."""
+        enricher.freshness.watermark_repo.get.return_value = None
+
+        with patch.object(enricher.client, 'get_crashes', return_value=crash_page()) as mock_get:
+            result = enricher.enrich_carrier_crash_data(1)
+
+        assert result["crash_count"] == 2
+        mock_get.assert_called_once()
+        enricher.freshness.watermark_repo.upsert.assert_called_once()
+
+    def test_force_bypasses_probe(self, enricher):
+        """Test force rewrites even when the watermark matches."""
+        enricher.freshness.watermark_repo.get.return_value = compute_watermark("crashes", crash_page())
+
+        with patch.object(enricher.client, 'get_crashes', return_value=crash_page()):
+            result = enricher.enrich_carrier_crash_data(1, force=True)
+
+        assert "skipped" not in result
+        assert result["crash_count"] == 2
+    
+    @pytest.mark.parametrize("family,method,enrich", [
+        ("crashes", "get_crashes", "enrich_carrier_crash_data"),
+        ("inspections", "get_inspections", "enrich_carrier_inspection_data"),
+    ])
+    def test_empty_response_commits_zero_watermark(self, enricher, family, method, enrich):
+        """Test a carrier with no records is recorded as enriched, not left never enriched."""
+        enricher.freshness.watermark_repo.get.return_value = None
+        empty = {"data": [], "meta": {"current_page": 1, "last_page": 1, "total": 0}}
+
+        with patch.object(enricher.client, method, return_value=empty):
+            getattr(enricher, enrich)(1)
+
+        usdot, stored_family, record_count = enricher.freshness.watermark_repo.upsert.call_args[0][:3]
+        assert (usdot, stored_family, record_count) == (1, family, 0)
+
+    def test_empty_insurance_commits_zero_watermark(self, enricher):
+        """Test a carrier without policies gets an insurance watermark."""
+        enricher.freshness.watermark_repo.get.return_value = None
+
+        with patch.object(enricher.client, 'get_carrier_insurance_history', return_value={"data": []}):
+            results = enricher.enrich_carriers([{"usdot": 1, "carrier_name": "Empty Co"}])
+
+        assert results[0]["error"] is None
+        assert enricher.freshness.watermark_repo.upsert.call_args[0][:3] == (1, "insurance", 0)
+
+    def test_empty_safety_commits_zero_watermark(self, enricher):
+        """Test a carrier without a safety summary gets a safety watermark."""
+        enricher.freshness.watermark_repo.get.return_value = None
+
+        with patch.object(enricher.client, 'get_safety_summary', return_value={"data": {}}):
+            result = enricher.enrich_carrier_safety_data(1)
+
+        assert result == {"snapshot_created": False, "reason": "no safety data"}
+        assert enricher.freshness.watermark_repo.upsert.call_args[0][:3] == (1, "safety", 0)
+        enricher.safety_repo.create.assert_not_called()
+
+    def test_error_response_not_committed(self, enricher):
+        """Test a failed fetch leaves the watermark untouched."""
+        with patch.object(enricher.client, 'get_crashes', return_value={"data": [], "error": "Not found"}):
+            result = enricher.enrich_carrier_crash_data(1)
+
+        assert result == {"error": "Not found"}
+        enricher.freshness.watermark_repo.upsert.assert_not_called()
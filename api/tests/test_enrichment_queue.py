@@ -0,0 +1,537 @@
+"""
+Unit tests for the durable enrichment queue and its worker.
+
+Tests priority ordering, retry backoff, dead-lettering, recovery after a
+restart, cancellation, the progress stream and how queued results are
+rebuilt into a job report.
+"""
+
+import pytest
+import time
+import asyncio
+from unittest.mock import Mock, patch
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import app
+from services.enrichment_queue import EnrichmentQueue, ItemState, Priority
+from services.searchcarriers_enrichment_service import (
+    get_enrichment_status,
+    process_queue_item,
+    run_queue_worker,
+    stream_enrichment_progress
+)
+
+
+client = TestClient(app)
+headers = {"X-API-Key": "test-api-key"}
+
+
+class TestEnrichmentQueue:
+    """Test suite for queue state transitions."""
+
+    @pytest.fixture
+    def queue(self):
+        """Create an in-memory queue with no backoff between attempts."""
+        return EnrichmentQueue(":memory:", max_attempts=3, base_delay=0, max_delay=0)
+
+    def test_interactive_jumps_bulk(self, queue):
+        """Test an interactive item queued after a backfill is claimed first."""
+        queue.enqueue([1, 2, 3], priority=Priority.BULK)
+        queue.enqueue([99], priority=Priority.INTERACTIVE)
+
+        assert queue.claim()["usdot"] == 99
+        assert queue.claim()["usdot"] == 1
+
+    def test_claim_carries_job_options(self, queue):
+        """Test claimed items include the job's enrichment options."""
+        job_id = queue.enqueue([1], {"insurance_data": True})
+
+        item = queue.claim()
+
+        assert item["job_id"] == job_id
+        assert item["options"] == {"insurance_data": True}
+        assert item["attempts"] == 1
+        assert queue.claim() is None
+
+    def test_failure_retries_then_dead_letters(self, queue):
+        """Test failed items are retried until max_attempts, then dead-lettered."""
+        queue.enqueue([1])
+
+        for attempt in range(1, 4):
+            item = queue.claim()
+            assert item["attempts"] == attempt
+            state = queue.fail(item["item_id"], "timeout")
+
+        assert state == ItemState.DEAD
+        assert queue.claim() is None
+        assert queue.dead_letters()[0]["last_error"] == "timeout"
+
+        assert queue.retry_dead(item["item_id"]) is True
+        assert queue.claim()["attempts"] == 1
+
+    def test_backoff_delays_retry(self):
+        """Test a failed item is not claimable until its backoff elapses."""
+        queue = EnrichmentQueue(":memory:", max_attempts=3, base_delay=60, max_delay=600)
+        queue.enqueue([1])
+        queue.fail(queue.claim()["item_id"], "429")
+
+        assert queue.claim() is None
+        assert queue.backoff_delay(1) == 60
+        assert queue.backoff_delay(2) == 120
+        assert queue.backoff_delay(10) == 600
+
+    def test_jobs_survive_restart(self, tmp_path):
+        """Test queued and interrupted items are recovered by a new process."""
+        path = str(tmp_path / "queue.db")
+        first = EnrichmentQueue(path, lease_seconds=0)
+        job_id = first.enqueue([1, 2])
+        first.claim("worker-a")  # process dies while this item is running
+
+        restarted = EnrichmentQueue(path)
+        assert restarted.requeue_interrupted() == 1
+        assert restarted.get_job(job_id)["items"][ItemState.PENDING] == 2
+
+    def test_job_status(self, queue):
+        """Test job status follows its items."""
+        job_id = queue.enqueue([1, 2])
+        assert queue.get_job(job_id)["status"] == "queued"
+
+        queue.complete(queue.claim()["item_id"], {"usdot": 1})
+        assert queue.get_job(job_id)["status"] == "processing"
+
+        queue.complete(queue.claim()["item_id"], {"usdot": 2})
+        assert queue.get_job(job_id)["status"] == "completed"
+        assert queue.get_job("missing") is None
+
+
+class TestLeases:
+    """Test suite for lease-based claims shared by several workers."""
+
+    def test_live_lease_not_claimable(self):
+        """Test a carrier leased by one worker is not handed to another, even from another job."""
+        queue = EnrichmentQueue(":memory:")
+        queue.enqueue([1])
+        queue.enqueue([1, 2])
+
+        assert queue.claim("worker-a")["usdot"] == 1
+        assert queue.claim("worker-b")["usdot"] == 2
+        assert queue.claim("worker-c") is None
+
+    def test_expired_lease_reclaimed(self):
+        """Test work held by a dead worker is taken over once its lease expires."""
+        queue = EnrichmentQueue(":memory:", lease_seconds=0)
+        queue.enqueue([1])
+        first = queue.claim("worker-a")
+
+        second = queue.claim("worker-b")
+
+        assert second["item_id"] == first["item_id"]
+        assert second["attempts"] == 2
+        assert second["lease_owner"] == "worker-b"
+
+    def test_lost_lease_result_discarded(self):
+        """Test only the current lease owner can complete, fail or renew an item."""
+        queue = EnrichmentQueue(":memory:", lease_seconds=0)
+        job_id = queue.enqueue([1])
+        stale = queue.claim("worker-a")
+        queue.claim("worker-b")
+
+        assert queue.complete(stale["item_id"], {"usdot": 1}, "worker-a") is False
+        assert queue.fail(stale["item_id"], "timeout", None, "worker-a") is None
+        assert queue.renew(stale["item_id"], "worker-a") is False
+
+        assert queue.renew(stale["item_id"], "worker-b") is True
+        assert queue.complete(stale["item_id"], {"usdot": 1}, "worker-b") is True
+        assert queue.get_job(job_id)["status"] == "completed"
+
+    def test_live_leases_survive_housekeeping(self):
+        """Test requeue_interrupted leaves items held by live workers alone."""
+        queue = EnrichmentQueue(":memory:")
+        queue.enqueue([1])
+        queue.claim("worker-a")
+
+        assert queue.requeue_interrupted() == 0
+        assert queue.claim("worker-b") is None
+
+    def test_workers_share_file_queue(self, tmp_path):
+        """Test separate queue handles on one file never claim the same item."""
+        path = str(tmp_path / "queue.db")
+        workers = [EnrichmentQueue(path) for _ in range(3)]
+        workers[0].enqueue(list(range(1, 31)))
+
+        claimed = []
+        for _ in range(10):
+            for i, worker in enumerate(workers):
+                claimed.append(worker.claim(f"worker-{i}")["usdot"])
+
+        assert sorted(claimed) == list(range(1, 31))
+
+
+class TestQueueWorker:
+    """Test suite for processing queued items."""
+
+    @pytest.fixture
+    def queue(self):
+        """Create an in-memory queue with no backoff between attempts."""
+        return EnrichmentQueue(":memory:", max_attempts=2, base_delay=0, max_delay=0)
+
+    @pytest.fixture
+    def mock_enricher(self):
+        """Create a mock enricher with insurance enrichment."""
+        enricher = Mock()
+        enricher.enrich_carrier_by_usdot = Mock(return_value={
+            "policies_created": 2, "events_created": 1, "gaps_found": 0
+        })
+        return enricher
+
+    @pytest.mark.asyncio
+    async def test_successful_item_completes(self, queue, mock_enricher):
+        """Test a successful carrier result is stored on the item."""
+        job_id = queue.enqueue([1], {"insurance_data": True})
+
+        state = await process_queue_item(queue, mock_enricher, queue.claim())
+
+        assert state == ItemState.SUCCEEDED
+        assert queue.get_job_results(job_id)[0]["result"]["insurance"]["policies_created"] == 2
+
+    @pytest.mark.asyncio
+    async def test_raised_family_is_retried(self, queue, mock_enricher):
+        """Test a family exception schedules a retry instead of completing."""
+        mock_enricher.enrich_carrier_by_usdot.side_effect = Exception("Connection reset")
+        queue.enqueue([1], {"insurance_data": True})
+
+        state = await process_queue_item(queue, mock_enricher, queue.claim())
+
+        assert state == ItemState.PENDING
+        assert queue.claim()["attempts"] == 2
+
+    @pytest.mark.asyncio
+    async def test_lease_renewed_while_enriching(self, mock_enricher):
+        """Test a slow carrier keeps its lease and is completed by its worker."""
+        queue = EnrichmentQueue(":memory:", lease_seconds=0.09)
+        mock_enricher.enrich_carrier_by_usdot.side_effect = lambda usdot, force: (
+            time.sleep(0.3) or {"policies_created": 1}
+        )
+        queue.enqueue([1], {"insurance_data": True})
+        item = queue.claim("worker-a")
+
+        processing = asyncio.create_task(process_queue_item(queue, mock_enricher, item, "worker-a"))
+        await asyncio.sleep(0.2)
+        assert queue.claim("worker-b") is None  # lease renewed past its original expiry
+
+        assert await processing == ItemState.SUCCEEDED
+
+    @pytest.mark.asyncio
+    async def test_worker_drains_queue_and_reports(self, queue, mock_enricher):
+        """Test the worker drains a job and the status report aggregates it."""
+        job_id = queue.enqueue([1, 2, 3], {"insurance_data": True})
+        stop = asyncio.Event()
+
+        async def stop_when_done():
+            while queue.get_job(job_id)["status"] != "completed":
+                await asyncio.sleep(0.01)
+            stop.set()
+
+        with patch('scripts.ingest.searchcarriers_insurance_enrichment.SearchCarriersInsuranceEnrichment',
+                   return_value=mock_enricher), \
+             patch('services.searchcarriers_enrichment_service.get_enrichment_queue', return_value=queue):
+            await asyncio.gather(
+                run_queue_worker(queue, stop, concurrency=2, poll_interval=0.01),
+                stop_when_done()
+            )
+            report = await get_enrichment_status(job_id)
+
+        assert report["status"] == "completed"
+        assert report["carriers_processed"] == 3
+        assert report["policies_created"] == 6
+        assert report["priority"] == "bulk"
+
+    @pytest.mark.asyncio
+    async def test_worker_claims_with_its_worker_id(self, queue, mock_enricher):
+        """Test every concurrent worker claims under the process's lease owner."""
+        queue.enqueue([1, 2], {"insurance_data": True})
+        stop = asyncio.Event()
+        owners = []
+        claim = queue.claim
+
+        def recording_claim(worker_id="local"):
+            owners.append(worker_id)
+            item = claim(worker_id)
+            if item is None:
+                stop.set()
+            return item
+
+        with patch('scripts.ingest.searchcarriers_insurance_enrichment.SearchCarriersInsuranceEnrichment',
+                   return_value=mock_enricher), \
+             patch.object(queue, 'claim', side_effect=recording_claim):
+            await run_queue_worker(queue, stop, concurrency=2, poll_interval=0.01, worker_id="host:42")
+
+        assert set(owners) == {"host:42"}
+
+    @pytest.mark.asyncio
+    async def test_unknown_job_status(self, queue):
+        """Test an unknown job ID reports an unknown status."""
+        with patch('services.searchcarriers_enrichment_service.get_enrichment_queue', return_value=queue):
+            report = await get_enrichment_status("missing")
+
+        assert report["status"] == "unknown"
+
+
+class TestJobCancellation:
+    """Test suite for cooperative job cancellation."""
+
+    @pytest.fixture
+    def queue(self):
+        """Create an in-memory queue with no backoff between attempts."""
+        return EnrichmentQueue(":memory:", max_attempts=3, base_delay=0, max_delay=0)
+
+    def test_cancel_withdraws_pending_items(self, queue):
+        """Test pending items are withdrawn while the in-flight item finishes."""
+        job_id = queue.enqueue([1, 2, 3])
+        running = queue.claim()
+
+        assert queue.cancel_job(job_id) == 2
+        assert queue.claim() is None
+        assert queue.get_job(job_id)["status"] == "cancelling"
+
+        queue.complete(running["item_id"], {"usdot": 1})
+        job = queue.get_job(job_id)
+        assert job["status"] == "cancelled"
+        assert job["items"][ItemState.CANCELLED] == 2
+        assert job["items"][ItemState.SUCCEEDED] == 1
+
+    def test_failed_item_of_cancelled_job_not_retried(self, queue):
+        """Test a failure after cancellation does not put the item back on the queue."""
+        job_id = queue.enqueue([1])
+        item = queue.claim()
+        queue.cancel_job(job_id)
+
+        assert queue.fail(item["item_id"], "timeout") == ItemState.CANCELLED
+        assert queue.claim() is None
+
+    def test_cancel_finished_or_unknown_job(self, queue):
+        """Test jobs that are done, already cancelled or missing cannot be cancelled."""
+        job_id = queue.enqueue([1])
+        queue.complete(queue.claim()["item_id"], {"usdot": 1})
+
+        assert queue.cancel_job(job_id) is None
+        assert queue.cancel_job("missing") is None
+
+        other = queue.enqueue([2])
+        assert queue.cancel_job(other) == 1
+        assert queue.cancel_job(other) is None
+
+    def test_interrupted_item_of_cancelled_job_not_requeued(self):
+        """Test restart recovery does not revive cancelled work."""
+        queue = EnrichmentQueue(":memory:", lease_seconds=0)
+        job_id = queue.enqueue([1])
+        queue.claim()
+        queue.cancel_job(job_id)
+
+        assert queue.requeue_interrupted() == 0
+        assert queue.get_job(job_id)["status"] == "cancelled"
+
+    def test_existing_queue_file_is_migrated(self, tmp_path):
+        """Test a queue file created before cancellation support gains the new column."""
+        import sqlite3
+
+        path = str(tmp_path / "queue.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            "CREATE TABLE enrichment_jobs (job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, "
+            "priority INTEGER NOT NULL, options TEXT NOT NULL, total_items INTEGER NOT NULL, "
+            "created_at TEXT NOT NULL);"
+        )
+        conn.close()
+
+        queue = EnrichmentQueue(path)
+        job_id = queue.enqueue([1])
+        assert queue.cancel_job(job_id) == 1
+
+
+class TestProgressStream:
+    """Test suite for the job progress stream."""
+
+    @pytest.fixture
+    def queue(self):
+        """Create an in-memory queue with no backoff between attempts."""
+        return EnrichmentQueue(":memory:", max_attempts=1, base_delay=0, max_delay=0)
+
+    @pytest.mark.asyncio
+    async def test_stream_follows_job_to_completion(self, queue):
+        """Test carrier, progress and done events carry running counters and ETA."""
+        job_id = queue.enqueue([1, 2])
+        queue.complete(queue.claim()["item_id"], {"usdot": 1, "insurance": {"policies_created": 2}})
+
+        with patch('services.searchcarriers_enrichment_service.get_enrichment_queue', return_value=queue):
+            stream = stream_enrichment_progress(job_id, poll_interval=0.01)
+
+            event, data = await stream.__anext__()
+            assert event == "carrier"
+            assert data["usdot"] == 1
+            assert data["families"] == ["insurance"]
+
+            event, data = await stream.__anext__()
+            assert event == "progress"
+            assert data["completed"] == 1
+            assert data["remaining"] == 1
+            assert data["percent_complete"] == 50.0
+            assert data["counters"]["policies_created"] == 2
+            assert data["throughput_per_minute"] > 0
+            assert data["eta_seconds"] is not None
+
+            queue.fail(queue.claim()["item_id"], "timeout")
+            events = [event async for event in stream]
+
+        assert [event for event, _ in events] == ["carrier", "done"]
+        assert events[0][1]["error"] == "timeout"
+        done = events[1][1]
+        assert done["status"] == "completed_with_errors"
+        assert done["failed"] == 1
+        assert done["eta_seconds"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_stream_of_unknown_job_is_empty(self, queue):
+        """Test an unknown job yields no events."""
+        with patch('services.searchcarriers_enrichment_service.get_enrichment_queue', return_value=queue):
+            events = [event async for event in stream_enrichment_progress("missing")]
+
+        assert events == []
+
+    def test_stream_endpoint(self, queue):
+        """Test the endpoint formats events as server-sent events."""
+        job_id = queue.enqueue([1])
+        queue.complete(queue.claim()["item_id"], {"usdot": 1})
+
+        with patch('routes.ingest_routes.get_enrichment_queue', return_value=queue), \
+             patch('services.searchcarriers_enrichment_service.get_enrichment_queue', return_value=queue):
+            response = client.get(f"/ingest/status/{job_id}/stream", headers=headers)
+            missing = client.get("/ingest/status/missing/stream", headers=headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "event: carrier\ndata: " in response.text
+        assert response.text.rstrip().split("\n\n")[-1].startswith("event: done")
+        assert missing.status_code == 404
+
+    def test_cancel_endpoint(self, queue):
+        """Test the cancel endpoint stops an active job and rejects unknown ones."""
+        job_id = queue.enqueue([1, 2])
+
+        with patch('services.searchcarriers_enrichment_service.get_enrichment_queue', return_value=queue):
+            response = client.post(f"/ingest/status/{job_id}/cancel", headers=headers)
+            missing = client.post("/ingest/status/missing/cancel", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "cancelling"
+        assert queue.get_job(job_id)["status"] == "cancelled"
+        assert missing.status_code == 404
+
+
+class TestIngestEnrichmentJob:
+    """Test suite for the enrichment job started by an ingest."""
+
+    def test_returned_job_id_reaches_status(self):
+        """Test the job ID an ingest returns is the one its enrichment is queued under."""
+        import base64
+        from services.ingest_orchestrator import IngestionOrchestrator
+
+        queue = EnrichmentQueue(":memory:", max_attempts=1, base_delay=0, max_delay=0)
+        csv_content = base64.b64encode(
+            b"dot_number,JB Carrier,Carrier,Primary Officer\n999001,Yes,Test Carrier LLC,John Smith\n"
+        ).decode("utf-8")
+
+        with patch.multiple(IngestionOrchestrator, create_or_verify_target_company=Mock(),
+                            create_entities=Mock(return_value={"carriers": 1, "insurance_providers": 0, "persons": 0}),
+                            create_relationships=Mock(return_value=0), refresh_risk_scores=Mock(),
+                            refresh_chameleon_clusters=Mock()), \
+             patch('routes.ingest_routes.get_enrichment_queue', return_value=queue), \
+             patch('services.searchcarriers_enrichment_service.get_enrichment_queue', return_value=queue):
+            response = client.post("/ingest/", json={"csv_content": csv_content, "enable_enrichment": True},
+                                   headers=headers)
+            job_id = response.json()["enrichment"]["job_id"]
+            status = client.get(f"/ingest/status/{job_id}", headers=headers)
+            client.post(f"/ingest/status/{job_id}/cancel", headers=headers)
+            stream = client.get(f"/ingest/status/{job_id}/stream", headers=headers)
+
+        assert response.status_code == 200
+        assert job_id == response.json()["job_id"]
+        assert status.json()["job_id"] == job_id
+        assert status.json()["kind"] == "ingest"
+        assert status.json()["total_carriers"] == 1
+        assert stream.status_code == 200
+        assert "event: done" in stream.text
+
+
+class TestWorkerEntryPoint:
+    """Test suite for the standalone enrichment worker."""
+
+    @pytest.mark.asyncio
+    async def test_worker_stops_on_event(self):
+        """Test the worker drains with its own lease owner and stops when signalled."""
+        from workers.enrichment import run_worker
+
+        queue = EnrichmentQueue(":memory:")
+        job_id = queue.enqueue([1], {"insurance_data": True})
+        enricher = Mock(enrich_carrier_by_usdot=Mock(return_value={"policies_created": 1}))
+        stop = asyncio.Event()
+
+        async def stop_when_done():
+            while queue.get_job(job_id)["status"] != "completed":
+                await asyncio.sleep(0.01)
+            stop.set()
+
+        with patch('workers.enrichment.get_enrichment_queue', return_value=queue), \
+             patch('scripts.ingest.searchcarriers_insurance_enrichment.SearchCarriersInsuranceEnrichment',
+                   return_value=enricher):
+            await asyncio.gather(
+                run_worker(2, 0.01, "node-1:42", refresh_scheduler=False, stop_event=stop),
+                stop_when_done()
+            )
+
+        assert queue.get_job(job_id)["status"] == "completed"
+
+    def test_worker_requires_token(self):
+        """Test the worker refuses to start without an API token."""
+        from workers import enrichment
+
+        with patch.object(enrichment.settings, 'search_carriers_api_token', None), \
+             patch.object(sys, 'argv', ['workers.enrichment']):
+            with pytest.raises(SystemExit):
+                enrichment.main()
+
+    @pytest.mark.asyncio
+    async def test_scheduler_only_process_does_not_consume(self):
+        """Test --no-consume runs the refresh scheduler and leaves the queue to the workers."""
+        from workers.enrichment import run_worker
+
+        queue = EnrichmentQueue(":memory:")
+        job_id = queue.enqueue([1])
+        stop = asyncio.Event()
+        stop.set()
+        scheduler = Mock()
+        scheduler.return_value.run = Mock(side_effect=lambda stop_event: asyncio.sleep(0))
+
+        with patch('workers.enrichment.get_enrichment_queue', return_value=queue), \
+             patch('workers.enrichment.RefreshScheduler', scheduler):
+            await run_worker(2, 0.01, "node-1:42", refresh_scheduler=True, stop_event=stop, consume=False)
+
+        scheduler.assert_called_once_with(queue=queue)
+        assert queue.get_job(job_id)["items"][ItemState.PENDING] == 1
+
+    def test_scheduler_only_process_needs_no_token(self):
+        """Test the scheduler-only process starts without a vendor API token."""
+        from workers import enrichment
+
+        with patch.object(enrichment.settings, 'search_carriers_api_token', None), \
+             patch.object(sys, 'argv', ['workers.enrichment', '--no-consume', '--refresh-scheduler']), \
+             patch.object(enrichment, 'run_worker', Mock()) as run_worker, \
+             patch.object(enrichment.asyncio, 'run'):
+            enrichment.main()
+
+        assert run_worker.call_args.kwargs["consume"] is False
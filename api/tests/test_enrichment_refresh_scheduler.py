@@ -0,0 +1,129 @@
+"""
+Unit tests for the staleness-driven refresh scheduler.
+
+Tests the per-tick budget, deferral behind on-demand work, grouping by
+stale family and the stale-carrier query parameters.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from repositories.enrichment_watermark_repository import EnrichmentWatermarkRepository
+from services.enrichment_queue import EnrichmentQueue, Priority
+from services.enrichment_refresh_scheduler import RefreshScheduler
+
+
+def stale(usdot, families, risk_score=1.0):
+    """Build a stale-carrier row as returned by find_stale_carriers."""
+    return {"usdot": usdot, "stale_families": families, "risk_score": risk_score}
+
+
+class TestRefreshScheduler:
+    """Test suite for RefreshScheduler.tick."""
+
+    @pytest.fixture
+    def queue(self):
+        """Create an in-memory queue."""
+        return EnrichmentQueue(":memory:")
+
+    @pytest.fixture
+    def repo(self):
+        """Create a mock EnrichmentWatermarkRepository."""
+        return Mock(find_stale_carriers=Mock(return_value=[]))
+
+    @pytest.fixture
+    def scheduler(self, queue, repo):
+        """Create a scheduler allowed 10 carriers per tick."""
+        return RefreshScheduler(queue=queue, watermark_repo=repo, max_age_days=7,
+                                rate_per_hour=120, interval_seconds=300, max_backlog=0)
+
+    @pytest.fixture(autouse=True)
+    def use_queue(self, queue):
+        """Route enqueue_enrichment to the test queue."""
+        with patch('services.searchcarriers_enrichment_service.get_enrichment_queue', return_value=queue):
+            yield
+
+    def test_stale_carriers_queued_at_refresh_priority(self, scheduler, queue, repo):
+        """Test stale carriers are queued below on-demand work, one job per family set."""
+        repo.find_stale_carriers.return_value = [
+            stale(1, ["safety", "insurance"], 4.5),
+            stale(2, ["insurance"], 2.0),
+            stale(3, ["insurance", "safety"], 1.0),
+        ]
+
+        result = scheduler.tick()
+
+        assert result["status"] == "scheduled"
+        assert result["carriers_queued"] == 3
+        assert len(result["job_ids"]) == 2
+
+        families, cutoff, limit = repo.find_stale_carriers.call_args[0]
+        assert limit == 10
+        assert sorted(families) == ["crashes", "inspections", "insurance", "safety"]
+
+        both = queue.get_job(result["job_ids"][0])
+        assert both["priority"] == "refresh"
+        assert both["kind"] == "refresh"
+        assert both["total_items"] == 2
+        assert both["options"] == {
+            "insurance_data": True, "safety_data": True,
+            "crash_data": False, "inspection_data": False
+        }
+
+        # Riskiest carrier first within its job
+        assert queue.claim()["usdot"] == 1
+
+    def test_deferred_while_on_demand_work_waits(self, scheduler, queue, repo):
+        """Test no refresh is scheduled while on-demand items are pending."""
+        queue.enqueue([99], priority=Priority.INTERACTIVE)
+
+        result = scheduler.tick()
+
+        assert result["status"] == "deferred"
+        assert result["on_demand_backlog"] == 1
+        repo.find_stale_carriers.assert_not_called()
+
+    def test_unclaimed_refreshes_use_budget(self, scheduler, queue, repo):
+        """Test refreshes still pending from earlier ticks reduce the next tick's budget."""
+        queue.enqueue(list(range(1, 8)), priority=Priority.REFRESH, kind="refresh")
+
+        scheduler.tick()
+
+        assert repo.find_stale_carriers.call_args[0][2] == 3
+        assert sorted(repo.find_stale_carriers.call_args[1]["exclude"]) == list(range(1, 8))
+
+    def test_fractional_rate_accumulates(self, queue, repo):
+        """Test a rate below one carrier per tick still queues carriers over time."""
+        scheduler = RefreshScheduler(queue=queue, watermark_repo=repo, max_age_days=7,
+                                     rate_per_hour=6, interval_seconds=300, max_backlog=0)
+
+        results = [scheduler.tick()["status"] for _ in range(2)]
+
+        assert results == ["idle", "idle"]
+        assert repo.find_stale_carriers.call_count == 1  # 0.5 + 0.5 carriers
+        assert repo.find_stale_carriers.call_args[0][2] == 1
+
+
+class TestFindStaleCarriers:
+    """Test suite for EnrichmentWatermarkRepository.find_stale_carriers."""
+
+    def test_query_parameters(self):
+        """Test families, cutoff, exclusions and weight overrides are passed to the query."""
+        repo = EnrichmentWatermarkRepository()
+
+        with patch.object(repo, 'execute_query', return_value=[]) as mock_query:
+            repo.find_stale_carriers(["insurance"], "2026-01-01T00:00:00+00:00", 5,
+                                     exclude=[7], weights={"fatal_crash": 5.0})
+
+        query, params = mock_query.call_args[0]
+        assert "ORDER BY risk_score DESC" in query
+        assert params["families"] == ["insurance"]
+        assert params["exclude"] == [7]
+        assert params["limit"] == 5
+        assert params["fatal_crash"] == 5.0
+        assert params["driver_oos_threshold"] == 10.0
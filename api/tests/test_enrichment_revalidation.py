@@ -0,0 +1,111 @@
+"""
+Unit tests for stale-while-revalidate freshness checks.
+
+Tests staleness detection from enrichment watermarks and deduplicated
+background refresh queueing.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from datetime import datetime, timedelta, timezone
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.enrichment_queue import EnrichmentQueue, Priority
+from services.enrichment_revalidation import revalidate_carrier
+
+
+def hours_ago(hours):
+    """ISO timestamp ``hours`` hours in the past."""
+    return (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+
+
+class TestRevalidateCarrier:
+    """Test suite for revalidate_carrier."""
+
+    @pytest.fixture
+    def queue(self):
+        """Create an in-memory queue."""
+        return EnrichmentQueue(":memory:")
+
+    @pytest.fixture
+    def repo(self):
+        """Create a mock EnrichmentWatermarkRepository."""
+        return Mock(get_for_carrier=Mock(return_value=[]))
+
+    @pytest.fixture(autouse=True)
+    def configured(self, queue):
+        """Configure an API token and route enqueues to the test queue."""
+        with patch('services.enrichment_revalidation.settings') as mock_settings, \
+             patch('services.searchcarriers_enrichment_service.get_enrichment_queue', return_value=queue):
+            mock_settings.search_carriers_api_token = "test_token_123"
+            mock_settings.enrichment_revalidate_max_age_hours = 24
+            yield mock_settings
+
+    def test_fresh_data_not_refreshed(self, repo, queue):
+        """Test data checked within the max age is served without a refresh."""
+        repo.get_for_carrier.return_value = [
+            {"family": "safety", "checked_at": hours_ago(2)},
+            {"family": "crashes", "checked_at": hours_ago(5)},
+        ]
+
+        freshness = revalidate_carrier(1, ["safety", "crashes"], watermark_repo=repo, queue=queue)
+
+        assert freshness["stale"] is False
+        assert freshness["refresh_pending"] is False
+        assert freshness["data_as_of"] == repo.get_for_carrier.return_value[1]["checked_at"]
+        assert queue.active_item(1) is None
+
+    def test_stale_data_queues_interactive_refresh(self, repo, queue):
+        """Test stale data queues one interactive refresh of the requested families."""
+        repo.get_for_carrier.return_value = [{"family": "safety", "checked_at": hours_ago(48)}]
+
+        freshness = revalidate_carrier(1, ["safety"], watermark_repo=repo, queue=queue)
+
+        assert freshness["stale"] is True
+        assert freshness["refresh_pending"] is True
+        job = queue.get_job(freshness["refresh_job_id"])
+        assert job["priority"] == "interactive"
+        assert job["options"] == {
+            "insurance_data": False, "safety_data": True,
+            "crash_data": False, "inspection_data": False
+        }
+
+    def test_repeated_reads_deduplicated(self, repo, queue):
+        """Test a carrier already queued is not queued again."""
+        first = revalidate_carrier(1, ["safety"], watermark_repo=repo, queue=queue)
+        second = revalidate_carrier(1, ["safety"], watermark_repo=repo, queue=queue)
+
+        assert first["data_as_of"] is None
+        assert second["refresh_job_id"] == first["refresh_job_id"]
+        assert queue.stats()["pending"] == {"interactive": 1}
+
+    def test_bulk_item_promoted(self, repo, queue):
+        """Test a carrier waiting in a bulk job is promoted instead of queued twice."""
+        queue.enqueue([2, 1], priority=Priority.BULK)
+
+        freshness = revalidate_carrier(1, ["safety"], watermark_repo=repo, queue=queue)
+
+        assert freshness["refresh_pending"] is True
+        assert queue.claim()["usdot"] == 1
+
+    def test_no_token_no_refresh(self, repo, queue, configured):
+        """Test nothing is queued when enrichment is not configured."""
+        configured.search_carriers_api_token = None
+
+        freshness = revalidate_carrier(1, ["safety"], watermark_repo=repo, queue=queue)
+
+        assert freshness["stale"] is True
+        assert freshness["refresh_pending"] is False
+
+    def test_watermark_failure_treated_as_missing(self, repo, queue):
+        """Test a failed watermark read still answers and refreshes."""
+        repo.get_for_carrier.side_effect = Exception("Neo4j unavailable")
+
+        freshness = revalidate_carrier(1, ["safety"], watermark_repo=repo, queue=queue)
+
+        assert freshness["data_as_of"] is None
+        assert freshness["refresh_pending"] is True
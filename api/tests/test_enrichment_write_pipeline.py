@@ -0,0 +1,218 @@
+"""
+Unit tests for the enrichment write pipeline.
+
+Tests write coalescing, backpressure, failure isolation and cost
+attribution of the write stage, and how the enricher's families hand
+their pages to it.
+"""
+
+import time
+import threading
+import pytest
+from unittest.mock import Mock, patch
+from datetime import date
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.enrichment_cost import CostMeter, current_meter, metering
+from services.enrichment_freshness import FreshnessProbe
+from services.enrichment_write_pipeline import WritePipeline
+
+
+class GatedWriter:
+    """Batch writer that records its batches and can be held closed."""
+
+    def __init__(self):
+        self.batches = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+
+    def __call__(self, payloads):
+        self.entered.set()
+        self.gate.wait(5)
+        self.batches.append(list(payloads))
+        return [f"wrote {payload}" for payload in payloads]
+
+
+class TestWritePipeline:
+    """Test suite for WritePipeline."""
+
+    @pytest.fixture
+    def writer(self):
+        """Create a gated batch writer."""
+        return GatedWriter()
+
+    def test_writes_are_coalesced(self, writer):
+        """Test payloads queued while the writer is busy are written as one batch."""
+        pipeline = WritePipeline({"pages": writer}, max_pending=10, batch_size=10, linger_ms=0).start()
+        writer.gate.clear()
+
+        first = pipeline.submit("pages", 1)
+        writer.entered.wait(1)
+        rest = [pipeline.submit("pages", n) for n in range(2, 6)]
+        writer.gate.set()
+        pipeline.close()
+
+        assert first.result() == "wrote 1"
+        assert [f.result() for f in rest] == ["wrote 2", "wrote 3", "wrote 4", "wrote 5"]
+        assert writer.batches == [[1], [2, 3, 4, 5]]
+        assert pipeline.stats()["max_batch"] == 4
+
+    def test_full_queue_blocks_submit(self, writer):
+        """Test backpressure: submit waits while the writer is behind."""
+        pipeline = WritePipeline({"pages": writer}, max_pending=1, batch_size=1, linger_ms=0).start()
+        writer.gate.clear()
+        pipeline.submit("pages", 1)
+        writer.entered.wait(1)
+        pipeline.submit("pages", 2)  # fills the queue
+
+        blocked = threading.Thread(target=pipeline.submit, args=("pages", 3))
+        blocked.start()
+        blocked.join(0.1)
+        assert blocked.is_alive()
+
+        writer.gate.set()
+        blocked.join(1)
+        pipeline.close()
+
+        assert not blocked.is_alive()
+        assert pipeline.stats()["backpressure_waits"] == 1
+        assert writer.batches == [[1], [2], [3]]
+
+    def test_failed_batch_is_isolated(self):
+        """Test a failing payload does not fail the others coalesced with it."""
+        def writer(payloads):
+            if "bad" in payloads:
+                raise ValueError("constraint violated")
+            return payloads
+
+        pipeline = WritePipeline({"pages": writer}, max_pending=10, batch_size=10, linger_ms=50).start()
+        futures = [pipeline.submit("pages", payload) for payload in ["a", "bad", "c"]]
+        pipeline.close()
+
+        assert futures[0].result() == "a"
+        assert futures[2].result() == "c"
+        with pytest.raises(ValueError):
+            futures[1].result()
+
+    def test_cost_charged_to_submitters(self):
+        """Test statements of a coalesced write are shared out between the jobs that queued it."""
+        def writer(payloads):
+            current_meter().record_database(3, 9.0, {"nodes_created": len(payloads)})
+            return payloads
+
+        pipeline = WritePipeline({"pages": writer}, max_pending=10, batch_size=10, linger_ms=50).start()
+        meters = [CostMeter(), CostMeter()]
+        for n, meter in enumerate(meters):
+            with metering(meter):
+                pipeline.submit("pages", n)
+        pipeline.close()
+
+        databases = [meter.to_dict()["database"] for meter in meters]
+        assert sum(d["statements"] for d in databases) == 3
+        assert sum(d["nodes_created"] for d in databases) == 2
+        assert all("pages_write" in meter.to_dict()["stages_ms"] for meter in meters)
+
+    def test_unknown_kind_rejected(self, writer):
+        """Test submitting a kind without a writer fails immediately."""
+        pipeline = WritePipeline({"pages": writer}).start()
+        try:
+            with pytest.raises(ValueError):
+                pipeline.submit("crashes", [])
+        finally:
+            pipeline.close()
+
+
+def inspection_page(usdot, inspection_ids):
+    """Build a normalized inspections page."""
+    return {
+        "data": [
+            {"inspection_id": inspection_id, "inspection_date": date(2024, 3, 1), "level": 1, "state": "TX"}
+            for inspection_id in inspection_ids
+        ],
+        "meta": {"current_page": 1, "last_page": 1, "total": len(inspection_ids)}
+    }
+
+
+class TestEnricherWriteStage:
+    """Test suite for enrichment families writing through the pipeline."""
+
+    @pytest.fixture
+    def enricher(self):
+        """Create an enricher with repositories mocked out."""
+        module = 'scripts.ingest.searchcarriers_insurance_enrichment'
+        with patch.dict('os.environ', {'SEARCH_CARRIERS_API_TOKEN': 'test_token_123'}), \
+             patch(f'{module}.CarrierRepository'), \
+             patch(f'{module}.InsurancePolicyRepository'), \
+             patch(f'{module}.InsuranceProviderRepository'), \
+             patch(f'{module}.SafetySnapshotRepository'), \
+             patch(f'{module}.CrashRepository'), \
+             patch(f'{module}.InspectionRepository'):
+            from scripts.ingest.searchcarriers_insurance_enrichment import SearchCarriersInsuranceEnrichment
+            enricher = SearchCarriersInsuranceEnrichment()
+        enricher.freshness = FreshnessProbe(Mock(get=Mock(return_value=None)))
+        enricher.inspection_repo.bulk_write_pages.return_value = {"statements": 2}
+        yield enricher
+        enricher.stop_write_pipeline()
+
+    def test_inline_writes_without_pipeline(self, enricher):
+        """Test a page is written before the family returns when no pipeline runs."""
+        with patch.object(enricher.client, 'get_inspections', return_value=inspection_page(1, ["I1", "I2"])):
+            result = enricher.enrich_carrier_inspection_data(1)
+
+        assert result["inspection_count"] == 2
+        assert result["page_timings"][0]["statements"] == 2
+        pages = enricher.inspection_repo.bulk_write_pages.call_args[0][0]
+        assert [(usdot, len(inspections)) for usdot, inspections, _ in pages] == [(1, 2)]
+
+    def test_carriers_coalesced_into_one_write(self, enricher):
+        """Test pages of carriers enriched side by side are written in one transaction."""
+        gate = threading.Event()
+        first_write = threading.Event()
+
+        def bulk_write_pages(pages):
+            first_write.set()
+            gate.wait(5)
+            return {"statements": 2}
+
+        enricher.inspection_repo.bulk_write_pages.side_effect = bulk_write_pages
+        enricher.start_write_pipeline(max_pending=10, batch_size=10, linger_ms=0)
+        pages = {n: inspection_page(n, [f"I{n}"]) for n in range(1, 4)}
+        results = {}
+
+        def enrich(usdot):
+            results[usdot] = enricher.enrich_carrier_inspection_data(usdot)
+
+        with patch.object(enricher.client, 'get_inspections', side_effect=lambda usdot, **kw: pages[usdot]):
+            first = threading.Thread(target=enrich, args=(1,))
+            first.start()
+            first_write.wait(1)
+            others = [threading.Thread(target=enrich, args=(n,)) for n in (2, 3)]
+            for thread in others:
+                thread.start()
+            deadline = time.monotonic() + 5
+            while enricher.write_pipeline.stats()["pending"] < 2 and time.monotonic() < deadline:
+                time.sleep(0.001)
+            gate.set()
+            for thread in [first, *others]:
+                thread.join(5)
+
+        calls = enricher.inspection_repo.bulk_write_pages.call_args_list
+        assert [[usdot for usdot, _, _ in call[0][0]] for call in calls] == [[1], [2, 3]]
+        assert all(results[n]["inspection_count"] == 1 for n in (1, 2, 3))
+        assert results[2]["page_timings"][0]["batch_pages"] == 2
+
+    def test_failed_write_keeps_watermark(self, enricher):
+        """Test a carrier whose pages failed to write is not marked fresh."""
+        enricher.inspection_repo.bulk_write_pages.side_effect = Exception("Neo4j unavailable")
+        enricher.start_write_pipeline(linger_ms=0)
+
+        with patch.object(enricher.client, 'get_inspections', return_value=inspection_page(1, ["I1"])):
+            result = enricher.enrich_carrier_inspection_data(1)
+
+        assert result["inspection_count"] == 0
+        enricher.freshness.watermark_repo.upsert.assert_not_called()
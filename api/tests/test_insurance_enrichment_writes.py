@@ -0,0 +1,185 @@
+"""
+Unit tests for batched insurance timeline writes.
+
+Tests the repository UNWIND batch and how the enrichment script builds
+per-carrier timelines in memory and groups carriers per transaction.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from datetime import date
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.insurance_policy import InsurancePolicy
+from models.insurance_event import InsuranceEvent
+from models.insurance_provider import InsuranceProvider
+from repositories.insurance_policy_repository import InsurancePolicyRepository
+from services.enrichment_freshness import FreshnessProbe
+
+
+def insurance_history(usdot):
+    """Build a normalized insurance history with a provider change."""
+    return {
+        "data": [
+            {"name_company": "Acme Insurance", "max_cov_amount": "01000", "ins_form_code": "91X",
+             "effective_date": date(2022, 1, 1), "expiration_date": date(2022, 12, 31)},
+            {"name_company": "Budget Mutual", "max_cov_amount": "00750", "ins_form_code": "91X",
+             "effective_date": date(2023, 3, 1), "expiration_date": None},
+        ],
+        "meta": {"total": 2}
+    }
+
+
+class TestBulkWriteTimelines:
+    """Test suite for InsurancePolicyRepository.bulk_write_timelines."""
+
+    @pytest.fixture
+    def repo(self):
+        """Create an InsurancePolicyRepository instance."""
+        return InsurancePolicyRepository()
+
+    @pytest.fixture
+    def timeline(self):
+        """Create a one-policy timeline."""
+        policy = InsurancePolicy(
+            policy_id="POL-1-ACME-20220101",
+            carrier_usdot=1,
+            provider_name="Acme",
+            policy_type="BMC-91X",
+            coverage_amount=1000000.0,
+            filing_status="ACTIVE",
+            effective_date=date(2022, 1, 1),
+            expiration_date=date(2022, 12, 31)
+        )
+        event = InsuranceEvent(
+            event_id="EVT-1-20220101-NEW_POLICY",
+            carrier_usdot=1,
+            event_type="NEW_POLICY",
+            event_date=date(2022, 1, 1)
+        )
+        return {
+            "carrier_usdot": 1,
+            "providers": [InsuranceProvider(provider_id="PROV-ACME", name="Acme")],
+            "policies": [policy],
+            "successions": [],
+            "events": [event]
+        }
+
+    def test_timeline_written_in_one_transaction(self, repo, timeline):
+        """Test every node and relationship type is one UNWIND statement."""
+        results = [[{"count": 1}]] * 5
+
+        with patch.object(repo, 'transaction_query', return_value=results) as mock_tx:
+            counts = repo.bulk_write_timelines([timeline])
+
+        mock_tx.assert_called_once()
+        queries = mock_tx.call_args[0][0]
+        assert counts["statements"] == 5  # no succession rows
+        assert counts["policies"] == 1
+        assert all("UNWIND" in query for query, _ in queries)
+
+        coverage = queries[2][1]["coverage"][0]
+        assert coverage["from_date"] == "2022-01-01"
+        assert coverage["to_date"] == "2022-12-31"
+        assert coverage["status"] == "EXPIRED"
+        assert coverage["duration_days"] == 364
+
+    def test_carriers_share_statements(self, repo, timeline):
+        """Test a group of carriers is concatenated and providers deduplicated."""
+        second = dict(timeline, carrier_usdot=2)
+
+        with patch.object(repo, 'transaction_query', return_value=[[{"count": 2}]] * 5) as mock_tx:
+            repo.bulk_write_timelines([timeline, second])
+
+        queries = mock_tx.call_args[0][0]
+        assert len(queries[0][1]["providers"]) == 1
+        assert [row["carrier_usdot"] for row in queries[2][1]["coverage"]] == [1, 2]
+
+    def test_empty_group_skips_transaction(self, repo):
+        """Test nothing is sent when there is nothing to write."""
+        with patch.object(repo, 'transaction_query') as mock_tx:
+            counts = repo.bulk_write_timelines([])
+
+        mock_tx.assert_not_called()
+        assert counts["statements"] == 0
+
+
+class TestInsuranceEnrichmentGrouping:
+    """Test suite for grouped insurance enrichment."""
+
+    @pytest.fixture
+    def enricher(self):
+        """Create an enricher with repositories mocked out."""
+        module = 'scripts.ingest.searchcarriers_insurance_enrichment'
+        with patch.dict('os.environ', {'SEARCH_CARRIERS_API_TOKEN': 'test_token_123'}), \
+             patch(f'{module}.CarrierRepository'), \
+             patch(f'{module}.InsurancePolicyRepository'), \
+             patch(f'{module}.InsuranceProviderRepository'), \
+             patch(f'{module}.SafetySnapshotRepository'), \
+             patch(f'{module}.CrashRepository'), \
+             patch(f'{module}.InspectionRepository'):
+            from scripts.ingest.searchcarriers_insurance_enrichment import SearchCarriersInsuranceEnrichment
+            enricher = SearchCarriersInsuranceEnrichment()
+        enricher.freshness = FreshnessProbe(Mock(get=Mock(return_value=None)))
+        enricher.policy_repo.get_existing_policy_ids.return_value = set()
+        return enricher
+
+    def test_group_written_in_one_call(self, enricher):
+        """Test several carriers are persisted with a single batched write."""
+        carriers = [{"usdot": 1, "carrier_name": "One"}, {"usdot": 2, "carrier_name": "Two"}]
+
+        with patch.object(enricher.client, 'get_carrier_insurance_history', side_effect=insurance_history):
+            results = enricher.enrich_carriers(carriers)
+
+        enricher.policy_repo.bulk_write_timelines.assert_called_once()
+        timelines = enricher.policy_repo.bulk_write_timelines.call_args[0][0]
+        assert [t["carrier_usdot"] for t in timelines] == [1, 2]
+        assert len(timelines[0]["events"]) == 1  # provider change
+        assert results[0]["policies_created"] == 2
+        assert results[1]["events_created"] == 1
+        enricher.policy_repo.create.assert_not_called()
+
+    def test_written_carriers_rescored(self, enricher):
+        """Test carriers whose timelines were written get their risk score refreshed."""
+        carriers = [{"usdot": 1, "carrier_name": "One"}, {"usdot": 2, "carrier_name": "Two"}]
+
+        with patch.object(enricher.client, 'get_carrier_insurance_history', side_effect=insurance_history):
+            enricher.enrich_carriers(carriers)
+
+        enricher.carrier_repo.refresh_insurance_fraud_risk_scores.assert_called_once_with([1, 2])
+
+    def test_existing_policies_not_recreated(self, enricher):
+        """Test stored policies are excluded from the write."""
+        enricher.policy_repo.get_existing_policy_ids.return_value = {"POL-1-ACMEINSURA-20220101"}
+
+        with patch.object(enricher.client, 'get_carrier_insurance_history', side_effect=insurance_history):
+            result = enricher.enrich_carrier({"usdot": 1, "carrier_name": "One"})
+
+        timeline = enricher.policy_repo.bulk_write_timelines.call_args[0][0][0]
+        assert [p.provider_name for p in timeline["policies"]] == ["Budget Mutual"]
+        assert result["policies_created"] == 1
+
+    def test_compliance_from_fetched_page(self, enricher):
+        """Test compliance is evaluated without fetching the history again."""
+        carriers = [{"usdot": 1, "carrier_name": "One"}, {"usdot": 2, "carrier_name": "Two"}]
+
+        with patch.object(enricher.client, 'get_carrier_insurance_history', side_effect=insurance_history) as fetch:
+            results = enricher.enrich_carriers(carriers)
+
+        assert fetch.call_count == 2
+        assert [v["type"] for v in results[0]["compliance_violations"]] == ["NO_ACTIVE_INSURANCE"]
+
+    def test_write_failure_marks_group(self, enricher):
+        """Test a failed transaction is reported on every carrier of the group."""
+        enricher.policy_repo.bulk_write_timelines.side_effect = Exception("Neo4j unavailable")
+        carriers = [{"usdot": 1, "carrier_name": "One"}, {"usdot": 2, "carrier_name": "Two"}]
+
+        with patch.object(enricher.client, 'get_carrier_insurance_history', side_effect=insurance_history):
+            results = enricher.enrich_carriers(carriers)
+
+        assert all(r["error"] == "Neo4j unavailable" for r in results)
+        enricher.freshness.watermark_repo.upsert.assert_not_called()
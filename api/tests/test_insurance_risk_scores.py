@@ -0,0 +1,121 @@
+"""
+Unit tests for materialized insurance fraud risk scores.
+
+Tests the incremental refresh and full rebuild in the carrier repository,
+the paginated risk score routes, and rescoring after ingest writes, with
+mocked Neo4j operations.
+"""
+
+import pytest
+from unittest.mock import Mock, patch, call
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import app
+from repositories.carrier_repository import CarrierRepository
+from services.ingest_orchestrator import IngestionOrchestrator
+
+
+client = TestClient(app)
+headers = {"X-API-Key": "test-api-key"}
+
+
+class TestCarrierRiskScores:
+    """Test suite for stored risk scores in CarrierRepository."""
+
+    @pytest.fixture
+    def repo(self):
+        """Create a CarrierRepository instance."""
+        return CarrierRepository()
+
+    def test_refresh_scores_only_given_carriers(self, repo):
+        """Test a refresh rescores the given carriers in one statement."""
+        with patch.object(repo, 'execute_query', return_value=[{"scored": 2}]) as execute:
+            scored = repo.refresh_insurance_fraud_risk_scores([1, 2])
+
+        assert scored == 2
+        execute.assert_called_once()
+        query, params = execute.call_args[0]
+        assert "UNWIND $usdots" in query
+        assert "SET c.insurance_risk_score" in query
+        assert params["usdots"] == [1, 2]
+
+    def test_refresh_without_carriers_skips_query(self, repo):
+        """Test nothing is sent to Neo4j when no carrier was touched."""
+        with patch.object(repo, 'execute_query') as execute:
+            assert repo.refresh_insurance_fraud_risk_scores([]) == 0
+
+        execute.assert_not_called()
+
+    def test_rebuild_walks_carriers_in_batches(self, repo):
+        """Test the rebuild pages through carriers by USDOT."""
+        pages = [[{"usdot": 1}, {"usdot": 2}], [{"usdot": 3}], []]
+
+        with patch.object(repo, 'execute_query', side_effect=pages) as execute, \
+             patch.object(repo, 'refresh_insurance_fraud_risk_scores', side_effect=[2, 1]) as refresh:
+            result = repo.rebuild_insurance_fraud_risk_scores(batch_size=2)
+
+        assert result == {"carriers_scored": 3, "batches": 2}
+        assert refresh.call_args_list == [call([1, 2]), call([3])]
+        assert [c[0][1]["after"] for c in execute.call_args_list] == [-1, 2, 3]
+
+    def test_read_is_paginated(self, repo):
+        """Test the listing reads stored scores with skip, limit and threshold."""
+        with patch.object(repo, 'execute_query', return_value=[{"risk_info": {"carrier_usdot": 1}}]) as execute:
+            scores = repo.get_insurance_fraud_risk_scores(skip=20, limit=10, min_score=50)
+
+        query, params = execute.call_args[0]
+        assert scores == [{"carrier_usdot": 1}]
+        assert "ORDER BY c.insurance_risk_score DESC" in query
+        assert "HAD_INSURANCE" not in query
+        assert params == {"min_score": 50, "skip": 20, "limit": 10}
+
+
+class TestRiskScoreRoutes:
+    """Test suite for the risk score routes."""
+
+    def test_risk_scores_paginated(self):
+        """Test query parameters are passed through to the stored read."""
+        with patch('routes.insurance_routes.carrier_repo') as repo:
+            repo.get_insurance_fraud_risk_scores.return_value = [{"carrier_usdot": 1, "risk_score": 75}]
+            response = client.get("/insurance/fraud/risk-scores?skip=100&limit=50&min_score=25", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json()[0]["risk_score"] == 75
+        repo.get_insurance_fraud_risk_scores.assert_called_once_with(100, 50, 25)
+
+    def test_rebuild(self):
+        """Test the rebuild endpoint rescores every carrier."""
+        with patch('routes.insurance_routes.carrier_repo') as repo:
+            repo.rebuild_insurance_fraud_risk_scores.return_value = {"carriers_scored": 3, "batches": 1}
+            response = client.post("/insurance/fraud/risk-scores/rebuild", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json()["carriers_scored"] == 3
+
+
+class TestIngestRescoring:
+    """Test suite for rescoring carriers after ingest."""
+
+    def test_ingested_carriers_rescored(self):
+        """Test every ingested carrier is rescored."""
+        orchestrator = IngestionOrchestrator()
+        orchestrator.carrier_repo = Mock()
+
+        orchestrator.refresh_risk_scores([{"usdot": 1}, {"usdot": 2}])
+
+        orchestrator.carrier_repo.refresh_insurance_fraud_risk_scores.assert_called_once_with([1, 2])
+
+    def test_refresh_failure_recorded(self):
+        """Test a failed rescore is reported without failing the ingest."""
+        orchestrator = IngestionOrchestrator()
+        orchestrator.carrier_repo = Mock()
+        orchestrator.carrier_repo.refresh_insurance_fraud_risk_scores.side_effect = Exception("Neo4j unavailable")
+
+        orchestrator.refresh_risk_scores([{"usdot": 1}])
+
+        assert "Neo4j unavailable" in orchestrator.stats["errors"][0]
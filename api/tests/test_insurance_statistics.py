@@ -0,0 +1,136 @@
+"""
+Unit tests for the cached insurance statistics summary.
+
+Tests snapshot computation, serving from memory, single-flight fresh
+recomputation and the summary route, with a mocked carrier repository.
+"""
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import app
+from services.insurance_statistics import InsuranceStatisticsCache
+
+
+client = TestClient(app)
+headers = {"X-API-Key": "test-api-key"}
+
+
+@pytest.fixture
+def carrier_repo():
+    """Create a carrier repository mock with whole-graph query results."""
+    repo = Mock()
+    repo.detect_insurance_gaps.return_value = [{"gap_days": 40}, {"gap_days": 60}]
+    repo.detect_insurance_shopping_patterns.return_value = [{"carrier_usdot": 1}]
+    repo.find_underinsured_operations.return_value = []
+    repo.get_statistics.return_value = {"total_carriers": 2500}
+    repo.count_insurance_fraud_risk_scores.return_value = 7
+    repo.get_insurance_fraud_risk_scores.return_value = [{"carrier_usdot": 1, "risk_score": 100}]
+    return repo
+
+
+class TestInsuranceStatisticsCache:
+    """Test suite for InsuranceStatisticsCache."""
+
+    def test_compute(self, carrier_repo):
+        """Test the snapshot counts every carrier and reads stored risk scores."""
+        snapshot = InsuranceStatisticsCache(carrier_repo).compute()
+
+        assert snapshot["total_carriers"] == 2500
+        assert snapshot["carriers_with_gaps"] == 2
+        assert snapshot["average_gap_days"] == 50
+        assert snapshot["high_risk_carriers"] == 7
+        assert snapshot["top_risks"][0]["risk_score"] == 100
+        assert snapshot["computed_at"]
+        carrier_repo.get_all.assert_not_called()
+        carrier_repo.count_insurance_fraud_risk_scores.assert_called_once_with(min_score=51)
+
+    @pytest.mark.asyncio
+    async def test_served_from_memory(self, carrier_repo):
+        """Test only the first read computes; later reads return the snapshot."""
+        cache = InsuranceStatisticsCache(carrier_repo)
+
+        first = await cache.get()
+        second = await cache.get()
+
+        assert second is first
+        assert carrier_repo.detect_insurance_gaps.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_fresh_requests_are_single_flight(self, carrier_repo):
+        """Test concurrent fresh reads share one recomputation."""
+        release = threading.Event()
+
+        def slow_gaps(min_gap_days):
+            release.wait(5)
+            return []
+
+        carrier_repo.detect_insurance_gaps.side_effect = slow_gaps
+        cache = InsuranceStatisticsCache(carrier_repo)
+
+        reads = [asyncio.create_task(cache.get(fresh=True)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        release.set()
+        snapshots = await asyncio.gather(*reads)
+
+        assert carrier_repo.detect_insurance_gaps.call_count == 1
+        assert all(snapshot is snapshots[0] for snapshot in snapshots)
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_snapshot(self, carrier_repo):
+        """Test a failed recomputation raises and leaves the last snapshot in place."""
+        cache = InsuranceStatisticsCache(carrier_repo)
+        snapshot = await cache.get()
+        carrier_repo.detect_insurance_gaps.side_effect = Exception("Neo4j unavailable")
+
+        with pytest.raises(Exception):
+            await cache.get(fresh=True)
+
+        assert cache.snapshot is snapshot
+        assert await cache.get() is snapshot
+
+    @pytest.mark.asyncio
+    async def test_scheduled_refresh(self, carrier_repo):
+        """Test a scheduled refresh runs in the background and is not duplicated."""
+        cache = InsuranceStatisticsCache(carrier_repo)
+
+        cache.schedule_refresh()
+        cache.schedule_refresh()
+        await cache.refresh()
+
+        assert carrier_repo.detect_insurance_gaps.call_count == 1
+        assert cache.snapshot["total_carriers"] == 2500
+
+
+class TestStatisticsSummaryRoute:
+    """Test suite for /insurance/statistics/summary."""
+
+    def test_summary_passes_fresh_flag(self):
+        """Test the route serves the cache and forwards ?fresh=true."""
+        cache = Mock()
+        cache.get = AsyncMock(return_value={"total_carriers": 3, "computed_at": "2025-01-01T00:00:00+00:00"})
+
+        with patch('routes.insurance_routes.get_insurance_statistics_cache', return_value=cache):
+            response = client.get("/insurance/statistics/summary?fresh=true", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json()["computed_at"] == "2025-01-01T00:00:00+00:00"
+        cache.get.assert_awaited_once_with(fresh=True)
+
+    def test_summary_unavailable(self):
+        """Test a failed first computation is reported as unavailable."""
+        cache = Mock()
+        cache.get = AsyncMock(side_effect=Exception("Neo4j unavailable"))
+
+        with patch('routes.insurance_routes.get_insurance_statistics_cache', return_value=cache):
+            response = client.get("/insurance/statistics/summary", headers=headers)
+
+        assert response.status_code == 503
@@ -0,0 +1,152 @@
+"""
+Unit tests for person name search.
+
+Tests name normalization, phonetic blocking keys, full-text query building,
+match scoring, and the ranked search on PersonRepository and its endpoint.
+"""
+
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import app
+from repositories.person_repository import PersonRepository
+from utils.name_matching import (
+    fulltext_query, metaphone, name_keys, name_similarity, normalize_name, soundex
+)
+
+
+class TestNameKeys:
+    """Test suite for name normalization and blocking keys."""
+
+    def test_normalize_name(self):
+        """Test accents, punctuation, case and suffixes are normalized away."""
+        assert normalize_name("José O'Brien Jr.") == "jose o brien"
+        assert normalize_name("SMITH,  JOHN") == "smith john"
+        assert normalize_name("") == ""
+
+    def test_soundex(self):
+        """Test standard Soundex codes, including the H/W rule."""
+        assert soundex("Robert") == "R163"
+        assert soundex("Rupert") == "R163"
+        assert soundex("Ashcraft") == "A261"
+        assert soundex("Tymczak") == "T522"
+        assert soundex("Lee") == "L000"
+
+    def test_metaphone(self):
+        """Test spelling variants share a Metaphone code."""
+        assert metaphone("Smith") == metaphone("Smyth") == "SM0"
+        assert metaphone("Knight") == metaphone("Night") == "NT"
+        assert metaphone("Catherine") == metaphone("Kathryn")
+        assert metaphone("Phillips") == metaphone("Filips")
+
+    def test_name_keys(self):
+        """Test the stored keys for a name."""
+        keys = name_keys("John Smith")
+        assert keys["name_normalized"] == "john smith"
+        assert keys["name_tokens"] == ["john", "smith"]
+        assert keys["name_soundex"] == ["J500", "S530"]
+        assert keys["name_metaphone"] == ["JN", "SM0"]
+        assert keys["name_phonetic"] == "J500 S530 JN SM0"
+
+    def test_fulltext_query(self):
+        """Test queries match tokens exactly, by prefix, within one edit or by sound."""
+        query = fulltext_query("Jon Smyth")
+        assert "name_normalized:smyth~1" in query
+        assert "name_phonetic:sm0" in query
+        assert "name_normalized:jon~1" not in query
+        assert fulltext_query("!!") == ""
+
+    def test_phonetic_codes_not_operators(self):
+        """Test codes that spell Lucene operators are lowercased."""
+        assert "name_phonetic:or" in fulltext_query("Orr")
+
+    def test_name_similarity(self):
+        """Test scoring ranks exact, reordered, initial and phonetic matches and rejects partial ones."""
+        assert name_similarity("Smith John", "John Smith") == 1.0
+        assert name_similarity("J Smith", "John Smith") == 0.95
+        assert 0.8 < name_similarity("Jon Smyth", "John Smith") < 0.95
+        assert name_similarity("Test Person", "Test Person 1") == 0.95
+        assert name_similarity("Test Person", "Test Officer 1") == 0.0
+
+
+class TestPersonSearch:
+    """Test suite for PersonRepository name search."""
+
+    @pytest.fixture
+    def repo(self):
+        """Create a repository without a database."""
+        return PersonRepository()
+
+    def test_search_reranks_candidates(self, repo):
+        """Test full-text candidates are re-ranked by name similarity and filtered."""
+        candidates = [
+            {"p": {"person_id": "P1", "full_name": "Jon Smyth"}, "score": 9.0},
+            {"p": {"person_id": "P2", "full_name": "John Smith"}, "score": 4.0},
+            {"p": {"person_id": "P3", "full_name": "John Smithers Walker"}, "score": 3.0},
+            {"p": {"person_id": "P4", "full_name": "Mary Smith"}, "score": 2.0},
+        ]
+        with patch.object(repo, 'execute_query', return_value=candidates) as execute_query:
+            results = repo.search_by_name("John Smith", limit=3)
+
+        assert [p["person_id"] for p in results] == ["P2", "P3", "P1"]
+        assert results[0]["match_score"] == 1.0
+        params = execute_query.call_args[0][1]
+        assert params["index"] == "person_name_fulltext"
+        assert params["candidates"] == 50
+
+    def test_find_by_name_delegates_to_search(self, repo):
+        """Test the name lookup is the ranked search with its default limit."""
+        with patch.object(repo, 'search_by_name', return_value=[]) as search_by_name:
+            repo.find_by_name("Test Person")
+
+        search_by_name.assert_called_once_with("Test Person")
+
+    def test_update_refreshes_keys(self, repo):
+        """Test renaming a person rewrites its name keys."""
+        with patch.object(repo, 'execute_query', return_value=[{"p": {}}]) as execute_query:
+            repo.update("P1", {"full_name": "Jane Doe"})
+
+        query, params = execute_query.call_args[0]
+        assert "p.name_phonetic = $name_phonetic" in query
+        assert params["name_tokens"] == ["jane", "doe"]
+
+    def test_refresh_name_keys(self, repo):
+        """Test backfilling pages through persons by ID."""
+        pages = [[{"person_id": "P1", "full_name": "John Smith"}], []]
+        with patch.object(repo, 'execute_query', side_effect=pages), \
+             patch.object(repo, 'execute_write') as execute_write:
+            result = repo.refresh_name_keys(batch_size=1)
+
+        assert result == {"persons_updated": 1, "batches": 1}
+        rows = execute_write.call_args[0][1]["rows"]
+        assert rows[0]["keys"]["name_metaphone"] == ["JN", "SM0"]
+
+
+class TestSearchEndpoint:
+    """Test suite for /persons/search/by-name."""
+
+    @pytest.fixture
+    def client(self):
+        """Create test client."""
+        return TestClient(app)
+
+    @pytest.fixture
+    def headers(self):
+        """API key headers."""
+        return {"X-API-Key": "test-api-key"}
+
+    def test_search_ranked(self, client, headers):
+        """Test the endpoint returns the repository's ranked matches."""
+        with patch('routes.person_routes.person_repo') as person_repo:
+            person_repo.search_by_name.return_value = [{"person_id": "P2", "match_score": 1.0}]
+            response = client.get("/persons/search/by-name?name=John Smith&limit=5", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json() == [{"person_id": "P2", "match_score": 1.0}]
+        person_repo.search_by_name.assert_called_once_with("John Smith", 5)
@@ -0,0 +1,240 @@
+"""
+Unit tests for person entity resolution.
+
+Tests name scoring, blocking, merge and link decisions, the resolution run
+against a mocked repository, merge redirects and the resolution endpoints.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import app
+from models.person import Person
+from repositories.person_repository import PersonRepository
+from services.person_resolution import (
+    BLOCK_WINDOW, MAX_BLOCK_SIZE, blocking_keys, build_profile, candidate_pairs,
+    name_score, resolve_persons, resolve_profiles
+)
+from utils.name_matching import name_tokens
+
+
+def profile(person_id, full_name, **fields):
+    """Build a resolution profile."""
+    return build_profile({"person_id": person_id, "full_name": full_name, **fields})
+
+
+class TestNameScore:
+    """Test suite for name_score."""
+
+    @pytest.mark.parametrize("a,b", [
+        ("JOHN A SMITH", "John Smith"),
+        ("Smith, John", "John Smith"),
+    ])
+    def test_same_name(self, a, b):
+        """Test middle names and name order do not lower the score."""
+        assert name_score(name_tokens(a), name_tokens(b)) == 1.0
+
+    def test_initial_and_spelling(self):
+        """Test initials and surname spelling variants score high."""
+        assert name_score(name_tokens("J Smith"), name_tokens("John Smith")) == 0.95
+        assert name_score(name_tokens("John Smyth"), name_tokens("John Smith")) > 0.9
+
+    def test_different_given_names(self):
+        """Test given names that only sound alike stay apart."""
+        assert name_score(name_tokens("Jane Smith"), name_tokens("John Smith")) < 0.8
+
+    def test_middle_initial_conflict(self):
+        """Test different middle initials lower the score."""
+        assert name_score(name_tokens("John A Smith"), name_tokens("John B Smith")) == 0.7
+
+
+class TestBlocking:
+    """Test suite for blocking."""
+
+    def test_keys_cover_reversed_names_and_contacts(self):
+        """Test reversed names share a key and contact details become keys."""
+        a = blocking_keys(profile("P1", "John Smith", email=["JS@Example.com"], phone=["(555) 123-4567"]))
+        b = blocking_keys(profile("P2", "Smith John"))
+        assert a & b
+        assert "email:js@example.com" in a
+        assert "phone:5551234567" in a
+
+    def test_unrelated_names_not_compared(self):
+        """Test persons sharing no key produce no pairs."""
+        pairs, _ = candidate_pairs([profile("P1", "John Smith"), profile("P2", "Mary Jones")])
+        assert pairs == set()
+
+    def test_large_block_compared_within_window(self):
+        """Test comparisons in an oversized block grow linearly with its size."""
+        size = MAX_BLOCK_SIZE * 3
+        profiles = [profile(f"P{n:05d}", f"John Smith{n}") for n in range(size)]
+        profiles = [{**p, "tokens": ["john", "smith"]} for p in profiles]
+
+        pairs, blocks = candidate_pairs(profiles)
+
+        # Blocked under both name orders, which yield the same neighbours
+        assert blocks == 2
+        assert len(pairs) <= size * BLOCK_WINDOW
+
+
+class TestResolveProfiles:
+    """Test suite for resolve_profiles."""
+
+    def test_corroborated_duplicate_merged(self):
+        """Test a name variant sharing a carrier is merged into the better-connected person."""
+        result = resolve_profiles([
+            profile("P1", "JOHN A SMITH", carriers=[1]),
+            profile("P2", "John Smith", carriers=[1, 2]),
+        ])
+
+        assert result["merge_groups"] == [{
+            "survivor_id": "P2",
+            "merges": [{"person_id": "P1", "score": 0.9, "reasons": ["name:1.00", "shared_carriers"]}],
+        }]
+        assert result["links"] == []
+
+    def test_name_only_match_linked(self):
+        """Test a name match without shared evidence is only linked."""
+        result = resolve_profiles([profile("P1", "Smith, John"), profile("P2", "John Smith")])
+
+        assert result["merge_groups"] == []
+        assert [(link["person_id"], link["other_id"]) for link in result["links"]] == [("P1", "P2")]
+
+    def test_same_date_of_birth_corroborates(self):
+        """Test a matching date of birth counts as evidence towards a merge."""
+        result = resolve_profiles([
+            profile("P1", "Smith, John", date_of_birth="1970-01-01"),
+            profile("P2", "John Smith", date_of_birth="1970-01-01"),
+        ])
+
+        assert result["merge_groups"][0]["merges"][0]["reasons"] == ["name:1.00", "same_date_of_birth"]
+        assert result["merge_groups"][0]["merges"][0]["score"] == 0.9
+        assert result["links"] == []
+
+    def test_conflicting_dates_of_birth(self):
+        """Test persons with different dates of birth are neither merged nor linked."""
+        result = resolve_profiles([
+            profile("P1", "John Smith", carriers=[1], date_of_birth="1970-01-01"),
+            profile("P2", "John A Smith", carriers=[1], date_of_birth="1980-01-01"),
+        ])
+        assert result["merge_groups"] == []
+        assert result["links"] == []
+
+    def test_no_chaining_through_incompatible_persons(self):
+        """Test John A and John B Smith are not merged through a shared John Smith."""
+        result = resolve_profiles([
+            profile("P1", "John A Smith", carriers=[1]),
+            profile("P2", "John Smith", carriers=[1, 2]),
+            profile("P3", "John B Smith", carriers=[2]),
+        ])
+
+        merged = {m["person_id"] for group in result["merge_groups"] for m in group["merges"]}
+        assert len(merged) == 1
+        assert result["links"][0]["person_id"] == "P2"
+        assert result["links"][0]["other_id"] in {"P1", "P3"} - merged
+
+    def test_co_officers_not_merged(self):
+        """Test different people sharing a carrier stay apart."""
+        result = resolve_profiles([
+            profile("P1", "John Smith", carriers=[1]),
+            profile("P2", "Mary Smith", carriers=[1]),
+        ])
+        assert result["merge_groups"] == []
+        assert result["links"] == []
+
+
+class TestResolvePersons:
+    """Test suite for resolve_persons."""
+
+    @pytest.fixture
+    def repo(self):
+        """Create a mocked person repository with two duplicate persons."""
+        repo = Mock()
+        repo.get_resolution_profiles.side_effect = [
+            [{"person_id": "P1", "full_name": "JOHN A SMITH", "carriers": [7]},
+             {"person_id": "P2", "full_name": "John Smith", "carriers": [7, 8]},
+             {"person_id": "P3", "full_name": "Smith, John"}],
+            [],
+        ]
+        return repo
+
+    def test_dry_run_writes_nothing(self, repo):
+        """Test a dry run reports decisions without writing."""
+        result = resolve_persons(repo, dry_run=True)
+
+        assert result["persons"] == 3
+        assert result["persons_merged"] == 1
+        assert result["merge_groups_sample"][0]["survivor_id"] == "P2"
+        repo.merge_persons.assert_not_called()
+        repo.link_possible_duplicates.assert_not_called()
+
+    def test_run_merges_and_links(self, repo):
+        """Test merges and links are written and affected clusters updated."""
+        with patch('services.person_resolution.update_chameleon_clusters') as update_clusters:
+            result = resolve_persons(repo)
+
+        survivor_id, merges, run_id = repo.merge_persons.call_args[0]
+        assert survivor_id == "P2"
+        assert [m["person_id"] for m in merges] == ["P1"]
+        assert run_id == result["run_id"]
+        links = repo.link_possible_duplicates.call_args[0][0]
+        assert [(link["person_id"], link["other_id"]) for link in links] == [("P2", "P3")]
+        update_clusters.assert_called_once_with([7])
+        assert result["failed_merge_groups"] == 0
+
+
+class TestMergeRedirect:
+    """Test suite for lookups of merged persons."""
+
+    def test_find_or_create_follows_merge(self):
+        """Test a merged-away name resolves to the survivor instead of being recreated."""
+        repo = PersonRepository()
+        survivor = {"person_id": "P2", "full_name": "John Smith"}
+        with patch.object(repo, 'get_by_id', return_value=None), \
+             patch.object(repo, 'get_merge_survivor', return_value=survivor), \
+             patch.object(repo, 'update') as update, \
+             patch.object(repo, 'create') as create:
+            result = repo.find_or_create(Person(person_id="", full_name="JOHN A SMITH"))
+
+        assert result == survivor
+        update.assert_called_once()
+        assert update.call_args[0][0] == "P2"
+        create.assert_not_called()
+
+
+class TestResolutionRoutes:
+    """Test suite for the resolution endpoints."""
+
+    @pytest.fixture
+    def client(self):
+        """Create test client."""
+        return TestClient(app)
+
+    @pytest.fixture
+    def headers(self):
+        """API key headers."""
+        return {"X-API-Key": "test-api-key"}
+
+    def test_run_dry(self, client, headers):
+        """Test the run endpoint passes the dry-run flag."""
+        with patch('routes.person_routes.resolve_persons', return_value={"dry_run": True}) as resolve:
+            response = client.post("/persons/resolution/run?dry_run=true", headers=headers)
+
+        assert response.status_code == 200
+        assert resolve.call_args[0][1] is True
+
+    def test_merges(self, client, headers):
+        """Test the audit trail endpoint."""
+        with patch('routes.person_routes.person_repo') as person_repo:
+            person_repo.get_merge_audit.return_value = [{"merge_id": "r:P1"}]
+            response = client.get("/persons/resolution/merges?person_id=P2", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json() == [{"merge_id": "r:P1"}]
+        person_repo.get_merge_audit.assert_called_once_with("P2", 0, 100)
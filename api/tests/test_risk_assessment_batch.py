@@ -0,0 +1,139 @@
+"""
+Unit tests for batch carrier risk assessment.
+
+Tests the shared batch scorer, chunking, the per-family batch queries and
+the NDJSON batch endpoint.
+"""
+
+import json
+import pytest
+from unittest.mock import Mock, patch
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import app
+from repositories.crash_repository import CrashRepository
+from repositories.inspection_repository import InspectionRepository
+from repositories.safety_snapshot_repository import SafetySnapshotRepository
+from services.risk_assessment import assess_carriers, chunk_usdots, score_carriers
+
+
+class TestScoreCarriers:
+    """Test suite for score_carriers."""
+
+    def test_scores_each_carrier(self):
+        """Test every carrier is scored from its own data, missing families counting as zero."""
+        results = score_carriers(
+            [1, 2, 3],
+            {1: {"driver_oos_rate": 15.0, "vehicle_oos_rate": 50.0, "crash_indicator_alert": True}},
+            {1: {"fatal_crashes": 2, "injury_crashes": 5, "total_crashes": 10},
+             2: {"fatal_crashes": 0, "injury_crashes": 1, "total_crashes": 3}},
+            {1: {"avg_violations_per_inspection": 25.0}}
+        )
+
+        assert [row["usdot"] for row in results] == [1, 2, 3]
+        assert results[0]["risk_level"] == "CRITICAL"
+        assert results[0]["driver_oos_multiplier"] == 3.0
+        assert results[0]["vehicle_oos_multiplier"] == 2.5
+        assert results[0]["high_risk_indicators"] == [
+            "DRIVER_OOS_2X_NATIONAL", "VEHICLE_OOS_2X_NATIONAL", "SMS_ALERTS_ACTIVE",
+            "FATAL_CRASHES", "HIGH_INJURY_CRASHES", "HIGH_VIOLATION_FREQUENCY"
+        ]
+        assert results[1]["risk_level"] == "LOW"
+        assert results[1]["total_crashes"] == 3
+        assert results[2] == {
+            "usdot": 3, "risk_level": "LOW", "driver_oos_multiplier": 0.0,
+            "vehicle_oos_multiplier": 0.0, "fatal_crashes": 0, "injury_crashes": 0,
+            "total_crashes": 0, "violation_frequency": 0.0, "high_risk_indicators": []
+        }
+
+    @pytest.mark.parametrize("fatal,level", [(0, "LOW"), (1, "MODERATE"), (2, "HIGH"), (3, "CRITICAL")])
+    def test_levels(self, fatal, level):
+        """Test score thresholds map to risk levels."""
+        results = score_carriers([1], {}, {1: {"fatal_crashes": fatal}}, {})
+        assert results[0]["risk_level"] == level
+
+    def test_chunk_usdots(self):
+        """Test repeats are dropped and request order kept."""
+        assert chunk_usdots([5, 3, 5, 1, 3, 2], chunk_size=2) == [[5, 3], [1, 2]]
+        assert chunk_usdots([]) == []
+
+
+class TestBatchQueries:
+    """Test suite for the per-family batch queries."""
+
+    def test_assess_carriers_one_query_per_family(self):
+        """Test a chunk reads each family once for all its carriers."""
+        safety, crashes, inspections = Mock(), Mock(), Mock()
+        safety.find_latest_by_usdots.return_value = {}
+        crashes.calculate_crash_statistics_batch.return_value = {2: {"fatal_crashes": 1}}
+        inspections.calculate_violation_rates.return_value = {}
+
+        results = assess_carriers([1, 2], safety, crashes, inspections)
+
+        assert [row["risk_level"] for row in results] == ["LOW", "MODERATE"]
+        safety.find_latest_by_usdots.assert_called_once_with([1, 2])
+        crashes.calculate_crash_statistics_batch.assert_called_once_with([1, 2], months=24)
+        inspections.calculate_violation_rates.assert_called_once_with([1, 2], months=24)
+
+    def test_results_keyed_by_usdot(self):
+        """Test batch query rows are returned by USDOT."""
+        safety_repo = SafetySnapshotRepository()
+        with patch.object(safety_repo, 'execute_query',
+                          return_value=[{"usdot": 1, "s": {"driver_oos_rate": 4.0}}]) as execute_query:
+            assert safety_repo.find_latest_by_usdots([1, 2]) == {1: {"driver_oos_rate": 4.0}}
+        assert "UNWIND $usdots" in execute_query.call_args[0][0]
+
+        crash_repo = CrashRepository()
+        with patch.object(crash_repo, 'execute_query', return_value=[{"usdot": 1, "total_crashes": 3}]):
+            assert crash_repo.calculate_crash_statistics_batch([1]) == {1: {"total_crashes": 3}}
+
+        inspection_repo = InspectionRepository()
+        with patch.object(inspection_repo, 'execute_query', return_value=[{"usdot": 1, "total_inspections": 9}]):
+            assert inspection_repo.calculate_violation_rates([1]) == {1: {"total_inspections": 9}}
+
+
+class TestBatchEndpoint:
+    """Test suite for /carriers/risk-assessment/batch."""
+
+    @pytest.fixture
+    def client(self):
+        """Create test client."""
+        return TestClient(app)
+
+    @pytest.fixture
+    def headers(self):
+        """API key headers."""
+        return {"X-API-Key": "test-api-key"}
+
+    def test_streams_ndjson(self, client, headers):
+        """Test one line per distinct carrier, chunked, with a failed chunk reported inline."""
+        def assess(chunk, *repos):
+            if chunk == [3]:
+                raise RuntimeError("database unavailable")
+            return [{"usdot": usdot, "risk_level": "LOW"} for usdot in chunk]
+
+        with patch('routes.safety_routes.chunk_usdots', return_value=[[1, 2], [3]]) as chunk_usdots, \
+             patch('routes.safety_routes.assess_carriers', side_effect=assess):
+            response = client.post(
+                "/carriers/risk-assessment/batch", json={"usdots": [1, 2, 3]}, headers=headers
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == [
+            {"usdot": 1, "risk_level": "LOW"},
+            {"usdot": 2, "risk_level": "LOW"},
+            {"error": "database unavailable", "usdots": [3]},
+        ]
+        chunk_usdots.assert_called_once_with([1, 2, 3])
+
+    def test_empty_request_rejected(self, client, headers):
+        """Test a batch must name at least one carrier."""
+        response = client.post("/carriers/risk-assessment/batch", json={"usdots": []}, headers=headers)
+        assert response.status_code == 422
@@ -1,26 +1,40 @@
 """
 Unit tests for enhanced SearchCarriers enrichment service with safety data.
 
-Tests the enrichment orchestration with safety, crash, and inspection data options.
+Tests the enrichment orchestration with safety, crash, and inspection data
+options, run through the durable queue the worker process drains.
 """
 
 import pytest
 import asyncio
-from unittest.mock import Mock, patch, AsyncMock, MagicMock
-from datetime import datetime, timezone
+from unittest.mock import Mock, patch
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from services.enrichment_queue import EnrichmentQueue
 from services.searchcarriers_enrichment_service import (
-    enrich_carriers_async,
+    _enrich_carrier,
+    enqueue_enrichment,
     get_enrichment_status,
-    cancel_enrichment
+    process_queue_item
 )
 
 
+async def run_job(enricher, usdots, options=None):
+    """Queue carriers, drain the queue with the given enricher and return the job report."""
+    queue = EnrichmentQueue(":memory:", max_attempts=1, base_delay=0, max_delay=0)
+    with patch('services.searchcarriers_enrichment_service.get_enrichment_queue', return_value=queue):
+        job_id = enqueue_enrichment(usdots, options)
+        item = queue.claim()
+        while item is not None:
+            await process_queue_item(queue, enricher, item)
+            item = queue.claim()
+        return await get_enrichment_status(job_id)
+
+
 class TestSafetyEnrichmentService:
     """Test suite for enhanced enrichment service with safety data."""
     
@@ -29,13 +43,6 @@ class TestSafetyEnrichmentService:
         """Sample USDOT numbers for testing."""
         return [3487141, 3330908, 2440672]
     
-    @pytest.fixture
-    def mock_settings(self):
-        """Mock settings with API token."""
-        settings = Mock()
-        settings.search_carriers_api_token = "test_token_123"
-        return settings
-    
     @pytest.fixture
     def mock_enricher(self):
         """Create a mock enricher with all methods."""
@@ -76,7 +83,7 @@ class TestSafetyEnrichmentService:
         return enricher
     
     @pytest.mark.asyncio
-    async def test_enrich_with_all_options(self, sample_carrier_usdots, mock_settings, mock_enricher):
+    async def test_enrich_with_all_options(self, sample_carrier_usdots, mock_enricher):
         """Test enrichment with all data types enabled."""
         enrichment_options = {
             "safety_data": True,
@@ -85,37 +92,9 @@ class TestSafetyEnrichmentService:
             "insurance_data": True
         }
         
-        with patch('services.searchcarriers_enrichment_service.settings', mock_settings):
-            with patch('scripts.ingest.searchcarriers_insurance_enrichment.SearchCarriersInsuranceEnrichment', 
-                      return_value=mock_enricher):
-                with patch('asyncio.to_thread', new_callable=AsyncMock) as mock_to_thread:
-                    # Configure async mock to return enricher results
-                    mock_to_thread.side_effect = [
-                        # For carrier 1
-                        mock_enricher.enrich_carrier_by_usdot.return_value,
-                        mock_enricher.enrich_carrier_safety_data.return_value,
-                        mock_enricher.enrich_carrier_crash_data.return_value,
-                        mock_enricher.enrich_carrier_inspection_data.return_value,
-                        # For carrier 2
-                        mock_enricher.enrich_carrier_by_usdot.return_value,
-                        mock_enricher.enrich_carrier_safety_data.return_value,
-                        mock_enricher.enrich_carrier_crash_data.return_value,
-                        mock_enricher.enrich_carrier_inspection_data.return_value,
-                        # For carrier 3
-                        mock_enricher.enrich_carrier_by_usdot.return_value,
-                        mock_enricher.enrich_carrier_safety_data.return_value,
-                        mock_enricher.enrich_carrier_crash_data.return_value,
-                        mock_enricher.enrich_carrier_inspection_data.return_value
-                    ]
-                    
-                    result = await enrich_carriers_async(
-                        sample_carrier_usdots, 
-                        "test_job_123",
-                        enrichment_options
-                    )
+        result = await run_job(mock_enricher, sample_carrier_usdots, enrichment_options)
         
         # Verify results
-        assert result["job_id"] == "test_job_123"
         assert result["status"] == "completed"
         assert result["carriers_processed"] == 3
         assert result["policies_created"] == 9  # 3 carriers * 3 policies each
@@ -126,7 +105,7 @@ class TestSafetyEnrichmentService:
         assert result["violations_created"] == 75  # 3 carriers * 25 violations each
     
     @pytest.mark.asyncio
-    async def test_enrich_safety_only(self, sample_carrier_usdots, mock_settings, mock_enricher):
+    async def test_enrich_safety_only(self, mock_enricher):
         """Test enrichment with only safety data enabled."""
         enrichment_options = {
             "safety_data": True,
@@ -135,25 +114,16 @@ class TestSafetyEnrichmentService:
             "insurance_data": False
         }
         
-        with patch('services.searchcarriers_enrichment_service.settings', mock_settings):
-            with patch('scripts.ingest.searchcarriers_insurance_enrichment.SearchCarriersInsuranceEnrichment',
-                      return_value=mock_enricher):
-                with patch('asyncio.to_thread', new_callable=AsyncMock) as mock_to_thread:
-                    mock_to_thread.return_value = mock_enricher.enrich_carrier_safety_data.return_value
-                    
-                    result = await enrich_carriers_async(
-                        [3487141],  # Single carrier
-                        "test_job_456",
-                        enrichment_options
-                    )
+        result = await run_job(mock_enricher, [3487141], enrichment_options)
         
         assert result["safety_snapshots_created"] == 1
         assert result["policies_created"] == 0  # Insurance not enabled
         assert result["crashes_found"] == 0  # Crashes not enabled
         assert result["inspections_created"] == 0  # Inspections not enabled
+        mock_enricher.enrich_carrier_by_usdot.assert_not_called()
     
     @pytest.mark.asyncio
-    async def test_high_risk_carrier_identification(self, mock_settings, mock_enricher):
+    async def test_high_risk_carrier_identification(self, mock_enricher):
         """Test identification of high-risk carriers based on OOS rates."""
         enrichment_options = {
             "safety_data": True,
@@ -169,21 +139,7 @@ class TestSafetyEnrichmentService:
             {"snapshot_created": True, "driver_oos_rate": 5.0, "vehicle_oos_rate": 20.0}    # Normal
         ]
         
-        with patch('services.searchcarriers_enrichment_service.settings', mock_settings):
-            with patch('scripts.ingest.searchcarriers_insurance_enrichment.SearchCarriersInsuranceEnrichment',
-                      return_value=mock_enricher):
-                with patch('asyncio.to_thread', new_callable=AsyncMock) as mock_to_thread:
-                    mock_to_thread.side_effect = iter([
-                        {"snapshot_created": True, "driver_oos_rate": 15.0, "vehicle_oos_rate": 30.0},  # High driver OOS
-                        {"snapshot_created": True, "driver_oos_rate": 8.0, "vehicle_oos_rate": 50.0},   # High vehicle OOS
-                        {"snapshot_created": True, "driver_oos_rate": 5.0, "vehicle_oos_rate": 20.0}    # Normal
-                    ])
-                    
-                    result = await enrich_carriers_async(
-                        [1111111, 2222222, 3333333],
-                        "test_job_789",
-                        enrichment_options
-                    )
+        result = await run_job(mock_enricher, [1111111, 2222222, 3333333], enrichment_options)
         
         assert len(result["high_risk_carriers"]) == 2
         assert 1111111 in result["high_risk_carriers"]  # High driver OOS
@@ -191,7 +147,7 @@ class TestSafetyEnrichmentService:
         assert 3333333 not in result["high_risk_carriers"]  # Normal rates
     
     @pytest.mark.asyncio
-    async def test_fatal_crash_high_risk(self, mock_settings, mock_enricher):
+    async def test_fatal_crash_high_risk(self, mock_enricher):
         """Test identification of high-risk carriers based on fatal crashes."""
         enrichment_options = {
             "crash_data": True,
@@ -207,21 +163,7 @@ class TestSafetyEnrichmentService:
             {"crash_count": 2, "fatal_crashes": 1, "injury_crashes": 0}   # Fatal crash
         ]
         
-        with patch('services.searchcarriers_enrichment_service.settings', mock_settings):
-            with patch('scripts.ingest.searchcarriers_insurance_enrichment.SearchCarriersInsuranceEnrichment',
-                      return_value=mock_enricher):
-                with patch('asyncio.to_thread', new_callable=AsyncMock) as mock_to_thread:
-                    mock_to_thread.side_effect = iter([
-                        {"crash_count": 5, "fatal_crashes": 2, "injury_crashes": 1},  # Fatal crashes
-                        {"crash_count": 3, "fatal_crashes": 0, "injury_crashes": 3},  # No fatal
-                        {"crash_count": 2, "fatal_crashes": 1, "injury_crashes": 0}   # Fatal crash
-                    ])
-                    
-                    result = await enrich_carriers_async(
-                        [4444444, 5555555, 6666666],
-                        "test_job_999",
-                        enrichment_options
-                    )
+        result = await run_job(mock_enricher, [4444444, 5555555, 6666666], enrichment_options)
         
         assert len(result["high_risk_carriers"]) == 2
         assert 4444444 in result["high_risk_carriers"]  # Fatal crashes
@@ -229,30 +171,69 @@ class TestSafetyEnrichmentService:
         assert 5555555 not in result["high_risk_carriers"]  # No fatal crashes
     
     @pytest.mark.asyncio
-    async def test_batch_processing_with_delays(self, sample_carrier_usdots, mock_settings, mock_enricher):
-        """Test batch processing with rate limiting delays."""
-        # Use 15 carriers to test batching (batch size is 10)
-        large_usdot_list = list(range(1000000, 1000015))
+    async def test_families_fetched_concurrently(self, mock_enricher):
+        """Test a single carrier's families are in flight at the same time."""
+        in_flight = 0
+        peak = 0
+        
+        async def slow_to_thread(func, *args):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return func(*args)
+        
+        options = {"insurance_data": True, "safety_data": True, "crash_data": True, "inspection_data": True}
+        with patch('services.searchcarriers_enrichment_service.asyncio.to_thread', side_effect=slow_to_thread):
+            result = await _enrich_carrier(mock_enricher, 3487141, options, False)
+        
+        assert peak == 4
+        assert result["insurance"]["policies_created"] == 3
+        assert result["crashes"]["crash_count"] == 5
+        assert result["inspections"]["inspection_count"] == 10
+    
+    @pytest.mark.asyncio
+    async def test_family_failure_keeps_other_families(self, mock_enricher):
+        """Test one failing family is reported without discarding the others."""
+        mock_enricher.enrich_carrier_crash_data.side_effect = Exception("Crash endpoint down")
+        
+        options = {"insurance_data": True, "safety_data": True, "crash_data": True, "inspection_data": True}
+        result = await run_job(mock_enricher, [3487141], options)
+        
+        assert result["policies_created"] == 3
+        assert result["inspections_created"] == 10
+        assert result["crashes_found"] == 0
+        assert len(result["errors"]) == 1
+        assert "Crash endpoint down" in result["errors"][0]["error"]
+    
+    @pytest.mark.asyncio
+    async def test_inspection_page_timings_reported(self, mock_enricher):
+        """Test per-page inspection write timings are summarized in the enrichment report."""
+        mock_enricher.enrich_carrier_inspection_data.return_value = {
+            "inspection_count": 150,
+            "violation_count": 40,
+            "oos_inspections": 2,
+            "page_timings": [
+                {"page": 1, "records": 100, "inspections_written": 100, "statements": 4, "write_ms": 35.0},
+                {"page": 2, "records": 50, "inspections_written": 50, "statements": 2, "write_ms": 12.5}
+            ]
+        }
         
-        with patch('services.searchcarriers_enrichment_service.settings', mock_settings):
-            with patch('scripts.ingest.searchcarriers_insurance_enrichment.SearchCarriersInsuranceEnrichment',
-                      return_value=mock_enricher):
-                with patch('asyncio.to_thread', new_callable=AsyncMock) as mock_to_thread:
-                    mock_to_thread.return_value = mock_enricher.enrich_carrier_by_usdot.return_value
-                    
-                    with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
-                        result = await enrich_carriers_async(
-                            large_usdot_list,
-                            "test_batch_job",
-                            {"insurance_data": True}
-                        )
+        options = {"insurance_data": False, "inspection_data": True}
+        result = await run_job(mock_enricher, [3487141], options)
         
-        # Verify batch delay was applied (15 carriers = 2 batches, 1 delay between)
-        mock_sleep.assert_called_once_with(2)
-        assert result["carriers_processed"] == 15
+        assert result["inspections_created"] == 150
+        write_stats = result["inspection_write_stats"]
+        assert {key: write_stats[key] for key in ("pages", "statements", "total_ms", "max_ms")} == {
+            "pages": 2, "statements": 6, "total_ms": 47.5, "max_ms": 35.0
+        }
+        assert write_stats["p50_ms"] == 25.0
+        assert write_stats["p95_ms"] == 35.0
+        assert "inspection_page_timings" not in result
     
     @pytest.mark.asyncio
-    async def test_error_handling_continues_processing(self, sample_carrier_usdots, mock_settings, mock_enricher):
+    async def test_error_handling_continues_processing(self, sample_carrier_usdots, mock_enricher):
         """Test that errors in one carrier don't stop processing of others."""
         # Configure one carrier to fail
         mock_enricher.enrich_carrier_by_usdot.side_effect = [
@@ -261,67 +242,38 @@ class TestSafetyEnrichmentService:
             {"policies_created": 2, "events_created": 1, "gaps_found": 0}
         ]
         
-        with patch('services.searchcarriers_enrichment_service.settings', mock_settings):
-            with patch('scripts.ingest.searchcarriers_insurance_enrichment.SearchCarriersInsuranceEnrichment',
-                      return_value=mock_enricher):
-                with patch('asyncio.to_thread', new_callable=AsyncMock) as mock_to_thread:
-                    mock_to_thread.side_effect = mock_enricher.enrich_carrier_by_usdot.side_effect
-                    
-                    result = await enrich_carriers_async(
-                        sample_carrier_usdots,
-                        "test_error_job",
-                        {"insurance_data": True}
-                    )
+        result = await run_job(mock_enricher, sample_carrier_usdots, {"insurance_data": True})
         
         assert result["carriers_processed"] == 3  # All carriers counted
+        assert result["policies_created"] == 5
         assert len(result["errors"]) == 1  # One error recorded
         assert result["errors"][0]["usdot"] == sample_carrier_usdots[1]
         assert "API Error" in result["errors"][0]["error"]
         assert result["status"] == "completed_with_errors"
     
     @pytest.mark.asyncio
-    async def test_no_api_token_skips_enrichment(self, sample_carrier_usdots):
-        """Test that missing API token skips enrichment gracefully."""
-        mock_settings = Mock()
-        mock_settings.search_carriers_api_token = None  # No token
-        
-        with patch('services.searchcarriers_enrichment_service.settings', mock_settings):
-            result = await enrich_carriers_async(
-                sample_carrier_usdots,
-                "test_no_token_job",
-                {}
-            )
+    async def test_default_options_when_none_provided(self, mock_enricher):
+        """Test that every family is enriched when no options are provided."""
+        result = await run_job(mock_enricher, [3487141], None)
         
-        assert result["status"] == "skipped"
-        assert result["error"] == "API token not configured"
-        assert result["carriers_processed"] == 0
+        assert result["carriers_processed"] == 1
+        mock_enricher.enrich_carrier_by_usdot.assert_called_once()
+        mock_enricher.enrich_carrier_safety_data.assert_called_once()
+        mock_enricher.enrich_carrier_crash_data.assert_called_once()
+        mock_enricher.enrich_carrier_inspection_data.assert_called_once()
     
     @pytest.mark.asyncio
-    async def test_default_options_when_none_provided(self, mock_settings, mock_enricher):
-        """Test that default options are used when none provided."""
-        with patch('services.searchcarriers_enrichment_service.settings', mock_settings):
-            with patch('scripts.ingest.searchcarriers_insurance_enrichment.SearchCarriersInsuranceEnrichment',
-                      return_value=mock_enricher):
-                with patch('asyncio.to_thread', new_callable=AsyncMock) as mock_to_thread:
-                    # All methods should be called with default options
-                    mock_to_thread.side_effect = [
-                        mock_enricher.enrich_carrier_by_usdot.return_value,
-                        mock_enricher.enrich_carrier_safety_data.return_value,
-                        mock_enricher.enrich_carrier_crash_data.return_value,
-                        mock_enricher.enrich_carrier_inspection_data.return_value
-                    ]
-                    
-                    result = await enrich_carriers_async(
-                        [3487141],
-                        "test_default_job",
-                        None  # No options provided
-                    )
+    async def test_omitted_families_take_defaults(self, mock_enricher):
+        """Test families left out of the options fall back to the defaults."""
+        await run_job(mock_enricher, [3487141], {"safety_data": False})
         
-        # All enrichment types should have been attempted
-        assert mock_to_thread.call_count == 4  # All 4 enrichment types
+        mock_enricher.enrich_carrier_by_usdot.assert_called_once()
+        mock_enricher.enrich_carrier_safety_data.assert_not_called()
+        mock_enricher.enrich_carrier_crash_data.assert_called_once()
+        mock_enricher.enrich_carrier_inspection_data.assert_called_once()
     
     @pytest.mark.asyncio
-    async def test_enrichment_statistics_accumulation(self, mock_settings, mock_enricher):
+    async def test_enrichment_statistics_accumulation(self, mock_enricher):
         """Test that statistics are correctly accumulated across carriers."""
         mock_enricher.enrich_carrier_inspection_data.side_effect = [
             {"inspection_count": 10, "violation_count": 25},
@@ -329,26 +281,16 @@ class TestSafetyEnrichmentService:
             {"inspection_count": 5, "violation_count": 10}
         ]
         
-        with patch('services.searchcarriers_enrichment_service.settings', mock_settings):
-            with patch('scripts.ingest.searchcarriers_insurance_enrichment.SearchCarriersInsuranceEnrichment',
-                      return_value=mock_enricher):
-                with patch('asyncio.to_thread', new_callable=AsyncMock) as mock_to_thread:
-                    mock_to_thread.side_effect = iter([
-                        {"inspection_count": 10, "violation_count": 25},
-                        {"inspection_count": 15, "violation_count": 40},
-                        {"inspection_count": 5, "violation_count": 10}
-                    ])
-                    
-                    result = await enrich_carriers_async(
-                        [7777777, 8888888, 9999999],
-                        "test_stats_job",
-                        {
-                            "inspection_data": True,
-                            "insurance_data": False,
-                            "safety_data": False,
-                            "crash_data": False
-                        }
-                    )
+        result = await run_job(
+            mock_enricher,
+            [7777777, 8888888, 9999999],
+            {
+                "inspection_data": True,
+                "insurance_data": False,
+                "safety_data": False,
+                "crash_data": False
+            }
+        )
         
         assert result["inspections_created"] == 30  # 10 + 15 + 5
-        assert result["violations_created"] == 75  # 25 + 40 + 10
\ No newline at end of file
+        assert result["violations_created"] == 75  # 25 + 40 + 10
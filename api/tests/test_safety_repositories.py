@@ -17,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from models.safety_snapshot import SafetySnapshot
 from models.inspection import Inspection
 from models.crash import Crash
+from models.violation import Violation
 from repositories.safety_snapshot_repository import SafetySnapshotRepository
 from repositories.inspection_repository import InspectionRepository
 from repositories.crash_repository import CrashRepository
@@ -214,6 +215,52 @@ class TestInspectionRepository:
             assert "MERGE (i)-[r:FOUND]->(v)" in call_args[0][0]
             assert call_args[0][1]["violation_ids"] == ["V001", "V002", "V003"]
     
+    def test_bulk_write_page(self, repo, sample_inspection):
+        """Test a page is written with UNWIND statements in one transaction."""
+        violation = Violation(
+            violation_id="V001",
+            inspection_id="INS2023001",
+            code="393.9",
+            violation_date=date(2023, 10, 15)
+        )
+        results = [[{"count": 1}], [{"count": 1}], [{"count": 1}], [{"count": 1}]]
+        
+        with patch.object(repo, 'transaction_query', return_value=results) as mock_tx:
+            written = repo.bulk_write_page(3487141, [sample_inspection], [violation])
+            
+            assert written == {"inspections": 1, "underwent": 1, "violations": 1, "found": 1, "statements": 4}
+            
+            queries = mock_tx.call_args[0][0]
+            assert len(queries) == 4
+            assert all("UNWIND" in query for query, _ in queries)
+            assert queries[0][1]["inspections"][0]["inspection_date"] == "2023-10-15"
+            assert queries[3][1]["links"] == [{"inspection_id": "INS2023001", "violation_id": "V001"}]
+    
+    def test_bulk_write_page_without_violations(self, repo, sample_inspection):
+        """Test violation statements are skipped when a page has none."""
+        with patch.object(repo, 'transaction_query', return_value=[[{"count": 1}], [{"count": 1}]]) as mock_tx:
+            written = repo.bulk_write_page(3487141, [sample_inspection], [])
+            
+            assert written["statements"] == 2
+            assert written["violations"] == 0
+            assert len(mock_tx.call_args[0][0]) == 2
+    
+    def test_bulk_write_pages_coalesces_carriers(self, repo, sample_inspection):
+        """Test pages of several carriers share one transaction and link to their own carrier."""
+        other = sample_inspection.model_copy(update={"inspection_id": "INS2023002", "usdot": 42})
+        
+        with patch.object(repo, 'transaction_query', return_value=[[{"count": 2}], [{"count": 2}]]) as mock_tx:
+            written = repo.bulk_write_pages([(3487141, [sample_inspection], []), (42, [other], [])])
+            
+            assert written["inspections"] == 2
+            mock_tx.assert_called_once()
+            queries = mock_tx.call_args[0][0]
+            assert len(queries[0][1]["inspections"]) == 2
+            assert queries[1][1]["links"] == [
+                {"usdot": 3487141, "inspection_id": "INS2023001"},
+                {"usdot": 42, "inspection_id": "INS2023002"}
+            ]
+    
     def test_find_oos_inspections(self, repo):
         """Test finding out-of-service inspections."""
         expected_result = [
@@ -299,6 +346,17 @@ class TestCrashRepository:
             citation_issued=True
         )
     
+    def test_bulk_write(self, repo, sample_crash):
+        """Test crashes are merged and linked with two UNWIND statements in one transaction."""
+        with patch.object(repo, 'transaction_query', return_value=[[{"count": 1}], [{"count": 1}]]) as mock_tx:
+            written = repo.bulk_write([sample_crash])
+            
+            assert written == {"crashes": 1, "involved_in": 1, "statements": 2}
+            queries = mock_tx.call_args[0][0]
+            assert "MERGE (cr:Crash {report_number: row.report_number})" in queries[0][0]
+            assert queries[0][1]["crashes"][0]["crash_date"] == "2023-10-15T14:30:00"
+            assert queries[1][1]["links"] == [{"usdot": 3487141, "report_number": "CR2023001"}]
+    
     def test_create_crash(self, repo, sample_crash):
         """Test creating a new crash record."""
         expected_result = [{"cr": {
@@ -346,22 +404,19 @@ class TestCrashRepository:
             assert result["fatal_crashes"] == 2
             assert result["preventable_rate"] == 33.33
     
-    def test_find_crash_clusters(self, repo):
-        """Test finding crash clusters within time windows."""
-        expected_result = [
-            {
-                "cluster_start": "2023-07-01",
-                "crash_reports": ["CR001", "CR002", "CR003"],
-                "cluster_size": 3
-            }
+    def test_get_crash_timeline(self, repo):
+        """Test a carrier's crash rows are returned in date order for clustering."""
+        crashes = [
+            {"report_number": "CR001", "crash_date": "2023-07-01", "fatalities": 0, "injuries": 1},
+            {"report_number": "CR002", "crash_date": "2023-07-10", "fatalities": 1, "injuries": 0}
         ]
         
-        with patch.object(repo, 'execute_query', return_value=expected_result):
-            result = repo.find_crash_clusters(3487141, days_window=30)
+        with patch.object(repo, 'execute_query', return_value=crashes) as mock_query:
+            result = repo.get_crash_timeline(3487141)
             
-            assert len(result) == 1
-            assert result[0]["cluster_size"] == 3
-            assert len(result[0]["crash_reports"]) == 3
+            assert result == crashes
+            assert "ORDER BY cr.crash_date" in mock_query.call_args[0][0]
+            assert mock_query.call_args[0][1] == {"usdot": 3487141}
     
     def test_find_high_risk_carriers_by_crashes(self, repo):
         """Test finding high-risk carriers based on crash history."""
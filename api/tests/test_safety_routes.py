@@ -131,6 +131,34 @@ class TestSafetyRoutes:
         assert response.status_code == 404
         assert "No safety profile found" in response.json()["detail"]
     
+    def test_safety_profile_revalidate_reports_freshness(self, mock_safety_repo, sample_safety_snapshot):
+        """Test revalidate mode serves the snapshot with its freshness."""
+        mock_safety_repo.find_latest_by_usdot.return_value = sample_safety_snapshot
+        freshness = {"data_as_of": "2026-01-01T00:00:00+00:00", "stale": True,
+                     "refresh_pending": True, "refresh_job_id": "job-1"}
+        
+        with patch('routes.safety_routes.safety_repo', mock_safety_repo), \
+             patch('routes.safety_routes.revalidate_carrier', return_value=freshness) as mock_revalidate:
+            response = client.get("/carriers/3487141/safety-profile?revalidate=true", headers=headers)
+        
+        assert response.status_code == 200
+        assert response.json()["snapshot"]["usdot"] == 3487141
+        assert response.json()["freshness"]["refresh_pending"] is True
+        mock_revalidate.assert_called_once_with(3487141, ["safety"])
+    
+    def test_safety_profile_revalidate_missing_data(self, mock_safety_repo):
+        """Test revalidate mode answers 202 instead of 404 while the profile is fetched."""
+        mock_safety_repo.find_latest_by_usdot.return_value = None
+        freshness = {"data_as_of": None, "stale": True, "refresh_pending": True, "refresh_job_id": "job-1"}
+        
+        with patch('routes.safety_routes.safety_repo', mock_safety_repo), \
+             patch('routes.safety_routes.revalidate_carrier', return_value=freshness):
+            response = client.get("/carriers/9999999/safety-profile?revalidate=true", headers=headers)
+        
+        assert response.status_code == 202
+        assert response.json()["snapshot"] is None
+        assert response.json()["freshness"]["refresh_job_id"] == "job-1"
+    
     def test_get_carrier_crashes_with_statistics(self, mock_crash_repo, sample_crashes):
         """Test crash endpoint returns crashes and statistics."""
         mock_crash_repo.find_by_usdot.return_value = sample_crashes
@@ -360,6 +388,25 @@ class TestSafetyRoutes:
         assert data["driver_oos_multiplier"] == 0.0
         assert data["vehicle_oos_multiplier"] == 0.0
         assert data["risk_level"] == "LOW"
+        assert data["freshness"] is None
+    
+    def test_risk_assessment_revalidate(self, mock_safety_repo, mock_crash_repo, mock_inspection_repo):
+        """Test revalidate mode checks every family the assessment is built from."""
+        mock_safety_repo.find_latest_by_usdot.return_value = None
+        mock_crash_repo.calculate_crash_statistics.return_value = {}
+        mock_inspection_repo.calculate_violation_rate.return_value = {}
+        freshness = {"data_as_of": "2026-10-01T00:00:00+00:00", "stale": False,
+                     "refresh_pending": False, "refresh_job_id": None}
+        
+        with patch('routes.safety_routes.safety_repo', mock_safety_repo), \
+             patch('routes.safety_routes.crash_repo', mock_crash_repo), \
+             patch('routes.safety_routes.inspection_repo', mock_inspection_repo), \
+             patch('routes.safety_routes.revalidate_carrier', return_value=freshness) as mock_revalidate:
+            response = client.get("/carriers/3487141/risk-assessment?revalidate=true", headers=headers)
+        
+        assert response.status_code == 200
+        assert response.json()["freshness"]["stale"] is False
+        mock_revalidate.assert_called_once_with(3487141, ["safety", "crashes", "inspections"])
     
     def test_pagination_parameters(self, mock_inspection_repo):
         """Test that limit parameter is properly passed to repositories."""
@@ -324,4 +324,202 @@ class TestSearchCarriersClientSafety:
                 result = client.get_safety_summary(3487141)
                 
                 assert result["data"]["dot_number"] == 3487141
-                assert result["data"]["fetched_at"] == "2023-11-01T12:00:00"
\ No newline at end of file
+                assert result["data"]["fetched_at"] == "2023-11-01T12:00:00"
+
+class TestSearchCarriersClientPagination:
+    """Test suite for concurrent page iteration."""
+    
+    @pytest.fixture
+    def client(self):
+        """Create a SearchCarriers client with mocked API key."""
+        with patch.dict('os.environ', {'SEARCH_CARRIERS_API_TOKEN': 'test_token_123'}):
+            return SearchCarriersClient()
+    
+    @staticmethod
+    def _page(page, last_page=None, size=2):
+        """Build a fake paginated response."""
+        response = {"data": [{"page": page, "row": i} for i in range(size)]}
+        if last_page is not None:
+            response["meta"] = {"current_page": page, "last_page": last_page, "per_page": size}
+        return response
+    
+    def test_iter_pages_uses_meta_and_yields_in_order(self, client):
+        """Test all pages listed in meta are fetched and yielded in order."""
+        fetch_page = Mock(side_effect=lambda dot, page, per_page: self._page(page, last_page=4))
+        
+        pages = list(client.iter_pages(fetch_page, 123, per_page=2))
+        
+        assert [p["data"][0]["page"] for p in pages] == [1, 2, 3, 4]
+        assert fetch_page.call_count == 4
+        fetch_page.assert_any_call(123, page=4, per_page=2)
+    
+    def test_iter_pages_single_page(self, client):
+        """Test a single page response is yielded without further requests."""
+        fetch_page = Mock(return_value=self._page(1, last_page=1))
+        
+        pages = list(client.iter_pages(fetch_page, 123, per_page=2))
+        
+        assert len(pages) == 1
+        fetch_page.assert_called_once_with(123, page=1, per_page=2)
+    
+    def test_iter_pages_without_meta_walks_until_short_page(self, client):
+        """Test sequential fallback when the response has no pagination metadata."""
+        responses = [self._page(1), self._page(2), self._page(3, size=1)]
+        fetch_page = Mock(side_effect=responses)
+        
+        pages = list(client.iter_pages(fetch_page, 123, per_page=2))
+        
+        assert len(pages) == 3
+        assert fetch_page.call_count == 3
+    
+    def test_iter_pages_error_on_first_page(self, client):
+        """Test an error response on page one is yielded as-is."""
+        fetch_page = Mock(return_value={"error": "Not found", "data": []})
+        
+        pages = list(client.iter_pages(fetch_page, 123))
+        
+        assert pages == [{"error": "Not found", "data": []}]
+        fetch_page.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_aiter_pages(self, client):
+        """Test the async iterator yields every page in order."""
+        fetch_page = Mock(side_effect=lambda dot, page, per_page: self._page(page, last_page=3))
+        
+        pages = [page async for page in client.aiter_pages(fetch_page, 123, per_page=2)]
+        
+        assert [p["data"][0]["page"] for p in pages] == [1, 2, 3]
+    
+    def test_rate_limit_reserves_spaced_slots(self, client):
+        """Test concurrent callers are spaced by the rate limit delay."""
+        from services.searchcarriers_client import RateLimiter
+        client.rate_limiter = RateLimiter(delay=1.0)
+        
+        with patch('services.searchcarriers_client.time') as mock_time:
+            mock_time.time.return_value = 100.0
+            client._rate_limit()
+            client._rate_limit()
+        
+        mock_time.sleep.assert_called_once_with(1.0)
+        assert client.rate_limiter.last_request_time == 101.0
+    
+    def test_rate_limiter_shared_across_clients(self, client):
+        """Test every client instance draws from the same rate budget."""
+        with patch.dict('os.environ', {'SEARCH_CARRIERS_API_TOKEN': 'test_token_123'}):
+            other = SearchCarriersClient()
+        
+        assert other.rate_limiter is client.rate_limiter
+    
+    def test_rate_split_across_processes(self):
+        """Test each process paces itself to its share of the vendor rate."""
+        from services.searchcarriers_client import process_request_delay
+        
+        assert process_request_delay(1.0, 1) == 1.0
+        assert process_request_delay(0.5, 4) == 2.0
+        assert process_request_delay(1.0, 0) == 1.0
+
+
+class TestSearchCarriersClientSingleFlight:
+    """Test suite for single-flight request coalescing."""
+    
+    @pytest.fixture
+    def client(self):
+        """Create a SearchCarriers client with reset request counters."""
+        with patch.dict('os.environ', {'SEARCH_CARRIERS_API_TOKEN': 'test_token_123'}):
+            client = SearchCarriersClient()
+        SearchCarriersClient.reset_request_stats()
+        return client
+    
+    def _run_concurrently(self, func, count):
+        """Call func from several threads and collect results."""
+        import threading
+        results, errors = [], []
+        
+        def call():
+            try:
+                results.append(func())
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        return results, errors
+    
+    def test_identical_requests_share_one_call(self, client):
+        """Test concurrent identical requests hit the API once."""
+        import time
+        
+        def slow_fetch(endpoint, params):
+            time.sleep(0.2)
+            return {"data": [{"id": 1}]}
+        
+        with patch.object(client, '_fetch', side_effect=slow_fetch) as mock_fetch:
+            results, errors = self._run_concurrently(
+                lambda: client._make_request("/v1/company/123/crashes", {"page": 1}), 5
+            )
+        
+        assert not errors
+        assert len(results) == 5
+        assert mock_fetch.call_count == 1
+        stats = SearchCarriersClient.get_request_stats()
+        assert stats["upstream_requests"] == 1
+        assert stats["coalesced_requests"] == 4
+        assert stats["in_flight"] == 0
+    
+    def test_callers_receive_independent_copies(self, client):
+        """Test mutating one caller's result does not affect another's."""
+        with patch.object(client, '_fetch', return_value={"data": [{"id": 1}]}):
+            first = client._make_request("/v1/company/123/crashes", {"page": 1})
+            first["data"][0]["id"] = 99
+            second = client._make_request("/v1/company/123/crashes", {"page": 1})
+        
+        assert second["data"][0]["id"] == 1
+    
+    def test_different_params_are_not_coalesced(self, client):
+        """Test requests with different params are sent separately."""
+        with patch.object(client, '_fetch', return_value={"data": []}) as mock_fetch:
+            client._make_request("/v1/company/123/crashes", {"page": 1})
+            client._make_request("/v1/company/123/crashes", {"page": 2})
+        
+        assert mock_fetch.call_count == 2
+        assert SearchCarriersClient.get_request_stats()["coalesced_requests"] == 0
+    
+    def test_compliance_check_coalesces_with_enrichment_fetch(self, client):
+        """Test a compliance check and an enrichment fetch of one carrier share a call."""
+        import time
+        
+        def slow_fetch(endpoint, params):
+            time.sleep(0.2)
+            return {"data": [{"filing_status": "ACTIVE", "coverage_amount": 1000000.0}]}
+        
+        calls = iter([
+            lambda: client.check_insurance_compliance(123),
+            lambda: client.get_carrier_insurance_history(123)
+        ])
+        with patch.object(client, '_fetch', side_effect=slow_fetch) as mock_fetch:
+            results, errors = self._run_concurrently(lambda: next(calls)(), 2)
+        
+        assert not errors
+        assert len(results) == 2
+        assert mock_fetch.call_count == 1
+        assert SearchCarriersClient.get_request_stats()["coalesced_requests"] == 1
+    
+    def test_errors_propagate_to_waiting_callers(self, client):
+        """Test an upstream failure is raised for every coalesced caller."""
+        import time
+        
+        def failing_fetch(endpoint, params):
+            time.sleep(0.2)
+            raise ConnectionError("upstream down")
+        
+        with patch.object(client, '_fetch', side_effect=failing_fetch) as mock_fetch:
+            results, errors = self._run_concurrently(
+                lambda: client._make_request("/v1/company/123/crashes", None), 3
+            )
+        
+        assert mock_fetch.call_count == 1
+        assert len(errors) == 3
+        assert all(isinstance(e, ConnectionError) for e in errors)
@@ -0,0 +1,87 @@
+"""
+Unit tests for the SearchCarriers payload normalizer.
+"""
+
+import pytest
+from datetime import datetime, date
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.searchcarriers_normalizer import PayloadNormalizer, to_date, to_datetime
+
+
+class TestPayloadNormalizer:
+    """Test suite for batch normalization."""
+
+    @pytest.fixture
+    def normalizer(self):
+        """Create a fresh normalizer with an empty format cache."""
+        return PayloadNormalizer()
+
+    def test_inspections_page(self, normalizer):
+        """Test API field names are mapped and typed in one pass."""
+        page = [
+            {"inspection_id": "1", "insp_date": "2025-08-25 00:00:00", "viol_total": "3",
+             "oos_total": "1", "driver_oos_total": "0", "vehicle_oos_total": "1", "hazmat_oos_total": "0"},
+            {"inspection_id": "2", "insp_date": "2025-07-01 00:00:00", "viol_total": "0", "oos_total": "0"},
+        ]
+
+        records = normalizer.normalize_page("inspections", page, 123)
+
+        assert records[0]["inspection_date"] == date(2025, 8, 25)
+        assert records[0]["violations_count"] == 3
+        assert records[0]["oos_violations_count"] == 1
+        assert records[0]["vehicle_oos"] is True
+        assert records[0]["driver_oos"] is False
+        assert records[0]["result"] == "OOS"
+        assert records[1]["result"] == "Clean"
+        assert records[0]["dot_number"] == 123
+        assert records[0]["fetched_at"] == records[1]["fetched_at"]
+
+    def test_format_inferred_once_per_field(self, normalizer):
+        """Test the parser is cached per endpoint and field."""
+        normalizer.normalize_page("insurances", [{"effective_date": "03/15/2024"}], 1)
+
+        assert ("insurances", "effective_date") in normalizer._parsers
+        assert ("insurances", "cancellation_date") not in normalizer._parsers
+
+        records = normalizer.normalize_page("insurances", [{"effective_date": "04/01/2024"}], 1)
+        assert records[0]["effective_date"] == date(2024, 4, 1)
+
+    def test_format_drift_reinfers(self, normalizer):
+        """Test a value in a different format than the cached one still parses."""
+        normalizer.normalize_page("insurances", [{"effective_date": "2024-03-15"}], 1)
+        records = normalizer.normalize_page("insurances", [{"effective_date": "03/20/2024"}], 1)
+
+        assert records[0]["effective_date"] == date(2024, 3, 20)
+
+    def test_crash_datetime_and_severity(self, normalizer):
+        """Test crash dates keep their time and severity is derived."""
+        records = normalizer.normalize_page(
+            "crashes", [{"crash_date": "2023-06-15T14:30:00", "fatalities": "1", "injuries": 0}], 1
+        )
+
+        assert records[0]["crash_date"] == datetime(2023, 6, 15, 14, 30)
+        assert records[0]["fatalities"] == 1
+        assert records[0]["severity_level"] == "FATAL"
+
+    def test_unparseable_date_becomes_none(self, normalizer):
+        """Test garbage dates are nulled rather than raising."""
+        records = normalizer.normalize_page("inspections", [{"inspection_date": "not a date"}], 1)
+        assert records[0]["inspection_date"] is None
+
+    def test_to_columns(self, normalizer):
+        """Test records pivot into column lists."""
+        columns = PayloadNormalizer.to_columns([{"a": 1, "b": 2}, {"a": 3}], ["a", "b"])
+        assert columns == {"a": [1, 3], "b": [2, None]}
+
+    def test_coercion_helpers(self):
+        """Test to_date and to_datetime accept typed and raw values."""
+        assert to_date(date(2024, 1, 2)) == date(2024, 1, 2)
+        assert to_date(datetime(2024, 1, 2, 5)) == date(2024, 1, 2)
+        assert to_date("2024-01-02 00:00:00") == date(2024, 1, 2)
+        assert to_date("") is None
+        assert to_datetime("2024-01-02") == datetime(2024, 1, 2)
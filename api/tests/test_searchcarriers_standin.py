@@ -0,0 +1,119 @@
+"""
+Unit tests for the local SearchCarriers stand-in server.
+
+Tests synthetic pagination, fixture replay and recording, and fault injection.
+"""
+
+import pytest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.searchcarriers_standin import StandinConfig, FixtureStore, create_app
+
+AUTH = {"Authorization": "Bearer test_token_123"}
+
+
+class TestSearchCarriersStandin:
+    """Test suite for the SearchCarriers stand-in."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a test client for a synthetic stand-in without faults."""
+        return TestClient(create_app(StandinConfig(seed=7)))
+
+    def _find_paginated_dot(self, client, family):
+        """Find a synthetic DOT number with more than one page of records."""
+        for dot in range(1000, 1200):
+            response = client.get(f"/v1/company/{dot}/{family}", params={"perPage": 10}, headers=AUTH)
+            if response.json()["meta"]["last_page"] > 1:
+                return dot
+        pytest.fail("No synthetic carrier with multiple pages")
+
+    def test_requires_bearer_token(self, client):
+        """Test requests without a bearer token are rejected."""
+        response = client.get("/v1/company/123/crashes")
+        assert response.status_code == 401
+
+    def test_paginated_envelope(self, client):
+        """Test list endpoints return the standard pagination envelope."""
+        dot = self._find_paginated_dot(client, "inspections")
+
+        first = client.get(f"/v1/company/{dot}/inspections", params={"page": 1, "perPage": 10}, headers=AUTH).json()
+        second = client.get(f"/v1/company/{dot}/inspections", params={"page": 2, "perPage": 10}, headers=AUTH).json()
+
+        assert len(first["data"]) == 10
+        assert first["meta"]["current_page"] == 1
+        assert first["meta"]["total"] > 10
+        assert first["links"]["next"] is not None
+        assert second["meta"]["current_page"] == 2
+        assert first["data"][0]["inspection_id"] != second["data"][0]["inspection_id"]
+
+    def test_synthetic_data_is_deterministic(self, client):
+        """Test the same DOT number always produces the same records."""
+        first = client.get("/v2/company/555/insurances", headers=AUTH).json()
+        second = client.get("/v2/company/555/insurances", headers=AUTH).json()
+        assert first == second
+
+    def test_page_size_is_capped(self):
+        """Test requested page sizes above max_per_page are reduced."""
+        client = TestClient(create_app(StandinConfig(max_per_page=5)))
+        dot = self._find_paginated_dot(client, "inspections")
+
+        result = client.get(f"/v1/company/{dot}/inspections", params={"perPage": 100}, headers=AUTH).json()
+
+        assert result["meta"]["per_page"] == 5
+        assert len(result["data"]) <= 5
+
+    def test_safety_summary_is_object(self, client):
+        """Test non-list endpoints return a data object."""
+        result = client.get("/v1/company/555/safety-summary", headers=AUTH).json()
+        assert "driver_oos_rate" in result["data"]
+
+    def test_rate_limit_headers_and_429(self):
+        """Test the per-minute limit sets headers and throttles excess requests."""
+        client = TestClient(create_app(StandinConfig(rate_limit_per_minute=2, retry_after_seconds=3)))
+
+        responses = [client.get("/v1/company/555/authorities", headers=AUTH) for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [200, 200, 429]
+        assert responses[0].headers["X-RateLimit-Limit"] == "2"
+        assert responses[1].headers["X-RateLimit-Remaining"] == "0"
+        assert responses[2].headers["Retry-After"] == "3"
+
+    def test_random_429_rate(self):
+        """Test a 429 rate of one throttles every request."""
+        client = TestClient(create_app(StandinConfig(rate_429=1.0)))
+        response = client.get("/v1/company/555/crashes", headers=AUTH)
+        assert response.status_code == 429
+
+    def test_replay_uses_recorded_fixtures(self, tmp_path):
+        """Test replay mode re-paginates recorded pages."""
+        store = FixtureStore(tmp_path)
+        store.record("/v1/company/42/crashes", {"data": [{"report_number": "A"}, {"report_number": "B"}]}, page=1)
+        store.record("/v1/company/42/crashes", {"data": [{"report_number": "C"}]}, page=2)
+        client = TestClient(create_app(StandinConfig(mode="replay", fixtures_dir=tmp_path)))
+
+        result = client.get("/v1/company/42/crashes", params={"perPage": 2, "page": 2}, headers=AUTH).json()
+
+        assert result["meta"]["total"] == 3
+        assert result["data"] == [{"report_number": "C"}]
+
+    def test_record_mode_captures_upstream(self, tmp_path):
+        """Test record mode proxies upstream and writes the fixture corpus."""
+        config = StandinConfig(mode="record", fixtures_dir=tmp_path, upstream_token="real_token")
+        client = TestClient(create_app(config))
+        upstream = {"data": {"driver_oos_rate": 4.2}}
+
+        with patch('scripts.searchcarriers_standin.requests.get') as mock_get:
+            mock_get.return_value.status_code = 200
+            mock_get.return_value.json.return_value = upstream
+            result = client.get("/v1/company/42/safety-summary", headers=AUTH).json()
+
+        assert result == upstream
+        assert FixtureStore(tmp_path).load("/v1/company/42/safety-summary") == {"driver_oos_rate": 4.2}
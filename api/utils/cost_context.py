@@ -0,0 +1,32 @@
+"""
+Cost Meter Context Utility Module for RICO.
+
+This module holds the context variable through which work in progress
+exposes its cost meter (services.enrichment_cost.CostMeter) to the layers
+that incur the costs, such as the Neo4j repositories and the SearchCarriers
+client, without those layers depending on the enrichment service.
+asyncio.to_thread copies the context, so the meter follows the work into
+worker threads.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+
+_current_meter: ContextVar[Optional[Any]] = ContextVar("enrichment_cost_meter", default=None)
+
+
+def current_meter() -> Optional[Any]:
+    """The meter of the work running in this context, if any."""
+    return _current_meter.get()
+
+
+@contextmanager
+def metering(meter: Any) -> Iterator[Any]:
+    """Record costs incurred inside the block into ``meter``."""
+    token = _current_meter.set(meter)
+    try:
+        yield meter
+    finally:
+        _current_meter.reset(token)
@@ -0,0 +1,61 @@
+"""
+Date Range Utility Module for RICO.
+
+This module provides pure functions for working with dated periods as
+ordinal days: converting the date values stored in Neo4j and returned by
+the API to day numbers, and merging periods into sorted, disjoint ranges.
+"""
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Open-ended periods run to the last representable day
+OPEN_END = date.max.toordinal()
+
+
+def to_day(value) -> Optional[int]:
+    """Ordinal day of an ISO string, date or Neo4j date; None if unset."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10]).toordinal()
+    if hasattr(value, "to_native"):
+        value = value.to_native()
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal()
+
+
+def merge_periods(periods: Iterable[Dict]) -> Tuple[List[int], List[int]]:
+    """Merge periods into sorted, disjoint day ranges.
+
+    Periods that overlap or touch (one ends the day before the next starts)
+    are joined; both ends are inclusive.
+
+    Args:
+        periods: Dicts with ``from_date`` and optional ``to_date``
+
+    Returns:
+        tuple: Start days and end days of the merged ranges, as ordinals
+    """
+    ranges = []
+    for period in periods:
+        start = to_day(period.get("from_date"))
+        if start is None:
+            continue
+        end = to_day(period.get("to_date"))
+        end = OPEN_END if end is None else end
+        if end >= start:
+            ranges.append((start, end))
+    ranges.sort()
+
+    starts: List[int] = []
+    ends: List[int] = []
+    for start, end in ranges:
+        if ends and start <= ends[-1] + 1:
+            ends[-1] = max(ends[-1], end)
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
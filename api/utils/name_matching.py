@@ -0,0 +1,302 @@
+"""
+Person Name Matching Utility Module for RICO.
+
+This module provides pure functions for normalizing person names, deriving
+the blocking keys stored on Person nodes (normalized tokens, Soundex and
+Metaphone codes), building full-text queries over those keys, and scoring
+how well a candidate name matches a search.
+"""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Dict, List
+
+
+# Titles and generational suffixes that do not identify a person
+IGNORED_TOKENS = {"mr", "mrs", "ms", "miss", "dr", "jr", "sr", "ii", "iii", "iv"}
+
+# Lowest similarity at which a query token counts as matching a name token
+MIN_TOKEN_SIMILARITY = 0.75
+
+# Score lost per name token beyond those in the query
+EXTRA_TOKEN_PENALTY = 0.05
+
+_VOWELS = set("AEIOU")
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("BFPV", "1"),
+    **dict.fromkeys("CGJKQSXZ", "2"),
+    **dict.fromkeys("DT", "3"),
+    "L": "4",
+    **dict.fromkeys("MN", "5"),
+    "R": "6",
+}
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a person name for matching.
+
+    Accents are stripped, letters lowercased, punctuation replaced by spaces
+    and titles or suffixes dropped:
+    - "José O'Brien Jr." -> "jose o brien"
+    - "SMITH,  JOHN" -> "smith john"
+
+    Args:
+        name: Name as entered
+
+    Returns:
+        Normalized name, empty if nothing identifying remains
+    """
+    if not name:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", name)
+    ascii_name = "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+    tokens = re.sub(r"[^a-z0-9]+", " ", ascii_name).split()
+    return " ".join(token for token in tokens if token not in IGNORED_TOKENS)
+
+
+def name_tokens(name: str) -> List[str]:
+    """
+    Split a name into normalized tokens.
+
+    Args:
+        name: Name as entered
+
+    Returns:
+        Normalized tokens in order
+    """
+    return normalize_name(name).split()
+
+
+def soundex(token: str) -> str:
+    """
+    American Soundex code of a word, e.g. "Robert" -> "R163".
+
+    Args:
+        token: Word to encode
+
+    Returns:
+        Four-character code, or empty string if the word has no letters
+    """
+    letters = [ch for ch in token.upper() if "A" <= ch <= "Z"]
+    if not letters:
+        return ""
+
+    code = letters[0]
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for ch in letters[1:]:
+        digit = _SOUNDEX_CODES.get(ch, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # H and W do not separate letters with the same code; vowels do
+        if ch not in "HW":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def metaphone(token: str) -> str:
+    """
+    Metaphone code of a word, e.g. "Smith" -> "SM0", "Knight" -> "NT".
+
+    Implements the original Metaphone rules; "0" stands for "th".
+
+    Args:
+        token: Word to encode
+
+    Returns:
+        Phonetic code, or empty string if the word has no letters
+    """
+    word = "".join(ch for ch in token.upper() if "A" <= ch <= "Z")
+    if not word:
+        return ""
+
+    # Silent or altered initial letters
+    if word[:2] in ("AE", "GN", "KN", "PN", "WR"):
+        word = word[1:]
+    elif word[0] == "X":
+        word = "S" + word[1:]
+    elif word[:2] == "WH":
+        word = "W" + word[2:]
+
+    def at(i: int) -> str:
+        return word[i] if 0 <= i < len(word) else ""
+
+    code = []
+    for i, ch in enumerate(word):
+        prev, nxt = at(i - 1), at(i + 1)
+        if ch == prev and ch != "C":
+            continue
+
+        if ch in _VOWELS:
+            if i == 0:
+                code.append(ch)
+        elif ch == "B":
+            if not (prev == "M" and i == len(word) - 1):
+                code.append("B")
+        elif ch == "C":
+            if nxt == "I" and at(i + 2) == "A":
+                code.append("X")
+            elif nxt == "H":
+                code.append("K" if prev == "S" else "X")
+            elif nxt in ("I", "E", "Y"):
+                if prev != "S":
+                    code.append("S")
+            else:
+                code.append("K")
+        elif ch == "D":
+            if nxt == "G" and at(i + 2) in ("E", "Y", "I"):
+                code.append("J")
+            else:
+                code.append("T")
+        elif ch == "G":
+            if nxt == "H" and at(i + 2) and at(i + 2) not in _VOWELS:
+                continue
+            if nxt == "N" and (i + 2 == len(word) or word[i + 1:] == "NED"):
+                continue
+            if prev == "D" and nxt in ("E", "Y", "I"):
+                continue
+            if nxt in ("I", "E", "Y") and prev != "G":
+                code.append("J")
+            else:
+                code.append("K")
+        elif ch == "H":
+            if prev not in ("C", "S", "P", "T", "G") and nxt in _VOWELS:
+                code.append("H")
+        elif ch == "K":
+            if prev != "C":
+                code.append("K")
+        elif ch == "P":
+            code.append("F" if nxt == "H" else "P")
+        elif ch == "Q":
+            code.append("K")
+        elif ch == "S":
+            if nxt == "H":
+                code.append("X")
+            elif nxt == "I" and at(i + 2) in ("O", "A"):
+                code.append("X")
+            else:
+                code.append("S")
+        elif ch == "T":
+            if nxt == "I" and at(i + 2) in ("O", "A"):
+                code.append("X")
+            elif nxt == "H":
+                code.append("0")
+            elif not (nxt == "C" and at(i + 2) == "H"):
+                code.append("T")
+        elif ch == "V":
+            code.append("F")
+        elif ch in ("W", "Y"):
+            if nxt in _VOWELS:
+                code.append(ch)
+        elif ch == "X":
+            code.append("KS")
+        elif ch == "Z":
+            code.append("S")
+        else:
+            code.append(ch)
+    return "".join(code)
+
+
+def name_keys(full_name: str) -> Dict:
+    """
+    Blocking keys stored on a Person for the given name.
+
+    Args:
+        full_name: Person's full name
+
+    Returns:
+        Dictionary with name_normalized, name_tokens, name_soundex,
+        name_metaphone and name_phonetic (the codes joined for full-text search)
+    """
+    tokens = name_tokens(full_name)
+    words = [token for token in tokens if token.isalpha()]
+    soundex_codes = list(dict.fromkeys(soundex(word) for word in words))
+    metaphone_codes = list(dict.fromkeys(code for code in (metaphone(word) for word in words) if code))
+    return {
+        "name_normalized": " ".join(tokens),
+        "name_tokens": tokens,
+        "name_soundex": soundex_codes,
+        "name_metaphone": metaphone_codes,
+        "name_phonetic": " ".join(soundex_codes + metaphone_codes),
+    }
+
+
+def fulltext_query(name: str) -> str:
+    """
+    Lucene query over the person name full-text index.
+
+    Each token matches exactly, as a prefix, within one edit (when long
+    enough) or by sound.
+
+    Args:
+        name: Name searched for
+
+    Returns:
+        Query string, empty if the name has no tokens
+    """
+    clauses = []
+    for token in name_tokens(name):
+        parts = [f"name_normalized:{token}^4", f"name_normalized:{token}*"]
+        if len(token) >= 4:
+            parts.append(f"name_normalized:{token}~1")
+        if token.isalpha():
+            # Lowercased so codes like "OR" are not read as operators
+            parts.append(f"name_phonetic:{soundex(token).lower()}")
+            code = metaphone(token)
+            if code:
+                parts.append(f"name_phonetic:{code.lower()}")
+        clauses.append("(" + " OR ".join(parts) + ")")
+    return " OR ".join(clauses)
+
+
+def token_similarity(query_token: str, name_token: str) -> float:
+    """
+    How well one query token matches one name token, from 0 to 1.
+
+    Args:
+        query_token: Normalized query token
+        name_token: Normalized name token
+
+    Returns:
+        1.0 for equal tokens, 0.9 when the query token is a prefix (e.g.
+        an initial), otherwise the edit similarity, raised to 0.85 when
+        both sound alike
+    """
+    if query_token == name_token:
+        return 1.0
+    if name_token.startswith(query_token):
+        return 0.9
+    ratio = SequenceMatcher(None, query_token, name_token).ratio()
+    if query_token.isalpha() and name_token.isalpha() and metaphone(query_token) == metaphone(name_token):
+        ratio = max(ratio, 0.85)
+    return ratio
+
+
+def name_similarity(query: str, name: str) -> float:
+    """
+    How well a person's name matches a search, from 0 to 1.
+
+    Every query token must match some name token in any order; names
+    with tokens the query did not mention score slightly lower.
+
+    Args:
+        query: Name searched for
+        name: Candidate person's full name
+
+    Returns:
+        Match score, 0.0 if some query token matches nothing
+    """
+    query_tokens = name_tokens(query)
+    candidate_tokens = name_tokens(name)
+    if not query_tokens or not candidate_tokens:
+        return 0.0
+
+    best = [max(token_similarity(token, other) for other in candidate_tokens) for token in query_tokens]
+    if min(best) < MIN_TOKEN_SIMILARITY:
+        return 0.0
+    extra = max(0, len(candidate_tokens) - len(query_tokens))
+    return round(max(0.0, sum(best) / len(best) - EXTRA_TOKEN_PENALTY * extra), 3)
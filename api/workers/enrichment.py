@@ -0,0 +1,136 @@
+"""
+Standalone SearchCarriers enrichment worker.
+
+Consumes the durable enrichment queue outside the API process, so vendor
+calls and enrichment writes never compete with request handling for the
+GIL, threads or the Neo4j connection pool. The API only enqueues.
+
+Run from the api directory:
+
+    python -m workers.enrichment --concurrency 8
+
+Any number of replicas on the API's host can share its queue file (the
+queue is single-host, see services.enrichment_queue): claims are leases, so
+two workers never enrich the same carrier at once, and work held by a
+replica that dies is picked up by the others once its lease expires.
+SIGTERM and SIGINT stop the worker after the carriers in flight.
+
+The stale-data refresh scheduler must run in exactly one process. Run it as
+its own process rather than enabling it on scaled replicas:
+
+    python -m workers.enrichment --no-consume --refresh-scheduler
+"""
+
+import os
+import sys
+import signal
+import socket
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+from services.enrichment_queue import get_enrichment_queue
+from services.enrichment_refresh_scheduler import RefreshScheduler
+from services.searchcarriers_enrichment_service import run_queue_worker
+
+logger = logging.getLogger("workers.enrichment")
+
+
+def default_worker_id() -> str:
+    """Lease owner identifying this process across nodes."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def run_worker(concurrency: int, poll_interval: float, worker_id: str,
+                     refresh_scheduler: bool, stop_event: asyncio.Event = None,
+                     consume: bool = True):
+    """Run the queue consumer and/or the refresh scheduler until stopped.
+
+    Args:
+        concurrency: Carriers enriched concurrently by this replica
+        poll_interval: Seconds to wait when no item is due
+        worker_id: Lease owner recorded on claimed items
+        refresh_scheduler: Run the stale-data refresh scheduler
+        stop_event: Set to stop; installed on SIGTERM/SIGINT if not given
+        consume: Enrich carriers from the queue
+    """
+    if stop_event is None:
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop_event.set)
+
+    queue = get_enrichment_queue()
+    tasks = []
+    if consume:
+        tasks.append(run_queue_worker(queue, stop_event, concurrency, poll_interval, worker_id))
+    if refresh_scheduler:
+        tasks.append(RefreshScheduler(queue=queue).run(stop_event))
+
+    logger.info(f"Enrichment worker {worker_id} consuming {settings.enrichment_queue_path}")
+    await asyncio.gather(*tasks)
+    logger.info(f"Enrichment worker {worker_id} stopped")
+
+
+def main():
+    """Main entry point for the enrichment worker."""
+    parser = argparse.ArgumentParser(
+        description="Consume the SearchCarriers enrichment queue"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.enrichment_concurrency,
+        help="Carriers enriched concurrently by this worker"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="Seconds to wait when the queue is empty"
+    )
+    parser.add_argument(
+        "--worker-id",
+        default=default_worker_id(),
+        help="Lease owner name; must be unique per running worker"
+    )
+    parser.add_argument(
+        "--refresh-scheduler",
+        action=argparse.BooleanOptionalAction,
+        default=settings.enrichment_refresh_enabled,
+        help="Queue stale carriers for refresh (run in exactly one process)"
+    )
+    parser.add_argument(
+        "--consume",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Enrich carriers from the queue (--no-consume runs only the refresh scheduler)"
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper()),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    if not args.consume and not args.refresh_scheduler:
+        logger.error("Neither --consume nor --refresh-scheduler is enabled; nothing to do")
+        sys.exit(1)
+
+    if args.consume and not settings.search_carriers_api_token:
+        logger.error("SEARCH_CARRIERS_API_TOKEN is not configured; nothing to do")
+        sys.exit(1)
+
+    asyncio.run(run_worker(
+        args.concurrency, args.poll_interval, args.worker_id, args.refresh_scheduler, consume=args.consume
+    ))
+
+
+if __name__ == "__main__":
+    main()
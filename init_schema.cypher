@@ -61,6 +61,25 @@ FOR (c:Carrier) ON (c.vehicle_oos_rate);
 CREATE INDEX carrier_jb_carrier_index IF NOT EXISTS
 FOR (c:Carrier) ON (c.jb_carrier);
 
+// Materialized insurance fraud risk score, maintained by the API on insurance
+// writes; backs the score-ordered /insurance/fraud/risk-scores listing
+CREATE INDEX carrier_insurance_risk_score_index IF NOT EXISTS
+FOR (c:Carrier) ON (c.insurance_risk_score);
+
+// Stamped whenever a carrier's insurance is written; the API's in-memory
+// coverage index polls it for carriers to reload
+CREATE INDEX carrier_insurance_risk_scored_at_index IF NOT EXISTS
+FOR (c:Carrier) ON (c.insurance_risk_scored_at);
+
+// Stamped when a carrier is created, so the coverage index also picks up
+// new carriers that have no insurance yet
+CREATE INDEX carrier_coverage_changed_at_index IF NOT EXISTS
+FOR (c:Carrier) ON (c.coverage_changed_at);
+
+// Chameleon cluster a carrier currently belongs to (ChameleonCluster.cluster_id)
+CREATE INDEX carrier_chameleon_cluster_index IF NOT EXISTS
+FOR (c:Carrier) ON (c.chameleon_cluster_id);
+
 // ----------------------------------------------------------------------------
 // TARGET COMPANY CONSTRAINTS AND INDEXES
 // ----------------------------------------------------------------------------
@@ -99,6 +118,12 @@ FOR (p:Person) ON (p.first_name);
 CREATE INDEX person_last_name_index IF NOT EXISTS
 FOR (p:Person) ON (p.last_name);
 
+// Name search: normalized name tokens and their Soundex/Metaphone codes,
+// maintained by the API on create and rename; backs /persons/search/by-name.
+// Backfill existing persons with POST /persons/search/name-keys/rebuild
+CREATE FULLTEXT INDEX person_name_fulltext IF NOT EXISTS
+FOR (p:Person) ON EACH [p.name_normalized, p.name_phonetic];
+
 // ----------------------------------------------------------------------------
 // INSURANCE POLICY CONSTRAINTS AND INDEXES
 // ----------------------------------------------------------------------------
@@ -162,6 +187,70 @@ FOR (ie:InsuranceEvent) ON (ie.event_type);
 CREATE INDEX insurance_event_suspicious_index IF NOT EXISTS
 FOR (ie:InsuranceEvent) ON (ie.is_suspicious);
 
+// ----------------------------------------------------------------------------
+// ENRICHMENT WATERMARK CONSTRAINTS AND INDEXES
+// ----------------------------------------------------------------------------
+// EnrichmentWatermark records what the last full SearchCarriers enrichment saw
+// for one carrier and data family, used to skip unchanged carriers on refresh
+// Required properties: watermark_id ("<usdot>:<family>"), usdot, family
+// Optional properties: record_count, max_date, payload_hash, updated_at, checked_at
+
+CREATE CONSTRAINT enrichment_watermark_id_unique IF NOT EXISTS
+FOR (w:EnrichmentWatermark) REQUIRE w.watermark_id IS UNIQUE;
+
+CREATE INDEX enrichment_watermark_usdot_index IF NOT EXISTS
+FOR (w:EnrichmentWatermark) ON (w.usdot);
+
+CREATE INDEX enrichment_watermark_checked_index IF NOT EXISTS
+FOR (w:EnrichmentWatermark) ON (w.checked_at);
+
+// ----------------------------------------------------------------------------
+// CHAMELEON CLUSTER CONSTRAINTS AND INDEXES
+// ----------------------------------------------------------------------------
+// ChameleonCluster is a precomputed group of carriers linked by shared officers,
+// insurance providers, phones or addresses; backs /insurance/fraud/chameleon-patterns
+// Required properties: cluster_id ("CC-<lowest member usdot>"), members, size, score
+// Optional properties: shared_* counts, officer_ids, provider_names, generation, computed_at
+
+CREATE CONSTRAINT chameleon_cluster_id_unique IF NOT EXISTS
+FOR (cl:ChameleonCluster) REQUIRE cl.cluster_id IS UNIQUE;
+
+CREATE INDEX chameleon_cluster_score_index IF NOT EXISTS
+FOR (cl:ChameleonCluster) ON (cl.score);
+
+CREATE INDEX chameleon_cluster_generation_index IF NOT EXISTS
+FOR (cl:ChameleonCluster) ON (cl.generation);
+
+// ----------------------------------------------------------------------------
+// PERSON MERGE CONSTRAINTS AND INDEXES
+// ----------------------------------------------------------------------------
+// PersonMerge records one person merged into another by entity resolution:
+// the merged person's identity and relationships, the score and the reasons.
+// Lookups of a merged person_id resolve to the survivor through merged_id
+// Required properties: merge_id ("<run_id>:<merged_id>"), run_id, survivor_id, merged_id
+// Optional properties: merged_name, merged_* snapshot, score, reasons, merged_at
+
+CREATE CONSTRAINT person_merge_id_unique IF NOT EXISTS
+FOR (m:PersonMerge) REQUIRE m.merge_id IS UNIQUE;
+
+CREATE INDEX person_merge_merged_index IF NOT EXISTS
+FOR (m:PersonMerge) ON (m.merged_id);
+
+CREATE INDEX person_merge_survivor_index IF NOT EXISTS
+FOR (m:PersonMerge) ON (m.survivor_id);
+
+// ----------------------------------------------------------------------------
+// SAFETY DATA INDEXES
+// ----------------------------------------------------------------------------
+// SafetySnapshot and Inspection nodes carry their carrier's usdot; risk
+// assessments (single and /carriers/risk-assessment/batch) look them up by it
+
+CREATE INDEX safety_snapshot_usdot_date_index IF NOT EXISTS
+FOR (s:SafetySnapshot) ON (s.usdot, s.snapshot_date);
+
+CREATE INDEX inspection_usdot_index IF NOT EXISTS
+FOR (i:Inspection) ON (i.usdot);
+
 // ----------------------------------------------------------------------------
 // DOCUMENTED RELATIONSHIPS
 // ----------------------------------------------------------------------------
@@ -194,6 +283,14 @@ FOR (ie:InsuranceEvent) ON (ie.is_suspicious);
 // 7. (:Carrier)-[:INSURANCE_EVENT]->(:InsuranceEvent)
 //    - Links carriers to insurance-related events
 //    - Properties: None
+//
+// 8. (:Person)-[:POSSIBLY_SAME_AS]->(:Person)
+//    - Likely duplicate persons found by entity resolution, left for review
+//    - Properties: score, reasons, run_id, detected_at
+//
+// 9. (:Person)-[:MERGED_FROM]->(:PersonMerge)
+//    - Audit trail of persons merged into this one by entity resolution
+//    - Properties: None
 
 // ============================================================================
 // FUTURE IMPLEMENTATION - Planned Entities
@@ -266,6 +363,11 @@ FOR (ie:InsuranceEvent) ON (ie.is_suspicious);
 // CREATE INDEX crash_date_index IF NOT EXISTS
 // FOR (cr:Crash) ON (cr.crash_date);
 
+// Carrier a crash belongs to; backs per-carrier crash reads and the
+// fleet-wide crash burst scan (/carriers/crash-bursts)
+CREATE INDEX crash_usdot_index IF NOT EXISTS
+FOR (cr:Crash) ON (cr.usdot);
+
 // ----------------------------------------------------------------------------
 // VIOLATION (FUTURE)
 // ----------------------------------------------------------------------------
@@ -307,21 +409,17 @@ LIMIT 10;
 // ----------------------------------------------------------------------------
 // 2. IDENTIFY CHAMELEON CARRIERS
 // ----------------------------------------------------------------------------
-// Find carriers sharing officers and insurance providers (potential chameleons)
-MATCH (c1:Carrier)-[:MANAGED_BY]->(p:Person)<-[:MANAGED_BY]-(c2:Carrier)
-WHERE c1.usdot <> c2.usdot
-OPTIONAL MATCH (c1)-[:HAD_INSURANCE]->(ip1:InsurancePolicy)-[:PROVIDED_BY]->(prov:InsuranceProvider)
-OPTIONAL MATCH (c2)-[:HAD_INSURANCE]->(ip2:InsurancePolicy)-[:PROVIDED_BY]->(prov)
-WITH c1, c2, p, COUNT(DISTINCT prov) as shared_providers
-WHERE shared_providers > 0
-RETURN c1.usdot as carrier1_usdot,
-       c1.carrier_name as carrier1_name,
-       c2.usdot as carrier2_usdot,
-       c2.carrier_name as carrier2_name,
-       p.full_name as shared_officer,
-       shared_providers,
-       c1.violations + c2.violations as combined_violations
-ORDER BY shared_providers DESC, combined_violations DESC
+// Highest-scoring clusters of carriers sharing officers, insurance providers,
+// phones or addresses (potential chameleons); rebuilt via
+// POST /insurance/fraud/chameleon-clusters/rebuild
+MATCH (cl:ChameleonCluster)
+RETURN cl.cluster_id as cluster_id,
+       cl.members as carrier_usdots,
+       cl.shared_officers as shared_officers,
+       cl.shared_insurance_providers as shared_providers,
+       cl.total_violations as combined_violations,
+       cl.score as score
+ORDER BY cl.score DESC
 LIMIT 10;
 
 // ----------------------------------------------------------------------------